@@ -1,130 +1,200 @@
 """
 API Rate Limiter Module
 Manages API call frequency to avoid hitting rate limits
+
+Each endpoint gets a token bucket (capacity = calls per hour, refilled
+continuously). Checks are answered from memory; spending a token is an
+atomic read-modify-write on the api_rate_limits table, so the web app and
+the background updater processes share one budget.
 """
 
 import time
-import json
-import os
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import logging
+from config import Config
+from models import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Default endpoint and per-endpoint hourly budgets
+DEFAULT_ENDPOINT = 'espn'
+BALLDONTLIE_ENDPOINT = 'balldontlie'
+ENDPOINT_BUDGETS = {
+    DEFAULT_ENDPOINT: Config.ESPN_CALLS_PER_HOUR,
+    BALLDONTLIE_ENDPOINT: 5,
+}
+
+# How long an in-memory bucket is trusted before re-reading the shared row
+STATE_SYNC_SECONDS = 5.0
+
+
 class APIRateLimiter:
     """Manages API rate limiting with configurable limits"""
-    
-    def __init__(self, max_calls_per_hour: int = 5, rate_file: str = 'api_rate_limit.json'):
+
+    def __init__(self, max_calls_per_hour: int = 5, db_path: str = DATABASE_PATH,
+                 budgets: Optional[Dict[str, int]] = None):
         self.max_calls_per_hour = max_calls_per_hour
-        self.rate_file = rate_file
-        self.call_history = self._load_call_history()
-    
-    def _load_call_history(self) -> Dict:
-        """Load call history from file"""
-        try:
-            if os.path.exists(self.rate_file):
-                with open(self.rate_file, 'r') as f:
-                    data = json.load(f)
-                    # Clean old entries (older than 1 hour)
-                    cutoff_time = datetime.now() - timedelta(hours=1)
-                    data['calls'] = [
-                        call for call in data.get('calls', [])
-                        if datetime.fromisoformat(call) > cutoff_time
-                    ]
-                    return data
-        except Exception as e:
-            logger.warning(f"Could not load rate limit history: {e}")
-        
-        return {'calls': []}
-    
-    def _save_call_history(self):
-        """Save call history to file"""
+        self.db_path = db_path
+        self.budgets = dict(ENDPOINT_BUDGETS if budgets is None else budgets)
+        self._lock = threading.Lock()
+        # endpoint -> {'tokens': float, 'updated_at': epoch seconds, 'synced_at': monotonic}
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._table_ready = False
+
+    def _capacity(self, endpoint: str) -> int:
+        return self.budgets.get(endpoint, self.max_calls_per_hour)
+
+    def _ensure_table(self, cursor):
+        if self._table_ready:
+            return
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS api_rate_limits (
+                endpoint TEXT PRIMARY KEY,
+                capacity INTEGER NOT NULL,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self._table_ready = True
+
+    def _refill(self, tokens: float, updated_at: float, capacity: int, now: float) -> float:
+        """Tokens after refilling at capacity-per-hour since updated_at"""
+        elapsed = max(0.0, now - updated_at)
+        return min(float(capacity), tokens + elapsed * capacity / 3600.0)
+
+    def _update_bucket(self, endpoint: str, spend: int = 0,
+                       only_if_available: bool = False) -> Tuple[Dict[str, float], bool]:
+        """
+        Refill the shared bucket, spend tokens, and persist it in one write transaction
+        Returns (bucket, spent); with only_if_available nothing is spent unless the tokens are there
+        """
+        capacity = self._capacity(endpoint)
+        now = time.time()
+
+        conn = get_pooled_connection(self.db_path)
         try:
-            with open(self.rate_file, 'w') as f:
-                json.dump(self.call_history, f, default=str)
-        except Exception as e:
-            logger.error(f"Could not save rate limit history: {e}")
-    
-    def can_make_call(self) -> bool:
+            conn.isolation_level = None
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute('SELECT tokens, updated_at FROM api_rate_limits WHERE endpoint = ?', (endpoint,))
+                row = cursor.fetchone()
+                tokens = float(capacity) if row is None else self._refill(row[0], row[1], capacity, now)
+                spent = spend > 0 and (tokens >= spend or not only_if_available)
+                if spent:
+                    tokens = max(0.0, tokens - spend)
+                # A plain sync only writes when the row doesn't exist yet
+                if spent or row is None:
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO api_rate_limits (endpoint, capacity, tokens, updated_at)
+                        VALUES (?, ?, ?, ?)
+                    ''', (endpoint, capacity, tokens, now))
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+        bucket = {'tokens': tokens, 'updated_at': now, 'synced_at': time.monotonic()}
+        with self._lock:
+            self._buckets[endpoint] = bucket
+        return bucket, spent
+
+    def _current_tokens(self, endpoint: str) -> float:
+        """Tokens available now, from memory unless the cached bucket is stale"""
+        bucket = self._buckets.get(endpoint)
+        if bucket is None or time.monotonic() - bucket['synced_at'] > STATE_SYNC_SECONDS:
+            try:
+                bucket, _ = self._update_bucket(endpoint)
+            except Exception as e:
+                logger.warning(f"Could not sync rate limit state for {endpoint}: {e}")
+                if bucket is None:
+                    return float(self._capacity(endpoint))
+        return self._refill(bucket['tokens'], bucket['updated_at'], self._capacity(endpoint), time.time())
+
+    def can_make_call(self, endpoint: str = DEFAULT_ENDPOINT) -> bool:
         """Check if we can make an API call without exceeding rate limit"""
-        # Clean old entries
-        cutoff_time = datetime.now() - timedelta(hours=1)
-        self.call_history['calls'] = [
-            call for call in self.call_history.get('calls', [])
-            if datetime.fromisoformat(call) > cutoff_time
-        ]
-        
-        current_calls = len(self.call_history['calls'])
-        can_call = current_calls < self.max_calls_per_hour
-        
+        can_call = self._current_tokens(endpoint) >= 1.0
+
         if not can_call:
-            oldest_call = min(self.call_history['calls'])
-            next_available = datetime.fromisoformat(oldest_call) + timedelta(hours=1)
-            logger.info(f"Rate limit reached ({current_calls}/{self.max_calls_per_hour}). Next call available at: {next_available}")
-        
+            logger.info(f"Rate limit reached for {endpoint} ({self._capacity(endpoint)}/hour). "
+                        f"Next call available at: {self.get_next_available_time(endpoint)}")
+
         return can_call
-    
-    def record_call(self):
+
+    def record_call(self, endpoint: str = DEFAULT_ENDPOINT):
         """Record that an API call was made"""
-        now = datetime.now()
-        self.call_history['calls'].append(now.isoformat())
-        self._save_call_history()
-        logger.info(f"API call recorded. Total calls in last hour: {len(self.call_history['calls'])}")
-    
-    def get_next_available_time(self) -> Optional[datetime]:
+        try:
+            bucket, _ = self._update_bucket(endpoint, spend=1)
+            logger.info(f"API call recorded for {endpoint}. Calls remaining: {int(bucket['tokens'])}")
+        except Exception as e:
+            logger.error(f"Could not record API call for {endpoint}: {e}")
+
+    def try_acquire(self, endpoint: str = DEFAULT_ENDPOINT) -> bool:
+        """Atomically check and spend one call; False if the budget is exhausted"""
+        if self._current_tokens(endpoint) < 1.0:
+            return False
+        try:
+            # Re-checked inside the write transaction: another process may have spent it
+            _, spent = self._update_bucket(endpoint, spend=1, only_if_available=True)
+            return spent
+        except Exception as e:
+            logger.error(f"Could not acquire API call for {endpoint}: {e}")
+            return False
+
+    def get_next_available_time(self, endpoint: str = DEFAULT_ENDPOINT) -> Optional[datetime]:
         """Get the next time when an API call can be made"""
-        if self.can_make_call():
+        tokens = self._current_tokens(endpoint)
+        if tokens >= 1.0:
             return None
-        
-        if not self.call_history['calls']:
-            return None
-        
-        oldest_call = min(self.call_history['calls'])
-        return datetime.fromisoformat(oldest_call) + timedelta(hours=1)
-    
-    def get_calls_remaining(self) -> int:
+
+        seconds = (1.0 - tokens) * 3600.0 / self._capacity(endpoint)
+        return datetime.now() + timedelta(seconds=seconds)
+
+    def get_calls_remaining(self, endpoint: str = DEFAULT_ENDPOINT) -> int:
         """Get number of calls remaining in current hour"""
-        cutoff_time = datetime.now() - timedelta(hours=1)
-        self.call_history['calls'] = [
-            call for call in self.call_history.get('calls', [])
-            if datetime.fromisoformat(call) > cutoff_time
-        ]
-        
-        current_calls = len(self.call_history['calls'])
-        return max(0, self.max_calls_per_hour - current_calls)
+        return int(self._current_tokens(endpoint))
 
 # Global rate limiter instance
 api_rate_limiter = APIRateLimiter(max_calls_per_hour=5)
 
-def check_api_rate_limit() -> bool:
+def check_api_rate_limit(endpoint: str = DEFAULT_ENDPOINT) -> bool:
     """Check if we can make an API call"""
-    return api_rate_limiter.can_make_call()
+    return api_rate_limiter.can_make_call(endpoint)
 
-def record_api_call():
+def record_api_call(endpoint: str = DEFAULT_ENDPOINT):
     """Record that an API call was made"""
-    api_rate_limiter.record_call()
+    api_rate_limiter.record_call(endpoint)
+
+def acquire_api_call(endpoint: str = DEFAULT_ENDPOINT) -> bool:
+    """Check and record an API call in one step"""
+    return api_rate_limiter.try_acquire(endpoint)
 
-def get_api_calls_remaining() -> int:
+def get_api_calls_remaining(endpoint: str = DEFAULT_ENDPOINT) -> int:
     """Get remaining API calls in current hour"""
-    return api_rate_limiter.get_calls_remaining()
+    return api_rate_limiter.get_calls_remaining(endpoint)
 
-def get_next_api_call_time() -> Optional[datetime]:
+def get_next_api_call_time(endpoint: str = DEFAULT_ENDPOINT) -> Optional[datetime]:
     """Get next available time for API call"""
-    return api_rate_limiter.get_next_available_time()
+    return api_rate_limiter.get_next_available_time(endpoint)
 
 if __name__ == "__main__":
     # Test rate limiter
-    limiter = APIRateLimiter(max_calls_per_hour=3)  # Lower limit for testing
-    
-    print(f"Can make call: {limiter.can_make_call()}")
-    print(f"Calls remaining: {limiter.get_calls_remaining()}")
-    
+    limiter = APIRateLimiter(max_calls_per_hour=3, budgets={})  # Lower limit for testing
+
+    print(f"Can make call: {limiter.can_make_call('test')}")
+    print(f"Calls remaining: {limiter.get_calls_remaining('test')}")
+
     # Simulate making calls
     for i in range(5):
-        if limiter.can_make_call():
-            limiter.record_call()
-            print(f"Call {i+1} made. Remaining: {limiter.get_calls_remaining()}")
+        if limiter.try_acquire('test'):
+            print(f"Call {i+1} made. Remaining: {limiter.get_calls_remaining('test')}")
         else:
-            next_time = limiter.get_next_available_time()
+            next_time = limiter.get_next_available_time('test')
             print(f"Call {i+1} blocked. Next available: {next_time}")
@@ -9,20 +9,40 @@ from io import StringIO
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from werkzeug.security import generate_password_hash, check_password_hash
+from config import Config
 from setup_database import setup_complete_database
+from app_bootstrap import bootstrap_app, is_bootstrapped
+from models import get_pooled_connection, get_pool_stats
+from request_metrics import init_request_metrics, get_performance_report
+from db_backup import BackupError, backup_before_change, create_backup, get_backup_status
 from database_sync import sync_season_from_api, sync_week_from_api, update_live_scores
 from utils.timezone_utils import convert_to_ast, format_ast_time
 from contextlib import contextmanager
-from deadline_manager import DeadlineManager
+from deadline_manager import DeadlineManager, invalidate_deadline_cache
 from deadline_override_manager import DeadlineOverrideManager
 import csv
 import io
+import json
 from werkzeug.utils import secure_filename
 from background_updater import start_background_updater, stop_background_updater, get_updater_status
 import atexit
 
 # Import predictable winner analysis
 from predictable_winner import get_winner_prediction_summary, analyze_predictable_winners
+from weekly_standings import WeeklyStandingsEngine
+from weekly_winners import WeeklyWinnerEngine, summarize_rankings
+from pick_submission import PickSubmissionService
+from pick_import import PickImportPipeline
+from team_info import NFL_TEAM_NAMES, get_team_name, get_team_logo_url, get_team_display
+from game_views import get_week_game_views, invalidate_game_view_cache
+from mnf_cleanup_utils import on_schedule_changed
+from game_slots import refresh_game_slots
+from leaderboard_cache import cached_response, week_time_marker
+from score_broadcaster import LiveStreamFull, get_score_broadcaster
+from csv_export import (count_games, count_user_picks, stream_picks_long, stream_picks_wide,
+                        stream_user_picks, gzip_chunks)
+from season_standings import get_season_leaderboard, refresh_season_standings, refresh_standings_for_games
+from pick_correctness import score_finalized_games, score_games_with_cursor
 
 # Configure logging for better debugging
 logging.basicConfig(
@@ -58,23 +78,25 @@ def parse_game_date(date_string):
 
 app = Flask(__name__)
 app.secret_key = 'nfl-fantasy-secret-key-2024'
-app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
-app.jinja_env.auto_reload = True
-app.config['DEBUG'] = True
+# Registered first so request timing wraps every other hook
+init_request_metrics(app)
 
-# Force template cache clearing
-if app.debug:
-    app.jinja_env.cache = {}
-    from jinja2 import FileSystemLoader
-    app.jinja_loader = FileSystemLoader(app.template_folder)
+def configure_runtime(debug: bool, templates_auto_reload: bool) -> None:
+    """Debug mode and template reloading (FLASK_DEBUG / TEMPLATES_AUTO_RELOAD; off when serving production)"""
+    app.debug = debug
+    app.config['TEMPLATES_AUTO_RELOAD'] = templates_auto_reload
+    # Without auto reload Jinja keeps compiled templates and never stats the files again
+    app.jinja_env.auto_reload = templates_auto_reload
+
+configure_runtime(Config.DEBUG, Config.TEMPLATES_AUTO_RELOAD)
 
 DATABASE_PATH = 'nfl_fantasy.db'
 
 @contextmanager
 def get_db():
     """Database connection context manager for better resource management"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = get_pooled_connection(DATABASE_PATH)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -83,35 +105,13 @@ def get_db():
 
 def get_db_legacy():
     """Legacy database connection function - kept for compatibility"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = get_pooled_connection(DATABASE_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
 def initialize_app():
-    if not os.path.exists(DATABASE_PATH):
-        print("Database not found, running setup...")
-        setup_complete_database()
-    else:
-        print("Database exists, ready to run")
-    
-    # Ensure weekly_results table exists and is up to date
-    try:
-        from scoring_updater import create_weekly_results_table_if_not_exists
-        create_weekly_results_table_if_not_exists()
-        print("Weekly results table verified")
-    except Exception as e:
-        logger.error(f"Error initializing weekly results table: {e}")
-    
-    # Auto-update scoring for any final games that may not have been scored yet
-    try:
-        from database_sync import recalculate_all_pick_correctness
-        updated_picks = recalculate_all_pick_correctness()
-        if updated_picks > 0:
-            print(f"✅ Auto-updated scoring for {updated_picks} picks on app startup")
-        else:
-            print("✅ All pick scoring is up to date")
-    except Exception as e:
-        logger.error(f"Error auto-updating pick scoring on startup: {e}")
+    """Run one-time startup work; later calls in the same process are no-ops"""
+    return bootstrap_app(DATABASE_PATH)
 
 def get_dashboard_data(user_id: int, week: int, year: int) -> Dict[str, int]:
     """Get dashboard data with accurate game counts"""
@@ -150,6 +150,12 @@ def get_dashboard_data(user_id: int, week: int, year: int) -> Dict[str, int]:
         }
 
 
+@app.before_request
+def ensure_app_initialized():
+    """Run startup work on the first request if the entry point did not"""
+    if not is_bootstrapped():
+        initialize_app()
+
 # Security middleware to handle suspicious requests
 @app.before_request
 def security_headers():
@@ -184,8 +190,6 @@ def index():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    initialize_app()
-    
     # Use smart NFL week calculation based on game completion
     try:
         from nfl_week_calculator import get_current_nfl_week
@@ -251,8 +255,9 @@ def index():
 @app.after_request
 def add_cache_busting_headers(response):
     """Add cache-busting headers to prevent browser caching issues"""
-    # Only add to HTML responses to avoid breaking static files
-    if response.content_type and 'text/html' in response.content_type:
+    # Only add to HTML responses to avoid breaking static files; responses that
+    # carry an ETag (leaderboard cache) set their own revalidation policy
+    if response.content_type and 'text/html' in response.content_type and not response.headers.get('ETag'):
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
         response.headers['Pragma'] = 'no-cache'
         response.headers['Expires'] = '0'
@@ -386,7 +391,7 @@ def sync_season():
     elif games_added == 0:
         # Check if sync was blocked due to existing picks
         import sqlite3
-        conn = sqlite3.connect(DATABASE_PATH)
+        conn = get_pooled_connection(DATABASE_PATH)
         cursor = conn.cursor()
         cursor.execute('''
             SELECT COUNT(*) FROM user_picks up 
@@ -434,17 +439,17 @@ def admin_generate_week():
 @app.route('/update_scores/<int:week>/<int:year>')
 def update_scores(week, year):
     """Update live scores - can be called by anyone but respects rate limits"""
-    from api_rate_limiter import check_api_rate_limit, get_api_calls_remaining
+    from api_rate_limiter import check_api_rate_limit, get_api_calls_remaining, BALLDONTLIE_ENDPOINT
     
-    if not check_api_rate_limiter():
+    if not check_api_rate_limit(BALLDONTLIE_ENDPOINT):
         return jsonify({
             'error': 'API rate limit exceeded',
-            'calls_remaining': get_api_calls_remaining(),
-            'message': f'Please wait before making another API call. Calls remaining: {get_api_calls_remaining()}'
+            'calls_remaining': get_api_calls_remaining(BALLDONTLIE_ENDPOINT),
+            'message': f'Please wait before making another API call. Calls remaining: {get_api_calls_remaining(BALLDONTLIE_ENDPOINT)}'
         }), 429
     
     games_updated = update_live_scores(week, year)
-    remaining_calls = get_api_calls_remaining()
+    remaining_calls = get_api_calls_remaining(BALLDONTLIE_ENDPOINT)
     
     return jsonify({
         'success': True,
@@ -663,8 +668,6 @@ def games():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    initialize_app()
-    
     # Use smart NFL week calculation for current week display
     try:
         from nfl_week_calculator import get_current_nfl_week
@@ -677,15 +680,6 @@ def games():
     week = request.args.get('week', current_nfl_week, type=int)
     year = request.args.get('year', 2025, type=int)
     
-    # Auto-cleanup obsolete Monday Night Football score predictions
-    try:
-        from mnf_cleanup_utils import cleanup_obsolete_mnf_predictions
-        cleaned_count = cleanup_obsolete_mnf_predictions(DATABASE_PATH, week, year)
-        if cleaned_count > 0:
-            logger.info(f"Auto-cleaned {cleaned_count} obsolete MNF predictions for Week {week}")
-    except Exception as e:
-        logger.warning(f"MNF auto-cleanup failed: {e}")
-    
     # Get dashboard data for the selected week
     dashboard_data = get_dashboard_data(session['user_id'], week, year)
     
@@ -700,66 +694,12 @@ def games():
     # DON'T auto-update live scores on every page load to avoid hitting API rate limits
     # Admin can manually trigger updates using the update_scores endpoint
     
+    # Parsed AST times, team names/logos and MNF/TNF flags come from the per-week view cache
+    games_data = get_week_game_views(week, year, DATABASE_PATH)
+    
     with get_db() as conn:
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM nfl_games 
-            WHERE week = ? AND year = ? 
-            ORDER BY game_date
-        ''', (week, year))
-        games_raw = cursor.fetchall()
-        
-        # Find the actual Monday Night Football game (using database flag)
-        cursor.execute('''
-            SELECT id FROM nfl_games 
-            WHERE week = ? AND year = ? 
-            AND is_monday_night = 1
-            ORDER BY game_date DESC, id DESC
-            LIMIT 1
-        ''', (week, year))
-        
-        monday_night_game = cursor.fetchone()
-        monday_night_game_id = monday_night_game[0] if monday_night_game else None
-        
-        # Convert games to proper format with AST datetime objects
-        games_data = []
-        for game in games_raw:
-            game_dict = dict(game)
-            # Convert string date to datetime object and ensure AST
-            if game_dict['game_date']:
-                try:
-                    if isinstance(game_dict['game_date'], str):
-                        # Handle both formats: with T and with space
-                        date_str = game_dict['game_date']
-                        if 'T' in date_str:
-                            # ISO format with T
-                            dt = datetime.fromisoformat(date_str.replace('T', ' '))
-                        else:
-                            # Standard format with space
-                            dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                        # Convert to AST
-                        game_dict['game_date'] = convert_to_ast(dt)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Failed to parse game date '{game_dict['game_date']}': {e}")
-                    game_dict['game_date'] = None
-            
-            # Add team names to game data for easy access in template
-            game_dict['away_team_name'] = get_team_name(game_dict['away_team'])
-            game_dict['home_team_name'] = get_team_name(game_dict['home_team'])
-            
-            # Add team logos
-            game_dict['away_team_logo'] = get_team_logo_url(game_dict['away_team'])
-            game_dict['home_team_logo'] = get_team_logo_url(game_dict['home_team'])
-            
-            # Add actual Monday Night Football detection
-            game_dict['is_actual_monday_night'] = (game_dict['id'] == monday_night_game_id)
-            
-            # Add Thursday Night Football detection
-            game_dict['is_actual_thursday_night'] = game_dict.get('is_thursday_night', False)
-            
-            games_data.append(game_dict)
-        
         cursor.execute('''
             SELECT g.id, up.selected_team, up.predicted_home_score, up.predicted_away_score
             FROM user_picks up
@@ -899,43 +839,15 @@ def submit_picks():
                 
                 picks.append(pick)
     
-    # Check deadlines before allowing submissions
-    deadline_manager = DeadlineManager()
-    
-    with get_db() as conn:
-        cursor = conn.cursor()
-        successful_picks = 0
-        failed_picks = 0
-        rejected_games = []
-        
-        for pick in picks:
-            game_id = pick.get('game_id')
-            selected_team = pick.get('selected_team')
-            home_score = pick.get('home_score')
-            away_score = pick.get('away_score')
-            
-            if game_id and selected_team:
-                # Get game info to check deadline
-                cursor.execute('SELECT week, year, game_date, away_team, home_team FROM nfl_games WHERE id = ?', (game_id,))
-                game_info = cursor.fetchone()
-                
-                if game_info:
-                    week, year, game_date, away_team, home_team = game_info
-                    
-                    # Check if picks are still allowed for this game
-                    if deadline_manager.can_make_picks(week, year, game_date):
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO user_picks 
-                            (user_id, game_id, selected_team, predicted_home_score, predicted_away_score)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (session['user_id'], game_id, selected_team, home_score, away_score))
-                        successful_picks += 1
-                    else:
-                        failed_picks += 1
-                        rejected_games.append(f"{away_team} @ {home_team}")
-                        logger.warning(f"Pick submission after deadline for game {game_id} ({away_team} @ {home_team}) by user {session['user_id']}")
-        
-        conn.commit()
+    # Look up all games and check deadlines once, then save accepted picks in one transaction
+    submission = PickSubmissionService(DATABASE_PATH).submit(picks, user_id=session['user_id'])
+    successful_picks = submission['accepted_count']
+    rejected_games = []
+    for result in submission['rejected']:
+        if result['reason'] == 'deadline_passed':
+            rejected_games.append(result['matchup'])
+            logger.warning(f"Pick submission after deadline for game {result['game_id']} ({result['matchup']}) by user {session['user_id']}")
+    failed_picks = len(rejected_games)
     
     # Handle responses based on request type
     if request.is_json:
@@ -1094,66 +1006,66 @@ def leaderboard():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    conn = get_db_legacy()
-    cursor = conn.cursor()
-    
-    # Calculate leaderboard using subqueries to avoid Cartesian product from multiple JOINs
-    cursor.execute('''
-        SELECT u.username,
-               (SELECT COUNT(*) FROM weekly_results wr WHERE wr.user_id = u.id AND wr.is_winner = 1) as weekly_wins,
-               (SELECT SUM(CASE WHEN p2.is_correct = 1 AND g2.is_final = 1 THEN 1 ELSE 0 END) 
-                FROM user_picks p2 
-                JOIN nfl_games g2 ON p2.game_id = g2.id 
-                WHERE p2.user_id = u.id) as total_games_won,
-               (SELECT COUNT(DISTINCT g3.week || '-' || g3.year) 
-                FROM user_picks p3 
-                JOIN nfl_games g3 ON p3.game_id = g3.id 
-                WHERE p3.user_id = u.id AND g3.is_final = 1) as weeks_played,
-               (SELECT COUNT(*) 
-                FROM user_picks p4 
-                JOIN nfl_games g4 ON p4.game_id = g4.id 
-                WHERE p4.user_id = u.id AND g4.is_final = 1) as total_games_played,
-               ROUND(
-                   CASE 
-                       WHEN (SELECT COUNT(DISTINCT g5.week || '-' || g5.year) 
-                             FROM user_picks p5 
-                             JOIN nfl_games g5 ON p5.game_id = g5.id 
-                             WHERE p5.user_id = u.id AND g5.is_final = 1) > 0
-                       THEN CAST((SELECT SUM(CASE WHEN p6.is_correct = 1 AND g6.is_final = 1 THEN 1 ELSE 0 END) 
-                                  FROM user_picks p6 
-                                  JOIN nfl_games g6 ON p6.game_id = g6.id 
-                                  WHERE p6.user_id = u.id) AS FLOAT) / 
-                            (SELECT COUNT(DISTINCT g7.week || '-' || g7.year) 
-                             FROM user_picks p7 
-                             JOIN nfl_games g7 ON p7.game_id = g7.id 
-                             WHERE p7.user_id = u.id AND g7.is_final = 1)
-                       ELSE 0 
-                   END, 1
-               ) as avg_games_won_per_week
-        FROM users u
-        WHERE u.is_admin = 0 
-        AND ((SELECT COUNT(*) FROM user_picks p8 JOIN nfl_games g8 ON p8.game_id = g8.id WHERE p8.user_id = u.id AND g8.is_final = 1) > 0 
-             OR (SELECT COUNT(*) FROM weekly_results wr WHERE wr.user_id = u.id AND wr.is_winner = 1) > 0)
-        ORDER BY weekly_wins DESC, total_games_won DESC, avg_games_won_per_week DESC, u.username
-    ''')
-    
+    return cached_response(('leaderboard', bool(session.get('is_admin'))),
+                           lambda: render_template('leaderboard.html', leaderboard=_season_leaderboard_rows()))
+
+def _season_leaderboard_rows():
+    """Season leaderboard rows in the shape leaderboard.html expects"""
+    # Season totals are kept up to date in season_standings as games finalize
     leaderboard_data = []
-    for row in cursor.fetchall():
+    for row in get_season_leaderboard(DATABASE_PATH):
         leaderboard_data.append({
-            'username': row[0],
-            'weekly_wins': row[1] or 0,
-            'total_games_won': row[2] or 0,
-            'weeks_played': row[3] or 0,
-            'total_games_played': row[4] or 0,
-            'avg_games_won_per_week': row[5] or 0.0,
+            'username': row['username'],
+            'weekly_wins': row['weekly_wins'] or 0,
+            'total_games_won': row['total_games_won'] or 0,
+            'weeks_played': row['weeks_played'] or 0,
+            'total_games_played': row['games_played'] or 0,
+            'avg_games_won_per_week': row['avg_games_won_per_week'] or 0.0,
             # Map to template expected names
-            'wins': row[1] or 0,  # weekly wins
-            'avg_correct': row[5] or 0.0,  # avg games won per week
-            'total_points': row[2] or 0  # total games won (1 point per game)
+            'wins': row['weekly_wins'] or 0,  # weekly wins
+            'avg_correct': row['avg_games_won_per_week'] or 0.0,  # avg games won per week
+            'total_points': row['total_games_won'] or 0  # total games won (1 point per game)
+        })
+    
+    return leaderboard_data
+
+@app.route('/api/standings')
+def api_season_standings():
+    """Season standings as JSON (served from the leaderboard cache)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    
+    return cached_response(('api_standings',),
+                           lambda: json.dumps({'standings': _season_leaderboard_rows()}),
+                           mimetype='application/json')
+
+@app.route('/api/standings/<int:week>/<int:year>')
+def api_weekly_standings(week, year):
+    """One week's standings as JSON (served from the leaderboard cache)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    
+    def build():
+        standings = WeeklyStandingsEngine(DATABASE_PATH).build_week(week, year)
+        return json.dumps({
+            'week': week,
+            'year': year,
+            'games_available': standings['games_available'],
+            'completed_games': standings['completed_games'],
+            'week_completed': standings['week_completed'],
+            'standings': [{
+                'rank': entry['rank'],
+                'username': entry['username'],
+                'correct_picks': entry['correct_picks'],
+                'total_picks': entry['total_picks'],
+                'win_percentage': entry['breakdown']['win_percentage'],
+                'is_winner': entry['is_winner'],
+                'monday_tiebreaker': entry['monday_tiebreaker']
+            } for entry in standings['leaderboard']]
         })
     
-    conn.close()
-    return render_template('leaderboard.html', leaderboard=leaderboard_data)
+    return cached_response(('api_weekly_standings', week, year, week_time_marker(week, year, DATABASE_PATH)),
+                           build, mimetype='application/json')
 
 @app.route('/rules')
 def rules():
@@ -1399,7 +1311,8 @@ def admin_update_pick():
             
             cursor.execute('''
                 UPDATE user_picks 
-                SET selected_team = ?, predicted_away_score = ?, predicted_home_score = ?
+                SET selected_team = ?, predicted_away_score = ?, predicted_home_score = ?,
+                    is_correct = NULL
                 WHERE id = ?
             ''', (selected_team, predicted_away_score, predicted_home_score, pick_id))
             conn.commit()
@@ -1548,8 +1461,13 @@ def admin_create_game():
         ''', (week, year, game_id, away_team, home_team, game_date,
               is_thursday, is_sunday, is_monday, 'scheduled'))
         
+        refresh_game_slots(cursor, week, year)
         conn.commit()
     
+    invalidate_deadline_cache()
+    invalidate_game_view_cache()
+    on_schedule_changed(DATABASE_PATH, week, year)
+    
     return jsonify({'success': True, 'message': 'Game created successfully'})
 
 @app.route('/admin/update_game', methods=['POST'])
@@ -1586,8 +1504,21 @@ def admin_update_game():
             ''', (away_team, home_team, game_date, is_thursday, is_sunday, is_monday,
                   game_status, away_score, home_score, is_final, game_id))
             
+            cursor.execute('SELECT week, year FROM nfl_games WHERE id = ?', (game_id,))
+            game_week = cursor.fetchone()
+            if game_week:
+                refresh_game_slots(cursor, game_week[0], game_week[1])
+            
             conn.commit()
         
+        # Game time may have moved, and a changed final score needs rescoring
+        invalidate_deadline_cache()
+        invalidate_game_view_cache()
+        if game_week:
+            on_schedule_changed(DATABASE_PATH, game_week[0], game_week[1])
+        score_finalized_games([game_id], DATABASE_PATH, refresh_standings=False)
+        refresh_standings_for_games([game_id], DATABASE_PATH)
+        
         return jsonify({'success': True, 'message': 'Game updated successfully'})
         
     except Exception as e:
@@ -1606,6 +1537,13 @@ def admin_delete_game():
         with get_db() as conn:
             cursor = conn.cursor()
             
+            # Players whose season totals include this game
+            cursor.execute('SELECT DISTINCT user_id FROM user_picks WHERE game_id = ?', (game_id,))
+            affected_user_ids = [row[0] for row in cursor.fetchall()]
+            
+            cursor.execute('SELECT week, year FROM nfl_games WHERE id = ?', (game_id,))
+            game_week = cursor.fetchone()
+            
             # Delete user picks first (foreign key constraint)
             cursor.execute('DELETE FROM user_picks WHERE game_id = ?', (game_id,))
             
@@ -1614,6 +1552,12 @@ def admin_delete_game():
             
             conn.commit()
         
+        invalidate_deadline_cache()
+        invalidate_game_view_cache()
+        if game_week:
+            on_schedule_changed(DATABASE_PATH, game_week[0], game_week[1])
+        refresh_season_standings(affected_user_ids, DATABASE_PATH)
+        
         return jsonify({'success': True, 'message': 'Game deleted successfully'})
         
     except Exception as e:
@@ -1692,17 +1636,45 @@ def admin_results():
 
 @app.route('/admin/calculate_results', methods=['POST'])
 def admin_calculate_results():
+    """
+    Rank and store weekly results
+    {"week": N, "year": Y} recomputes one week; {"year": Y, "through_week": N}
+    (or {"year": Y, "all_weeks": true}) recomputes weeks 1..N (or the whole
+    season) in one transaction, e.g. to reconcile after a data fix
+    """
     if 'user_id' not in session or not session.get('is_admin'):
         return jsonify({'error': 'Admin access required'}), 403
     
-    data = request.get_json()
-    week = data.get('week')
-    year = data.get('year')
+    data = request.get_json(silent=True) or {}
+    try:
+        year = int(data.get('year', 2025))
+        week = int(data['week']) if data.get('week') is not None else None
+        through_week = int(data['through_week']) if data.get('through_week') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'week, through_week and year must be numbers'}), 400
     
-    # Calculate weekly results logic here
-    # This would determine winners based on picks vs actual results
+    if week is None and through_week is None and not data.get('all_weeks'):
+        return jsonify({'success': False, 'error': 'Week number (or through_week / all_weeks) required'}), 400
     
-    return jsonify({'success': True, 'message': 'Results calculated', 'winner': 'TBD'})
+    try:
+        engine = WeeklyWinnerEngine(DATABASE_PATH)
+        if week is not None:
+            ranked = {week: engine.recompute_week(week, year)}
+        else:
+            ranked = engine.recompute_season(year, through_week)
+        summary = summarize_rankings(ranked)
+        
+        logger.info(f"Admin {session.get('username')} recalculated results for "
+                    f"{len(summary)} weeks of {year}")
+        return jsonify({
+            'success': True,
+            'message': f'Results calculated for {len(summary)} week(s) of {year}',
+            'winner': summary[0]['winner'] if week is not None and summary else None,
+            'weeks': summary
+        })
+    except Exception as e:
+        logger.error(f"Error calculating results: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/admin/users')
 def admin_users():
@@ -1796,6 +1768,7 @@ def admin_delete_user():
             
             # Delete weekly results
             cursor.execute('DELETE FROM weekly_results WHERE user_id = ?', (user_id,))
+            cursor.execute('DELETE FROM season_standings WHERE user_id = ?', (user_id,))
             
             # Delete user
             cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
@@ -1842,25 +1815,15 @@ def admin_force_finalize_game():
             ''', (away_score, home_score, game_id))
             
             # Update pick correctness
-            winner = home_team if home_score > away_score else away_team if away_score > home_score else None
-            if winner:
-                cursor.execute('''
-                    UPDATE user_picks 
-                    SET is_correct = CASE 
-                        WHEN selected_team = ? THEN 1 
-                        ELSE 0 
-                    END
-                    WHERE game_id = ?
-                ''', (winner, game_id))
-                
-                picks_updated = cursor.rowcount
-            else:
-                picks_updated = 0  # Tie game
+            _, picks_updated = score_games_with_cursor(cursor, [game_id])
             
             conn.commit()
             
             logger.info(f"Admin {session['username']} force-finalized game {game_id}: {away_team} {away_score} - {home_team} {home_score}")
         
+        invalidate_game_view_cache()
+        refresh_standings_for_games([game_id], DATABASE_PATH)
+        
         return jsonify({
             'success': True, 
             'message': f'Game finalized: {away_team} {away_score} - {home_team} {home_score}',
@@ -1973,8 +1936,12 @@ def force_create_games(week, year):
                         ))
                         games_created += 1
                     
+                    refresh_game_slots(cursor, week, year)
                     conn.commit()
                 
+                invalidate_deadline_cache(week, year)
+                invalidate_game_view_cache(week, year)
+                on_schedule_changed(DATABASE_PATH, week, year)
                 flash(f'Successfully created {games_created} games for Week {week}', 'success')
             else:
                 flash(f'No schedule data available for Week {week}', 'error')
@@ -2034,35 +2001,14 @@ def admin_set_user_picks():
         user_id = data.get('user_id')
         picks = data.get('picks', [])
         
-        # Track weeks/years that need scoring updates
-        weeks_to_update = set()
+        # Admin entry skips deadline checks; all picks are written in one transaction
+        submission = PickSubmissionService(DATABASE_PATH).submit(
+            picks, user_id=user_id, enforce_deadlines=False, created_at=datetime.now()
+        )
+        successful_picks = submission['accepted_count']
         
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            successful_picks = 0
-            
-            for pick in picks:
-                game_id = pick.get('game_id')
-                selected_team = pick.get('selected_team')
-                home_score = pick.get('home_score')
-                away_score = pick.get('away_score')
-                
-                if game_id and selected_team:
-                    # Get week/year for this game to trigger scoring update
-                    cursor.execute('SELECT week, year FROM nfl_games WHERE id = ?', (game_id,))
-                    game_info = cursor.fetchone()
-                    if game_info:
-                        weeks_to_update.add((game_info[0], game_info[1]))
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO user_picks 
-                        (user_id, game_id, selected_team, predicted_home_score, predicted_away_score, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (user_id, game_id, selected_team, home_score, away_score, datetime.now()))
-                    successful_picks += 1
-            
-            conn.commit()
+        # Track weeks/years that need scoring updates
+        weeks_to_update = set(submission['weeks'])
         
         # Auto-update scoring for affected weeks
         scoring_updates = []
@@ -2203,46 +2149,21 @@ def admin_picks_table():
         current_week = request.args.get('week', get_current_nfl_week(), type=int)
         current_year = request.args.get('year', 2025, type=int)
         
+        # Create a simple object to access attributes in template
+        class GameObj:
+            def __init__(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+        
+        # Games come from the per-week view cache; this table shows the stored (ET) kickoff time
+        games = []
+        for view in get_week_game_views(current_week, current_year, DATABASE_PATH):
+            view['game_date'] = view['game_date_et']
+            games.append(GameObj(view))
+        
         with get_db() as conn:
             cursor = conn.cursor()
             
-            # Get all games for the week
-            cursor.execute('''
-                SELECT * FROM nfl_games 
-                WHERE week = ? AND year = ? 
-                ORDER BY game_date
-            ''', (current_week, current_year))
-            games_raw = cursor.fetchall()
-            
-            # Convert games to proper format with datetime objects
-            games = []
-            for game in games_raw:
-                game_dict = dict(game)
-                # Convert string date to datetime object if needed
-                if game_dict['game_date']:
-                    try:
-                        if isinstance(game_dict['game_date'], str):
-                            # Handle both formats: with T and with space
-                            date_str = game_dict['game_date']
-                            if 'T' in date_str:
-                                # ISO format with T
-                                dt = datetime.fromisoformat(date_str.replace('T', ' '))
-                            else:
-                                # Standard format with space
-                                dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                            game_dict['game_date'] = dt
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Could not parse game_date '{game_dict['game_date']}': {e}")
-                        game_dict['game_date'] = None
-                
-                # Create a simple object to access attributes in template
-                class GameObj:
-                    def __init__(self, data):
-                        for key, value in data.items():
-                            setattr(self, key, value)
-                
-                games.append(GameObj(game_dict))
-            
             # Get all users
             cursor.execute('SELECT id, username FROM users ORDER BY username')
             users_raw = cursor.fetchall()
@@ -2314,30 +2235,35 @@ def submit_all_picks():
             # Get all users
             cursor.execute('SELECT id, username FROM users')
             users = {username: user_id for user_id, username in cursor.fetchall()}
-            
-            successful_picks = 0
-            
-            # Process all form data
-            for field_name, selected_team in request.form.items():
-                if field_name.startswith('pick_') and selected_team:
-                    # Parse field name: pick_username_gameid
-                    parts = field_name.split('_')
-                    if len(parts) >= 3:
-                        username = parts[1]
-                        game_id = parts[2]
-                        
-                        if username in users:
-                            user_id = users[username]
-                            
-                            # Insert or update the pick
-                            cursor.execute('''
-                                INSERT OR REPLACE INTO user_picks 
-                                (user_id, game_id, selected_team, created_at)
-                                VALUES (?, ?, ?, ?)
-                            ''', (user_id, game_id, selected_team, datetime.now()))
-                            successful_picks += 1
-            
-            conn.commit()
+        
+        # Collect all form picks (fields are pick_username_gameid) for one bulk write
+        picks = []
+        for field_name, selected_team in request.form.items():
+            if field_name.startswith('pick_') and selected_team:
+                parts = field_name.split('_')
+                if len(parts) >= 3:
+                    username = parts[1]
+                    game_id = parts[2]
+                    
+                    if username in users:
+                        picks.append({
+                            'user_id': users[username],
+                            'game_id': game_id,
+                            'selected_team': selected_team
+                        })
+        
+        try:
+            backup_before_change('submit-all-picks', DATABASE_PATH)
+        except BackupError as e:
+            logger.error(f"Backup before submit all picks failed: {e}")
+            flash(f'Database backup failed, no picks were saved: {str(e)}')
+            return redirect(url_for('admin_picks_table', week=week, year=year))
+        
+        submission = PickSubmissionService(DATABASE_PATH).submit(
+            picks, enforce_deadlines=False, created_at=datetime.now()
+        )
+        successful_picks = submission['accepted_count']
+        weeks_to_update.update(submission['weeks'])
         
         # Auto-update scoring for affected weeks
         scoring_updates = []
@@ -2487,92 +2413,54 @@ def admin_emergency_deadline_extension():
         logger.error(f"Error creating emergency deadline extension: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+def _export_week_range(default_week: Optional[int] = 1):
+    """(week_from, week_to, year) from ?week= or ?week_from=&week_to= (inclusive range)"""
+    week = request.args.get('week', default_week, type=int)
+    week_from = request.args.get('week_from', week, type=int)
+    week_to = request.args.get('week_to', week_from, type=int)
+    year = request.args.get('year', 2025, type=int)
+    if week_from is None or week_to is None or week_from > week_to:
+        raise ValueError('Invalid week range')
+    return week_from, week_to, year
+
+def _export_filename(prefix: str, week_from: int, week_to: int, year: int) -> str:
+    if week_from == week_to:
+        return f'{prefix}_week_{week_from}_{year}.csv'
+    return f'{prefix}_weeks_{week_from}-{week_to}_{year}.csv'
+
+def _csv_stream_response(chunks, filename: str):
+    """Stream CSV chunks as a download; ?gzip=1 sends a .csv.gz instead"""
+    if request.args.get('gzip', '').lower() in ('1', 'true'):
+        response = app.response_class(gzip_chunks(chunks), mimetype='application/gzip')
+        filename += '.gz'
+    else:
+        response = app.response_class(chunks, mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
 @app.route('/admin/export_picks_csv', methods=['GET'])
 def admin_export_picks_csv():
-    """Export all user picks for a week as CSV"""
+    """Export all user picks for a week (or ?week_from=&week_to= range) as CSV"""
     if 'user_id' not in session or not session.get('is_admin'):
         return jsonify({'error': 'Admin access required'}), 403
     
     try:
-        week = request.args.get('week', 1, type=int)
-        year = request.args.get('year', 2025, type=int)
-        
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get all games for the week
-            cursor.execute('''
-                SELECT id, away_team, home_team, game_date, is_monday_night
-                FROM nfl_games 
-                WHERE week = ? AND year = ?
-                ORDER BY game_date
-            ''', (week, year))
-            
-            games = [dict(row) for row in cursor.fetchall()]
-            
-            if not games:
-                return jsonify({'error': f'No games found for Week {week}, {year}'}), 404
-            
-            # Get all users
-            cursor.execute('SELECT id, username FROM users ORDER BY username')
-            users = [dict(row) for row in cursor.fetchall()]
-            
-            # Get existing picks
-            cursor.execute('''
-                SELECT up.user_id, up.game_id, up.selected_team, 
-                       up.predicted_home_score, up.predicted_away_score,
-                       u.username
-                FROM user_picks up
-                JOIN users u ON up.user_id = u.id
-                JOIN nfl_games g ON up.game_id = g.id
-                WHERE g.week = ? AND g.year = ?
-            ''', (week, year))
-            
-            picks = {}
-            for row in cursor.fetchall():
-                key = (row['user_id'], row['game_id'])
-                picks[key] = {
-                    'selected_team': row['selected_team'],
-                    'predicted_home_score': row['predicted_home_score'],
-                    'predicted_away_score': row['predicted_away_score']
-                }
-        
-        # Create CSV content
-        output = io.StringIO()
-        fieldnames = ['username', 'game_id', 'away_team', 'home_team', 'selected_team', 
-                     'predicted_home_score', 'predicted_away_score']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        
-        # Write a row for each user-game combination
-        for user in users:
-            for game in games:
-                pick_key = (user['id'], game['id'])
-                pick_data = picks.get(pick_key, {})
-                
-                row = {
-                    'username': user['username'],
-                    'game_id': game['id'],
-                    'away_team': game['away_team'],
-                    'home_team': game['home_team'],
-                    'selected_team': pick_data.get('selected_team', ''),
-                    'predicted_home_score': pick_data.get('predicted_home_score', ''),
-                    'predicted_away_score': pick_data.get('predicted_away_score', '')
-                }
-                writer.writerow(row)
-        
-        # Prepare response
-        csv_content = output.getvalue()
-        output.close()
-        
-        response = app.response_class(
-            csv_content,
-            mimetype='text/csv',
-            headers={'Content-Disposition': f'attachment; filename=picks_week_{week}_{year}.csv'}
+        try:
+            week_from, week_to, year = _export_week_range()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not count_games(week_from, week_to, year, DATABASE_PATH):
+            weeks_label = f'Week {week_from}' if week_from == week_to else f'Weeks {week_from}-{week_to}'
+            return jsonify({'error': f'No games found for {weeks_label}, {year}'}), 404
+        
+        # Rows are streamed straight from the database: one per user x game
+        response = _csv_stream_response(
+            stream_picks_long(week_from, week_to, year, DATABASE_PATH),
+            _export_filename('picks', week_from, week_to, year)
         )
         
-        logger.info(f"Admin {session['username']} exported picks CSV for Week {week}, {year}")
+        logger.info(f"Admin {session['username']} exported picks CSV for Weeks {week_from}-{week_to}, {year}")
         return response
         
     except Exception as e:
@@ -2602,170 +2490,34 @@ def admin_import_picks_csv():
         if not file.filename.lower().endswith('.csv'):
             return jsonify({'error': 'File must be a CSV'}), 400
         
-        # Read and parse CSV
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        # Validation variables
-        total_rows = 0
-        valid_picks = 0
-        empty_picks = 0
-        users_found = set()
-        missing_users = set()
-        warnings = []
-        errors = []
-        
-        # Import variables
-        picks_imported = 0
-        picks_updated = 0
-        users_created = 0
-        skipped_picks = 0
+        # Stream and validate the CSV in memory, then write it in one transaction
+        stream = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+        pipeline = PickImportPipeline(DATABASE_PATH)
+        plan = pipeline.plan_long(stream, week, year, create_missing_users)
+        if not validate_only:
+            try:
+                backup_before_change('import-picks-csv', DATABASE_PATH)
+            except BackupError as e:
+                logger.error(f"Backup before picks CSV import failed: {e}")
+                return jsonify({'error': f'Database backup failed, nothing was imported: {str(e)}'}), 500
+        result = pipeline.apply(plan, overwrite_existing=overwrite_existing, dry_run=validate_only)
+        
+        # If validation only, return results
+        if validate_only:
+            return jsonify({
+                'success': True,
+                'total_rows': result['total_rows'],
+                'valid_picks': result['valid_picks'],
+                'empty_picks': result['empty_picks'],
+                'users_found': result['users_found'],
+                'missing_users': result['missing_users'],
+                'warnings': result['warnings'],
+                'errors': result['errors'],
+                'diff': result['diff']
+            })
         
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get existing users
-            cursor.execute('SELECT id, username FROM users')
-            existing_users = {row['username']: row['id'] for row in cursor.fetchall()}
-            
-            # Get existing games for the week
-            cursor.execute('''
-                SELECT id, away_team, home_team FROM nfl_games 
-                WHERE week = ? AND year = ?
-            ''', (week, year))
-            existing_games = {row['id']: row for row in cursor.fetchall()}
-            
-            picks_to_process = []
-            
-            for row in csv_reader:
-                total_rows += 1
-                
-                username = row.get('username', '').strip()
-                game_id = row.get('game_id', '').strip()
-                selected_team = row.get('selected_team', '').strip()
-                predicted_home_score = row.get('predicted_home_score', '').strip()
-                predicted_away_score = row.get('predicted_away_score', '').strip()
-                
-                if not username:
-                    errors.append(f"Row {total_rows}: Missing username")
-                    continue
-                
-                if not game_id or not game_id.isdigit():
-                    errors.append(f"Row {total_rows}: Invalid game_id '{game_id}'")
-                    continue
-                
-                game_id = int(game_id)
-                
-                if game_id not in existing_games:
-                    errors.append(f"Row {total_rows}: Game ID {game_id} not found for Week {week}, {year}")
-                    continue
-                
-                if not selected_team:
-                    empty_picks += 1
-                    continue
-                
-                # Validate team name
-                game = existing_games[game_id]
-                if selected_team not in [game['away_team'], game['home_team']]:
-                    errors.append(f"Row {total_rows}: '{selected_team}' is not valid for {game['away_team']} @ {game['home_team']}")
-                    continue
-                
-                # Check user exists
-                if username in existing_users:
-                    users_found.add(username)
-                    user_id = existing_users[username]
-                else:
-                    missing_users.add(username)
-                    if not create_missing_users:
-                        warnings.append(f"User '{username}' not found and user creation disabled")
-                        continue
-                    user_id = None  # Will create later
-                
-                # Validate score predictions
-                home_score = None
-                away_score = None
-                if predicted_home_score:
-                    try:
-                        home_score = int(predicted_home_score)
-                    except ValueError:
-                        warnings.append(f"Row {total_rows}: Invalid home score '{predicted_home_score}'")
-                
-                if predicted_away_score:
-                    try:
-                        away_score = int(predicted_away_score)
-                    except ValueError:
-                        warnings.append(f"Row {total_rows}: Invalid away score '{predicted_away_score}'")
-                
-                picks_to_process.append({
-                    'username': username,
-                    'user_id': user_id,
-                    'game_id': game_id,
-                    'selected_team': selected_team,
-                    'predicted_home_score': home_score,
-                    'predicted_away_score': away_score
-                })
-                
-                valid_picks += 1
-            
-            # If validation only, return results
-            if validate_only:
-                return jsonify({
-                    'success': True,
-                    'total_rows': total_rows,
-                    'valid_picks': valid_picks,
-                    'empty_picks': empty_picks,
-                    'users_found': len(users_found),
-                    'missing_users': list(missing_users),
-                    'warnings': warnings
-                })
-            
-            # Process imports
-            for pick in picks_to_process:
-                try:
-                    # Create user if needed
-                    if pick['user_id'] is None:
-                        cursor.execute('''
-                            INSERT INTO users (username, password_hash, email, is_admin)
-                            VALUES (?, ?, ?, ?)
-                        ''', (pick['username'], generate_password_hash('changeme123'), '', False))
-                        pick['user_id'] = cursor.lastrowid
-                        users_created += 1
-                        existing_users[pick['username']] = pick['user_id']
-                    
-                    # Check if pick already exists
-                    cursor.execute('''
-                        SELECT id FROM user_picks 
-                        WHERE user_id = ? AND game_id = ?
-                    ''', (pick['user_id'], pick['game_id']))
-                    
-                    existing_pick = cursor.fetchone()
-                    
-                    if existing_pick and not overwrite_existing:
-                        skipped_picks += 1
-                        continue
-                    
-                    # Insert or update pick
-                    if existing_pick:
-                        cursor.execute('''
-                            UPDATE user_picks 
-                            SET selected_team = ?, predicted_home_score = ?, predicted_away_score = ?
-                            WHERE user_id = ? AND game_id = ?
-                        ''', (pick['selected_team'], pick['predicted_home_score'], 
-                             pick['predicted_away_score'], pick['user_id'], pick['game_id']))
-                        picks_updated += 1
-                    else:
-                        cursor.execute('''
-                            INSERT INTO user_picks 
-                            (user_id, game_id, selected_team, predicted_home_score, predicted_away_score)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (pick['user_id'], pick['game_id'], pick['selected_team'], 
-                             pick['predicted_home_score'], pick['predicted_away_score']))
-                        picks_imported += 1
-                
-                except Exception as e:
-                    errors.append(f"Error processing pick for {pick['username']}: {str(e)}")
-            
-            conn.commit()
+        picks_imported = result['picks_imported']
+        picks_updated = result['picks_updated']
         
         logger.info(f"Admin {session['username']} imported {picks_imported + picks_updated} picks from CSV for Week {week}, {year}")
         
@@ -2773,9 +2525,9 @@ def admin_import_picks_csv():
             'success': True,
             'picks_imported': picks_imported,
             'picks_updated': picks_updated,
-            'users_created': users_created,
-            'skipped_picks': skipped_picks,
-            'errors': errors
+            'users_created': result['users_created'],
+            'skipped_picks': result['skipped_picks'],
+            'errors': result['errors']
         })
         
     except Exception as e:
@@ -2890,32 +2642,27 @@ def weekly_leaderboard(week=None, year=None):
     if year is None:
         year = 2025
     
+    # Kickoffs and deadlines passing reveal more picks, so they are part of the key
+    return cached_response(
+        ('weekly_leaderboard', week, year, bool(session.get('is_admin')),
+         week_time_marker(week, year, DATABASE_PATH)),
+        lambda: _render_weekly_leaderboard(week, year))
+
+def _render_weekly_leaderboard(week, year):
+    """Render the weekly leaderboard page (cached by weekly_leaderboard)"""
     try:
-        conn = get_db_legacy()
-        cursor = conn.cursor()
-        
-        # Check for games that are either past deadline OR completed (final)
-        # This allows ongoing weeks to show leaderboard as games finish
-        cursor.execute('''
-            SELECT COUNT(*) FROM nfl_games 
-            WHERE week = ? AND year = ? 
-            AND (game_date < datetime('now') OR is_final = 1)
-        ''', (week, year))
-        games_available = cursor.fetchone()[0]
+        # Games, picks, tiebreakers and pick grids for the week in one pass
+        standings_engine = WeeklyStandingsEngine(DATABASE_PATH)
+        standings = standings_engine.build_week(week, year)
         
-        # Also check for completed games specifically
-        cursor.execute('''
-            SELECT COUNT(*) FROM nfl_games 
-            WHERE week = ? AND year = ? AND is_final = 1
-        ''', (week, year))
-        completed_games = cursor.fetchone()[0]
-        
-        if games_available == 0:
+        if standings['games_available'] == 0:
             # No games available yet (not past deadline AND not final)
+            conn = get_db_legacy()
+            cursor = conn.cursor()
             cursor.execute('''
                 SELECT DISTINCT week, year 
                 FROM nfl_games 
-                WHERE game_date < datetime('now') OR is_final = 1
+                WHERE kickoff_utc < CAST(strftime('%s', 'now') AS INTEGER) OR is_final = 1
                 ORDER BY year DESC, week DESC
                 LIMIT 10
             ''')
@@ -2929,265 +2676,38 @@ def weekly_leaderboard(week=None, year=None):
                                  available_weeks=available_weeks,
                                  no_data_message=f"No games available yet for Week {week}, {year}. Games must be past deadline or completed.")
         
-        # Get users who made picks for this week with simplified scoring (1 point per win)
-        # Show picks for games that are either past deadline OR completed (allows ongoing weeks)
-        cursor.execute('''
-            SELECT u.id, u.username,
-                   COUNT(p.id) as total_picks,
-                   SUM(CASE WHEN p.is_correct = 1 THEN 1 ELSE 0 END) as correct_picks
-            FROM users u
-            JOIN user_picks p ON u.id = p.user_id
-            JOIN nfl_games g ON p.game_id = g.id
-            WHERE g.week = ? AND g.year = ? 
-            AND (g.game_date < datetime('now') OR g.is_final = 1) 
-            AND u.is_admin = 0
-            GROUP BY u.id, u.username
-            HAVING total_picks > 0
-            ORDER BY correct_picks DESC, u.username
-        ''', (week, year))
+        leaderboard_data = standings['leaderboard']
+        week_completed = standings['week_completed']
         
-        user_results = cursor.fetchall()
+        # Get available weeks for navigation
+        available_weeks = standings_engine.get_available_weeks()
         
-        # Get Monday Night data for tiebreakers
-        leaderboard_data = []
-        for i, (user_id, username, total_picks, correct_picks) in enumerate(user_results, 1):
+        # Check deadline statuses for pick revelations
+        thursday_deadline_passed = False
+        friday_deadline_passed = False
+        saturday_deadline_passed = False
+        sunday_deadline_passed = False
+        
+        try:
+            from deadline_manager import DeadlineManager
+            deadline_manager = DeadlineManager()
+            deadline_data = deadline_manager.get_week_deadlines(week, year)
             
-            # Get Monday Night pick data for this user (actual MNF game)
-            # First, find the actual Monday Night Football game
-            cursor.execute('''
-                SELECT id FROM nfl_games 
-                WHERE week = ? AND year = ? 
-                AND is_monday_night = 1
-                ORDER BY game_date DESC, id DESC
-                LIMIT 1
-            ''', (week, year))
+            # Thursday deadline
+            thursday_data = deadline_data.get('thursday_night')
+            if thursday_data and isinstance(thursday_data, dict):
+                thursday_status = thursday_data.get('status', {})
+                thursday_deadline_passed = thursday_status.get('is_closed', False)
             
-            monday_night_game = cursor.fetchone()
-            monday_night_game_id = monday_night_game[0] if monday_night_game else None
+            # Friday deadline
+            friday_data = deadline_data.get('friday_games')
+            if friday_data and isinstance(friday_data, list):
+                friday_deadline_passed = any(game.get('status', {}).get('is_closed', False) for game in friday_data)
             
-            monday_pick = None
-            if monday_night_game_id:
-                cursor.execute('''
-                    SELECT p.predicted_home_score, p.predicted_away_score,
-                           g.home_score, g.away_score, g.home_team, g.away_team, g.is_final,
-                           p.selected_team
-                    FROM user_picks p
-                    JOIN nfl_games g ON p.game_id = g.id
-                    WHERE p.user_id = ? AND g.id = ?
-                    LIMIT 1
-                ''', (user_id, monday_night_game_id))
-                
-                monday_pick = cursor.fetchone()
-            
-            # Get all picks for this user for this week
-            cursor.execute('''
-                SELECT p.selected_team, p.predicted_home_score, p.predicted_away_score,
-                       g.home_team, g.away_team, g.home_score, g.away_score, 
-                       g.is_final, p.is_correct, g.game_date
-                FROM user_picks p
-                JOIN nfl_games g ON p.game_id = g.id
-                WHERE p.user_id = ? AND g.week = ? AND g.year = ?
-                ORDER BY g.game_date
-            ''', (user_id, week, year))
-            
-            all_picks = cursor.fetchall()
-            
-            # Calculate Monday Night tiebreaker data
-            monday_tiebreaker = {
-                'has_pick': False, 
-                'correct_winner': False,
-                'home_diff': 999,
-                'away_diff': 999,
-                'total_diff': 999
-            }
-            if monday_pick:
-                pred_home = monday_pick[0] or 0
-                pred_away = monday_pick[1] or 0
-                actual_home = monday_pick[2] or 0
-                actual_away = monday_pick[3] or 0
-                home_team = monday_pick[4] or ''
-                away_team = monday_pick[5] or ''
-                is_final = monday_pick[6] or False
-                selected_team = monday_pick[7] if len(monday_pick) > 7 else None
-                
-                # Check if user predicted correct winner based on selected_team
-                if selected_team and is_final and actual_home is not None and actual_away is not None:
-                    actual_winner = away_team if actual_away > actual_home else home_team
-                    correct_winner = selected_team == actual_winner
-                else:
-                    correct_winner = False
-                
-                # NEW MONDAY NIGHT TIEBREAKER RULES (Starting Week 4, 2025):
-                # 1. Total points (home + away) - closest to actual total
-                # 2. Winning team score - closest to actual winner's score
-                # 3. Losing team score - closest to actual loser's score
-                if is_final and actual_home is not None and actual_away is not None:
-                    if actual_home > actual_away:
-                        # Home team won
-                        winner_diff = abs(pred_home - actual_home)
-                        loser_diff = abs(pred_away - actual_away)
-                    else:
-                        # Away team won  
-                        winner_diff = abs(pred_away - actual_away)
-                        loser_diff = abs(pred_home - actual_home)
-                else:
-                    winner_diff = 999
-                    loser_diff = 999
-                
-                monday_tiebreaker = {
-                    'has_pick': True,
-                    'correct_winner': correct_winner,
-                    'home_diff': abs(pred_home - actual_home) if is_final and actual_home is not None else 999,
-                    'away_diff': abs(pred_away - actual_away) if is_final and actual_away is not None else 999,
-                    'total_diff': abs((pred_home + pred_away) - (actual_home + actual_away)) if is_final and actual_home is not None and actual_away is not None else 999,
-                    'winner_diff': winner_diff,  # NEW: Difference from winning team's score
-                    'loser_diff': loser_diff,    # NEW: Difference from losing team's score
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'predicted_home': pred_home,
-                    'predicted_away': pred_away,
-                    'actual_home': actual_home,
-                    'actual_away': actual_away,
-                    'selected_team': selected_team,
-                    'is_final': is_final
-                }
-            
-            # Format all picks for display
-            picks_detail = []
-            for pick in all_picks:
-                selected_team, pred_home, pred_away, home_team, away_team, actual_home, actual_away, is_final, is_correct, game_date = pick
-                
-                # Parse game_date string to datetime object if needed
-                parsed_game_date = parse_game_date(game_date)
-                
-                pick_detail = {
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'selected_team': selected_team,
-                    'predicted_home': pred_home or 0,
-                    'predicted_away': pred_away or 0,
-                    'actual_home': actual_home,
-                    'actual_away': actual_away,
-                    'is_final': is_final,
-                    'is_correct': is_correct,
-                    'game_date': parsed_game_date
-                }
-                picks_detail.append(pick_detail)
-            
-            leaderboard_data.append({
-                'rank': i,
-                'username': username,
-                'total_score': correct_picks,  # 1 point per correct pick
-                'total_picks': total_picks,
-                'correct_picks': correct_picks,
-                'breakdown': {
-                    'games_won': correct_picks,
-                    'games_played': total_picks,
-                    'win_percentage': round((correct_picks / total_picks * 100) if total_picks > 0 else 0, 1),
-
-                    'total_score': correct_picks  # Same as correct_picks since 1 point per win
-                },
-                'monday_tiebreaker': monday_tiebreaker,
-                'picks_detail': picks_detail,  # Add detailed picks
-                'is_winner': False  # Determined later
-            })
-        
-        # Re-sort with NEW Monday Night tiebreaker logic (updated rules)
-        # NEW RULES: 1) Total points closest, 2) Winner closest, 3) Loser closest
-        leaderboard_data.sort(key=lambda x: (
-            -x['correct_picks'],                               # Most games won (1 point each)
-            not x['monday_tiebreaker'].get('correct_winner', False),  # Correct winner first
-            x['monday_tiebreaker'].get('total_diff', 999),     # NEW: 1st - Closest to total points
-            x['monday_tiebreaker'].get('winner_diff', 999),    # NEW: 2nd - Closest to winner score  
-            x['monday_tiebreaker'].get('loser_diff', 999),     # NEW: 3rd - Closest to loser score
-            x['username']                                      # Alphabetical as final tiebreaker
-        ))
-        
-        # Check if week is completed (all games final) for winner determination
-        cursor.execute('''
-            SELECT COUNT(*) as total_games,
-                   SUM(CASE WHEN is_final = 1 THEN 1 ELSE 0 END) as completed
-            FROM nfl_games
-            WHERE week = ? AND year = ?
-        ''', (week, year))
-        
-        game_counts = cursor.fetchone()
-        week_completed = False
-        if game_counts and game_counts[0] > 0:
-            week_completed = game_counts[0] == game_counts[1]
-        
-        # Update ranks after sorting
-        for i, user in enumerate(leaderboard_data, 1):
-            user['rank'] = i
-            # Only mark as winner if:
-            # 1. Week is completed AND they have the most correct picks, OR
-            # 2. They have significantly more correct picks than others, OR
-            # 3. All remaining games are Monday Night only AND they're ahead
-            if i == 1:
-                # Check if this user is actually ahead or tied
-                if len(leaderboard_data) > 1:
-                    second_place_score = leaderboard_data[1]['correct_picks']
-                    user_score = user['correct_picks']
-                    
-                    # Only mark as winner if:
-                    # - Week is completely finished, OR
-                    # - They have a commanding lead (5+ point difference)
-                    lead = user_score - second_place_score
-                    user['is_winner'] = ((week_completed and
-                                          user_score >= second_place_score) or
-                                         lead >= 5)
-                else:
-                    # Only one user, they win only if week is completed
-                    user['is_winner'] = week_completed
-            else:
-                user['is_winner'] = False
-        
-        # Get available weeks for navigation
-        cursor.execute('''
-            SELECT DISTINCT week, year 
-            FROM nfl_games 
-            WHERE is_final = 1
-            ORDER BY year DESC, week DESC
-            LIMIT 10
-        ''')
-        available_weeks = cursor.fetchall()
-        conn.close()
-        
-        # Get predictable winner analysis for Monday Night
-        try:
-            winner_prediction = get_winner_prediction_summary(week, year)
-            winner_analysis = analyze_predictable_winners(week, year)
-        except Exception as e:
-            logger.error(f"Error getting winner prediction: {e}")
-            winner_prediction = None
-            winner_analysis = None
-        
-        # Check deadline statuses for pick revelations
-        thursday_deadline_passed = False
-        friday_deadline_passed = False
-        saturday_deadline_passed = False
-        sunday_deadline_passed = False
-        
-        try:
-            from deadline_manager import DeadlineManager
-            deadline_manager = DeadlineManager()
-            deadline_data = deadline_manager.get_week_deadlines(week, year)
-            
-            # Thursday deadline
-            thursday_data = deadline_data.get('thursday_night')
-            if thursday_data and isinstance(thursday_data, dict):
-                thursday_status = thursday_data.get('status', {})
-                thursday_deadline_passed = thursday_status.get('is_closed', False)
-            
-            # Friday deadline
-            friday_data = deadline_data.get('friday_games')
-            if friday_data and isinstance(friday_data, list):
-                friday_deadline_passed = any(game.get('status', {}).get('is_closed', False) for game in friday_data)
-            
-            # Saturday deadline  
-            saturday_data = deadline_data.get('saturday_games')
-            if saturday_data and isinstance(saturday_data, list):
-                saturday_deadline_passed = any(game.get('status', {}).get('is_closed', False) for game in saturday_data)
+            # Saturday deadline  
+            saturday_data = deadline_data.get('saturday_games')
+            if saturday_data and isinstance(saturday_data, list):
+                saturday_deadline_passed = any(game.get('status', {}).get('is_closed', False) for game in saturday_data)
             
             # Sunday deadline
             sunday_data = deadline_data.get('sunday_games', {})
@@ -3198,108 +2718,20 @@ def weekly_leaderboard(week=None, year=None):
         except Exception as e:
             logger.error(f"Error checking deadlines: {e}")
         
-        # Check if week is completed (all games final)
-        week_completed = False
+        # Get predictable winner analysis for Monday Night; the scenario
+        # simulation is only shown (and only run) once Sunday picks are revealed
         try:
-            conn = get_db_legacy()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT COUNT(*) as total_games,
-                       SUM(CASE WHEN is_final = 1 THEN 1 ELSE 0 END) as completed_games
-                FROM nfl_games 
-                WHERE week = ? AND year = ?
-            ''', (week, year))
-            
-            game_counts = cursor.fetchone()
-            if game_counts and game_counts[0] > 0:
-                week_completed = game_counts[0] == game_counts[1]
-            conn.close()
+            winner_prediction = get_winner_prediction_summary(week, year, include_simulation=sunday_deadline_passed)
+            winner_analysis = analyze_predictable_winners(week, year, include_simulation=sunday_deadline_passed)
         except Exception as e:
-            logger.error(f"Error checking week completion: {e}")
+            logger.error(f"Error getting winner prediction: {e}")
+            winner_prediction = None
+            winner_analysis = None
         
-        # Get all picks data with game results for CSV-style display
-        all_picks = []
-        picks_by_game = {}
-        try:
-            conn = get_db_legacy()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT g.id, u.username, up.selected_team, up.predicted_home_score, up.predicted_away_score,
-                       up.is_correct, g.away_team, g.home_team, g.home_score, g.away_score, g.is_final,
-                       g.is_monday_night
-                FROM user_picks up
-                JOIN nfl_games g ON up.game_id = g.id
-                JOIN users u ON up.user_id = u.id
-                WHERE g.week = ? AND g.year = ? AND u.is_admin = 0 
-                  AND (g.game_date < datetime('now') OR g.is_final = 1)
-                ORDER BY g.game_date, u.username
-            ''', (week, year))
-            
-            for row in cursor.fetchall():
-                pick_data = {
-                    'game_id': row[0],
-                    'username': row[1],
-                    'selected_team': row[2],
-                    'predicted_home_score': row[3],
-                    'predicted_away_score': row[4],
-                    'is_correct': row[5],
-                    'away_team': row[6],
-                    'home_team': row[7],
-                    'home_score': row[8],
-                    'away_score': row[9],
-                    'is_final': row[10],
-                    'is_monday_night': row[11]
-                }
-                all_picks.append(pick_data)
-                
-                # Group picks by game for CSV-style display
-                if row[0] not in picks_by_game:
-                    picks_by_game[row[0]] = {
-                        'game_id': row[0],
-                        'away_team': row[6],
-                        'home_team': row[7],
-                        'home_score': row[8],
-                        'away_score': row[9],
-                        'is_final': row[10],
-                        'is_monday_night': row[11],
-                        'picks': []
-                    }
-                picks_by_game[row[0]]['picks'].append(pick_data)
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error getting all picks data: {e}")
+        all_picks = standings['all_picks']
+        picks_by_game = standings['picks_by_game']
+        games = standings['games']
         
-        # Get games data for Thursday revelation
-        games = []
-        try:
-            conn = get_db_legacy()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT id, away_team, home_team, game_date, is_thursday_night, is_final
-                FROM nfl_games 
-                WHERE week = ? AND year = ?
-                ORDER BY game_date, id
-            ''', (week, year))
-            
-            for row in cursor.fetchall():
-                # Parse game_date string to datetime object
-                game_date = parse_game_date(row[3])
-                
-                games.append({
-                    'id': row[0],
-                    'away_team': row[1],
-                    'home_team': row[2],
-                    'game_date': game_date,
-                    'is_thursday_night': bool(row[4]),
-                    'is_final': bool(row[5])
-                })
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error getting games data: {e}")
-
         return render_template('weekly_leaderboard.html',
                                  leaderboard=leaderboard_data,
                                  current_week=week,
@@ -3321,6 +2753,24 @@ def weekly_leaderboard(week=None, year=None):
         flash(f'Error loading weekly leaderboard: {str(e)}', 'error')
         return redirect(url_for('leaderboard'))
 
+@app.route('/stream/week/<int:week>')
+def stream_week(week):
+    """Server-Sent Events stream of score and standings changes for one week"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Login required'}), 401
+    
+    year = request.args.get('year', 2025, type=int)
+    broadcaster = get_score_broadcaster()
+    try:
+        client = broadcaster.subscribe(week, year)
+    except LiveStreamFull:
+        return jsonify({'error': 'Too many live connections, try again later'}), 503
+    
+    response = app.response_class(broadcaster.stream(week, year, client), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # don't let a proxy buffer the stream
+    return response
+
 @app.route('/debug_games_status')
 def debug_games_status():
     """Debug route to check current game status for leaderboard issues"""
@@ -3554,141 +3004,33 @@ def export_my_picks_csv():
         user_id = session['user_id']
         username = session['username']
         
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get all games for the week
-            cursor.execute('''
-                SELECT id, away_team, home_team, game_date, is_monday_night
-                FROM nfl_games 
-                WHERE week = ? AND year = ?
-                ORDER BY game_date
-            ''', (week, year))
-            
-            games = [dict(row) for row in cursor.fetchall()]
-            
-            if not games:
-                return jsonify({'error': f'No games found for Week {week}, {year}'}), 404
-            
-            # Get user's picks for this week
-            cursor.execute('''
-                SELECT up.game_id, up.selected_team, 
-                       up.predicted_home_score, up.predicted_away_score
-                FROM user_picks up
-                JOIN nfl_games g ON up.game_id = g.id
-                WHERE up.user_id = ? AND g.week = ? AND g.year = ?
-            ''', (user_id, week, year))
-            
-            user_picks = {}
-            for row in cursor.fetchall():
-                user_picks[row['game_id']] = {
-                    'selected_team': row['selected_team'],
-                    'predicted_home_score': row['predicted_home_score'],
-                    'predicted_away_score': row['predicted_away_score']
-                }
-            
-            # Find the actual Monday Night Football game (using database flag)
-            cursor.execute('''
-                SELECT id FROM nfl_games 
-                WHERE week = ? AND year = ? 
-                AND is_monday_night = 1
-                ORDER BY game_date DESC, id DESC
-                LIMIT 1
-            ''', (week, year))
-            
-            monday_night_game = cursor.fetchone()
-            monday_night_game_id = monday_night_game[0] if monday_night_game else None
-
-            # Create CSV content with beautiful format (similar to admin export)
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Header row with user info
-            writer.writerow([f'{username} - Week {week}, {year}', 'My Pick', 'Monday Night Score'])
-            
-            # Subheader row
-            writer.writerow(['Game', 'Selected Team', 'Score Prediction'])
-            
-            # Separate regular games and Monday Night
-            regular_games = []
-            monday_night_games = []
-            
-            # Write game picks
-            for game in games:
-                game_id = game['id']
-                is_actual_monday_night = (game_id == monday_night_game_id)
-                game_label = f"{game['away_team']} @ {game['home_team']}"
-                
-                pick_data = user_picks.get(game_id, {})
-                selected_team = pick_data.get('selected_team', 'No Pick Made')
-                
-                if is_actual_monday_night:
-                    # For actual Monday Night Football, include score prediction
-                    home_score = pick_data.get('predicted_home_score', '')
-                    away_score = pick_data.get('predicted_away_score', '')
-                    # Format as text to prevent Excel from converting numbers to months
-                    score_prediction = f"'{home_score}-{away_score}" if home_score and away_score else ''
-                    
-                    monday_night_games.append([game_label, selected_team, score_prediction])
-                else:
-                    regular_games.append([game_label, selected_team, ''])
-            
-            # Write regular games first
-            for game_row in regular_games:
-                writer.writerow(game_row)
-            
-            # Write Monday Night games
-            for game_row in monday_night_games:
-                writer.writerow(game_row)
-            
-            # Add summary section
-            writer.writerow([])  # Empty row
-            writer.writerow(['Summary', '', ''])
-            
-            # Count picks made
-            total_games = len(games)
-            picks_made = len([p for p in user_picks.values() if p.get('selected_team')])
-            
-            writer.writerow([f'Total Games: {total_games}', '', ''])
-            writer.writerow([f'Picks Made: {picks_made}', '', ''])
-            writer.writerow([f'Completion: {picks_made}/{total_games}', '', ''])
-            
-            # Monday Night prediction summary (already have the data from above)
-            monday_prediction = None
-            if monday_night_game_id:
-                pick_data = user_picks.get(monday_night_game_id, {})
-                home_score = pick_data.get('predicted_home_score', '')
-                away_score = pick_data.get('predicted_away_score', '')
-                if home_score and away_score:
-                    # Format as text to prevent Excel conversion
-                    monday_prediction = f"'{home_score}-{away_score}"
-            
-            if monday_prediction:
-                writer.writerow([f'Monday Night Prediction: {monday_prediction}', '', ''])
-            
-            # Prepare response
-            csv_content = output.getvalue()
-            output.close()
-            
-            # Check if user wants display format instead of download
-            if display_format:
-                # Return HTML page with CSV content for copy-paste
-                return render_template('picks_display.html',
-                                     username=username,
-                                     week=week,
-                                     year=year,
-                                     csv_content=csv_content,
-                                     total_games=total_games,
-                                     picks_made=picks_made)
+        week_from = request.args.get('week_from', week, type=int)
+        week_to = request.args.get('week_to', week_from, type=int)
+        if week_from > week_to:
+            return jsonify({'error': 'Invalid week range'}), 400
+        
+        total_games, picks_made = count_user_picks(user_id, week_from, week_to, year, DATABASE_PATH)
+        if not total_games:
+            return jsonify({'error': f'No games found for Week {week}, {year}'}), 404
+        
+        chunks = stream_user_picks(user_id, username, week_from, week_to, year, DATABASE_PATH)
+        
+        # Check if user wants display format instead of download
+        if display_format:
+            # Return HTML page with CSV content for copy-paste
+            csv_content = ''.join(chunks)
+            return render_template('picks_display.html',
+                                 username=username,
+                                 week=week,
+                                 year=year,
+                                 csv_content=csv_content,
+                                 total_games=total_games,
+                                 picks_made=picks_made)
         
         # Default: return downloadable CSV
-        response = app.response_class(
-            csv_content,
-            mimetype='text/csv',
-            headers={'Content-Disposition': f'attachment; filename={username}_picks_week_{week}_{year}.csv'}
-        )
+        response = _csv_stream_response(chunks, _export_filename(f'{username}_picks', week_from, week_to, year))
         
-        logger.info(f"User {username} exported their picks CSV for Week {week}, {year}")
+        logger.info(f"User {username} exported their picks CSV for Weeks {week_from}-{week_to}, {year}")
         return response
         
     except Exception as e:
@@ -3868,84 +3210,47 @@ def import_weekly_picks():
         if not file.filename.endswith('.csv'):
             return jsonify({'error': 'File must be a CSV'}), 400
         
-        content = file.read().decode('utf-8')
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        
-        if len(lines) < 2:
-            return jsonify({'error': 'Invalid CSV format - need at least header and one data row'}), 400
+        week = request.values.get('week', type=int)
+        year = request.values.get('year', 2025, type=int)
+        dry_run = request.values.get('dry_run') == 'true'
         
-        # Parse header row (usernames)
-        usernames = [name.strip() for name in lines[0].split(',') if name.strip()]
+        # Rows map onto the week's games (or the season's) in schedule order
+        stream = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+        pipeline = PickImportPipeline(DATABASE_PATH)
+        plan = pipeline.plan_wide(stream, year, week)
         
-        if not usernames:
+        if not plan['users_found'] and not plan['missing_users']:
             return jsonify({'error': 'No usernames found in header row'}), 400
         
-        imported_count = 0
-        error_messages = []
+        if plan['total_rows'] == 0:
+            return jsonify({'error': 'Invalid CSV format - need at least header and one data row'}), 400
         
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get user IDs for usernames (case-insensitive)
-            user_map = {}
-            for username in usernames:
-                cursor.execute('SELECT id, username FROM users WHERE LOWER(username) = LOWER(?)', (username,))
-                user_data = cursor.fetchone()
-                if user_data:
-                    user_map[username] = {'id': user_data[0], 'actual_name': user_data[1]}
-                else:
-                    error_messages.append(f"User '{username}' not found")
-            
-            # Process each data row (picks for games)
-            for row_num, line in enumerate(lines[1:], 2):
-                picks = [pick.strip() for pick in line.split(',')]
-                
-                if len(picks) != len(usernames):
-                    error_messages.append(f"Row {row_num}: Expected {len(usernames)} picks, got {len(picks)}")
-                    continue
-                
-                # Try to find the game for this row
-                # For now, assume rows correspond to games in chronological order
-                cursor.execute('''
-                    SELECT id, home_team, away_team, week, year 
-                    FROM nfl_games 
-                    ORDER BY game_date, id 
-                    LIMIT 1 OFFSET ?
-                ''', (row_num - 2,))
-                game = cursor.fetchone()
-                
-                if not game:
-                    error_messages.append(f"Row {row_num}: No game found for this row")
-                    continue
-                
-                game_id, home_team, away_team, week, year = game
-                
-                # Process each pick in this row
-                for username, pick in zip(usernames, picks):
-                    if username not in user_map or not pick:
-                        continue
-                    
-                    user_id = user_map[username]['id']
-                    
-                    # Validate pick is either home or away team
-                    if pick.upper() not in [home_team.upper(), away_team.upper()]:
-                        error_messages.append(f"Row {row_num}: Invalid pick '{pick}' for user '{username}' (game: {away_team} @ {home_team})")
-                        continue
-                    
-                    # Insert or update pick
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO user_picks (user_id, game_id, selected_team, created_at)
-                        VALUES (?, ?, ?, ?)
-                    ''', (user_id, game_id, pick, datetime.now()))
-                    
-                    imported_count += 1
-            
-            conn.commit()
+        if not dry_run:
+            try:
+                backup_before_change('import-weekly-picks', DATABASE_PATH)
+            except BackupError as e:
+                logger.error(f"Backup before weekly picks import failed: {e}")
+                return jsonify({'error': f'Database backup failed, nothing was imported: {str(e)}'}), 500
+        
+        import_result = pipeline.apply(plan, dry_run=dry_run)
+        imported_count = import_result['picks_imported'] + import_result['picks_updated']
+        error_messages = import_result['warnings'] + import_result['errors']
+        
+        if dry_run:
+            return jsonify({
+                'success': True,
+                'dry_run': True,
+                'message': f"Dry run: {import_result['diff']['counts']['insert']} new picks, "
+                           f"{import_result['diff']['counts']['update']} changed",
+                'diff': import_result['diff'],
+                'warnings': error_messages[:10]
+            })
         
         result = {
             'success': True,
             'message': f'Successfully imported {imported_count} picks',
-            'imported_count': imported_count
+            'imported_count': imported_count,
+            'unchanged_count': import_result['diff']['counts']['unchanged']
         }
         
         if error_messages:
@@ -4043,162 +3348,48 @@ def export_all_users_picks_csv():
         return redirect(url_for('index'))
     
     try:
-        week = request.args.get('week', 1, type=int)
-        year = request.args.get('year', 2025, type=int)
+        try:
+            week_from, week_to, year = _export_week_range()
+        except ValueError as e:
+            flash(str(e), 'error')
+            return redirect(url_for('admin'))
         
         with get_db() as conn:
             cursor = conn.cursor()
-            
-            # Get all users (excluding admin) ordered by username
-            cursor.execute('SELECT id, username FROM users WHERE is_admin = 0 ORDER BY username')
-            users = cursor.fetchall()
-            
-            if not users:
-                flash('No users found', 'error')
-                return redirect(url_for('admin'))
-            
-            # Get all games for the week ordered by game_date
-            cursor.execute('''
-                SELECT id, home_team, away_team, game_date, is_monday_night,
-                       home_score, away_score
-                FROM nfl_games 
-                WHERE week = ? AND year = ? 
-                ORDER BY game_date
-            ''', (week, year))
-            games = cursor.fetchall()
-            
-            if not games:
-                flash(f'No games found for Week {week}, {year}', 'error')
-                return redirect(url_for('admin'))
-            
-            # Create CSV content
-            output = StringIO()
-            writer = csv.writer(output)
-            
-            # Header row: Game column + usernames (Fantasy League Format)
-            header_row = ['Game']
-            for user in users:
-                header_row.append(user[1])  # username
-            writer.writerow(header_row)
-            
-            # Find the actual Monday Night Football game (using database flag)
-            cursor.execute('''
-                SELECT id FROM nfl_games 
-                WHERE week = ? AND year = ? 
-                AND is_monday_night = 1
-                ORDER BY game_date DESC, id DESC
-                LIMIT 1
-            ''', (week, year))
-            
-            monday_night_game = cursor.fetchone()
-            monday_night_game_id = monday_night_game[0] if monday_night_game else None
-
-            # Data rows: each game's picks (one row per game)
-            regular_games = []
-            monday_night_games = []
-            
-            for game in games:
-                game_id, home_team, away_team, game_date, is_monday_night, home_score, away_score = game
-                
-                # Check if this is the actual Monday Night Football game
-                is_actual_monday_night = (game_id == monday_night_game_id)
-                
-                # Create game label
-                game_label = f"{away_team} @ {home_team}"
-                
-                picks_row = [game_label]
-                for user in users:
-                    user_id = user[0]
-                    
-                    # Get user's pick for this game
-                    cursor.execute('''
-                        SELECT selected_team 
-                        FROM user_picks 
-                        WHERE user_id = ? AND game_id = ?
-                    ''', (user_id, game_id))
-                    
-                    pick = cursor.fetchone()
-                    picks_row.append(pick[0] if pick else '')
-                
-                if is_actual_monday_night:
-                    monday_night_games.append(picks_row)
-                else:
-                    regular_games.append(picks_row)
-            
-            # Write regular games first
-            for picks_row in regular_games:
-                writer.writerow(picks_row)
-            
-            # Write Monday Night games
-            for picks_row in monday_night_games:
-                writer.writerow(picks_row)
-            
-            # Add empty row before Monday Night scores
-            writer.writerow([''] * (len(users) + 1))
-            
-            # Add Monday Night total scores row (only for the actual Monday Night Football game)
-            monday_scores_header = ['Monday Night Scores']
-            
-            # Find the actual Monday Night Football game (using database flag)
-            cursor.execute('''
-                SELECT id FROM nfl_games 
-                WHERE week = ? AND year = ? 
-                AND is_monday_night = 1
-                ORDER BY game_date DESC, id DESC
-                LIMIT 1
-            ''', (week, year))
-            
-            monday_night_game = cursor.fetchone()
-            monday_night_game_id = monday_night_game[0] if monday_night_game else None
-            
-            for user in users:
-                user_id = user[0]
-                
-                if monday_night_game_id:
-                    # Get user's Monday Night score prediction for the actual MNF game
-                    cursor.execute('''
-                        SELECT predicted_home_score, predicted_away_score
-                        FROM user_picks 
-                        WHERE user_id = ? AND game_id = ?
-                    ''', (user_id, monday_night_game_id))
-                    
-                    scores = cursor.fetchone()
-                    if scores and scores[0] is not None and scores[1] is not None:
-                        home_score = str(scores[0])  # Ensure it's treated as text
-                        away_score = str(scores[1])  # Ensure it's treated as text
-                        # Format as text to prevent Excel from converting to months
-                        monday_scores_header.append(f"'{home_score}-{away_score}")
-                    else:
-                        monday_scores_header.append("")
-                else:
-                    monday_scores_header.append("")
-            
-            # Write Monday Night scores row
-            writer.writerow(monday_scores_header)
-            
-            # Prepare response with better headers for download reliability
-            output.seek(0)
-            csv_content = output.getvalue()
-            
-            response = make_response(csv_content)
+            cursor.execute('SELECT COUNT(*) FROM users WHERE is_admin = 0')
+            user_count = cursor.fetchone()[0]
+        
+        if not user_count:
+            flash('No users found', 'error')
+            return redirect(url_for('admin'))
+        
+        if not count_games(week_from, week_to, year, DATABASE_PATH):
+            weeks_label = f'Week {week_from}' if week_from == week_to else f'Weeks {week_from}-{week_to}'
+            flash(f'No games found for {weeks_label}, {year}', 'error')
+            return redirect(url_for('admin'))
+        
+        # Game rows x username columns, streamed from one query (Fantasy League Format)
+        response = _csv_stream_response(
+            stream_picks_wide(week_from, week_to, year, DATABASE_PATH),
+            _export_filename('fantasy_league_picks', week_from, week_to, year)
+        )
+        if response.mimetype == 'text/csv':
             response.headers['Content-Type'] = 'text/csv; charset=utf-8'
-            response.headers['Content-Disposition'] = f'attachment; filename=fantasy_league_picks_week_{week}_{year}.csv'
-            
-            # Add headers to prevent SSL/HTTPS download issues
-            response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response.headers['Pragma'] = 'no-cache'
-            response.headers['Expires'] = '0'
-            response.headers['Content-Length'] = str(len(csv_content.encode('utf-8')))
-            
-            # Add CORS headers to prevent mixed content issues
-            response.headers['Access-Control-Allow-Origin'] = '*'
-            response.headers['Access-Control-Allow-Methods'] = 'GET'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
-            
-            # Force download by ensuring proper MIME type
-            response.headers['X-Content-Type-Options'] = 'nosniff'
-            
-            return response
+        
+        # Add headers to prevent SSL/HTTPS download issues
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+        
+        # Add CORS headers to prevent mixed content issues
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.headers['Access-Control-Allow-Methods'] = 'GET'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+        
+        # Force download by ensuring proper MIME type
+        response.headers['X-Content-Type-Options'] = 'nosniff'
+        
+        return response
             
     except Exception as e:
         logger.error(f"Export all users picks error: {e}")
@@ -4223,15 +3414,95 @@ def admin_background_updater_status():
     
     try:
         status = get_updater_status()
+        lease = status['lease']
+        if status['running']:
+            message = 'Background updater running' + (' (standby)' if status['role'] == 'standby' else '')
+        elif lease['active']:
+            message = f"Background updater running in another process ({lease['holder_role']})"
+        else:
+            message = 'Background updater stopped'
         return jsonify({
             'success': True,
             'status': status,
-            'message': 'Background updater running' if status['running'] else 'Background updater stopped'
+            'lease': lease,
+            'message': message
         })
     except Exception as e:
         logger.error(f"Error getting background updater status: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/admin/db_pool_stats')
+def admin_db_pool_stats():
+    """Get SQLite connection pool statistics (hits, waits, open connections)"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Admin access required'}), 403
+
+    try:
+        return jsonify({
+            'success': True,
+            'pools': get_pool_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting database pool stats: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/admin/perf')
+def admin_perf():
+    """Route latency histograms, slowest SQL statement shapes and recent slow requests"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        flash('Admin access required')
+        return redirect(url_for('login'))
+
+    try:
+        return render_template('admin_perf.html', report=get_performance_report())
+    except Exception as e:
+        logger.error(f"Admin performance page error: {e}")
+        flash(f'Error loading performance metrics: {str(e)}')
+        return redirect(url_for('admin'))
+
+@app.route('/admin/perf_stats')
+def admin_perf_stats():
+    """Performance metrics as JSON (slow_limit caps the slow request list)"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Admin access required'}), 403
+
+    try:
+        slow_limit = request.args.get('slow_limit', 50, type=int)
+        return jsonify({
+            'success': True,
+            'perf': get_performance_report(slow_limit=max(0, slow_limit))
+        })
+    except Exception as e:
+        logger.error(f"Error getting performance metrics: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/admin/backups')
+def admin_backups():
+    """Database backups on disk and the backup schedule"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Admin access required'}), 403
+
+    try:
+        return jsonify({'success': True, 'backups': get_backup_status()})
+    except Exception as e:
+        logger.error(f"Error listing backups: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/admin/backup_database', methods=['POST'])
+def admin_backup_database():
+    """Take a verified, compressed database backup now"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Admin access required'}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        backup = create_backup(data.get('reason') or 'manual', DATABASE_PATH)
+        logger.info(f"Admin {session['username']} backed up the database: {backup['name']}")
+        return jsonify({'success': True, 'backup': backup})
+    except BackupError as e:
+        logger.error(f"Admin database backup failed: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/admin/control_background_updater', methods=['POST'])
 def admin_control_background_updater():
     """Start or stop the background game updater"""
@@ -4346,7 +3617,8 @@ def health_check():
         try:
             from background_updater import get_updater_status
             status = get_updater_status()
-            updater_status = "running" if status.get('running') else "stopped"
+            # Under the pre-fork server the updater runs in its own process
+            updater_status = "running" if status.get('running') or status['lease']['active'] else "stopped"
         except:
             updater_status = "not_available"
         
@@ -4393,95 +3665,6 @@ def shutdown_handler():
 
 atexit.register(shutdown_handler)
 
-# NFL team name mappings
-NFL_TEAM_NAMES = {
-    'ARI': 'Arizona Cardinals',
-    'ATL': 'Atlanta Falcons', 
-    'BAL': 'Baltimore Ravens',
-    'BUF': 'Buffalo Bills',
-    'CAR': 'Carolina Panthers',
-    'CHI': 'Chicago Bears',
-    'CIN': 'Cincinnati Bengals',
-    'CLE': 'Cleveland Browns',
-    'DAL': 'Dallas Cowboys',
-    'DEN': 'Denver Broncos',
-    'DET': 'Detroit Lions',
-    'GB': 'Green Bay Packers',
-    'HOU': 'Houston Texans',
-    'IND': 'Indianapolis Colts',
-    'JAX': 'Jacksonville Jaguars',
-    'KC': 'Kansas City Chiefs',
-    'LAC': 'Los Angeles Chargers',
-    'LAR': 'Los Angeles Rams',
-    'LV': 'Las Vegas Raiders',
-    'MIA': 'Miami Dolphins',
-    'MIN': 'Minnesota Vikings',
-    'NE': 'New England Patriots',
-    'NO': 'New Orleans Saints',
-    'NYG': 'New York Giants',
-    'NYJ': 'New York Jets',
-    'PHI': 'Philadelphia Eagles',
-    'PIT': 'Pittsburgh Steelers',
-    'SF': 'San Francisco 49ers',
-    'SEA': 'Seattle Seahawks',
-    'TB': 'Tampa Bay Buccaneers',
-    'TEN': 'Tennessee Titans',
-    'WAS': 'Washington Commanders'
-}
-
-def get_team_name(abbreviation):
-    """Get full team name from abbreviation"""
-    return NFL_TEAM_NAMES.get(abbreviation, abbreviation)
-
-def get_team_logo_url(team_name_or_abbr):
-    """Get team logo URL from team name or abbreviation"""
-    # Create reverse mapping from team names to abbreviations
-    name_to_abbr = {
-        'Arizona Cardinals': 'ari',
-        'Atlanta Falcons': 'atl', 
-        'Baltimore Ravens': 'bal',
-        'Buffalo Bills': 'buf',
-        'Carolina Panthers': 'car',
-        'Chicago Bears': 'chi',
-        'Cincinnati Bengals': 'cin',
-        'Cleveland Browns': 'cle',
-        'Dallas Cowboys': 'dal',
-        'Denver Broncos': 'den',
-        'Detroit Lions': 'det',
-        'Green Bay Packers': 'gb',
-        'Houston Texans': 'hou',
-        'Indianapolis Colts': 'ind',
-        'Jacksonville Jaguars': 'jax',
-        'Kansas City Chiefs': 'kc',
-        'Los Angeles Chargers': 'lac',
-        'Los Angeles Rams': 'lar',
-        'Las Vegas Raiders': 'lv',
-        'Miami Dolphins': 'mia',
-        'Minnesota Vikings': 'min',
-        'New England Patriots': 'ne',
-        'New Orleans Saints': 'no',
-        'New York Giants': 'nyg',
-        'New York Jets': 'nyj',
-        'Philadelphia Eagles': 'phi',
-        'Pittsburgh Steelers': 'pit',
-        'Seattle Seahawks': 'sea',
-        'San Francisco 49ers': 'sf',
-        'Tampa Bay Buccaneers': 'tb',
-        'Tennessee Titans': 'ten',
-        'Washington Commanders': 'was'
-    }
-    
-    # Get abbreviation (either directly or from mapping)
-    abbr = name_to_abbr.get(team_name_or_abbr, team_name_or_abbr.lower())
-    
-    # Use local SVG files
-    return f"/static/images/{abbr}.svg"
-
-def get_team_display(abbreviation):
-    """Get team display as 'ABB - Full Name'"""
-    full_name = NFL_TEAM_NAMES.get(abbreviation, abbreviation)
-    return f"{abbreviation} - {full_name}"
-
 # Add team names to template context
 @app.context_processor
 def inject_team_names():
@@ -4500,12 +3683,13 @@ if __name__ == '__main__':
     # Initialize the database on startup
     initialize_app()
     
-    # Start background game updater (every 15 minutes)
-    try:
-        start_background_updater()
-        logger.info("✅ Background game updater started (updates every 15 minutes)")
-    except Exception as e:
-        logger.error(f"❌ Failed to start background updater: {e}")
+    def start_updater_in_process():
+        """Start background game updater in this process (single-process modes)"""
+        try:
+            start_background_updater()
+            logger.info("✅ Background game updater started (updates every 15 minutes)")
+        except Exception as e:
+            logger.error(f"❌ Failed to start background updater: {e}")
     
     # Simple SSL context setup for existing certificates
     def setup_ssl_context():
@@ -4577,6 +3761,8 @@ if __name__ == '__main__':
         print("📍 Access at: http://localhost:5000")
         print("💡 Press Ctrl+C to stop")
         print("=" * 50)
+        configure_runtime(True, True)
+        start_updater_in_process()
         app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
     
     elif mode == 'http' or mode == 'http-only':
@@ -4584,19 +3770,32 @@ if __name__ == '__main__':
         print("📍 Access at: http://localhost:8080")
         print("💡 Press Ctrl+C to stop")
         print("=" * 50)
+        start_updater_in_process()
         app.run(debug=False, host='0.0.0.0', port=8080, threaded=True)
         
     else:
-        # Production mode - HTTP on 80, HTTPS on 443 if certificates available
+        # Production mode - HTTP on HTTP_PORT (80), HTTPS on HTTPS_PORT (443) if certificates available.
+        # 'production' pre-forks worker processes; 'threaded' (or a platform
+        # without fork) serves everything from one process as before.
+        from prefork_server import PreforkServer, can_prefork
+        use_prefork = mode != 'threaded' and can_prefork()
+        
+        # Never serve production traffic with the debugger or template reloading on
+        configure_runtime(False, False)
+        
         print("🚀 Production Mode")
-        print("🌐 HTTP Server: Starting on port 80...")
+        print(f"🌐 HTTP Server: Starting on port {Config.HTTP_PORT}...")
         
         ssl_context = setup_ssl_context()
         if ssl_context:
-            print("🔒 HTTPS Server: SSL certificates found, starting on port 443...")
+            print(f"🔒 HTTPS Server: SSL certificates found, starting on port {Config.HTTPS_PORT}...")
         else:
             print("⚠️ HTTPS Server: No SSL certificates, HTTPS disabled")
         
+        if use_prefork:
+            print(f"⚙️ Workers: {Config.WEB_WORKERS} processes + 1 background updater process")
+        else:
+            print("⚙️ Workers: single process (threaded)")
         print("📍 Access URLs:")
         print("   🌐 HTTP:  http://your-domain.com")
         if ssl_context:
@@ -4605,27 +3804,42 @@ if __name__ == '__main__':
         print("=" * 50)
         
         try:
-            # Start HTTP server
-            http_server = make_server('0.0.0.0', 80, app, threaded=True)
-            print("✅ HTTP server started on port 80")
-            
-            if ssl_context:
-                # Start HTTPS server if SSL is available
-                import threading
+            if use_prefork:
+                listeners = [('0.0.0.0', Config.HTTP_PORT, None)]
+                if ssl_context:
+                    listeners.append(('0.0.0.0', Config.HTTPS_PORT, ssl_context))
+                server = PreforkServer(app, listeners, workers=Config.WEB_WORKERS,
+                                       start_updater=start_background_updater,
+                                       stop_updater=stop_background_updater)
+                server.bind()
+                print(f"✅ HTTP server listening on port {Config.HTTP_PORT}")
+                if ssl_context:
+                    print(f"✅ HTTPS server listening on port {Config.HTTPS_PORT}")
+                server.serve_forever()
+            else:
+                start_updater_in_process()
                 
-                def run_https():
-                    try:
-                        https_server = make_server('0.0.0.0', 443, app, ssl_context=ssl_context, threaded=True)
-                        print("✅ HTTPS server started on port 443")
-                        https_server.serve_forever()
-                    except Exception as e:
-                        logger.error(f"HTTPS server error: {e}")
+                # Start HTTP server
+                http_server = make_server('0.0.0.0', Config.HTTP_PORT, app, threaded=True)
+                print(f"✅ HTTP server started on port {Config.HTTP_PORT}")
                 
-                https_thread = threading.Thread(target=run_https, daemon=True)
-                https_thread.start()
-            
-            # Run HTTP server in main thread
-            http_server.serve_forever()
+                if ssl_context:
+                    # Start HTTPS server if SSL is available
+                    import threading
+                    
+                    def run_https():
+                        try:
+                            https_server = make_server('0.0.0.0', Config.HTTPS_PORT, app, ssl_context=ssl_context, threaded=True)
+                            print(f"✅ HTTPS server started on port {Config.HTTPS_PORT}")
+                            https_server.serve_forever()
+                        except Exception as e:
+                            logger.error(f"HTTPS server error: {e}")
+                    
+                    https_thread = threading.Thread(target=run_https, daemon=True)
+                    https_thread.start()
+                
+                # Run HTTP server in main thread
+                http_server.serve_forever()
             
         except PermissionError:
             print("❌ Permission denied for ports 80/443")
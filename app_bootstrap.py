@@ -0,0 +1,185 @@
+"""
+Application bootstrap for NFL Fantasy League
+Runs the one-time startup work (database setup, schema migrations, scoring
+catch-up) once per process instead of on every page view
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_bootstrap_lock = threading.Lock()
+_bootstrap_state: Dict[str, Any] = {
+    'completed': False,
+    'started_at': None,
+    'completed_at': None,
+    'duration_seconds': None,
+    'steps': {}
+}
+
+# Schema migrations run once at startup, in registration order.
+# Each entry is (name, callable(database_path)).
+_startup_migrations: List[Tuple[str, Callable[[str], Any]]] = []
+
+
+def register_startup_migration(name: str, migration: Callable[[str], Any]) -> None:
+    """Register an idempotent schema migration to run during bootstrap"""
+    if any(existing_name == name for existing_name, _ in _startup_migrations):
+        return
+    _startup_migrations.append((name, migration))
+
+
+def _ensure_database_file(database_path: str) -> bool:
+    """Create the database from scratch if the file does not exist yet"""
+    if os.path.exists(database_path):
+        print("Database exists, ready to run")
+        return False
+
+    print("Database not found, running setup...")
+    from setup_database import setup_complete_database
+    setup_complete_database()
+    return True
+
+
+def _migrate_weekly_results(database_path: str) -> bool:
+    """Ensure weekly_results table exists and is up to date"""
+    from scoring_updater import create_weekly_results_table_if_not_exists
+    return create_weekly_results_table_if_not_exists()
+
+
+def _migrate_pick_indexes(database_path: str) -> bool:
+    """Index user_picks by game so per-game correctness updates stay cheap"""
+    from models import get_pooled_connection
+    conn = get_pooled_connection(database_path)
+    try:
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_picks_game ON user_picks(game_id)')
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
+
+def _migrate_season_standings(database_path: str) -> bool:
+    """Ensure season_standings table exists and is populated"""
+    from season_standings import ensure_season_standings
+    return ensure_season_standings(database_path)
+
+
+def _migrate_game_scoring_state(database_path: str) -> bool:
+    """Ensure the per-game scoring watermark table exists"""
+    from pick_correctness import create_game_scoring_state_table_if_not_exists
+    return create_game_scoring_state_table_if_not_exists(database_path)
+
+
+def _migrate_game_slots(database_path: str) -> bool:
+    """Add and backfill the kickoff_utc / slot columns on nfl_games"""
+    from game_slots import ensure_game_slot_columns
+    return ensure_game_slot_columns(database_path)
+
+
+def _migrate_deadline_overrides(database_path: str) -> bool:
+    """Ensure the deadline override table exists (its data version triggers need it)"""
+    from deadline_override_manager import DeadlineOverrideManager
+    DeadlineOverrideManager(database_path)
+    return True
+
+
+def _migrate_data_version(database_path: str) -> bool:
+    """Ensure the data version counters and their triggers exist (shared cache keys)"""
+    from data_version import ensure_data_version_triggers
+    return ensure_data_version_triggers(database_path)
+
+
+def _migrate_updater_lease(database_path: str) -> bool:
+    """Ensure the single-updater lease table exists"""
+    from updater_lease import ensure_updater_lease_table
+    return ensure_updater_lease_table(database_path)
+
+
+register_startup_migration('weekly_results_table', _migrate_weekly_results)
+register_startup_migration('user_picks_game_index', _migrate_pick_indexes)
+register_startup_migration('season_standings_table', _migrate_season_standings)
+register_startup_migration('game_scoring_state_table', _migrate_game_scoring_state)
+register_startup_migration('game_slot_columns', _migrate_game_slots)
+register_startup_migration('deadline_overrides_table', _migrate_deadline_overrides)
+register_startup_migration('data_version_triggers', _migrate_data_version)
+register_startup_migration('updater_lease_table', _migrate_updater_lease)
+
+
+def _score_unscored_games(database_path: str) -> int:
+    """Score picks on final games that were finalized while the app was down"""
+    from database_sync import score_unscored_final_games
+    updated_picks = score_unscored_final_games()
+    if updated_picks > 0:
+        print(f"✅ Auto-updated scoring for {updated_picks} picks on app startup")
+    else:
+        print("✅ All pick scoring is up to date")
+    return updated_picks
+
+
+def _run_step(name: str, func: Callable[[str], Any], database_path: str) -> None:
+    """Run a single bootstrap step, recording its outcome instead of raising"""
+    step_start = datetime.now()
+    try:
+        result = func(database_path)
+        _bootstrap_state['steps'][name] = {
+            'success': True,
+            'result': result,
+            'duration_seconds': (datetime.now() - step_start).total_seconds()
+        }
+    except Exception as e:
+        logger.error(f"Bootstrap step '{name}' failed: {e}")
+        _bootstrap_state['steps'][name] = {
+            'success': False,
+            'error': str(e),
+            'duration_seconds': (datetime.now() - step_start).total_seconds()
+        }
+
+
+def bootstrap_app(database_path: str = 'nfl_fantasy.db', force: bool = False) -> Dict[str, Any]:
+    """
+    Run startup work exactly once per process.
+    Safe to call from every entry point and from concurrent request threads;
+    only the first caller does the work, the rest return the recorded status.
+    """
+    if _bootstrap_state['completed'] and not force:
+        return get_bootstrap_status()
+
+    with _bootstrap_lock:
+        if _bootstrap_state['completed'] and not force:
+            return get_bootstrap_status()
+
+        start_time = datetime.now()
+        _bootstrap_state['started_at'] = start_time.isoformat()
+        _bootstrap_state['steps'] = {}
+
+        _run_step('database_file', _ensure_database_file, database_path)
+
+        for name, migration in _startup_migrations:
+            _run_step(name, migration, database_path)
+
+        _run_step('pick_scoring_catch_up', _score_unscored_games, database_path)
+
+        _bootstrap_state['completed'] = True
+        _bootstrap_state['completed_at'] = datetime.now().isoformat()
+        _bootstrap_state['duration_seconds'] = (datetime.now() - start_time).total_seconds()
+
+        logger.info(f"App bootstrap finished in {_bootstrap_state['duration_seconds']:.2f}s")
+
+    return get_bootstrap_status()
+
+
+def is_bootstrapped() -> bool:
+    """Check whether startup work has already run in this process"""
+    return _bootstrap_state['completed']
+
+
+def get_bootstrap_status() -> Dict[str, Any]:
+    """Get a copy of the bootstrap status for health/admin endpoints"""
+    status = dict(_bootstrap_state)
+    status['steps'] = dict(_bootstrap_state['steps'])
+    return status
@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 import pytz
 from database_sync import sync_week_from_api
 from nfl_week_calculator import get_current_nfl_week
-from api_rate_limiter import check_api_rate_limit
+from api_rate_limiter import check_api_rate_limit, BALLDONTLIE_ENDPOINT
 
 # Set up logging
 logging.basicConfig(
@@ -75,7 +75,7 @@ def auto_sync_next_week():
             return True
             
         # Check API rate limit
-        if not check_api_rate_limit():
+        if not check_api_rate_limit(BALLDONTLIE_ENDPOINT):
             logger.warning("API rate limit exceeded, cannot sync")
             return False
             
@@ -110,7 +110,7 @@ def check_and_sync_missing_weeks():
             logger.info(f"Found missing weeks: {missing_weeks}")
             
             for week in missing_weeks:
-                if not check_api_rate_limit():
+                if not check_api_rate_limit(BALLDONTLIE_ENDPOINT):
                     logger.warning(f"API rate limit hit, stopping at week {week}")
                     break
                     
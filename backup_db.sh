@@ -1,26 +1,17 @@
 #!/bin/bash
 # Emergency backup script for NFL Fantasy database
 # Run this before any admin operations
+#
+# Uses db_backup.py (SQLite backup API), so it is safe while the app and
+# updaters are writing; backups are verified, gzipped and kept under the
+# tiered retention in config.py (BACKUP_* settings) in backups/
 
-DB_FILE="nfl_fantasy.db"
-BACKUP_DIR="backups"
-TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
-BACKUP_FILE="${BACKUP_DIR}/nfl_fantasy_backup_${TIMESTAMP}.db"
+cd "$(dirname "$0")"
 
-# Create backup directory if it doesn't exist
-mkdir -p "$BACKUP_DIR"
-
-# Create backup
 echo "🔄 Creating database backup..."
-cp "$DB_FILE" "$BACKUP_FILE"
+python3 db_backup.py --reason "${1:-manual}"
 
-if [ $? -eq 0 ]; then
-    echo "✅ Backup created: $BACKUP_FILE"
-    
-    # Keep only last 10 backups
-    ls -t ${BACKUP_DIR}/nfl_fantasy_backup_*.db | tail -n +11 | xargs -r rm
-    echo "📁 Cleaned old backups (keeping last 10)"
-else
+if [ $? -ne 0 ]; then
     echo "❌ Backup failed!"
     exit 1
 fi
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Synthetic-league benchmark for NFL Fantasy League
+Builds a throwaway league in a temp directory: the full 18-week schedule from
+nfl_2025_schedule.get_2025_nfl_schedule, N players with a pick for every game
+(Monday Night score predictions included) and final scores for the completed
+weeks. It then drives the real Flask routes through the test client and
+reports p50/p95 latency and SQL statements per request (from request_metrics).
+
+Game dates are shifted by whole weeks so the completed weeks are in the past
+and the week after the open one is still ahead; /submit_picks submits that
+week and gets the same deadline checks as a real player.
+
+Each league size runs in its own subprocess, so caches and connection pools
+never carry over. Leagues and request sequences are seeded: the same options
+build the same league on every commit, and --baseline compares a run against
+one saved with --output.
+
+Usage:
+    python benchmark_league.py                                # 10, 100 and 500 players
+    python benchmark_league.py --users 50 --iterations 40
+    python benchmark_league.py --output bench_before.json
+    python benchmark_league.py --baseline bench_before.json --fail-on-regression
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+# background_updater lives in cleanup_backup in this tree
+sys.path.append(os.path.join(REPO_DIR, 'cleanup_backup'))
+
+SEASON = 2025
+DATABASE_PATH = 'nfl_fantasy.db'
+DEFAULT_USERS = [10, 100, 500]
+GAME_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Regressions smaller than this are treated as timer noise
+NOISE_FLOOR_MS = 2.0
+
+# name, whether it runs as the admin, whether the leaderboard cache is cleared
+# before every request, and a function (rng, league) -> (path, json body or None)
+Scenario = namedtuple('Scenario', ['name', 'admin', 'uncached', 'build'])
+
+
+def _completed_week(rng, league):
+    return rng.randint(1, league['completed_weeks'])
+
+
+def _submit_picks(rng, league):
+    picks = []
+    for game_id, home_team, away_team, is_monday in league['submission_games']:
+        pick = {'game_id': game_id, 'selected_team': rng.choice((home_team, away_team))}
+        if is_monday:
+            pick['home_score'] = rng.randint(10, 38)
+            pick['away_score'] = rng.randint(10, 38)
+        picks.append(pick)
+    return '/submit_picks', {'picks': picks}
+
+
+SCENARIOS = [
+    Scenario('games', False, False,
+             lambda rng, league: (f'/games?week={_completed_week(rng, league)}&year={SEASON}', None)),
+    # Cached pages: the latest completed week, which is what players keep reloading
+    Scenario('weekly_leaderboard', False, False,
+             lambda rng, league: (f"/weekly_leaderboard/{league['completed_weeks']}/{SEASON}", None)),
+    Scenario('weekly_leaderboard_uncached', False, True,
+             lambda rng, league: (f'/weekly_leaderboard/{_completed_week(rng, league)}/{SEASON}', None)),
+    Scenario('leaderboard', False, False, lambda rng, league: ('/leaderboard', None)),
+    Scenario('leaderboard_uncached', False, True, lambda rng, league: ('/leaderboard', None)),
+    Scenario('submit_picks', False, False, _submit_picks),
+    Scenario('export_my_picks_csv', False, False,
+             lambda rng, league: (f'/export_my_picks_csv?week={_completed_week(rng, league)}&year={SEASON}', None)),
+    Scenario('admin_export_picks_csv', True, False,
+             lambda rng, league: (f'/admin/export_picks_csv?week={_completed_week(rng, league)}&year={SEASON}', None)),
+    Scenario('export_all_users_picks_csv', True, False,
+             lambda rng, league: (f'/export_all_users_picks_csv?week={_completed_week(rng, league)}&year={SEASON}', None)),
+    Scenario('export_weekly_dashboard_pdf', True, False,
+             lambda rng, league: (f'/export_weekly_dashboard_pdf?week={_completed_week(rng, league)}&year={SEASON}', None)),
+]
+
+
+def build_league(users: int, completed_weeks: int, seed: int, in_progress: bool = False) -> Dict[str, Any]:
+    """
+    Create nfl_fantasy.db in the current directory with a synthetic season.
+    in_progress places the week after the completed ones mid-play (its first
+    game kicked off within the last week and nothing is final yet) instead of
+    leaving it about to start.
+    """
+    import setup_database
+    from nfl_2025_schedule import get_2025_nfl_schedule
+    from werkzeug.security import generate_password_hash
+
+    if not setup_database.setup_complete_database():
+        raise RuntimeError('Database setup failed')
+
+    rng = random.Random(seed)
+    schedule = get_2025_nfl_schedule()
+
+    # Whole weeks keep every game on its weekday (slots and deadlines depend on it)
+    now = datetime.now()
+    if in_progress:
+        anchor = min(game['game_date'] for game in schedule[completed_weeks + 1])
+        target = now - timedelta(hours=1)
+    else:
+        anchor = max(game['game_date'] for game in schedule[completed_weeks])
+        target = now - timedelta(hours=12)
+    shift = timedelta(weeks=math.floor((target - anchor) / timedelta(weeks=1)))
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM user_picks')
+        cursor.execute('DELETE FROM nfl_games')
+        cursor.execute('DELETE FROM user_statistics WHERE user_id IN (SELECT id FROM users WHERE is_admin = 0)')
+        cursor.execute('DELETE FROM users WHERE is_admin = 0')
+
+        password_hash = generate_password_hash('benchmark')
+        cursor.executemany('''
+            INSERT INTO users (username, password_hash, email, full_name, is_admin)
+            VALUES (?, ?, ?, ?, 0)
+        ''', [(f'player{n:03d}', password_hash, f'player{n:03d}@example.com', f'Player {n}')
+              for n in range(1, users + 1)])
+        usernames = dict(cursor.execute('SELECT id, username FROM users ORDER BY id').fetchall())
+        user_ids = [row[0] for row in cursor.execute('SELECT id FROM users WHERE is_admin = 0 ORDER BY id')]
+        cursor.executemany('INSERT INTO user_statistics (user_id) VALUES (?)', [(user_id,) for user_id in user_ids])
+        admin_id = cursor.execute('SELECT id FROM users WHERE is_admin = 1 ORDER BY id LIMIT 1').fetchone()[0]
+
+        games = []
+        for week in sorted(schedule):
+            for game in schedule[week]:
+                kickoff = game['game_date'] + shift
+                is_final = week <= completed_weeks
+                home_score = away_score = None
+                if is_final:
+                    home_score, away_score = rng.randint(3, 45), rng.randint(3, 45)
+                    if home_score == away_score:
+                        home_score += 3
+                cursor.execute('''
+                    INSERT INTO nfl_games (week, year, game_id, away_team, home_team, game_date,
+                                           is_thursday_night, is_monday_night, is_sunday_night,
+                                           game_status, home_score, away_score, is_final)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (week, SEASON, f"bench_{SEASON}_w{week}_{game['away_team']}_{game['home_team']}",
+                      game['away_team'], game['home_team'], kickoff.strftime(GAME_DATE_FORMAT),
+                      bool(game.get('is_thursday_night')), bool(game.get('is_monday_night')),
+                      bool(game.get('is_sunday_night')), 'final' if is_final else 'scheduled',
+                      home_score, away_score, is_final))
+                games.append((cursor.lastrowid, week, game['home_team'], game['away_team'],
+                              bool(game.get('is_monday_night')), kickoff))
+
+        # Everyone has picked every game up to the open week; the week after is left for /submit_picks
+        picks = []
+        for game_id, week, home_team, away_team, is_monday, kickoff in games:
+            if week > completed_weeks + 1:
+                continue
+            for user_id in user_ids:
+                submitted = kickoff - timedelta(minutes=rng.randint(30, 96 * 60))
+                picks.append((user_id, game_id, rng.choice((home_team, away_team)),
+                              rng.randint(10, 38) if is_monday else None,
+                              rng.randint(10, 38) if is_monday else None,
+                              submitted.strftime(GAME_DATE_FORMAT)))
+        cursor.executemany('''
+            INSERT INTO user_picks (user_id, game_id, selected_team, predicted_home_score,
+                                    predicted_away_score, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', picks)
+        conn.commit()
+    finally:
+        conn.close()
+
+    # New picks go to the first week after the open one that hasn't started
+    submission_week = min((week for week in schedule if week > completed_weeks + 1
+                           and min(game['game_date'] for game in schedule[week]) + shift > now + timedelta(hours=1)),
+                          default=None)
+    if submission_week is None:
+        raise ValueError(f'No week after week {completed_weeks + 1} is still open for picks')
+    return {
+        'users': users,
+        'user_ids': user_ids,
+        'usernames': usernames,
+        'admin_id': admin_id,
+        'games': len(games),
+        'picks': len(picks),
+        'completed_weeks': completed_weeks,
+        'open_week': completed_weeks + 1,
+        'submission_week': submission_week,
+        'submission_games': [(game_id, home_team, away_team, is_monday)
+                             for game_id, week, home_team, away_team, is_monday, _ in games
+                             if week == submission_week]
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _timed_request(client, path: str, body: Optional[Dict[str, Any]]):
+    started = time.perf_counter()
+    response = client.open(path, method='POST' if body is not None else 'GET', json=body)
+    size = len(response.get_data())
+    response.close()
+    return time.perf_counter() - started, response.status_code, size
+
+
+def run_scenario(client, scenario: Scenario, league: Dict[str, Any], iterations: int,
+                 warmup: int, seed: int) -> Dict[str, Any]:
+    from leaderboard_cache import clear_leaderboard_cache
+    from request_metrics import get_performance_report, reset_request_metrics
+
+    rng = random.Random(f'{seed}:{scenario.name}')
+    timings = []
+    statuses: Counter = Counter()
+    total_bytes = 0
+    for iteration in range(warmup + iterations):
+        if iteration == warmup:
+            reset_request_metrics()
+        user_id = league['admin_id'] if scenario.admin else rng.choice(league['user_ids'])
+        with client.session_transaction() as session:
+            session['user_id'] = user_id
+            session['username'] = league['usernames'][user_id]
+            session['is_admin'] = scenario.admin
+        if scenario.uncached:
+            clear_leaderboard_cache()
+        path, body = scenario.build(rng, league)
+
+        seconds, status, size = _timed_request(client, path, body)
+        if iteration >= warmup:
+            timings.append(seconds * 1000)
+            statuses[status] += 1
+            total_bytes += size
+
+    routes = get_performance_report(slow_limit=0)['routes']
+    recorded = sum(row['count'] for row in routes)
+    sql_per_request = sum(row['avg_sql_count'] * row['count'] for row in routes) / recorded if recorded else None
+    sql_ms = sum(row['avg_sql_ms'] * row['count'] for row in routes) / recorded if recorded else None
+
+    return {
+        'requests': iterations,
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'sql_per_request': round(sql_per_request, 1) if sql_per_request is not None else None,
+        'sql_ms_per_request': round(sql_ms, 2) if sql_ms is not None else None,
+        'avg_bytes': total_bytes // iterations,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+
+def run_worker(args) -> Dict[str, Any]:
+    """One league size, in the fresh temp directory the worker was started in"""
+    from config import Config
+
+    workdir = os.getcwd()
+    Config.PERF_INSTRUMENTATION = True
+    Config.PERF_SNAPSHOT_DIR = os.path.join(workdir, 'perf_metrics')
+
+    started = time.perf_counter()
+    league = build_league(args.users[0], args.completed_weeks, args.seed)
+    build_seconds = time.perf_counter() - started
+
+    import logging
+    import app as app_module
+    from models import close_all_pools
+    from weekly_winners import WeeklyWinnerEngine
+    logging.getLogger().setLevel(logging.WARNING)
+
+    started = time.perf_counter()
+    app_module.initialize_app()
+    bootstrap_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    WeeklyWinnerEngine(DATABASE_PATH).recompute_season(SEASON, league['completed_weeks'])
+    recompute_seconds = time.perf_counter() - started
+
+    client = app_module.app.test_client()
+    scenarios = {}
+    for scenario in SCENARIOS:
+        if args.scenarios and scenario.name not in args.scenarios:
+            continue
+        scenarios[scenario.name] = run_scenario(client, scenario, league, args.iterations,
+                                                args.warmup, args.seed)
+    close_all_pools()
+
+    return {
+        'users': league['users'],
+        'games': league['games'],
+        'picks': league['picks'],
+        'completed_weeks': league['completed_weeks'],
+        'setup_seconds': {
+            'build_league': round(build_seconds, 3),
+            'bootstrap': round(bootstrap_seconds, 3),
+            'recompute_season': round(recompute_seconds, 3)
+        },
+        'scenarios': scenarios
+    }
+
+
+def _run_in_subprocess(users: int, args) -> Dict[str, Any]:
+    fd, result_path = tempfile.mkstemp(prefix='league-bench-', suffix='.json')
+    os.close(fd)
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--result-file', result_path,
+               '--users', str(users), '--iterations', str(args.iterations), '--warmup', str(args.warmup),
+               '--completed-weeks', str(args.completed_weeks), '--seed', str(args.seed)]
+    if args.scenarios:
+        command += ['--scenarios', ','.join(args.scenarios)]
+    # The worker imports app (which opens app.log in its working directory), so
+    # start it in the throwaway league directory rather than the repo
+    workdir = tempfile.mkdtemp(prefix='league-bench-')
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=workdir)
+        if completed.returncode != 0:
+            sys.stderr.write(completed.stdout[-4000:] + completed.stderr[-4000:])
+            raise RuntimeError(f'Benchmark worker for {users} players failed (exit {completed.returncode})')
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(result_path)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                  text=True, cwd=REPO_DIR, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, cwd=REPO_DIR, check=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    meta = results['meta']
+    print(f"\nBenchmark {meta['revision'] or 'unknown revision'} - Python {meta['python']}, "
+          f"{meta['iterations']} requests per scenario, seed {meta['seed']}")
+    for run in results['runs']:
+        setup = run['setup_seconds']
+        print(f"\n{run['users']} players, {run['games']} games, {run['picks']} picks "
+              f"(build {setup['build_league']}s, bootstrap {setup['bootstrap']}s, "
+              f"season recompute {setup['recompute_season']}s)")
+        print(f"  {'scenario':<30} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'sql/req':>8} {'sql ms':>8}  status")
+        for name, row in run['scenarios'].items():
+            statuses = ' '.join(f'{status}x{count}' for status, count in row['statuses'].items())
+            print(f"  {name:<30} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['max_ms']:>9} "
+                  f"{row['sql_per_request'] if row['sql_per_request'] is not None else '-':>8} "
+                  f"{row['sql_ms_per_request'] if row['sql_ms_per_request'] is not None else '-':>8}  {statuses}")
+
+
+def _change(new: float, old: float) -> str:
+    if not old:
+        return 'n/a'
+    return f'{(new - old) / old * 100:+.0f}%'
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print deltas against a saved run; returns the regressions found"""
+    base_runs = {run['users']: run for run in baseline['runs']}
+    regressions = []
+    print(f"\nCompared with {baseline['meta'].get('revision') or 'baseline'} "
+          f"(regression: p95 over +{threshold:.0f}% or more SQL per request)")
+    for run in results['runs']:
+        base_run = base_runs.get(run['users'])
+        if base_run is None:
+            continue
+        print(f"\n{run['users']} players")
+        print(f"  {'scenario':<30} {'p50':>8} {'p95':>8} {'sql/req':>12}")
+        for name, row in run['scenarios'].items():
+            base = base_run['scenarios'].get(name)
+            if base is None:
+                continue
+            flags = []
+            if (row['p95_ms'] > base['p95_ms'] * (1 + threshold / 100)
+                    and row['p95_ms'] - base['p95_ms'] > NOISE_FLOOR_MS):
+                flags.append('p95')
+            if (row['sql_per_request'] is not None and base['sql_per_request'] is not None
+                    and row['sql_per_request'] > base['sql_per_request'] + 0.5):
+                flags.append('sql')
+            if flags:
+                regressions.append(f"{run['users']} players / {name}: {', '.join(flags)}")
+            sql = f"{base['sql_per_request']}->{row['sql_per_request']}"
+            print(f"  {name:<30} {_change(row['p50_ms'], base['p50_ms']):>8} "
+                  f"{_change(row['p95_ms'], base['p95_ms']):>8} {sql:>12}"
+                  f"{'  REGRESSION (' + ', '.join(flags) + ')' if flags else ''}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Flask routes against a synthetic league')
+    parser.add_argument('--users', type=lambda value: [int(part) for part in value.split(',')],
+                        default=DEFAULT_USERS, help='comma-separated league sizes (default 10,100,500)')
+    parser.add_argument('--iterations', type=int, default=20, help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=2, help='untimed requests per scenario')
+    parser.add_argument('--completed-weeks', type=int, default=16,
+                        help='weeks with final scores (1-16; the week after is open, the next one takes new picks)')
+    parser.add_argument('--scenarios', type=lambda value: value.split(','),
+                        help='comma-separated subset of: ' + ', '.join(s.name for s in SCENARIOS))
+    parser.add_argument('--seed', type=int, default=2025)
+    parser.add_argument('--output', help='save results as JSON')
+    parser.add_argument('--baseline', help='compare against results saved with --output')
+    parser.add_argument('--threshold', type=float, default=20.0, help='p95 regression threshold in percent')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 when --baseline finds a regression')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.completed_weeks <= 16:
+        parser.error('--completed-weeks must be between 1 and 16')
+    if any(users < 1 for users in args.users):
+        parser.error('--users must be positive')
+    if args.iterations < 1:
+        parser.error('--iterations must be at least 1')
+    unknown = set(args.scenarios or []) - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.worker:
+        result = run_worker(args)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    results = {
+        'meta': {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'completed_weeks': args.completed_weeks,
+            'seed': args.seed
+        },
+        'runs': []
+    }
+    for users in args.users:
+        print(f"Benchmarking a {users}-player league...", file=sys.stderr)
+        results['runs'].append(_run_in_subprocess(users, args))
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for regression in regressions:
+                print(f"  {regression}")
+            if args.fail_on_regression:
+                return 1
+        else:
+            print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
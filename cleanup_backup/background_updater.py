@@ -1,6 +1,10 @@
 """
 Background Game Results Updater
-Automatically updates game scores every 15 minutes during game days
+Automatically updates game scores, polling on a plan built from the stored
+schedule: densely while games are in progress, asleep until the next kickoff otherwise.
+Only the updater holding the score updater lease (updater_lease) polls; any
+other instance stays on standby until the lease frees up. The lease holder
+also takes the scheduled database backups (db_backup) between cycles.
 """
 
 import threading
@@ -10,6 +14,10 @@ from datetime import datetime, timedelta
 from typing import Optional
 from database_sync import update_live_scores, update_live_scores_espn
 from api_rate_limiter import check_api_rate_limit
+from polling_scheduler import PollingScheduler, PollingPlan
+from updater_lease import UpdaterLease, get_lease_status
+from db_backup import run_scheduled_backup
+from config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -21,26 +29,24 @@ class BackgroundGameUpdater:
         self.running = False
         self.thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        self.scheduler = PollingScheduler('nfl_fantasy.db')
+        self.last_plan: Optional[PollingPlan] = None
+        self.next_update_at: Optional[datetime] = None
+        self.lease = UpdaterLease('background_updater', 'nfl_fantasy.db')
         
-    def _get_dynamic_interval(self) -> int:
-        """Get dynamic update interval based on current time and game status"""
+    def _get_polling_plan(self) -> Optional[PollingPlan]:
+        """Build the polling plan from the games schedule"""
         try:
-            current_day = datetime.now().weekday()  # 0=Monday, 6=Sunday
-            current_hour = datetime.now().hour
-            
-            # Game days: Thursday (3), Saturday (5), Sunday (6), Monday (0), Tuesday (1)
-            game_days = [0, 1, 3, 5, 6]
-            
-            # During game days and peak game hours (11 AM - 11 PM)
-            if current_day in game_days and 11 <= current_hour <= 23:
-                return 5 * 60  # 5 minutes during game times
-            # Non-game days or off-peak hours
-            else:
-                return 30 * 60  # 30 minutes during quiet periods
-                
+            self.last_plan = self.scheduler.build_plan()
+            return self.last_plan
         except Exception as e:
-            logger.error(f"Error calculating dynamic interval: {e}")
-            return self.default_interval
+            logger.error(f"Error building polling plan: {e}")
+            return None
+        
+    def _get_dynamic_interval(self) -> int:
+        """Seconds until the next update cycle, from the latest polling plan"""
+        plan = self.last_plan or self._get_polling_plan()
+        return plan.sleep_seconds if plan else self.default_interval
         
     def start(self):
         """Start the background updater"""
@@ -66,62 +72,82 @@ class BackgroundGameUpdater:
         logger.info("Background game updater stopped")
         
     def _update_loop(self):
-        """Main update loop with dynamic intervals"""
+        """Main update loop driven by the polling plan, while holding the updater lease"""
         while self.running and not self.stop_event.is_set():
+            if not self.lease.acquire():
+                # Hot standby: another process is polling; check the lease once per heartbeat
+                self.next_update_at = None
+                self.stop_event.wait(Config.UPDATER_LEASE_HEARTBEAT_SECONDS)
+                continue
+            
+            plan = self._get_polling_plan()
+            started_at = time.time()
             try:
-                # Get current interval (5 min during games, 30 min otherwise)
-                current_interval = self._get_dynamic_interval()
-                
-                # Log current interval for monitoring
-                interval_min = current_interval // 60
-                logger.info(f"Update cycle starting (next in {interval_min} min)")
-                
-                self._update_games()
+                if plan is None or plan.should_poll:
+                    reason = plan.reason if plan else 'no polling plan'
+                    logger.info(f"Update cycle starting ({reason})")
+                    self._update_games(plan)
+                    result = f"polled: {reason}"
+                else:
+                    logger.info(f"Skipping update cycle: {plan.reason}")
+                    result = f"skipped: {plan.reason}"
             except Exception as e:
                 logger.error(f"Error in background game update: {e}")
+                result = f"error: {e}"
+            self.lease.record_cycle(started_at, time.time(), result)
                 
-            # Wait for dynamic interval or stop event
-            current_interval = self._get_dynamic_interval()
-            self.stop_event.wait(current_interval)
+            # Re-plan after the update: games may have just gone final
+            plan = self._get_polling_plan()
+            current_interval = plan.sleep_seconds if plan else self.default_interval
+            self.next_update_at = datetime.now() + timedelta(seconds=current_interval)
+            logger.info(f"Next update cycle in {current_interval // 60} min")
+            self._wait_holding_lease(current_interval)
+        
+        self.lease.release()
+        
+    def _wait_holding_lease(self, seconds: float):
+        """
+        Sleep until the next cycle, renewing the lease and taking any scheduled
+        backup that is due; returns early if the lease is lost or on stop
+        """
+        deadline = time.monotonic() + seconds
+        while not self.stop_event.is_set():
+            run_scheduled_backup('nfl_fantasy.db')
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.stop_event.wait(min(remaining, Config.UPDATER_LEASE_HEARTBEAT_SECONDS)):
+                return
+            if not self.lease.acquire():
+                self.next_update_at = None
+                return
             
-    def _update_games(self):
-        """Update game scores for current week using ESPN API and new score updater"""
+    def _update_games(self, plan: Optional[PollingPlan] = None):
+        """Update game scores for the weeks in the polling plan using ESPN API and new score updater"""
         try:
             # Check API rate limits first
             if not check_api_rate_limit():
                 logger.warning("API rate limit reached, skipping update")
                 return
                 
-            # Get current week
-            current_week = self._get_current_nfl_week()
-            if current_week is None:
-                logger.info("No current NFL week determined, skipping update")
-                return
-                
-            # First, check if there are any games that need updating
-            games_needing_update = self._check_games_needing_update(current_week)
-            
-            # Get current day for game day logic
-            current_day = datetime.now().weekday()  # 0=Mon, 6=Sun
-            game_days = [3, 6, 0, 1]  # Thursday, Sunday, Monday, Tuesday
+            # Weeks with games in progress or awaiting a final score
+            if plan is not None:
+                weeks = plan.weeks
+            else:
+                current_week = self._get_current_nfl_week()
+                weeks = [(current_week, 2025)] if current_week is not None else []
             
-            # If it's not a game day but no games need updating, skip
-            if current_day not in game_days and games_needing_update == 0:
-                logger.info(f"Not a game day (weekday {current_day}) "
-                            f"and no games need updating, skipping")
+            if not weeks:
+                logger.info("No games in progress or awaiting final scores, skipping update")
                 return
-            elif current_day not in game_days and games_needing_update > 0:
-                logger.info(f"Not a game day (weekday {current_day}) but "
-                            f"{games_needing_update} games need updating")
-            else:
-                logger.info(f"Game day (weekday {current_day}), "
-                            f"updating live scores for Week {current_week}")
+            
+            logger.info(f"Updating live scores for weeks {weeks}")
                 
             # Use new comprehensive score updater
             try:
                 from score_updater import NFLScoreUpdater
                 score_updater = NFLScoreUpdater('nfl_fantasy.db')
-                results = score_updater.run_update_cycle()
+                results = score_updater.run_update_cycle(weeks)
                 
                 updated_count = results.get('games_updated', 0)
                 if updated_count > 0:
@@ -129,7 +155,8 @@ class BackgroundGameUpdater:
                                 f"via new score updater")
                     
                     # IMPORTANT: Update weekly results after updating scores
-                    self._update_weekly_results(current_week)
+                    for week, year in weeks:
+                        self._update_weekly_results(week, year)
                 else:
                     logger.debug("No games needed updating via new score "
                                  "updater")
@@ -139,46 +166,21 @@ class BackgroundGameUpdater:
                 
                 # Fallback to original ESPN updater
                 logger.info("Falling back to original ESPN API updater")
-                updated_count = update_live_scores_espn(current_week, 2025)
-                
-                if updated_count > 0:
-                    logger.info(f"Successfully updated {updated_count} games "
-                                f"via fallback ESPN")
+                for week, year in weeks:
+                    updated_count = update_live_scores_espn(week, year)
                     
-                    # IMPORTANT: Update weekly results after updating scores
-                    self._update_weekly_results(current_week)
-                else:
-                    logger.debug("No games needed updating via fallback ESPN")
+                    if updated_count > 0:
+                        logger.info(f"Successfully updated {updated_count} games "
+                                    f"via fallback ESPN")
+                        
+                        # IMPORTANT: Update weekly results after updating scores
+                        self._update_weekly_results(week, year)
+                    else:
+                        logger.debug("No games needed updating via fallback ESPN")
                 
         except Exception as e:
             logger.error(f"Error updating games: {e}")
             
-    def _check_games_needing_update(self, week: int) -> int:
-        """Check how many games in the current week need score updates"""
-        try:
-            # Import here to avoid circular imports
-            import sqlite3
-            
-            conn = sqlite3.connect('nfl_fantasy.db')
-            cursor = conn.cursor()
-            
-            # Check for games that are not final but should be
-            # (game time was more than 4 hours ago)
-            cursor.execute('''
-                SELECT COUNT(*) FROM nfl_games
-                WHERE week = ? AND year = 2025
-                AND is_final = 0
-                AND datetime(game_date) < datetime('now', '-4 hours')
-            ''', (week,))
-            
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
-            
-        except Exception as e:
-            logger.error(f"Error checking games needing update: {e}")
-            return 0
-            
     def _get_current_nfl_week(self) -> Optional[int]:
         """Determine current NFL week based on date"""
         try:
@@ -204,23 +206,17 @@ class BackgroundGameUpdater:
             logger.error(f"Error determining current NFL week: {e}")
             return None
     
-    def _update_weekly_results(self, week: int):
+    def _update_weekly_results(self, week: int, year: int = 2025):
         """Update weekly results after game scores are updated"""
         try:
             from scoring_updater import ScoringUpdater
             
-            logger.info(f"Updating weekly results for Week {week}, 2025...")
+            logger.info(f"Updating weekly results for Week {week}, {year}...")
             updater = ScoringUpdater('nfl_fantasy.db')
-            success = updater.update_weekly_results(week, 2025)
+            success = updater.update_weekly_results(week, year)
             
             if success:
                 logger.info(f"✅ Weekly results updated for Week {week}")
-                
-                # Also update previous week if it might have been affected
-                if week > 1:
-                    prev_success = updater.update_weekly_results(week - 1, 2025)
-                    if prev_success:
-                        logger.info(f"✅ Previous week ({week - 1}) results also updated")
             else:
                 logger.warning(f"❌ Failed to update weekly results for Week {week}")
                 
@@ -233,25 +229,30 @@ class BackgroundGameUpdater:
         
     def get_status(self) -> dict:
         """Get current status of the background updater"""
-        if self.is_running():
-            current_interval = self._get_dynamic_interval()
-        else:
-            current_interval = None
+        plan = self._get_polling_plan()
+        current_interval = plan.sleep_seconds if plan else None
+        
+        next_update_in = None
+        if self.is_running() and self.next_update_at:
+            next_update_in = max(0, int((self.next_update_at - datetime.now()).total_seconds()))
             
         return {
             'running': self.is_running(),
+            # Running here and polling, or running but standing by for another process
+            'role': ('leader' if self.lease.held else 'standby') if self.is_running() else None,
+            'lease': get_lease_status('nfl_fantasy.db'),
             'update_interval_minutes': (current_interval // 60
                                         if current_interval else None),
             'dynamic_intervals': True,
-            'game_time_interval': '5 minutes',
-            'off_peak_interval': '30 minutes',
+            'schedule_driven': True,
+            'game_time_interval': f"{self.scheduler.live_interval() // 60} minutes",
+            'polling_plan': plan.to_dict() if plan else None,
             'current_week': self._get_current_nfl_week(),
-            'next_update_in_seconds': (current_interval
-                                       if self.is_running() else None)
+            'next_update_in_seconds': next_update_in
         }
 
 
-# Global instance - dynamic intervals: 5 min during games, 30 min off-peak
+# Global instance - polling follows the games schedule
 game_updater = BackgroundGameUpdater(update_interval=5)
 
 
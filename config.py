@@ -8,19 +8,90 @@ class Config:
     # Flask Configuration
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'nfl-fantasy-super-secret-key-2024'
     DEBUG = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
+    # Re-read templates from disk when they change; follows DEBUG unless set
+    TEMPLATES_AUTO_RELOAD = os.environ.get('TEMPLATES_AUTO_RELOAD', str(DEBUG)).lower() == 'true'
+
+    # Production server (python app.py production): WEB_WORKERS pre-forked
+    # worker processes, each running a threaded server on the shared sockets
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', os.cpu_count() or 2))
+    WEB_LISTEN_BACKLOG = int(os.environ.get('WEB_LISTEN_BACKLOG', 128))
+    WEB_SHUTDOWN_TIMEOUT_SECONDS = float(os.environ.get('WEB_SHUTDOWN_TIMEOUT_SECONDS', 10))
+    HTTP_PORT = int(os.environ.get('HTTP_PORT', 80))
+    HTTPS_PORT = int(os.environ.get('HTTPS_PORT', 443))
     
     # Database Configuration
     DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'nfl_fantasy.db')
-    
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 16))
+    DB_POOL_WAIT_SECONDS = float(os.environ.get('DB_POOL_WAIT_SECONDS', 2.0))
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+    DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', 16384))  # 16MB page cache
+    DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 64 * 1024 * 1024))  # 64MB
+
     # League Configuration
     CURRENT_SEASON = int(os.environ.get('NFL_SEASON', datetime.now().year))
     WEEKLY_FEE = float(os.environ.get('WEEKLY_FEE', 5.0))
     SEASON_FEE = float(os.environ.get('SEASON_FEE', 10.0))
     
     # NFL API Configuration
-    ESPN_API_BASE = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
+    ESPN_API_BASE = os.environ.get('ESPN_API_BASE') or "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
     API_TIMEOUT = 15
-    
+    ESPN_CACHE_TTL_SECONDS = int(os.environ.get('ESPN_CACHE_TTL_SECONDS', 60))
+    ESPN_CACHE_DIR = os.environ.get('ESPN_CACHE_DIR') or os.path.join(os.path.dirname(__file__), 'espn_cache')
+    # Certificates are verified unless a deployment behind an intercepting proxy opts out
+    # with ESPN_VERIFY_SSL=false (or the general DISABLE_SSL_VERIFY=true)
+    ESPN_VERIFY_SSL = (os.environ.get('ESPN_VERIFY_SSL', 'True').lower() == 'true'
+                       and os.environ.get('DISABLE_SSL_VERIFY', '').lower() != 'true')
+    ESPN_CALLS_PER_HOUR = int(os.environ.get('ESPN_CALLS_PER_HOUR', 5))
+
+    # Score polling schedule (driven by nfl_games.game_date)
+    POLL_LIVE_INTERVAL_SECONDS = int(os.environ.get('POLL_LIVE_INTERVAL_SECONDS', 300))
+    POLL_GAME_WINDOW_HOURS = float(os.environ.get('POLL_GAME_WINDOW_HOURS', 4.5))
+    POLL_OVERDUE_INTERVAL_SECONDS = int(os.environ.get('POLL_OVERDUE_INTERVAL_SECONDS', 1800))
+    POLL_OVERDUE_GIVE_UP_HOURS = float(os.environ.get('POLL_OVERDUE_GIVE_UP_HOURS', 48))
+    POLL_MAX_IDLE_SECONDS = int(os.environ.get('POLL_MAX_IDLE_SECONDS', 6 * 3600))
+    POLL_MIN_SLEEP_SECONDS = int(os.environ.get('POLL_MIN_SLEEP_SECONDS', 60))
+
+    # Score updater lease (only one poller process runs update cycles)
+    UPDATER_LEASE_TTL_SECONDS = int(os.environ.get('UPDATER_LEASE_TTL_SECONDS', 90))
+    UPDATER_LEASE_HEARTBEAT_SECONDS = int(os.environ.get('UPDATER_LEASE_HEARTBEAT_SECONDS', 30))
+
+    # Per-week game view cache (safety net for edits made by other processes)
+    GAME_VIEW_CACHE_TTL_SECONDS = int(os.environ.get('GAME_VIEW_CACHE_TTL_SECONDS', 60))
+
+    # Leaderboard response cache (keyed by the shared data version)
+    DATA_VERSION_CHECK_SECONDS = float(os.environ.get('DATA_VERSION_CHECK_SECONDS', 5))
+    LEADERBOARD_CACHE_TTL_SECONDS = int(os.environ.get('LEADERBOARD_CACHE_TTL_SECONDS', 900))
+    LEADERBOARD_CACHE_MAX_ENTRIES = int(os.environ.get('LEADERBOARD_CACHE_MAX_ENTRIES', 128))
+
+    # Request performance metrics (/admin/perf): per-route latency, SQL per request, slow requests
+    PERF_INSTRUMENTATION = os.environ.get('PERF_INSTRUMENTATION', 'True').lower() == 'true'
+    PERF_SLOW_REQUEST_MS = float(os.environ.get('PERF_SLOW_REQUEST_MS', 500))
+    PERF_SLOW_REQUEST_BUFFER = int(os.environ.get('PERF_SLOW_REQUEST_BUFFER', 100))
+    PERF_MAX_STATEMENT_SHAPES = int(os.environ.get('PERF_MAX_STATEMENT_SHAPES', 500))
+    PERF_TOP_STATEMENTS = int(os.environ.get('PERF_TOP_STATEMENTS', 25))
+    PERF_SNAPSHOT_SECONDS = float(os.environ.get('PERF_SNAPSHOT_SECONDS', 10))
+    PERF_SNAPSHOT_MAX_AGE_SECONDS = int(os.environ.get('PERF_SNAPSHOT_MAX_AGE_SECONDS', 24 * 3600))
+    PERF_SNAPSHOT_DIR = os.environ.get('PERF_SNAPSHOT_DIR') or os.path.join(os.path.dirname(__file__), 'perf_metrics')
+
+    # Online database backups (db_backup.py): SQLite backup API, verified and gzipped, tiered retention
+    BACKUP_DIR = os.environ.get('BACKUP_DIR') or os.path.join(os.path.dirname(__file__), 'backups')
+    BACKUP_SCHEDULED = os.environ.get('BACKUP_SCHEDULED', 'True').lower() == 'true'
+    BACKUP_GAME_DAY_INTERVAL_SECONDS = int(os.environ.get('BACKUP_GAME_DAY_INTERVAL_SECONDS', 3600))
+    BACKUP_INTERVAL_SECONDS = int(os.environ.get('BACKUP_INTERVAL_SECONDS', 24 * 3600))
+    BACKUP_PAGES_PER_STEP = int(os.environ.get('BACKUP_PAGES_PER_STEP', 256))
+    BACKUP_STEP_PAUSE_SECONDS = float(os.environ.get('BACKUP_STEP_PAUSE_SECONDS', 0.01))
+    BACKUP_MAX_RESTARTS = int(os.environ.get('BACKUP_MAX_RESTARTS', 3))
+    BACKUP_KEEP_RECENT = int(os.environ.get('BACKUP_KEEP_RECENT', 10))
+    BACKUP_HOURLY_RETENTION_DAYS = int(os.environ.get('BACKUP_HOURLY_RETENTION_DAYS', 7))
+    BACKUP_DAILY_RETENTION_DAYS = int(os.environ.get('BACKUP_DAILY_RETENTION_DAYS', 60))
+    BACKUP_BEFORE_ADMIN_CHANGES = os.environ.get('BACKUP_BEFORE_ADMIN_CHANGES', 'True').lower() == 'true'
+    BACKUP_PRE_CHANGE_MAX_AGE_SECONDS = int(os.environ.get('BACKUP_PRE_CHANGE_MAX_AGE_SECONDS', 300))
+
+    # Live score stream (/stream/week/<week>)
+    LIVE_STREAM_MAX_CLIENTS = int(os.environ.get('LIVE_STREAM_MAX_CLIENTS', 100))
+    LIVE_STREAM_KEEPALIVE_SECONDS = int(os.environ.get('LIVE_STREAM_KEEPALIVE_SECONDS', 15))
+    LIVE_STREAM_RETRY_MS = int(os.environ.get('LIVE_STREAM_RETRY_MS', 5000))
+
     # Timezone Configuration
     TIMEZONE = 'America/Puerto_Rico'  # AST
     
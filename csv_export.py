@@ -0,0 +1,277 @@
+"""
+Streaming CSV exports for NFL Fantasy League
+Each export is a generator of CSV text that reads rows straight off a SQLite
+cursor, so a season-wide export of every user x every game never has to be
+held in memory. gzip_chunks() compresses any of them on the fly.
+
+The pooled connection is held while the generator runs and returned when it
+finishes or is closed (e.g. when a client disconnects mid-download).
+"""
+
+import io
+import csv
+import zlib
+import sqlite3
+import logging
+from itertools import groupby
+from typing import Any, Iterable, Iterator, List, Tuple
+
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Rows pulled from the cursor per fetchmany() call
+FETCH_SIZE = 500
+# Bytes of CSV gathered before a chunk is handed to the WSGI server
+CHUNK_SIZE = 64 * 1024
+
+# Latest Monday Night game of a game's week (the tiebreaker game)
+MONDAY_NIGHT_GAME_SQL = '''
+    (SELECT m.id FROM nfl_games m
+     WHERE m.week = g.week AND m.year = g.year AND m.is_monday_night = 1
+     ORDER BY m.game_date DESC, m.id DESC
+     LIMIT 1)
+'''
+
+
+class _CSVLineWriter:
+    """csv.writer into a reusable buffer; format_row() returns one CSV line"""
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def format_row(self, row: Iterable[Any]) -> str:
+        self._writer.writerow(row)
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+
+def _iter_rows(cursor) -> Iterator[sqlite3.Row]:
+    """Step through a result set in fetchmany() batches"""
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            return
+        yield from rows
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    """Coalesce CSV lines into ~CHUNK_SIZE strings"""
+    parts, size = [], 0
+    for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts)
+            parts, size = [], 0
+    if parts:
+        yield ''.join(parts)
+
+
+def _text_score(home_score, away_score) -> str:
+    """Monday Night prediction formatted as text so Excel doesn't turn it into a date"""
+    if home_score is None or away_score is None or home_score == '' or away_score == '':
+        return ''
+    return f"'{home_score}-{away_score}"
+
+
+def count_games(week_from: int, week_to: int, year: int, db_path: str = DATABASE_PATH) -> int:
+    """Games in the export range (exports 404 when there are none)"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM nfl_games WHERE year = ? AND week BETWEEN ? AND ?',
+                       (year, week_from, week_to))
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def count_user_picks(user_id: int, week_from: int, week_to: int, year: int,
+                     db_path: str = DATABASE_PATH) -> Tuple[int, int]:
+    """(games, picks made) for one user over the export range"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*), COUNT(NULLIF(up.selected_team, ''))
+            FROM nfl_games g
+            LEFT JOIN user_picks up ON up.game_id = g.id AND up.user_id = ?
+            WHERE g.year = ? AND g.week BETWEEN ? AND ?
+        ''', (user_id, year, week_from, week_to))
+        return tuple(cursor.fetchone())
+    finally:
+        conn.close()
+
+
+def stream_picks_long(week_from: int, week_to: int, year: int,
+                      db_path: str = DATABASE_PATH) -> Iterator[str]:
+    """
+    One row per user x game (admin export / long import format).
+    A week column is added when more than one week is exported.
+    """
+    multi_week = week_from != week_to
+    fieldnames = ['username', 'game_id', 'away_team', 'home_team', 'selected_team',
+                  'predicted_home_score', 'predicted_away_score']
+    if multi_week:
+        fieldnames.insert(1, 'week')
+
+    writer = _CSVLineWriter()
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT u.username, g.week, g.id, g.away_team, g.home_team, up.selected_team,
+                   up.predicted_home_score, up.predicted_away_score
+            FROM users u
+            CROSS JOIN nfl_games g
+            LEFT JOIN user_picks up ON up.user_id = u.id AND up.game_id = g.id
+            WHERE g.year = ? AND g.week BETWEEN ? AND ?
+            ORDER BY u.username, u.id, g.week, g.game_date, g.id
+        ''', (year, week_from, week_to))
+
+        def lines():
+            yield writer.format_row(fieldnames)
+            for username, week, game_id, away_team, home_team, selected_team, pred_home, pred_away in _iter_rows(cursor):
+                row = [username, game_id, away_team, home_team, selected_team or '',
+                       '' if pred_home is None else pred_home, '' if pred_away is None else pred_away]
+                if multi_week:
+                    row.insert(1, week)
+                yield writer.format_row(row)
+
+        yield from _chunked(lines())
+    finally:
+        conn.close()
+
+
+def stream_picks_wide(week_from: int, week_to: int, year: int,
+                      db_path: str = DATABASE_PATH) -> Iterator[str]:
+    """
+    Fantasy League format: usernames across, one row per game, the Monday Night
+    game last, then each user's Monday Night score prediction.
+    Repeated per week when more than one week is exported.
+    """
+    multi_week = week_from != week_to
+    writer = _CSVLineWriter()
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT username FROM users WHERE is_admin = 0 ORDER BY username, id')
+        usernames = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(f'''
+            SELECT g.week, g.id, g.away_team, g.home_team,
+                   g.id = {MONDAY_NIGHT_GAME_SQL} AS is_tiebreaker,
+                   up.selected_team, up.predicted_home_score, up.predicted_away_score
+            FROM nfl_games g
+            CROSS JOIN users u
+            LEFT JOIN user_picks up ON up.user_id = u.id AND up.game_id = g.id
+            WHERE g.year = ? AND g.week BETWEEN ? AND ? AND u.is_admin = 0
+            ORDER BY g.week, is_tiebreaker, g.game_date, g.id, u.username, u.id
+        ''', (year, week_from, week_to))
+
+        def week_footer(week, monday_scores):
+            label = f'Week {week} Monday Night Scores' if multi_week else 'Monday Night Scores'
+            yield writer.format_row([''] * (len(usernames) + 1))
+            yield writer.format_row([label] + (monday_scores or [''] * len(usernames)))
+
+        def lines():
+            yield writer.format_row(['Game'] + usernames)
+            current_week, monday_scores = None, None
+            for (week, game_id), game_rows in groupby(_iter_rows(cursor), key=lambda row: (row[0], row[1])):
+                if current_week is not None and week != current_week:
+                    yield from week_footer(current_week, monday_scores)
+                    monday_scores = None
+                current_week = week
+
+                game_rows = list(game_rows)  # one row per user
+                _, _, away_team, home_team, is_tiebreaker = game_rows[0][:5]
+                label = f"{away_team} @ {home_team}"
+                if multi_week:
+                    label = f"Week {week}: {label}"
+                yield writer.format_row([label] + [row[5] or '' for row in game_rows])
+                if is_tiebreaker:
+                    monday_scores = [_text_score(row[6], row[7]) for row in game_rows]
+
+            if current_week is not None:
+                yield from week_footer(current_week, monday_scores)
+
+        yield from _chunked(lines())
+    finally:
+        conn.close()
+
+
+def stream_user_picks(user_id: int, username: str, week_from: int, week_to: int, year: int,
+                      db_path: str = DATABASE_PATH) -> Iterator[str]:
+    """A single user's picks with a per-week summary (the 'My Picks' format)"""
+    writer = _CSVLineWriter()
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT g.week, g.away_team, g.home_team,
+                   g.id = {MONDAY_NIGHT_GAME_SQL} AS is_tiebreaker,
+                   up.selected_team, up.predicted_home_score, up.predicted_away_score
+            FROM nfl_games g
+            LEFT JOIN user_picks up ON up.game_id = g.id AND up.user_id = ?
+            WHERE g.year = ? AND g.week BETWEEN ? AND ?
+            ORDER BY g.week, is_tiebreaker, g.game_date, g.id
+        ''', (user_id, year, week_from, week_to))
+
+        def week_block(week, game_rows) -> List[str]:
+            lines = [
+                writer.format_row([f'{username} - Week {week}, {year}', 'My Pick', 'Monday Night Score']),
+                writer.format_row(['Game', 'Selected Team', 'Score Prediction'])
+            ]
+            picks_made = 0
+            monday_prediction = ''
+            for _, away_team, home_team, is_tiebreaker, selected_team, pred_home, pred_away in game_rows:
+                if selected_team:
+                    picks_made += 1
+                score_prediction = ''
+                if is_tiebreaker:
+                    # Blank or zero predictions are left out, as before
+                    score_prediction = _text_score(pred_home, pred_away) if pred_home and pred_away else ''
+                    monday_prediction = score_prediction
+                lines.append(writer.format_row([f"{away_team} @ {home_team}",
+                                                selected_team or 'No Pick Made', score_prediction]))
+
+            total_games = len(game_rows)
+            lines.append(writer.format_row([]))
+            lines.append(writer.format_row(['Summary', '', '']))
+            lines.append(writer.format_row([f'Total Games: {total_games}', '', '']))
+            lines.append(writer.format_row([f'Picks Made: {picks_made}', '', '']))
+            lines.append(writer.format_row([f'Completion: {picks_made}/{total_games}', '', '']))
+            if monday_prediction:
+                lines.append(writer.format_row([f'Monday Night Prediction: {monday_prediction}', '', '']))
+            return lines
+
+        def lines():
+            for index, (week, game_rows) in enumerate(groupby(_iter_rows(cursor), key=lambda row: row[0])):
+                if index:
+                    yield writer.format_row([])
+                yield from week_block(week, list(game_rows))
+
+        yield from _chunked(lines())
+    finally:
+        conn.close()
+
+
+def gzip_chunks(chunks: Iterable[str], encoding: str = 'utf-8') -> Iterator[bytes]:
+    """gzip a stream of text chunks without buffering the whole file"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode(encoding))
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
@@ -0,0 +1,130 @@
+"""
+Shared data version counters for NFL Fantasy League
+The data_versions table holds one counter per scope, bumped by SQLite
+triggers whenever the data behind that scope changes:
+
+    standings           a game's teams, time or score, a pick, or the season standings
+    games               a game's teams, time, flags or score (the schedule views)
+    deadline_overrides  an admin deadline override created, replaced or removed
+
+Every writer - score updates, pick scoring, admin edits, the updater process
+and the standalone updater services - invalidates in-memory caches in every
+web worker this way without having to call into them. Each process re-reads
+the counters at most every Config.DATA_VERSION_CHECK_SECONDS, so most
+requests never touch the database.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+STANDINGS_SCOPE = 'standings'
+GAMES_SCOPE = 'games'
+OVERRIDES_SCOPE = 'deadline_overrides'
+DATA_VERSION_SCOPES = (STANDINGS_SCOPE, GAMES_SCOPE, OVERRIDES_SCOPE)
+
+DATA_VERSIONS_SQL = '''
+    CREATE TABLE IF NOT EXISTS data_versions (
+        scope TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+'''
+
+_BUMP_STANDINGS = f"UPDATE data_versions SET version = version + 1 WHERE scope = '{STANDINGS_SCOPE}';"
+_BUMP_GAMES = ("UPDATE data_versions SET version = version + 1 "
+               f"WHERE scope IN ('{STANDINGS_SCOPE}', '{GAMES_SCOPE}');")
+_BUMP_OVERRIDES = f"UPDATE data_versions SET version = version + 1 WHERE scope = '{OVERRIDES_SCOPE}';"
+
+# Only columns the pages show; live polls that rewrite unchanged rows (or only
+# touch the clock) leave the versions alone
+DATA_VERSION_TRIGGERS = {
+    'trg_data_version_games_update': f'''
+        AFTER UPDATE ON nfl_games
+        WHEN OLD.home_score IS NOT NEW.home_score OR OLD.away_score IS NOT NEW.away_score
+        OR OLD.is_final IS NOT NEW.is_final OR OLD.game_status IS NOT NEW.game_status
+        OR OLD.game_date IS NOT NEW.game_date OR OLD.kickoff_utc IS NOT NEW.kickoff_utc
+        OR OLD.home_team IS NOT NEW.home_team OR OLD.away_team IS NOT NEW.away_team
+        OR OLD.is_monday_night IS NOT NEW.is_monday_night
+        OR OLD.is_thursday_night IS NOT NEW.is_thursday_night
+        OR OLD.week IS NOT NEW.week OR OLD.year IS NOT NEW.year
+        BEGIN {_BUMP_GAMES} END''',
+    'trg_data_version_games_insert': f'AFTER INSERT ON nfl_games BEGIN {_BUMP_GAMES} END',
+    'trg_data_version_games_delete': f'AFTER DELETE ON nfl_games BEGIN {_BUMP_GAMES} END',
+    'trg_data_version_picks_update': f'''
+        AFTER UPDATE ON user_picks
+        WHEN OLD.selected_team IS NOT NEW.selected_team OR OLD.is_correct IS NOT NEW.is_correct
+        OR OLD.predicted_home_score IS NOT NEW.predicted_home_score
+        OR OLD.predicted_away_score IS NOT NEW.predicted_away_score
+        OR OLD.game_id IS NOT NEW.game_id OR OLD.user_id IS NOT NEW.user_id
+        BEGIN {_BUMP_STANDINGS} END''',
+    'trg_data_version_picks_insert': f'AFTER INSERT ON user_picks BEGIN {_BUMP_STANDINGS} END',
+    'trg_data_version_picks_delete': f'AFTER DELETE ON user_picks BEGIN {_BUMP_STANDINGS} END',
+    'trg_data_version_standings_update': f'AFTER UPDATE ON season_standings BEGIN {_BUMP_STANDINGS} END',
+    'trg_data_version_standings_insert': f'AFTER INSERT ON season_standings BEGIN {_BUMP_STANDINGS} END',
+    'trg_data_version_standings_delete': f'AFTER DELETE ON season_standings BEGIN {_BUMP_STANDINGS} END',
+    'trg_data_version_overrides_update': f'AFTER UPDATE ON deadline_overrides BEGIN {_BUMP_OVERRIDES} END',
+    'trg_data_version_overrides_insert': f'AFTER INSERT ON deadline_overrides BEGIN {_BUMP_OVERRIDES} END',
+    'trg_data_version_overrides_delete': f'AFTER DELETE ON deadline_overrides BEGIN {_BUMP_OVERRIDES} END',
+}
+
+_version_lock = threading.Lock()
+# db_path -> ({scope: version}, monotonic time they were read)
+_versions: Dict[str, Tuple[Dict[str, int], float]] = {}
+
+
+def ensure_data_version_triggers(db_path: str = DATABASE_PATH) -> bool:
+    """Startup migration: create the data_versions rows and the triggers that bump them"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(DATA_VERSIONS_SQL)
+        for scope in DATA_VERSION_SCOPES:
+            cursor.execute('INSERT OR IGNORE INTO data_versions (scope, version) VALUES (?, 0)', (scope,))
+        # Recreated every start so databases created by older versions get the current bodies
+        for name, body in DATA_VERSION_TRIGGERS.items():
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'CREATE TRIGGER {name} {body}')
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
+
+def get_data_version(db_path: str = DATABASE_PATH, scope: str = STANDINGS_SCOPE) -> Optional[int]:
+    """Current version of a scope (re-read at most every DATA_VERSION_CHECK_SECONDS); None if unavailable"""
+    now = time.monotonic()
+    cached = _versions.get(db_path)
+    if cached is not None and now - cached[1] < Config.DATA_VERSION_CHECK_SECONDS:
+        return cached[0].get(scope)
+
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT scope, version FROM data_versions')
+        versions = dict(cursor.fetchall())
+    except Exception as e:
+        logger.warning(f"Could not read data version: {e}")
+        return None
+    finally:
+        conn.close()
+
+    with _version_lock:
+        _versions[db_path] = (versions, now)
+    return versions.get(scope)
+
+
+def refresh_data_version(db_path: Optional[str] = None) -> None:
+    """Make the next request re-read the data versions (after writes in this process)"""
+    with _version_lock:
+        if db_path is None:
+            _versions.clear()
+        else:
+            _versions.pop(db_path, None)
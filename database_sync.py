@@ -2,27 +2,35 @@
 Database synchronization with BallDontLie NFL API and ESPN API
 Includes rate limiting to avoid API abuse (max 5 calls per hour)
 """
-import sqlite3
 from datetime import datetime
 from nfl_api_service import get_season_schedule, get_week_games, get_live_scores
 from espn_api_service import get_espn_live_scores
 from utils.timezone_utils import format_ast_time
-from api_rate_limiter import check_api_rate_limit, record_api_call, get_api_calls_remaining
+from api_rate_limiter import acquire_api_call, get_api_calls_remaining, BALLDONTLIE_ENDPOINT
 import logging
+from models import get_pooled_connection
+from pick_correctness import score_finalized_games
+from deadline_manager import invalidate_deadline_cache
+from game_views import invalidate_game_view_cache
+from mnf_cleanup_utils import on_schedule_changed
+from game_slots import refresh_game_slots
+from data_version import refresh_data_version
+from score_broadcaster import notify_scores_changed
+from espn_scoreboard_client import get_scoreboard_client
 
 logger = logging.getLogger(__name__)
 
 def sync_season_from_api(year: int = 2025) -> int:
     """Sync complete season from BallDontLie API with AST timezone and rate limiting"""
     try:
-        # Check rate limit before making API call
-        if not check_api_rate_limit():
-            remaining = get_api_calls_remaining()
+        # Check and spend the BallDontLie budget before making the API call
+        if not acquire_api_call(BALLDONTLIE_ENDPOINT):
+            remaining = get_api_calls_remaining(BALLDONTLIE_ENDPOINT)
             logger.warning(f"API rate limit exceeded. Calls remaining: {remaining}")
             return 0
         
         print(f"🔄 Syncing {year} NFL season from BallDontLie API (times in AST)...")
-        print(f"📊 API calls remaining this hour: {get_api_calls_remaining()}")
+        print(f"📊 API calls remaining this hour: {get_api_calls_remaining(BALLDONTLIE_ENDPOINT)}")
         
         # Ensure we're syncing the correct year
         if year < 2020:
@@ -31,14 +39,13 @@ def sync_season_from_api(year: int = 2025) -> int:
         
         # Get season schedule from API
         games_data = get_season_schedule(year)
-        record_api_call()  # Record the API call
         
         if not games_data:
             print(f"❌ No games data received from BallDontLie API for {year}")
             return 0
         
         # Clear existing games for the year
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         cursor = conn.cursor()
         
         # SAFETY CHECK: Count existing picks before deleting games
@@ -93,9 +100,14 @@ def sync_season_from_api(year: int = 2025) -> int:
                 logger.error(f"Error inserting game: {e}")
                 continue
         
+        refresh_game_slots(cursor, year=year)
         conn.commit()
         conn.close()
         
+        invalidate_deadline_cache(year=year)
+        invalidate_game_view_cache(year=year)
+        on_schedule_changed('nfl_fantasy.db', year=year)
+        
         print(f"✅ Successfully synced {games_added} games for {year}")
         return games_added
         
@@ -107,14 +119,14 @@ def sync_season_from_api(year: int = 2025) -> int:
 def sync_week_from_api(week: int, year: int = 2025) -> int:
     """Sync specific week from BallDontLie API with rate limiting"""
     try:
-        # Check rate limit before making API call
-        if not check_api_rate_limit():
-            remaining = get_api_calls_remaining()
+        # Check and spend the BallDontLie budget before making the API call
+        if not acquire_api_call(BALLDONTLIE_ENDPOINT):
+            remaining = get_api_calls_remaining(BALLDONTLIE_ENDPOINT)
             logger.warning(f"API rate limit exceeded. Cannot sync Week {week}. Calls remaining: {remaining}")
             return 0
         
         print(f"🔄 Syncing Week {week}, {year} from BallDontLie API...")
-        print(f"📊 API calls remaining this hour: {get_api_calls_remaining()}")
+        print(f"📊 API calls remaining this hour: {get_api_calls_remaining(BALLDONTLIE_ENDPOINT)}")
         
         # Ensure we're syncing the correct year  
         if year < 2020:
@@ -123,13 +135,12 @@ def sync_week_from_api(week: int, year: int = 2025) -> int:
         
         # Get week games from API
         games_data = get_week_games(week, year)
-        record_api_call()  # Record the API call
         
         if not games_data:
             print(f"❌ No games data for Week {week}")
             return 0
         
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         cursor = conn.cursor()
         
         games_updated = 0
@@ -182,9 +193,14 @@ def sync_week_from_api(week: int, year: int = 2025) -> int:
                 logger.error(f"Error updating game: {e}")
                 continue
         
+        refresh_game_slots(cursor, week, year)
         conn.commit()
         conn.close()
         
+        invalidate_deadline_cache(week, year)
+        invalidate_game_view_cache(week, year)
+        on_schedule_changed('nfl_fantasy.db', week, year)
+        
         print(f"✅ Updated {games_updated} games for Week {week}, {year}")
         return games_updated
         
@@ -196,39 +212,39 @@ def sync_week_from_api(week: int, year: int = 2025) -> int:
 def update_live_scores(week: int, year: int = 2025) -> int:
     """Update live scores from BallDontLie API with rate limiting and trigger scoring updates"""
     try:
-        # Check rate limit before making API call
-        if not check_api_rate_limit():
-            remaining = get_api_calls_remaining()
+        # Check and spend the BallDontLie budget before making the API call
+        if not acquire_api_call(BALLDONTLIE_ENDPOINT):
+            remaining = get_api_calls_remaining(BALLDONTLIE_ENDPOINT)
             logger.info(f"API rate limit reached. Skipping live scores update. Calls remaining: {remaining}")
             # Return 0 but don't log as error since this is normal rate limiting
             return 0
         
-        logger.info(f"Updating live scores for Week {week}, {year}. API calls remaining: {get_api_calls_remaining()}")
+        logger.info(f"Updating live scores for Week {week}, {year}. API calls remaining: {get_api_calls_remaining(BALLDONTLIE_ENDPOINT)}")
         
         # Get live scores from API
         scores_data = get_live_scores(week, year)
-        record_api_call()  # Record the API call
         
         if not scores_data:
             logger.info(f"No live scores data received for Week {week}, {year}")
             return 0
         
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         cursor = conn.cursor()
         
         games_updated = 0
         games_newly_finalized = 0
+        newly_finalized_ids = []
         
         for game in scores_data:
             try:
                 # Check if game was already final before this update
                 cursor.execute('''
-                    SELECT is_final FROM nfl_games 
+                    SELECT id, is_final FROM nfl_games 
                     WHERE away_team = ? AND home_team = ? AND week = ? AND year = ?
                 ''', (game['away_team'], game['home_team'], week, year))
                 
                 current_game = cursor.fetchone()
-                was_final_before = current_game[0] if current_game else False
+                was_final_before = current_game[1] if current_game else False
                 
                 # Update scores and status
                 cursor.execute('''
@@ -248,6 +264,7 @@ def update_live_scores(week: int, year: int = 2025) -> int:
                     # Track if this game was newly finalized
                     if not was_final_before and game['is_final']:
                         games_newly_finalized += 1
+                        newly_finalized_ids.append(current_game[0])
                 
             except Exception as e:
                 logger.error(f"Error updating live score: {e}")
@@ -256,11 +273,16 @@ def update_live_scores(week: int, year: int = 2025) -> int:
         conn.commit()
         conn.close()
         
+        if games_updated:
+            invalidate_game_view_cache(week, year)
+            refresh_data_version()
+            notify_scores_changed(week, year)
+        
         # Trigger scoring update if any games were newly finalized
         if games_newly_finalized > 0:
             try:
-                # Update is_correct field for picks on newly finalized games
-                update_pick_correctness(week, year)
+                # Update is_correct field for picks on newly finalized games only
+                update_pick_correctness_for_games(newly_finalized_ids)
                 
                 from scoring_updater import ScoringUpdater
                 updater = ScoringUpdater()
@@ -277,54 +299,23 @@ def update_live_scores(week: int, year: int = 2025) -> int:
 
 def update_pick_correctness(week: int, year: int = 2025) -> int:
     """
-    Update the is_correct field for all picks when games are finalized
-    This is crucial for the leaderboard to show correct scoring
+    Update the is_correct field for picks on this week's final games
+    Only games that are not yet scored (or whose final score changed) are touched
     """
     try:
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         cursor = conn.cursor()
         
         # Get all final games for this week
         cursor.execute('''
-            SELECT id, home_team, away_team, home_score, away_score
-            FROM nfl_games 
+            SELECT id FROM nfl_games 
             WHERE week = ? AND year = ? AND is_final = 1
         ''', (week, year))
         
-        final_games = cursor.fetchall()
-        updated_picks = 0
-        
-        for game in final_games:
-            game_id, home_team, away_team, home_score, away_score = game
-            
-            # Determine the winner
-            if home_score is None or away_score is None:
-                continue
-                
-            if home_score > away_score:
-                winning_team = home_team
-            elif away_score > home_score:
-                winning_team = away_team
-            else:
-                # Tie game - handle as needed (NFL doesn't have ties in regular games usually)
-                winning_team = None
-            
-            if winning_team:
-                # Update is_correct for picks that match the winning team
-                cursor.execute('''
-                    UPDATE user_picks 
-                    SET is_correct = CASE 
-                        WHEN selected_team = ? THEN 1 
-                        ELSE 0 
-                    END
-                    WHERE game_id = ?
-                ''', (winning_team, game_id))
-                
-                updated_picks += cursor.rowcount
-        
-        conn.commit()
+        game_ids = [row[0] for row in cursor.fetchall()]
         conn.close()
         
+        updated_picks = score_finalized_games(game_ids)
         logger.info(f"Updated is_correct for {updated_picks} picks in Week {week}, {year}")
         return updated_picks
         
@@ -332,44 +323,40 @@ def update_pick_correctness(week: int, year: int = 2025) -> int:
         logger.error(f"Error updating pick correctness for Week {week}, {year}: {e}")
         return 0
 
-def recalculate_all_pick_correctness() -> int:
+def recalculate_all_pick_correctness(force: bool = False) -> int:
     """
-    Recalculate is_correct for all picks on all final games
-    Use this to fix any missing correctness data
+    Recalculate is_correct for picks on all final games
+    Use this to fix any missing correctness data; force=True rescores every final game
     """
-    try:
-        conn = sqlite3.connect('nfl_fantasy.db')
-        cursor = conn.cursor()
-        
-        # Get all distinct weeks with final games
-        cursor.execute('''
-            SELECT DISTINCT week, year 
-            FROM nfl_games 
-            WHERE is_final = 1
-            ORDER BY year, week
-        ''')
-        
-        weeks_with_final_games = cursor.fetchall()
-        conn.close()
-        
-        total_updated = 0
-        for week, year in weeks_with_final_games:
-            updated = update_pick_correctness(week, year)
-            total_updated += updated
-        
-        logger.info(f"Recalculated is_correct for {total_updated} total picks across all weeks")
-        return total_updated
-        
-    except Exception as e:
-        logger.error(f"Error recalculating all pick correctness: {e}")
-        return 0
+    total_updated = score_finalized_games(None, force=force)
+    logger.info(f"Recalculated is_correct for {total_updated} total picks across all weeks")
+    return total_updated
+
+
+def update_pick_correctness_for_games(game_ids) -> int:
+    """
+    Update is_correct only for picks on the given games
+    Called when games are finalized so only the affected picks are touched
+    """
+    return score_finalized_games(game_ids)
+
+
+def score_unscored_final_games() -> int:
+    """
+    Score picks on final games that have not been scored yet
+    Cheap catch-up for games finalized while the app was not running
+    """
+    return score_finalized_games(None)
 
 
 def update_live_scores_espn(week: int, year: int = 2025) -> int:
     """Update live scores from ESPN API with rate limiting and trigger scoring updates"""
     try:
-        # Check rate limit before making API call
-        if not check_api_rate_limit():
+        # A fresh cached scoreboard doesn't touch ESPN, so it doesn't spend the budget
+        served_from_cache = get_scoreboard_client().is_fresh(week=week, year=year)
+        
+        # Check and spend the shared rate limit budget before making the API call
+        if not served_from_cache and not acquire_api_call():
             remaining = get_api_calls_remaining()
             logger.info(f"API rate limit reached. Skipping ESPN update. "
                        f"Calls remaining: {remaining}")
@@ -380,28 +367,28 @@ def update_live_scores_espn(week: int, year: int = 2025) -> int:
         
         # Get live scores from ESPN API
         scores_data = get_espn_live_scores(week, year)
-        record_api_call()  # Record the API call
         
         if not scores_data:
             logger.info(f"No ESPN scores data received for Week {week}, {year}")
             return 0
         
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         cursor = conn.cursor()
         
         games_updated = 0
         games_newly_finalized = 0
+        newly_finalized_ids = []
         
         for game in scores_data:
             try:
                 # Check if game was already final before this update
                 cursor.execute('''
-                    SELECT is_final FROM nfl_games 
+                    SELECT id, is_final FROM nfl_games 
                     WHERE away_team = ? AND home_team = ? AND week = ? AND year = ?
                 ''', (game['away_team'], game['home_team'], week, year))
                 
                 current_game = cursor.fetchone()
-                was_final_before = current_game[0] if current_game else False
+                was_final_before = current_game[1] if current_game else False
                 
                 # Update scores and status
                 cursor.execute('''
@@ -421,6 +408,7 @@ def update_live_scores_espn(week: int, year: int = 2025) -> int:
                     # Track if this game was newly finalized
                     if not was_final_before and game['is_final']:
                         games_newly_finalized += 1
+                        newly_finalized_ids.append(current_game[0])
                 
             except Exception as e:
                 logger.error(f"Error updating ESPN live score: {e}")
@@ -429,11 +417,16 @@ def update_live_scores_espn(week: int, year: int = 2025) -> int:
         conn.commit()
         conn.close()
         
+        if games_updated:
+            invalidate_game_view_cache(week, year)
+            refresh_data_version()
+            notify_scores_changed(week, year)
+        
         # Trigger scoring update if any games were newly finalized
         if games_newly_finalized > 0:
             try:
-                # Update is_correct field for picks on newly finalized games
-                update_pick_correctness(week, year)
+                # Update is_correct field for picks on newly finalized games only
+                update_pick_correctness_for_games(newly_finalized_ids)
                 
                 from scoring_updater import ScoringUpdater
                 updater = ScoringUpdater()
@@ -0,0 +1,363 @@
+"""
+Online database backups for NFL Fantasy League
+Copies nfl_fantasy.db with SQLite's backup API while the app and the score
+updater keep writing, instead of cp-ing a live WAL database (backup_db.sh),
+which can capture a torn file. The copy runs Config.BACKUP_PAGES_PER_STEP
+pages at a time with a short pause between steps so writers never wait on
+it. A write from another connection makes SQLite restart the copy; after
+Config.BACKUP_MAX_RESTARTS restarts it finishes in one step instead (under
+WAL a single step still doesn't block writers, it only holds a read snapshot).
+
+Each copy is switched to a rollback journal, checked with
+PRAGMA integrity_check and gzipped to
+Config.BACKUP_DIR/nfl_fantasy_backup_<YYYYmmdd_HHMMSS>_<reason>.db.gz;
+a copy that fails the check is thrown away.
+
+Backups are taken:
+- on a schedule by the background updater while it holds the score updater
+  lease, so one process takes them under the pre-fork server: every
+  Config.BACKUP_GAME_DAY_INTERVAL_SECONDS on days with games, otherwise every
+  Config.BACKUP_INTERVAL_SECONDS
+- by admin routes before bulk changes (submit_all_picks, CSV imports),
+  unless one was taken within Config.BACKUP_PRE_CHANGE_MAX_AGE_SECONDS
+- from /admin/backup_database or `python db_backup.py`
+
+Retention keeps the newest Config.BACKUP_KEEP_RECENT backups, one per hour on
+game days for Config.BACKUP_HOURLY_RETENTION_DAYS and one per day for
+Config.BACKUP_DAILY_RETENTION_DAYS; anything older is deleted.
+
+To restore, stop the app and run:
+    gunzip -c backups/nfl_fantasy_backup_<...>.db.gz > nfl_fantasy.db
+(and remove any nfl_fantasy.db-wal / -shm files left beside it).
+"""
+
+import os
+import re
+import sys
+import gzip
+import time
+import shutil
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config import Config
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+BACKUP_PREFIX = 'nfl_fantasy_backup_'
+BACKUP_SUFFIX = '.db.gz'
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+BACKUP_NAME_RE = re.compile(r'^nfl_fantasy_backup_(\d{8}_\d{6})(?:_([a-z0-9-]+))?\.db\.gz$')
+
+# One backup at a time per process; other processes write different temp files
+_backup_lock = threading.Lock()
+
+
+class BackupError(Exception):
+    """A backup could not be written or failed verification"""
+
+
+class _BackupRestarted(Exception):
+    pass
+
+
+def _reason_tag(reason: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', (reason or 'manual').lower()).strip('-')[:40] or 'manual'
+
+
+def _parse_backup_name(name: str) -> Optional[Dict[str, Any]]:
+    match = BACKUP_NAME_RE.match(name)
+    if not match:
+        return None
+    return {'name': name, 'created_at': datetime.strptime(match.group(1), TIMESTAMP_FORMAT),
+            'reason': match.group(2) or 'manual'}
+
+
+def list_backups(backup_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Backups in backup_dir, newest first"""
+    backup_dir = backup_dir or Config.BACKUP_DIR
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+    backups = []
+    for name in names:
+        backup = _parse_backup_name(name)
+        if backup is None:
+            continue
+        try:
+            backup['size_bytes'] = os.path.getsize(os.path.join(backup_dir, name))
+        except OSError:
+            continue
+        backups.append(backup)
+    return sorted(backups, key=lambda backup: backup['name'], reverse=True)
+
+
+def _copy_database(source: sqlite3.Connection, target: sqlite3.Connection, pages: int) -> None:
+    """Backup API copy; raises _BackupRestarted when another writer forces too many restarts"""
+    state = {'remaining': None, 'restarts': 0}
+
+    def progress(status, remaining, total):
+        # A step that didn't shrink remaining started over after a write elsewhere
+        if state['remaining'] is not None and remaining >= state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > Config.BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        state['remaining'] = remaining
+        if remaining and Config.BACKUP_STEP_PAUSE_SECONDS > 0:
+            time.sleep(Config.BACKUP_STEP_PAUSE_SECONDS)
+
+    try:
+        source.backup(target, pages=pages, progress=progress)
+    except _BackupRestarted:
+        raise
+    except Exception as e:
+        # sqlite3 wraps exceptions raised by the progress callback
+        if state['restarts'] > Config.BACKUP_MAX_RESTARTS:
+            raise _BackupRestarted() from e
+        raise
+
+
+def create_backup(reason: str = 'manual', db_path: str = DATABASE_PATH,
+                  backup_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write a verified, compressed snapshot of db_path; returns its name, sizes
+    and timings. Raises BackupError if the copy fails or doesn't verify
+    """
+    backup_dir = backup_dir or Config.BACKUP_DIR
+    os.makedirs(backup_dir, exist_ok=True)
+
+    with _backup_lock:
+        started = time.perf_counter()
+        created_at = datetime.now()
+        name = f'{BACKUP_PREFIX}{created_at.strftime(TIMESTAMP_FORMAT)}_{_reason_tag(reason)}{BACKUP_SUFFIX}'
+        final_path = os.path.join(backup_dir, name)
+        copy_path = os.path.join(backup_dir, f'.{name}.{os.getpid()}.db')
+        gzip_path = os.path.join(backup_dir, f'.{name}.{os.getpid()}.tmp')
+        single_step = False
+        try:
+            source = get_pooled_connection(db_path)
+            try:
+                for attempt in range(2):
+                    target = sqlite3.connect(copy_path)
+                    try:
+                        _copy_database(source.raw_connection, target,
+                                       -1 if attempt else Config.BACKUP_PAGES_PER_STEP)
+                        break
+                    except _BackupRestarted:
+                        logger.info(f"Backup copy of {db_path} kept restarting under writes; copying in one step")
+                        single_step = True
+                    finally:
+                        target.close()
+            finally:
+                source.close()
+            copy_seconds = time.perf_counter() - started
+
+            target = sqlite3.connect(copy_path)
+            try:
+                # A self-contained file: no -wal needed to read it back
+                target.execute('PRAGMA journal_mode = DELETE')
+                integrity = [row[0] for row in target.execute('PRAGMA integrity_check')]
+                page_count = target.execute('PRAGMA page_count').fetchone()[0]
+            finally:
+                target.close()
+            if integrity != ['ok']:
+                raise BackupError(f"Integrity check failed on the copy: {'; '.join(integrity[:5])}")
+
+            database_bytes = os.path.getsize(copy_path)
+            with open(copy_path, 'rb') as f_in, gzip.open(gzip_path, 'wb', compresslevel=6) as f_out:
+                shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+            os.replace(gzip_path, final_path)
+        except BackupError:
+            raise
+        except Exception as e:
+            raise BackupError(f'Backup of {db_path} failed: {e}') from e
+        finally:
+            for path in (copy_path, gzip_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    backup = {
+        'name': name,
+        'path': final_path,
+        'reason': _reason_tag(reason),
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'pages': page_count,
+        'database_bytes': database_bytes,
+        'size_bytes': os.path.getsize(final_path),
+        'single_step': single_step,
+        'copy_seconds': round(copy_seconds, 3),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    logger.info(f"Database backup {name} written ({backup['database_bytes']} bytes -> "
+                f"{backup['size_bytes']} compressed, {backup['seconds']}s)")
+    prune_backups(db_path, backup_dir)
+    return backup
+
+
+def _game_days(db_path: str, since: datetime) -> Set[str]:
+    """Dates (YYYY-MM-DD) with at least one game on or after since"""
+    conn = get_pooled_connection(db_path)
+    try:
+        rows = conn.execute('SELECT DISTINCT date(game_date) FROM nfl_games WHERE game_date >= ?',
+                            (since.strftime('%Y-%m-%d'),)).fetchall()
+    finally:
+        conn.close()
+    return {row[0] for row in rows if row[0]}
+
+
+def select_expired(backups: Iterable[Dict[str, Any]], game_days: Set[str],
+                   now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Backups the retention tiers no longer keep: everything past the newest
+    BACKUP_KEEP_RECENT that isn't the newest of its hour (game days, within
+    BACKUP_HOURLY_RETENTION_DAYS) or of its day (within BACKUP_DAILY_RETENTION_DAYS)
+    """
+    now = now or datetime.now()
+    hourly_cutoff = now - timedelta(days=Config.BACKUP_HOURLY_RETENTION_DAYS)
+    daily_cutoff = now - timedelta(days=Config.BACKUP_DAILY_RETENTION_DAYS)
+    kept_buckets = set()
+    expired = []
+    for index, backup in enumerate(sorted(backups, key=lambda backup: backup['created_at'], reverse=True)):
+        created_at = backup['created_at']
+        day = created_at.strftime('%Y-%m-%d')
+        if created_at >= hourly_cutoff and day in game_days:
+            bucket = created_at.strftime('%Y-%m-%d %H')
+        elif created_at >= daily_cutoff:
+            bucket = day
+        else:
+            bucket = None
+        if index < Config.BACKUP_KEEP_RECENT:
+            kept_buckets.add(bucket)
+        elif bucket is not None and bucket not in kept_buckets:
+            kept_buckets.add(bucket)
+        else:
+            expired.append(backup)
+    return expired
+
+
+def prune_backups(db_path: str = DATABASE_PATH, backup_dir: Optional[str] = None) -> List[str]:
+    """Delete backups past retention; returns the deleted names"""
+    backup_dir = backup_dir or Config.BACKUP_DIR
+    backups = list_backups(backup_dir)
+    if len(backups) <= Config.BACKUP_KEEP_RECENT:
+        return []
+    try:
+        game_days = _game_days(db_path, datetime.now() - timedelta(days=Config.BACKUP_HOURLY_RETENTION_DAYS + 1))
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read game days for backup retention: {e}")
+        game_days = set()
+
+    deleted = []
+    for backup in select_expired(backups, game_days):
+        try:
+            os.remove(os.path.join(backup_dir, backup['name']))
+            deleted.append(backup['name'])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete old backup {backup['name']}: {e}")
+    if deleted:
+        logger.info(f"Deleted {len(deleted)} backups past retention")
+    return deleted
+
+
+def latest_backup_age(backup_dir: Optional[str] = None, now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds since the newest backup, or None when there is none"""
+    backups = list_backups(backup_dir)
+    if not backups:
+        return None
+    return ((now or datetime.now()) - backups[0]['created_at']).total_seconds()
+
+
+def backup_before_change(operation: str, db_path: str = DATABASE_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Back up before an admin bulk change, unless a backup is recent enough.
+    Returns the new backup (None when skipped); raises BackupError on failure
+    """
+    if not Config.BACKUP_BEFORE_ADMIN_CHANGES:
+        return None
+    age = latest_backup_age()
+    if age is not None and age < Config.BACKUP_PRE_CHANGE_MAX_AGE_SECONDS:
+        return None
+    return create_backup(f'pre-{operation}', db_path)
+
+
+def run_scheduled_backup(db_path: str = DATABASE_PATH, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Take the scheduled backup if one is due (hourly on game days, daily
+    otherwise). Called by the score updater lease holder between cycles;
+    never raises
+    """
+    if not Config.BACKUP_SCHEDULED:
+        return None
+    now = now or datetime.now()
+    try:
+        interval = Config.BACKUP_INTERVAL_SECONDS
+        if now.strftime('%Y-%m-%d') in _game_days(db_path, now.replace(hour=0, minute=0, second=0, microsecond=0)):
+            interval = Config.BACKUP_GAME_DAY_INTERVAL_SECONDS
+        age = latest_backup_age(now=now)
+        if age is not None and age < interval:
+            return None
+        return create_backup('scheduled', db_path)
+    except Exception as e:
+        logger.error(f"Scheduled database backup failed: {e}")
+        return None
+
+
+def get_backup_status(backup_dir: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+    """Backup list and settings for the admin page"""
+    backups = list_backups(backup_dir)
+    return {
+        'backup_dir': backup_dir or Config.BACKUP_DIR,
+        'count': len(backups),
+        'total_bytes': sum(backup['size_bytes'] for backup in backups),
+        'backups': [{'name': backup['name'], 'reason': backup['reason'],
+                     'created_at': backup['created_at'].isoformat(timespec='seconds'),
+                     'size_bytes': backup['size_bytes']} for backup in backups[:limit]],
+        'scheduled': Config.BACKUP_SCHEDULED,
+        'game_day_interval_seconds': Config.BACKUP_GAME_DAY_INTERVAL_SECONDS,
+        'interval_seconds': Config.BACKUP_INTERVAL_SECONDS
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Back up the NFL Fantasy database with the SQLite backup API')
+    parser.add_argument('--db', default=DATABASE_PATH, help='database to back up')
+    parser.add_argument('--reason', default='manual', help='tag added to the backup file name')
+    parser.add_argument('--list', action='store_true', help='list backups instead of taking one')
+    parser.add_argument('--prune', action='store_true', help='only apply retention')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for backup in list_backups():
+            print(f"{backup['name']}  {backup['size_bytes']:>12} bytes")
+        return 0
+    if args.prune:
+        for name in prune_backups(args.db):
+            print(f"🗑️ Deleted {name}")
+        return 0
+    if not os.path.exists(args.db):
+        print(f"❌ Database not found: {args.db}")
+        return 1
+    try:
+        backup = create_backup(args.reason, args.db)
+    except BackupError as e:
+        print(f"❌ Backup failed: {e}")
+        return 1
+    print(f"✅ Backup created: {backup['path']} ({backup['size_bytes']} bytes, {backup['seconds']}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -5,10 +5,61 @@ Handles dynamic deadlines based on actual game times and league rules
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 import pytz
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
-from utils.timezone_utils import convert_to_ast
+from utils.timezone_utils import AST, convert_to_ast
+from models import get_pooled_connection
+from data_version import GAMES_SCOPE, get_data_version
+
+# Precomputed deadline schedules keyed by (week, year). Game times are parsed and
+# converted once; only the open/closed status is evaluated per call.
+# Edits in this process call invalidate_deadline_cache(); edits made by other
+# processes (other web workers, the updater) move the shared 'games' data
+# version. Entries also expire after SCHEDULE_CACHE_TTL_SECONDS as a safety net.
+SCHEDULE_CACHE_TTL_SECONDS = 300
+
+# (week, year) -> (monotonic time built, games data version, schedule)
+_schedule_cache: Dict[Tuple[int, int], Tuple[float, Optional[int], Dict[str, Any]]] = {}
+_schedule_cache_lock = threading.Lock()
+
+def _get_cached_schedule(week: int, year: int) -> Optional[Dict[str, Any]]:
+    cached = _schedule_cache.get((week, year))
+    if cached is None:
+        return None
+    cached_at, version, schedule = cached
+    if time.monotonic() - cached_at > SCHEDULE_CACHE_TTL_SECONDS:
+        return None
+    if version != get_data_version('nfl_fantasy.db', GAMES_SCOPE):
+        return None
+    return schedule
+
+def _store_cached_schedule(week: int, year: int, schedule: Dict[str, Any], version: Optional[int]) -> None:
+    with _schedule_cache_lock:
+        _schedule_cache[(week, year)] = (time.monotonic(), version, schedule)
+
+def invalidate_deadline_cache(week: Optional[int] = None, year: Optional[int] = None) -> None:
+    """Drop cached deadline schedules (one week, one season, or everything)"""
+    with _schedule_cache_lock:
+        if week is None and year is None:
+            _schedule_cache.clear()
+            return
+        for key in list(_schedule_cache):
+            if (week is None or key[0] == week) and (year is None or key[1] == year):
+                del _schedule_cache[key]
+
+def parse_game_time(time_str: str) -> Optional[datetime]:
+    """Parse a stored game_date string (naive Eastern) in any of its stored formats"""
+    return DeadlineManager._parse_game_time(time_str)
+
+@lru_cache(maxsize=2048)
+def parse_game_time_ast(time_str: str) -> Optional[datetime]:
+    """Parse a stored game_date string and convert it to AST (memoized)"""
+    game_time = DeadlineManager._parse_game_time(time_str)
+    return convert_to_ast(game_time) if game_time else None
 
 class DeadlineManager:
     """Manages game submission deadlines based on NFL schedule"""
@@ -26,7 +77,8 @@ class DeadlineManager:
             'elimination': 10080     # 7 days (7 * 24 * 60) before Saturday
         }
     
-    def _parse_game_time(self, time_str: str) -> Optional[datetime]:
+    @staticmethod
+    def _parse_game_time(time_str: str) -> Optional[datetime]:
         """Parse game time string handling multiple formats"""
         if not isinstance(time_str, str):
             return None
@@ -48,156 +100,197 @@ class DeadlineManager:
     
     def get_week_deadlines(self, week: int, year: int) -> Dict[str, Dict]:
         """Get all deadlines for a specific week"""
+        schedule = _get_cached_schedule(week, year)
+        if schedule is None:
+            # Read before the schedule so a write landing mid-build forces another rebuild
+            version = get_data_version('nfl_fantasy.db', GAMES_SCOPE)
+            try:
+                schedule = self._build_week_schedule(week, year)
+            except Exception as e:
+                print(f"Error calculating deadlines: {e}")
+                return self._get_default_deadlines()
+            _store_cached_schedule(week, year, schedule, version)
+        
+        if schedule is None or not schedule['has_games']:
+            return self._get_default_deadlines()
+        
+        # Only the status depends on the current time; everything else is precomputed
+        deadlines = {}
+        for key, entry in schedule['entries'].items():
+            if entry is None:
+                deadlines[key] = None
+            elif isinstance(entry, list):
+                deadlines[key] = [self._deadline_from_entry(item) for item in entry]
+            else:
+                deadlines[key] = self._deadline_from_entry(entry)
         
-        deadlines = {
+        return deadlines
+    
+    def _deadline_from_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a deadline dict from a cached schedule entry"""
+        return {
+            'game_time': entry['game_time'],
+            'deadline': entry['deadline'],
+            'matchup': entry['matchup'],
+            'status': self._get_deadline_status(entry['status_time'], entry['status_type'])
+        }
+    
+    def _build_week_schedule(self, week: int, year: int) -> Dict[str, Any]:
+        """Build the (time-independent) deadline schedule for a week from the games table"""
+        
+        entries = {
             'thursday_night': None,
             'sunday_games': None, 
             'monday_night': None,
             'elimination': None
         }
         
+        conn = get_pooled_connection('nfl_fantasy.db')
+        conn.row_factory = sqlite3.Row
         try:
-            conn = sqlite3.connect('nfl_fantasy.db')
-            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
             # Get all games for the week
             cursor.execute('''
                 SELECT game_date, is_thursday_night, is_sunday_night, is_monday_night,
-                       home_team, away_team, game_id
+                       home_team, away_team, game_id, kickoff_utc, slot
                 FROM nfl_games 
                 WHERE week = ? AND year = ?
                 ORDER BY game_date
             ''', (week, year))
             
             games = cursor.fetchall()
-            
-            if not games:
-                return self._get_default_deadlines()
-            
-            # Separate games by type
-            thursday_games = []
-            friday_games = []
-            saturday_games = []
-            sunday_monday_games = []
-            
-            for game in games:
-                try:
-                    # Parse game time using the helper function
-                    if isinstance(game[0], str):
-                        game_time = self._parse_game_time(game[0])
-                        if game_time is None:
-                            continue
-                        
-                        # Times are stored in UTC format, convert to AST
-                        game_time_ast = convert_to_ast(game_time)
-                        
-                    else:
-                        game_time_ast = convert_to_ast(game[0])
+        finally:
+            conn.close()
+        
+        if not games:
+            return {'has_games': False, 'entries': {}}
+        
+        # Separate games by type
+        thursday_games = []
+        friday_games = []
+        saturday_games = []
+        sunday_monday_games = []
+        
+        for game in games:
+            try:
+                # Prefer the stored kickoff timestamp; parse game_date only if it isn't filled yet
+                if game['kickoff_utc'] is not None:
+                    game_time_ast = datetime.fromtimestamp(game['kickoff_utc'], AST)
+                elif isinstance(game[0], str):
+                    game_time = self._parse_game_time(game[0])
+                    if game_time is None:
+                        continue
                     
-                    # Determine game type based on day of week and flags
-                    weekday = game_time_ast.weekday()  # Monday = 0, Sunday = 6
+                    # Times are stored in UTC format, convert to AST
+                    game_time_ast = convert_to_ast(game_time)
                     
-                    if game[1]:  # Thursday Night flag
-                        thursday_games.append((game, game_time_ast))
-                    elif weekday == 4:  # Friday = 4
-                        friday_games.append((game, game_time_ast))
-                    elif weekday == 5:  # Saturday = 5
-                        saturday_games.append((game, game_time_ast))
-                    else:  # Sunday, Monday, or other days
-                        sunday_monday_games.append((game, game_time_ast))
-                        
-                except Exception as e:
-                    print(f"Error processing game {game}: {e}")
-                    continue
-            
-            # Process Thursday Night games
-            if thursday_games:
-                game, game_time_ast = thursday_games[0]  # Usually only one Thursday game
-                deadline = game_time_ast - timedelta(minutes=self.deadline_offsets['thursday_night'])
+                else:
+                    game_time_ast = convert_to_ast(game[0])
+                
+                # Determine game type based on slot (or day of week) and flags
+                weekday = game_time_ast.weekday()  # Monday = 0, Sunday = 6
+                slot = game['slot']
                 
-                deadlines['thursday_night'] = {
+                if game[1]:  # Thursday Night flag
+                    thursday_games.append((game, game_time_ast))
+                elif slot == 'FRI' or (slot is None and weekday == 4):  # Friday = 4
+                    friday_games.append((game, game_time_ast))
+                elif slot == 'SAT' or (slot is None and weekday == 5):  # Saturday = 5
+                    saturday_games.append((game, game_time_ast))
+                else:  # Sunday, Monday, or other days
+                    sunday_monday_games.append((game, game_time_ast))
+                    
+            except Exception as e:
+                print(f"Error processing game {game}: {e}")
+                continue
+        
+        # Process Thursday Night games
+        if thursday_games:
+            game, game_time_ast = thursday_games[0]  # Usually only one Thursday game
+            deadline = game_time_ast - timedelta(minutes=self.deadline_offsets['thursday_night'])
+            
+            entries['thursday_night'] = {
+                'game_time': game_time_ast,
+                'deadline': deadline,
+                'matchup': f"{game[5]} @ {game[4]}",
+                'status_time': game_time_ast,
+                'status_type': 'thursday_night'
+            }
+        
+        # Friday games have individual deadlines (NOT included in Sunday deadline)
+        if friday_games:
+            entries['friday_games'] = []
+            for game, game_time_ast in friday_games:
+                deadline = game_time_ast - timedelta(minutes=self.deadline_offsets['friday_games'])
+                entries['friday_games'].append({
                     'game_time': game_time_ast,
                     'deadline': deadline,
                     'matchup': f"{game[5]} @ {game[4]}",
-                    'status': self._get_deadline_status(game_time_ast, 'thursday_night')
-                }
-            
-            # Friday games have individual deadlines (NOT included in Sunday deadline)
-            if friday_games:
-                deadlines['friday_games'] = []
-                for game, game_time_ast in friday_games:
-                    deadline = game_time_ast - timedelta(minutes=self.deadline_offsets['friday_games'])
-                    deadlines['friday_games'].append({
-                        'game_time': game_time_ast,
-                        'deadline': deadline,
-                        'matchup': f"{game[5]} @ {game[4]}",
-                        'status': self._get_deadline_status(game_time_ast, 'friday_games')
-                    })
-            
-            # Saturday games have individual deadlines (NOT included in Sunday deadline)
-            if saturday_games:
-                deadlines['saturday_games'] = []
-                for game, game_time_ast in saturday_games:
-                    deadline = game_time_ast - timedelta(minutes=self.deadline_offsets['saturday_games'])
-                    deadlines['saturday_games'].append({
-                        'game_time': game_time_ast,
-                        'deadline': deadline,
-                        'matchup': f"{game[5]} @ {game[4]}",
-                        'status': self._get_deadline_status(game_time_ast, 'saturday_games')
-                    })
-                    
-            # Find first Sunday game for Sunday+Monday deadline
-            # Only Sunday and Monday games share the same deadline: 30 minutes before first Sunday game
-            # Friday and Saturday games are NOT included in this deadline
-            if sunday_monday_games:
-                first_sunday = min(sunday_monday_games, key=lambda x: x[1])  # x[1] is game_time_ast
-                game, sunday_time_ast = first_sunday
-                
-                deadline = sunday_time_ast - timedelta(minutes=self.deadline_offsets['sunday_games'])
-                deadlines['sunday_games'] = {
-                    'game_time': sunday_time_ast,
+                    'status_time': game_time_ast,
+                    'status_type': 'friday_games'
+                })
+        
+        # Saturday games have individual deadlines (NOT included in Sunday deadline)
+        if saturday_games:
+            entries['saturday_games'] = []
+            for game, game_time_ast in saturday_games:
+                deadline = game_time_ast - timedelta(minutes=self.deadline_offsets['saturday_games'])
+                entries['saturday_games'].append({
+                    'game_time': game_time_ast,
                     'deadline': deadline,
-                    'matchup': f"First Sunday Game: {game[5]} @ {game[4]}",
-                    'status': self._get_deadline_status(sunday_time_ast, 'sunday_games')
-                }
+                    'matchup': f"{game[5]} @ {game[4]}",
+                    'status_time': game_time_ast,
+                    'status_type': 'saturday_games'
+                })
                 
-                # Monday games also use this same deadline
-                monday_games = [(g, t) for g, t in sunday_monday_games if g[3]]  # Monday Night games
-                if monday_games:
-                    monday_game, monday_time_ast = monday_games[0]  # Usually only one Monday game
-                    
-                    deadlines['monday_night'] = {
-                        'game_time': monday_time_ast,
-                        'deadline': deadline,  # Same deadline as Sunday games
-                        'matchup': f"{monday_game[5]} @ {monday_game[4]}",
-                        'status': self._get_deadline_status(sunday_time_ast, 'sunday_games')  # Status based on Sunday game
-                    }
+        # Find first Sunday game for Sunday+Monday deadline
+        # Only Sunday and Monday games share the same deadline: 30 minutes before first Sunday game
+        # Friday and Saturday games are NOT included in this deadline
+        if sunday_monday_games:
+            first_sunday = min(sunday_monday_games, key=lambda x: x[1])  # x[1] is game_time_ast
+            game, sunday_time_ast = first_sunday
             
-            # Calculate elimination deadline (7 days before Saturday)
-            if games:
-                first_game = min(games, key=lambda x: x[0])
-                first_game_time = self._parse_game_time(first_game[0])
-                if first_game_time:
-                    # Find the Saturday before the week
-                    days_until_saturday = (5 - first_game_time.weekday()) % 7
-                    saturday = first_game_time - timedelta(days=days_until_saturday)
-                    elimination_deadline = saturday - timedelta(days=7)
-                    
-                    deadlines['elimination'] = {
-                        'game_time': convert_to_ast(first_game_time),
-                        'deadline': convert_to_ast(elimination_deadline),
-                        'matchup': f"Week {week} Elimination Format",
-                    'status': self._get_deadline_status(elimination_deadline, 'elimination')
-                }
+            deadline = sunday_time_ast - timedelta(minutes=self.deadline_offsets['sunday_games'])
+            entries['sunday_games'] = {
+                'game_time': sunday_time_ast,
+                'deadline': deadline,
+                'matchup': f"First Sunday Game: {game[5]} @ {game[4]}",
+                'status_time': sunday_time_ast,
+                'status_type': 'sunday_games'
+            }
             
-            conn.close()
+            # Monday games also use this same deadline
+            monday_games = [(g, t) for g, t in sunday_monday_games if g[3]]  # Monday Night games
+            if monday_games:
+                monday_game, monday_time_ast = monday_games[0]  # Usually only one Monday game
+                
+                entries['monday_night'] = {
+                    'game_time': monday_time_ast,
+                    'deadline': deadline,  # Same deadline as Sunday games
+                    'matchup': f"{monday_game[5]} @ {monday_game[4]}",
+                    'status_time': sunday_time_ast,  # Status based on Sunday game
+                    'status_type': 'sunday_games'
+                }
         
-        except Exception as e:
-            print(f"Error calculating deadlines: {e}")
-            return self._get_default_deadlines()
+        # Calculate elimination deadline (7 days before Saturday)
+        first_game = min(games, key=lambda x: x[0])
+        first_game_time = self._parse_game_time(first_game[0])
+        if first_game_time:
+            # Find the Saturday before the week
+            days_until_saturday = (5 - first_game_time.weekday()) % 7
+            saturday = first_game_time - timedelta(days=days_until_saturday)
+            elimination_deadline = saturday - timedelta(days=7)
+            
+            entries['elimination'] = {
+                'game_time': convert_to_ast(first_game_time),
+                'deadline': convert_to_ast(elimination_deadline),
+                'matchup': f"Week {week} Elimination Format",
+                'status_time': elimination_deadline,
+                'status_type': 'elimination'
+            }
         
-        return deadlines
+        return {'has_games': True, 'entries': entries}
     
     def _get_deadline_status(self, game_time: datetime, game_type: str) -> Dict[str, any]:
         """Determine if deadline is open, closing soon, or closed"""
@@ -289,76 +382,109 @@ class DeadlineManager:
         
         return None
     
+    def get_pick_deadline(self, deadlines: Dict[str, Any], game_date: str = None) -> Tuple[str, Optional[datetime]]:
+        """
+        Find the deadline bucket a game belongs to.
+        Returns (bucket, deadline); a None deadline means picks stay open, and the
+        'any_open' bucket means "open while any deadline of the week is still open".
+        """
+        if game_date:
+            # Check specific game
+            game_time_ast = parse_game_time_ast(game_date) if isinstance(game_date, str) else None
+            if game_time_ast is None:
+                return 'unparsed', None  # If can't parse, allow picks
+            
+            # Determine game type based on day of week
+            weekday = game_time_ast.weekday()  # Monday = 0, Sunday = 6
+            
+            if weekday == 3:  # Thursday
+                deadline_info = deadlines.get('thursday_night')
+                if deadline_info and deadline_info.get('deadline'):
+                    return 'thursday_night', deadline_info['deadline']
+            elif weekday in (4, 5):  # Friday / Saturday games have individual deadlines
+                game_type = 'friday_games' if weekday == 4 else 'saturday_games'
+                for deadline_info in deadlines.get(game_type, []):
+                    if deadline_info and deadline_info.get('deadline'):
+                        # Find the deadline for this specific game
+                        game_deadline = deadline_info['deadline']
+                        if abs((game_deadline + timedelta(minutes=30) - game_time_ast).total_seconds()) < 3600:  # Within 1 hour
+                            return f"{game_type}:{game_deadline.isoformat()}", game_deadline
+                # If no specific deadline found, default to allowing picks
+                return f"{game_type}:open", None
+            elif weekday == 0:  # Monday - uses same deadline as Sunday games
+                deadline_info = deadlines.get('monday_night')  # This uses Sunday deadline
+                if deadline_info and deadline_info.get('deadline'):
+                    return 'sunday_games', deadline_info['deadline']
+            else:  # Sunday and other days (assume Sunday deadline)
+                deadline_info = deadlines.get('sunday_games')
+                if deadline_info and deadline_info.get('deadline'):
+                    return 'sunday_games', deadline_info['deadline']
+        
+        return 'any_open', None
+    
+    def _is_pick_deadline_open(self, deadlines: Dict[str, Any], bucket: str,
+                               deadline: Optional[datetime], now: datetime) -> bool:
+        """Evaluate a deadline bucket from get_pick_deadline against the current time"""
+        if bucket != 'any_open':
+            return deadline is None or now < deadline
+        
+        # If no specific game date, check if any deadline is still open
+        for key, deadline_info in deadlines.items():
+            if key in ['friday_games', 'saturday_games']:
+                # Handle list of deadlines for Friday/Saturday
+                if isinstance(deadline_info, list):
+                    for info in deadline_info:
+                        if info and info.get('deadline') and now < info['deadline']:
+                            return True
+            else:
+                # Handle single deadline
+                if deadline_info and deadline_info.get('deadline'):
+                    if now < deadline_info['deadline']:
+                        return True
+        
+        return False
+    
     def can_make_picks(self, week: int, year: int, game_date: str = None) -> bool:
         """Check if picks can still be made for a specific game or week"""
         try:
             deadlines = self.get_week_deadlines(week, year)
             now = datetime.now(self.ast_tz)
             
-            if game_date:
-                # Check specific game
-                game_time = self._parse_game_time(game_date)
-                if game_time is None:
-                    return True  # If can't parse, assume deadline passed
-                    
-                game_time_ast = convert_to_ast(game_time)
-                
-                # Determine game type based on day of week
-                weekday = game_time_ast.weekday()  # Monday = 0, Sunday = 6
-                
-                if weekday == 3:  # Thursday
-                    deadline_info = deadlines.get('thursday_night')
-                    if deadline_info and deadline_info.get('deadline'):
-                        return now < deadline_info['deadline']
-                elif weekday == 4:  # Friday
-                    friday_deadlines = deadlines.get('friday_games', [])
-                    for deadline_info in friday_deadlines:
-                        if deadline_info and deadline_info.get('deadline'):
-                            # Find the deadline for this specific Friday game
-                            game_deadline = deadline_info['deadline']
-                            if abs((game_deadline + timedelta(minutes=30) - game_time_ast).total_seconds()) < 3600:  # Within 1 hour
-                                return now < game_deadline
-                    # If no specific Friday deadline found, default to allowing picks
-                    return True
-                elif weekday == 5:  # Saturday
-                    saturday_deadlines = deadlines.get('saturday_games', [])
-                    for deadline_info in saturday_deadlines:
-                        if deadline_info and deadline_info.get('deadline'):
-                            # Find the deadline for this specific Saturday game
-                            game_deadline = deadline_info['deadline']
-                            if abs((game_deadline + timedelta(minutes=30) - game_time_ast).total_seconds()) < 3600:  # Within 1 hour
-                                return now < game_deadline
-                    # If no specific Saturday deadline found, default to allowing picks
-                    return True
-                elif weekday == 0:  # Monday - uses same deadline as Sunday games
-                    deadline_info = deadlines.get('monday_night')  # This uses Sunday deadline
-                    if deadline_info and deadline_info.get('deadline'):
-                        return now < deadline_info['deadline']
-                else:  # Sunday and other days (assume Sunday deadline)
-                    deadline_info = deadlines.get('sunday_games')
-                    if deadline_info and deadline_info.get('deadline'):
-                        return now < deadline_info['deadline']
-            
-            # If no specific game date, check if any deadline is still open
-            for key, deadline_info in deadlines.items():
-                if key in ['friday_games', 'saturday_games']:
-                    # Handle list of deadlines for Friday/Saturday
-                    if isinstance(deadline_info, list):
-                        for info in deadline_info:
-                            if info and info.get('deadline') and now < info['deadline']:
-                                return True
-                else:
-                    # Handle single deadline
-                    if deadline_info and deadline_info.get('deadline'):
-                        if now < deadline_info['deadline']:
-                            return True
-            
-            return False
+            bucket, deadline = self.get_pick_deadline(deadlines, game_date)
+            return self._is_pick_deadline_open(deadlines, bucket, deadline, now)
             
         except Exception as e:
             print(f"Error checking pick availability: {e}")
             return True  # Default to allowing picks if error occurs
     
+    def can_make_picks_for_games(self, games: List[Tuple[Any, int, int, str]]) -> Dict[Any, bool]:
+        """
+        Batch version of can_make_picks for (game_id, week, year, game_date) tuples.
+        Each week's deadlines are loaded once and each deadline bucket
+        (Thursday, Sunday/Monday, individual Friday/Saturday games) is evaluated once.
+        """
+        now = datetime.now(self.ast_tz)
+        week_deadlines = {}
+        bucket_results = {}
+        results = {}
+        
+        for game_id, week, year, game_date in games:
+            try:
+                if (week, year) not in week_deadlines:
+                    week_deadlines[(week, year)] = self.get_week_deadlines(week, year)
+                deadlines = week_deadlines[(week, year)]
+                
+                bucket, deadline = self.get_pick_deadline(deadlines, game_date)
+                if (week, year, bucket) not in bucket_results:
+                    bucket_results[(week, year, bucket)] = self._is_pick_deadline_open(deadlines, bucket, deadline, now)
+                results[game_id] = bucket_results[(week, year, bucket)]
+                
+            except Exception as e:
+                print(f"Error checking pick availability: {e}")
+                results[game_id] = True  # Default to allowing picks if error occurs
+        
+        return results
+    
     def get_deadline_summary(self, week: int, year: int) -> Dict[str, Any]:
         """Get a user-friendly summary of deadlines with hours remaining"""
         try:
@@ -5,9 +5,28 @@ Allows administrators to extend or modify deadlines for specific users or global
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import pytz
+from models import get_pooled_connection
+from data_version import OVERRIDES_SCOPE, get_data_version, refresh_data_version
+
+# Active overrides per (week, year): {(deadline_type, user_id or None): new_deadline}
+# Cleared whenever an override is created or removed in this process; changes
+# made by other web workers move the shared 'deadline_overrides' data version.
+# Entries also expire after OVERRIDE_CACHE_TTL_SECONDS as a safety net.
+OVERRIDE_CACHE_TTL_SECONDS = 300
+
+# (week, year) -> (monotonic time loaded, overrides data version, overrides)
+_override_cache: Dict[Tuple[int, int], Tuple[float, Optional[int], Dict[Tuple[str, Optional[int]], str]]] = {}
+_override_cache_lock = threading.Lock()
+
+def invalidate_override_cache() -> None:
+    """Drop all cached override lookups"""
+    with _override_cache_lock:
+        _override_cache.clear()
 
 class DeadlineOverrideManager:
     """Manages admin deadline overrides"""
@@ -20,7 +39,7 @@ class DeadlineOverrideManager:
     def _ensure_override_table(self):
         """Create deadline override table if it doesn't exist"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -51,7 +70,7 @@ class DeadlineOverrideManager:
                        reason: str = "") -> bool:
         """Create a deadline override"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             cursor = conn.cursor()
             
             # Deactivate existing overrides for same criteria
@@ -69,49 +88,58 @@ class DeadlineOverrideManager:
                 (week, year, user_id, deadline_type, new_deadline, reason, created_by)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (week, year, user_id, deadline_type, new_deadline.isoformat(), reason, admin_id))
-            
+
             conn.commit()
             conn.close()
+
+            self._invalidate_caches(week, year)
             return True
             
         except Exception as e:
             print(f"Error creating deadline override: {e}")
             return False
     
-    def get_user_deadline(self, week: int, year: int, deadline_type: str, 
-                         user_id: int, default_deadline: datetime) -> datetime:
-        """Get effective deadline for a user (considering overrides)"""
+    def _get_week_overrides(self, week: int, year: int) -> Dict[Tuple[str, Optional[int]], str]:
+        """Active overrides for a week, loaded once and cached"""
+        cached = _override_cache.get((week, year))
+        if (cached is not None and time.monotonic() - cached[0] <= OVERRIDE_CACHE_TTL_SECONDS
+                and cached[1] == get_data_version(self.db_path, OVERRIDES_SCOPE)):
+            return cached[2]
+
+        # Read before the overrides so a write landing mid-load forces another load
+        version = get_data_version(self.db_path, OVERRIDES_SCOPE)
+        conn = get_pooled_connection(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            
-            # Check for user-specific override first
-            cursor.execute('''
-                SELECT new_deadline FROM deadline_overrides
-                WHERE week = ? AND year = ? AND deadline_type = ? 
-                AND user_id = ? AND is_active = TRUE
-                ORDER BY created_at DESC LIMIT 1
-            ''', (week, year, deadline_type, user_id))
-            
-            result = cursor.fetchone()
-            if result:
-                conn.close()
-                return datetime.fromisoformat(result[0])
-            
-            # Check for global override
             cursor.execute('''
-                SELECT new_deadline FROM deadline_overrides
-                WHERE week = ? AND year = ? AND deadline_type = ? 
-                AND user_id IS NULL AND is_active = TRUE
-                ORDER BY created_at DESC LIMIT 1
-            ''', (week, year, deadline_type))
-            
-            result = cursor.fetchone()
+                SELECT deadline_type, user_id, new_deadline FROM deadline_overrides
+                WHERE week = ? AND year = ? AND is_active = TRUE
+                ORDER BY created_at, id
+            ''', (week, year))
+
+            # Later rows win, matching the most-recent-override rule
+            overrides = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+        finally:
             conn.close()
-            
-            if result:
-                return datetime.fromisoformat(result[0])
-            
+
+        with _override_cache_lock:
+            _override_cache[(week, year)] = (time.monotonic(), version, overrides)
+        return overrides
+
+    def get_user_deadline(self, week: int, year: int, deadline_type: str,
+                         user_id: int, default_deadline: datetime) -> datetime:
+        """Get effective deadline for a user (considering overrides)"""
+        try:
+            overrides = self._get_week_overrides(week, year)
+
+            # Check for user-specific override first, then global override
+            new_deadline = overrides.get((deadline_type, user_id))
+            if new_deadline is None:
+                new_deadline = overrides.get((deadline_type, None))
+
+            if new_deadline:
+                return datetime.fromisoformat(new_deadline)
+
             return default_deadline
             
         except Exception as e:
@@ -121,7 +149,7 @@ class DeadlineOverrideManager:
     def get_active_overrides(self, week: int, year: int) -> List[Dict]:
         """Get all active overrides for a week"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -145,7 +173,7 @@ class DeadlineOverrideManager:
     def remove_override(self, override_id: int, admin_id: int) -> bool:
         """Remove/deactivate an override"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -153,11 +181,21 @@ class DeadlineOverrideManager:
                 SET is_active = FALSE 
                 WHERE id = ?
             ''', (override_id,))
-            
+
             conn.commit()
             conn.close()
+
+            self._invalidate_caches()
             return True
-            
+
         except Exception as e:
             print(f"Error removing override: {e}")
             return False
+
+    def _invalidate_caches(self, week: Optional[int] = None, year: Optional[int] = None) -> None:
+        """Drop cached overrides and deadline schedules after an override change"""
+        invalidate_override_cache()
+        refresh_data_version(self.db_path)
+
+        from deadline_manager import invalidate_deadline_cache
+        invalidate_deadline_cache(week, year)
@@ -3,10 +3,10 @@ ESPN API Service Module
 Provides NFL game data and live scores from ESPN API
 """
 
-import requests
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
+from espn_scoreboard_client import get_scoreboard_client
 
 logger = logging.getLogger(__name__)
 
@@ -15,32 +15,13 @@ class ESPNAPIService:
     """Service for fetching NFL data from ESPN API"""
     
     def __init__(self):
-        self.base_url = ("https://site.api.espn.com/apis/site/v2/sports/"
-                         "football/nfl")
-        self.headers = {
-            'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                           'AppleWebKit/537.36')
-        }
+        self.client = get_scoreboard_client()
         
     def get_week_games(self, week: int, year: int = 2025) -> List[Dict]:
         """Get games for a specific NFL week from ESPN"""
         try:
-            # ESPN API endpoint for scoreboard
-            url = f"{self.base_url}/scoreboard"
-            
-            # ESPN uses different week numbering for some endpoints
-            # For now, get current week games
-            params = {
-                'seasontype': 2,  # Regular season
-                'week': week,
-                'year': year
-            }
-            
-            response = requests.get(url, headers=self.headers, 
-                                   params=params, timeout=15, verify=False)
-            response.raise_for_status()
-            
-            data = response.json()
+            # Regular season scoreboard, shared cache with other callers
+            data = self.client.fetch_json(week=week, year=year, seasontype=2)
             events = data.get('events', [])
             
             normalized_games = []
@@ -65,13 +46,7 @@ class ESPNAPIService:
     def get_current_week_games(self, year: int = 2025) -> List[Dict]:
         """Get current week games from ESPN scoreboard"""
         try:
-            url = f"{self.base_url}/scoreboard"
-            
-            response = requests.get(url, headers=self.headers, timeout=15, 
-                                   verify=False)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.client.fetch_json()
             events = data.get('events', [])
             
             # Try to determine week from the games
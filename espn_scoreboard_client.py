@@ -0,0 +1,291 @@
+"""
+Shared ESPN scoreboard client for NFL Fantasy League
+One keep-alive HTTP session for every ESPN scoreboard caller, with:
+- a short-TTL in-memory cache backed by an on-disk copy (survives restarts)
+- conditional requests (If-None-Match / If-Modified-Since) once the TTL expires
+- request coalescing, so concurrent callers share a single in-flight fetch
+- async wrappers for callers running inside an event loop
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCOREBOARD_URL = f"{Config.ESPN_API_BASE}/scoreboard"
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+              'AppleWebKit/537.36')
+
+
+@dataclass
+class ScoreboardResponse:
+    """A scoreboard payload and where it came from"""
+    data: Dict[str, Any]
+    source: str  # 'memory', 'disk', 'network', 'not_modified' or 'stale'
+    fetched_at: float
+
+    @property
+    def from_network(self) -> bool:
+        """True when this call actually went out to ESPN"""
+        return self.source in ('network', 'not_modified')
+
+
+class _InFlight:
+    """A fetch other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[ScoreboardResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+class ScoreboardClient:
+    """Cached, coalescing ESPN scoreboard client (thread-safe)"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None, cache_dir: Optional[str] = None,
+                 timeout: Optional[int] = None, verify: Optional[bool] = None):
+        self.ttl_seconds = Config.ESPN_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.cache_dir = cache_dir if cache_dir is not None else Config.ESPN_CACHE_DIR
+        self.timeout = timeout or Config.API_TIMEOUT
+        self.verify = Config.ESPN_VERIFY_SSL if verify is None else verify
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'application/json'})
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+        if not self.verify:
+            logger.warning("ESPN SSL certificate verification disabled (ESPN_VERIFY_SSL=false)")
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, _InFlight] = {}
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'network_fetches': 0,
+                      'not_modified': 0, 'coalesced': 0, 'stale_served': 0, 'errors': 0}
+
+    @staticmethod
+    def _params(week: Optional[int], year: Optional[int], seasontype: Optional[int]) -> Dict[str, int]:
+        """Query parameters; no week/year means ESPN's current scoreboard"""
+        params = {}
+        if seasontype is not None and (week is not None or year is not None):
+            params['seasontype'] = seasontype
+        if week is not None:
+            params['week'] = week
+        if year is not None:
+            params['year'] = year
+        return params
+
+    @staticmethod
+    def _cache_key(params: Dict[str, int]) -> str:
+        if not params:
+            return 'current'
+        return '_'.join(f'{key}-{params[key]}' for key in sorted(params))
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f'scoreboard_{key}_{digest}.json')
+
+    def _load_entry(self, key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Cached entry from memory, falling back to disk"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry, 'memory'
+
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None, ''
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read ESPN cache file {path}: {e}")
+            return None, ''
+
+        with self._lock:
+            self._memory[key] = entry
+        return entry, 'disk'
+
+    def _store_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+
+        path = self._disk_path(key)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write ESPN cache file {path}: {e}")
+
+    def _is_fresh(self, entry: Optional[Dict[str, Any]], max_age: Optional[float]) -> bool:
+        ttl = self.ttl_seconds if max_age is None else max_age
+        return entry is not None and time.time() - entry['fetched_at'] <= ttl
+
+    def is_fresh(self, week: Optional[int] = None, year: Optional[int] = None,
+                 seasontype: Optional[int] = 2, max_age: Optional[float] = None) -> bool:
+        """Whether a fetch would be served from cache without touching ESPN"""
+        entry, _ = self._load_entry(self._cache_key(self._params(week, year, seasontype)))
+        return self._is_fresh(entry, max_age)
+
+    def _fetch_from_network(self, key: str, params: Dict[str, int],
+                            cached: Optional[Dict[str, Any]]) -> ScoreboardResponse:
+        """Conditional GET; a 304 reuses the cached payload"""
+        headers = {}
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.session.get(SCOREBOARD_URL, params=params, headers=headers,
+                                    timeout=self.timeout, verify=self.verify)
+        now = time.time()
+
+        if response.status_code == 304 and cached is not None:
+            entry = dict(cached, fetched_at=now)
+            self._store_entry(key, entry)
+            self.stats['not_modified'] += 1
+            return ScoreboardResponse(entry['data'], 'not_modified', now)
+
+        response.raise_for_status()
+        entry = {
+            'data': response.json(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now
+        }
+        self._store_entry(key, entry)
+        self.stats['network_fetches'] += 1
+        return ScoreboardResponse(entry['data'], 'network', now)
+
+    def fetch(self, week: Optional[int] = None, year: Optional[int] = None,
+              seasontype: Optional[int] = 2, max_age: Optional[float] = None) -> ScoreboardResponse:
+        """
+        Get a scoreboard payload, from cache when fresh enough.
+        Raises requests.RequestException only when ESPN fails and nothing is cached.
+        """
+        params = self._params(week, year, seasontype)
+        key = self._cache_key(params)
+
+        cached, cached_source = self._load_entry(key)
+        if self._is_fresh(cached, max_age):
+            self.stats['memory_hits' if cached_source == 'memory' else 'disk_hits'] += 1
+            return ScoreboardResponse(cached['data'], cached_source, cached['fetched_at'])
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = self._inflight[key] = _InFlight()
+
+        if not is_leader:
+            self.stats['coalesced'] += 1
+            inflight.done.wait(self.timeout + 5)
+            if inflight.response is not None:
+                return inflight.response
+            if inflight.error is not None and cached is None:
+                raise inflight.error
+            if cached is not None:
+                return ScoreboardResponse(cached['data'], 'stale', cached['fetched_at'])
+            raise requests.Timeout(f"Timed out waiting for in-flight ESPN fetch ({key})")
+
+        try:
+            inflight.response = self._fetch_from_network(key, params, cached)
+            return inflight.response
+        except Exception as e:
+            inflight.error = e
+            self.stats['errors'] += 1
+            if cached is not None:
+                logger.warning(f"ESPN fetch failed for {key}, serving cached copy: {e}")
+                self.stats['stale_served'] += 1
+                inflight.response = ScoreboardResponse(cached['data'], 'stale', cached['fetched_at'])
+                return inflight.response
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.done.set()
+
+    def fetch_json(self, week: Optional[int] = None, year: Optional[int] = None,
+                   seasontype: Optional[int] = 2, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Scoreboard payload only"""
+        return self.fetch(week, year, seasontype, max_age).data
+
+    async def fetch_async(self, week: Optional[int] = None, year: Optional[int] = None,
+                          seasontype: Optional[int] = 2,
+                          max_age: Optional[float] = None) -> ScoreboardResponse:
+        """Awaitable fetch; shares cache and in-flight requests with sync callers"""
+        return await asyncio.to_thread(self.fetch, week, year, seasontype, max_age)
+
+    async def fetch_weeks_async(self, weeks, year: int, seasontype: Optional[int] = 2,
+                                max_age: Optional[float] = None) -> Dict[int, ScoreboardResponse]:
+        """Fetch several weeks concurrently"""
+        weeks = list(weeks)
+        responses = await asyncio.gather(
+            *(self.fetch_async(week, year, seasontype, max_age) for week in weeks),
+            return_exceptions=True
+        )
+        results = {}
+        for week, response in zip(weeks, responses):
+            if isinstance(response, Exception):
+                logger.error(f"ESPN fetch failed for Week {week}, {year}: {response}")
+                continue
+            results[week] = response
+        return results
+
+    def clear(self) -> None:
+        """Drop the in-memory cache (disk copies are kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters for diagnostics"""
+        with self._lock:
+            return dict(self.stats, cached_keys=len(self._memory), in_flight=len(self._inflight))
+
+
+_client: Optional[ScoreboardClient] = None
+_client_lock = threading.Lock()
+
+
+def get_scoreboard_client() -> ScoreboardClient:
+    """Process-wide shared client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ScoreboardClient()
+    return _client
+
+
+def fetch_scoreboard(week: Optional[int] = None, year: Optional[int] = None,
+                     seasontype: Optional[int] = 2, max_age: Optional[float] = None) -> Dict[str, Any]:
+    """Convenience wrapper: scoreboard JSON via the shared client"""
+    return get_scoreboard_client().fetch_json(week, year, seasontype, max_age)
+
+
+async def fetch_scoreboard_async(week: Optional[int] = None, year: Optional[int] = None,
+                                 seasontype: Optional[int] = 2,
+                                 max_age: Optional[float] = None) -> Dict[str, Any]:
+    """Convenience wrapper: awaitable scoreboard JSON via the shared client"""
+    response = await get_scoreboard_client().fetch_async(week, year, seasontype, max_age)
+    return response.data
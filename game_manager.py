@@ -6,6 +6,7 @@ import sqlite3
 import datetime
 import requests
 from nfl_schedule import generate_schedule_for_year, NFL_TEAMS
+from game_slots import refresh_game_slots
 
 def create_emergency_games(week, year):
     """Create emergency minimal games when all other methods fail"""
@@ -180,6 +181,7 @@ def ensure_games_exist(week, year):
                 print(f"Error inserting game: {game_error}")
                 continue
         
+        refresh_game_slots(cursor, week, year)
         conn.commit()
         conn.close()
         
@@ -0,0 +1,179 @@
+"""
+Kickoff time and broadcast slot columns for nfl_games
+game_date is stored as a naive Eastern time string in one of several formats,
+so day-of-week filters used to need strftime() scans or Python-side parsing.
+Each game also carries:
+
+    kickoff_utc  INTEGER  kickoff as a UTC epoch timestamp
+    slot         TEXT     TNF / FRI / SAT / SUN_EARLY / SUN_LATE / SNF / MNF
+                          (OTHER for the odd Tuesday/Wednesday game)
+
+indexed as (year, week, slot) and (kickoff_utc). The app's game writers set
+both, via game_time_fields() or refresh_game_slots() in the same transaction.
+Rows written by anything else (one-off scripts) start with both NULL, and a
+trigger clears them when such a write moves game_date. Readers comparing on
+kickoff_utc treat those games as not started until refresh_game_slots() fills
+them in on the next schedule change or app start.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+import pytz
+
+from models import get_pooled_connection
+from deadline_manager import parse_game_time
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+EASTERN = pytz.timezone('US/Eastern')
+
+SLOT_TNF = 'TNF'
+SLOT_FRI = 'FRI'
+SLOT_SAT = 'SAT'
+SLOT_SUN_EARLY = 'SUN_EARLY'
+SLOT_SUN_LATE = 'SUN_LATE'
+SLOT_SNF = 'SNF'
+SLOT_MNF = 'MNF'
+SLOT_OTHER = 'OTHER'
+
+# Sunday kickoffs (Eastern hour) at or after these are the late window / SNF
+SUNDAY_LATE_HOUR = 16
+SUNDAY_NIGHT_HOUR = 19
+
+GAME_SLOT_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_games_year_week_slot ON nfl_games(year, week, slot)',
+    'CREATE INDEX IF NOT EXISTS idx_games_kickoff_utc ON nfl_games(kickoff_utc)'
+]
+
+# Any write that moves game_date without also setting kickoff_utc leaves both
+# columns NULL for refresh_game_slots() rather than stale
+CLEAR_STALE_SLOT_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS trg_games_clear_stale_slot
+    AFTER UPDATE OF game_date ON nfl_games
+    WHEN NEW.game_date IS NOT OLD.game_date
+    AND NEW.kickoff_utc IS NOT NULL AND NEW.kickoff_utc IS OLD.kickoff_utc
+    BEGIN
+        UPDATE nfl_games SET kickoff_utc = NULL, slot = NULL WHERE id = NEW.id;
+    END
+'''
+
+
+def classify_slot(kickoff_et: datetime) -> str:
+    """Broadcast slot for a naive Eastern kickoff time"""
+    weekday = kickoff_et.weekday()  # Monday = 0, Sunday = 6
+    if weekday == 3:
+        return SLOT_TNF
+    if weekday == 4:
+        return SLOT_FRI
+    if weekday == 5:
+        return SLOT_SAT
+    if weekday == 6:
+        if kickoff_et.hour >= SUNDAY_NIGHT_HOUR:
+            return SLOT_SNF
+        if kickoff_et.hour >= SUNDAY_LATE_HOUR:
+            return SLOT_SUN_LATE
+        return SLOT_SUN_EARLY
+    if weekday == 0:
+        return SLOT_MNF
+    return SLOT_OTHER
+
+
+def game_time_fields(game_date) -> Tuple[Optional[int], Optional[str]]:
+    """(kickoff_utc, slot) for a stored game_date string or naive Eastern datetime"""
+    if isinstance(game_date, str):
+        kickoff_et = parse_game_time(game_date)
+    elif isinstance(game_date, datetime):
+        kickoff_et = game_date.replace(tzinfo=None) if game_date.tzinfo is None else \
+            game_date.astimezone(EASTERN).replace(tzinfo=None)
+    else:
+        kickoff_et = None
+    if kickoff_et is None:
+        return None, None
+
+    kickoff_utc = int(EASTERN.localize(kickoff_et).timestamp())
+    return kickoff_utc, classify_slot(kickoff_et)
+
+
+def refresh_game_slots(cursor, week: Optional[int] = None, year: Optional[int] = None,
+                       force: bool = False) -> int:
+    """
+    Fill kickoff_utc/slot for games missing them (every game with force=True),
+    inside the caller's transaction. Returns the number of games updated.
+    """
+    sql = 'SELECT id, game_date FROM nfl_games WHERE game_date IS NOT NULL'
+    params = []
+    if not force:
+        sql += ' AND (kickoff_utc IS NULL OR slot IS NULL)'
+    if week is not None:
+        sql += ' AND week = ?'
+        params.append(week)
+    if year is not None:
+        sql += ' AND year = ?'
+        params.append(year)
+    cursor.execute(sql, params)
+
+    updates = []
+    for game_id, game_date in cursor.fetchall():
+        kickoff_utc, slot = game_time_fields(game_date)
+        if kickoff_utc is not None:
+            updates.append((kickoff_utc, slot, game_id))
+    if updates:
+        cursor.executemany('UPDATE nfl_games SET kickoff_utc = ?, slot = ? WHERE id = ?', updates)
+    return len(updates)
+
+
+def sync_game_slots(db_path: str = DATABASE_PATH, week: Optional[int] = None,
+                    year: Optional[int] = None) -> int:
+    """refresh_game_slots() in its own transaction; a read-only check when nothing is missing"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        sql = 'SELECT 1 FROM nfl_games WHERE game_date IS NOT NULL AND (kickoff_utc IS NULL OR slot IS NULL)'
+        params = []
+        if week is not None:
+            sql += ' AND week = ?'
+            params.append(week)
+        if year is not None:
+            sql += ' AND year = ?'
+            params.append(year)
+        cursor.execute(sql + ' LIMIT 1', params)
+        if cursor.fetchone() is None:
+            return 0
+
+        updated = refresh_game_slots(cursor, week, year)
+        conn.commit()
+    finally:
+        conn.close()
+
+    if updated:
+        logger.info(f"Filled kickoff/slot for {updated} games")
+    return updated
+
+
+def ensure_game_slot_columns(db_path: str = DATABASE_PATH) -> bool:
+    """Startup migration: add the columns, indexes and trigger, then backfill"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA table_info(nfl_games)')
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'kickoff_utc' not in columns:
+            cursor.execute('ALTER TABLE nfl_games ADD COLUMN kickoff_utc INTEGER')
+        if 'slot' not in columns:
+            cursor.execute('ALTER TABLE nfl_games ADD COLUMN slot TEXT')
+        for index_sql in GAME_SLOT_INDEXES:
+            cursor.execute(index_sql)
+        cursor.execute(CLEAR_STALE_SLOT_TRIGGER)
+
+        updated = refresh_game_slots(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+
+    if updated:
+        print(f"✅ Backfilled kickoff/slot for {updated} games")
+    return True
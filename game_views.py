@@ -0,0 +1,122 @@
+"""
+Per-week game view-models for NFL Fantasy League
+Everything the game pages derive from nfl_games rows that doesn't change per
+request - parsed AST kickoff times, team names and logos, the actual Monday /
+Thursday Night flags and each game's pick deadline bucket - is built once per
+(week, year) and shared by /games, the weekly leaderboard, the admin picks
+table and the PDF export.
+
+Score updates and admin game edits in this process call
+invalidate_game_view_cache(). Entries are also tied to the shared 'games'
+data version, so edits made by other web workers or the updater process are
+picked up within Config.DATA_VERSION_CHECK_SECONDS; they expire after
+Config.GAME_VIEW_CACHE_TTL_SECONDS as a last safety net.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+from models import get_pooled_connection
+from data_version import GAMES_SCOPE, get_data_version
+from deadline_manager import DeadlineManager, parse_game_time, parse_game_time_ast
+from team_info import get_team_name, get_team_logo_url
+from weekly_winners import pick_monday_night_game
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# (db_path, week, year) -> (monotonic time built, games data version, views)
+_view_cache: Dict[Tuple[str, int, int], Tuple[float, Optional[int], List[Dict[str, Any]]]] = {}
+_view_cache_lock = threading.Lock()
+
+
+def invalidate_game_view_cache(week: Optional[int] = None, year: Optional[int] = None) -> None:
+    """Drop cached game views (one week, one season, or everything)"""
+    with _view_cache_lock:
+        if week is None and year is None:
+            _view_cache.clear()
+            return
+        for key in list(_view_cache):
+            if (week is None or key[1] == week) and (year is None or key[2] == year):
+                del _view_cache[key]
+
+
+def _build_week_views(week: int, year: int, db_path: str) -> List[Dict[str, Any]]:
+    """Load the week's games and derive their display fields"""
+    conn = get_pooled_connection(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM nfl_games
+            WHERE week = ? AND year = ?
+            ORDER BY game_date, id
+        ''', (week, year))
+        rows = [dict(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+    # Actual Monday Night game: the tiebreaker game the weekly rankings use
+    monday_game = pick_monday_night_game(rows)
+    monday_night_game_id = monday_game['id'] if monday_game else None
+
+    deadline_manager = DeadlineManager()
+    deadlines = deadline_manager.get_week_deadlines(week, year) if rows else {}
+
+    views = []
+    for row in rows:
+        raw_date = row['game_date']
+        game_date = parse_game_time_ast(raw_date) if isinstance(raw_date, str) else None
+        if raw_date and game_date is None:
+            logger.warning(f"Failed to parse game date '{raw_date}' for game {row['id']}")
+
+        bucket, pick_deadline = deadline_manager.get_pick_deadline(deadlines, raw_date)
+
+        view = dict(row)
+        view.update({
+            'game_date_raw': raw_date,
+            'game_date': game_date,
+            # Naive, as stored (Eastern); for views that always showed the stored time
+            'game_date_et': parse_game_time(raw_date) if raw_date else None,
+            'away_team_name': get_team_name(row['away_team']),
+            'home_team_name': get_team_name(row['home_team']),
+            'away_team_logo': get_team_logo_url(row['away_team']),
+            'home_team_logo': get_team_logo_url(row['home_team']),
+            'is_actual_monday_night': row['id'] == monday_night_game_id,
+            'is_actual_thursday_night': row.get('is_thursday_night', False),
+            'deadline_bucket': bucket,
+            'pick_deadline': pick_deadline
+        })
+        views.append(view)
+    return views
+
+
+def get_week_game_views(week: int, year: int, db_path: str = DATABASE_PATH) -> List[Dict[str, Any]]:
+    """
+    The week's games in kickoff order as view-model dicts.
+    Each call gets its own dicts, so callers may add per-request keys.
+    """
+    key = (db_path, week, year)
+    version = get_data_version(db_path, GAMES_SCOPE)
+    cached = _view_cache.get(key)
+    if (cached is None or cached[1] != version or
+            time.monotonic() - cached[0] > Config.GAME_VIEW_CACHE_TTL_SECONDS):
+        views = _build_week_views(week, year, db_path)
+        with _view_cache_lock:
+            _view_cache[key] = (time.monotonic(), version, views)
+    else:
+        views = cached[2]
+    return [dict(view) for view in views]
+
+
+def get_monday_night_game_id(week: int, year: int, db_path: str = DATABASE_PATH) -> Optional[int]:
+    """Id of the week's actual Monday Night (tiebreaker) game"""
+    for view in get_week_game_views(week, year, db_path):
+        if view['is_actual_monday_night']:
+            return view['id']
+    return None
@@ -0,0 +1,118 @@
+"""
+Leaderboard response cache for NFL Fantasy League
+Rendered /leaderboard and /weekly_leaderboard pages and the JSON standings
+are kept in memory, keyed by the page's parameters plus the shared
+'standings' data version (see data_version), so score updates, pick scoring,
+admin edits and writes from other processes all invalidate the cache without
+having to call into it.
+
+Responses carry an ETag; a matching If-None-Match gets a 304.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response, request, session
+
+from config import Config
+from data_version import get_data_version
+from game_views import get_week_game_views
+from utils.timezone_utils import AST
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+_cache_lock = threading.Lock()
+# (db_path, key, version) -> {'etag', 'data', 'mimetype', 'created'}
+_response_cache: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+
+# Striped locks so concurrent misses on one page render it once
+_build_locks = [threading.Lock() for _ in range(16)]
+
+
+def clear_leaderboard_cache() -> None:
+    with _cache_lock:
+        _response_cache.clear()
+
+
+def week_time_marker(week: int, year: int, db_path: str = DATABASE_PATH) -> int:
+    """
+    How many of the week's kickoffs and pick deadlines have passed.
+    Weekly pages reveal picks as these go by, so it is part of their cache key.
+    """
+    now = datetime.now(AST)
+    passed = 0
+    for view in get_week_game_views(week, year, db_path):
+        for moment in (view['game_date'], view['pick_deadline']):
+            if moment is not None and moment <= now:
+                passed += 1
+    return passed
+
+
+def _cache_get(cache_key: Tuple) -> Optional[Dict[str, Any]]:
+    with _cache_lock:
+        entry = _response_cache.get(cache_key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry['created'] > Config.LEADERBOARD_CACHE_TTL_SECONDS:
+            del _response_cache[cache_key]
+            return None
+        _response_cache.move_to_end(cache_key)
+        return entry
+
+
+def _cache_put(cache_key: Tuple, entry: Dict[str, Any]) -> None:
+    with _cache_lock:
+        _response_cache[cache_key] = entry
+        _response_cache.move_to_end(cache_key)
+        while len(_response_cache) > Config.LEADERBOARD_CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+
+
+def cached_response(key: Tuple, build: Callable[[], Any], mimetype: str = 'text/html',
+                    db_path: str = DATABASE_PATH) -> Response:
+    """
+    Serve build()'s output from the cache when the data version hasn't moved.
+    build() returns the body as a string; anything else (e.g. a redirect on
+    error) is passed through uncached. Pending flash messages bypass the cache
+    since rendering the page is what consumes them.
+    """
+    version = get_data_version(db_path)
+    if version is None or session.get('_flashes'):
+        return _as_response(build(), mimetype)
+
+    cache_key = (db_path, key, version)
+    entry = _cache_get(cache_key)
+    if entry is None:
+        with _build_locks[hash(cache_key) % len(_build_locks)]:
+            entry = _cache_get(cache_key)
+            if entry is None:
+                body = build()
+                if not isinstance(body, str):
+                    return body
+                data = body.encode('utf-8')
+                entry = {
+                    'etag': hashlib.sha1(data).hexdigest(),
+                    'data': data,
+                    'mimetype': mimetype,
+                    'created': time.monotonic()
+                }
+                _cache_put(cache_key, entry)
+
+    response = Response(entry['data'], mimetype=entry['mimetype'])
+    response.set_etag(entry['etag'])
+    # Browsers keep the copy but revalidate every time, which is a cheap 304
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
+def _as_response(body: Any, mimetype: str) -> Any:
+    if isinstance(body, str):
+        return Response(body, mimetype=mimetype)
+    return body
@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Sunday-afternoon load replay for NFL Fantasy League
+Replays a game-day mix against a running server: N simulated family members
+log in and keep reloading /games and /weekly_leaderboard for the week being
+played, submitting next week's picks now and then, while an admin finalizes
+games by hand and the background updater polls a local fake ESPN scoreboard
+and writes live scores.
+
+By default a synthetic league (benchmark_league.build_league) is built in a
+temp directory with the open week's early Sunday games already kicked off, and
+app.py is started against it with ESPN_API_BASE pointing at the fake
+scoreboard. The fake scoreboard plays each started game from 0-0 to a final
+score over --game-minutes, so the updater has something to write throughout
+the run.
+
+The report covers throughput, error rate, latency percentiles per action and
+how often SQLite answered "database is locked" (in response bodies and in the
+server logs) - the failure mode described in CRASH_ANALYSIS.md.
+
+Usage:
+    python load_replay.py                                  # 30 users for 2 minutes, threaded server
+    python load_replay.py --concurrency 100 --duration 300 --mode production --workers 4
+    python load_replay.py --output replay_before.json
+    python load_replay.py --url http://127.0.0.1:8080 --db /srv/casa/nfl_fantasy.db --server-log /srv/casa/app.log
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import shutil
+import socket
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from benchmark_league import DATABASE_PATH, build_league, percentile
+
+LOCKED_MESSAGE = 'database is locked'
+DEFAULT_MIX = {'games': 40, 'weekly_leaderboard': 35, 'submit_picks': 15, 'login': 10}
+REQUEST_TIMEOUT_SECONDS = 30
+SERVER_START_TIMEOUT_SECONDS = 60
+
+
+def _final_score(seed: int, game_id: int) -> Tuple[int, int]:
+    """Final (away, home) score for a game; the fake ESPN feed and the admin agree on it"""
+    rng = random.Random(f'{seed}-{game_id}')
+    away_score, home_score = rng.randint(3, 45), rng.randint(3, 45)
+    if away_score == home_score:
+        home_score += 3
+    return away_score, home_score
+
+
+def load_league_state(db_path: str) -> Dict[str, Any]:
+    """
+    Read what the load needs from a league database: the players, the week
+    being played (the earliest with a game that isn't final) and the first
+    week whose games are all still ahead, which takes new picks
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        usernames = [row[0] for row in cursor.execute(
+            'SELECT username FROM users WHERE is_admin = 0 ORDER BY id')]
+        games = cursor.execute('''
+            SELECT id, week, year, away_team, home_team, game_date, is_monday_night, is_final
+            FROM nfl_games ORDER BY game_date, id
+        ''').fetchall()
+    finally:
+        conn.close()
+
+    if not usernames:
+        raise ValueError(f'No players in {db_path}')
+    now = datetime.now()
+    weeks = defaultdict(list)
+    for game in games:
+        weeks[(game[2], game[1])].append(game)
+    open_weeks = [key for key in sorted(weeks) if any(not game[7] for game in weeks[key])]
+    if not open_weeks:
+        raise ValueError(f'Every game in {db_path} is already final')
+    submission = next((key for key in open_weeks
+                       if all(_parse_date(game[5]) > now + timedelta(hours=1) for game in weeks[key])), None)
+
+    return {
+        'usernames': usernames,
+        'year': open_weeks[0][0],
+        'open_week': open_weeks[0][1],
+        'submission_week': submission[1] if submission else None,
+        'submission_games': [(game[0], game[4], game[3], bool(game[6])) for game in weeks[submission]]
+        if submission else [],
+        'games': [{'id': game[0], 'week': game[1], 'year': game[2], 'away_team': game[3],
+                   'home_team': game[4], 'kickoff': _parse_date(game[5]), 'is_final': bool(game[7])}
+                  for game in games]
+    }
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('T', ' ').split('.')[0])
+
+
+def _count_finals(db_path: str, year: int, week: int) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM nfl_games WHERE year = ? AND week = ? AND is_final = 1',
+                            (year, week)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+class FakeScoreboard:
+    """
+    Local stand-in for ESPN's /scoreboard: games that have kicked off go from
+    0-0 to their final score over game_seconds, starting when the replay
+    starts (or at kickoff for games that start during it)
+    """
+
+    def __init__(self, games: List[Dict[str, Any]], seed: int, game_seconds: float, port: int = 0):
+        self.games = [game for game in games if not game['is_final']]
+        self.seed = seed
+        self.game_seconds = max(1.0, game_seconds)
+        self.started = datetime.now()
+        self.polls = Counter()
+        self._lock = threading.Lock()
+        scoreboard = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if not url.path.rstrip('/').endswith('/scoreboard'):
+                    self.send_error(404)
+                    return
+                query = parse_qs(url.query)
+                week = int(query.get('week', ['0'])[0] or 0)
+                body = json.dumps(scoreboard.payload(week)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def start(self) -> None:
+        self.started = datetime.now()
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _event(self, game: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        away_score = home_score = 0
+        description, completed = 'Scheduled', False
+        if game['kickoff'] <= now:
+            progress = (now - max(game['kickoff'], self.started)).total_seconds() / self.game_seconds
+            final_away, final_home = _final_score(self.seed, game['id'])
+            if progress >= 1:
+                away_score, home_score = final_away, final_home
+                description, completed = 'Final', True
+            else:
+                away_score = int(final_away * max(0.0, progress))
+                home_score = int(final_home * max(0.0, progress))
+                description = 'In Progress'
+        competitors = [
+            {'homeAway': 'away', 'score': str(away_score), 'team': {'abbreviation': game['away_team']}},
+            {'homeAway': 'home', 'score': str(home_score), 'team': {'abbreviation': game['home_team']}}
+        ]
+        return {
+            'id': str(game['id']),
+            'name': f"{game['away_team']} at {game['home_team']}",
+            'date': game['kickoff'].strftime('%Y-%m-%dT%H:%M:%S'),
+            'status': {'type': {'description': description, 'completed': completed}},
+            'competitions': [{'competitors': competitors}]
+        }
+
+    def payload(self, week: int) -> Dict[str, Any]:
+        with self._lock:
+            self.polls[week] += 1
+        now = datetime.now()
+        return {'week': {'number': week},
+                'events': [self._event(game, now) for game in self.games if game['week'] == week]}
+
+
+class ReplayStats:
+    """Thread-safe per-action samples: (seconds, status, ok)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self.locked_responses = 0
+
+    def record(self, action: str, seconds: float, status: Optional[int], ok: bool,
+               error: Optional[str] = None, locked: bool = False) -> None:
+        with self._lock:
+            self.samples[action].append((seconds, status, ok))
+            if not ok:
+                self.errors[f'{action}: {error or status}'] += 1
+            if locked:
+                self.locked_responses += 1
+
+
+class SimulatedUser(threading.Thread):
+    """One family member: log in, then reload pages with exponential think time"""
+
+    def __init__(self, base_url: str, username: str, password: str, league: Dict[str, Any],
+                 mix: Dict[str, int], think_seconds: float, start_delay: float,
+                 stop_event: threading.Event, stats: ReplayStats, rng: random.Random):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.league = league
+        self.actions = list(mix)
+        self.weights = [mix[action] for action in self.actions]
+        self.think_seconds = think_seconds
+        self.start_delay = start_delay
+        self.stop_event = stop_event
+        self.stats = stats
+        self.rng = rng
+        self.session = requests.Session()
+
+    def _request(self, action: str, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=REQUEST_TIMEOUT_SECONDS,
+                                            allow_redirects=False, **kwargs)
+        except requests.RequestException as e:
+            self.stats.record(action, time.perf_counter() - started, None, False, type(e).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+        ok = response.status_code < 400
+        if action == 'login':
+            ok = response.status_code == 302 and '/login' not in response.headers.get('Location', '')
+        elif ok and response.headers.get('Content-Type', '').startswith('application/json'):
+            try:
+                ok = response.json().get('success', True) is not False
+            except ValueError:
+                ok = False
+        self.stats.record(action, elapsed, response.status_code, ok,
+                          locked=LOCKED_MESSAGE in response.text)
+        return response
+
+    def login(self) -> bool:
+        self.session.cookies.clear()
+        response = self._request('login', 'POST', '/login',
+                                 data={'username': self.username, 'password': self.password})
+        return response is not None and response.status_code == 302
+
+    def _picks(self) -> Dict[str, Any]:
+        picks = []
+        for game_id, home_team, away_team, is_monday in self.league['submission_games']:
+            pick = {'game_id': game_id, 'selected_team': self.rng.choice((home_team, away_team))}
+            if is_monday:
+                pick['home_score'] = self.rng.randint(10, 38)
+                pick['away_score'] = self.rng.randint(10, 38)
+            picks.append(pick)
+        return {'picks': picks}
+
+    def run(self) -> None:
+        if self.stop_event.wait(self.start_delay) or not self.login():
+            return
+        week, year = self.league['open_week'], self.league['year']
+        while not self.stop_event.wait(self.rng.expovariate(1 / self.think_seconds) if self.think_seconds else 0):
+            action = self.rng.choices(self.actions, self.weights)[0]
+            if action == 'login':
+                self.login()
+            elif action == 'games':
+                self._request(action, 'GET', f'/games?week={week}&year={year}')
+            elif action == 'weekly_leaderboard':
+                self._request(action, 'GET', f'/weekly_leaderboard/{week}/{year}')
+            elif action == 'submit_picks' and self.league['submission_games']:
+                self._request(action, 'POST', '/submit_picks', json=self._picks())
+
+
+class AdminFinalizer(SimulatedUser):
+    """The admin finalizing games that have kicked off, one every interval seconds"""
+
+    def __init__(self, base_url: str, username: str, password: str, league: Dict[str, Any],
+                 interval: float, seed: int, stop_event: threading.Event, stats: ReplayStats):
+        super().__init__(base_url, username, password, league, {}, 0, 0, stop_event, stats, random.Random(seed))
+        self.interval = interval
+        self.seed = seed
+        self.finalized = 0
+
+    def run(self) -> None:
+        if self.interval <= 0 or not self.login():
+            return
+        pending = [game for game in self.league['games']
+                   if game['week'] == self.league['open_week'] and not game['is_final']]
+        while not self.stop_event.wait(self.interval):
+            started = [game for game in pending if game['kickoff'] <= datetime.now()]
+            if not started:
+                continue
+            game = self.rng.choice(started)
+            pending.remove(game)
+            away_score, home_score = _final_score(self.seed, game['id'])
+            response = self._request('admin_finalize', 'POST', '/admin/force_finalize_game',
+                                     json={'game_id': game['id'], 'away_score': away_score,
+                                           'home_score': home_score})
+            if response is not None and response.status_code == 200:
+                self.finalized += 1
+
+    def perf_report(self) -> Optional[Dict[str, Any]]:
+        """The server's /admin/perf_stats, or None when it isn't reachable"""
+        if 'session' not in self.session.cookies and not self.login():
+            return None
+        try:
+            response = self.session.get(f'{self.base_url}/admin/perf_stats', params={'slow_limit': 0},
+                                        timeout=REQUEST_TIMEOUT_SECONDS)
+            return response.json().get('perf') if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: str, mode: str, workers: int, espn_base: str, poll_seconds: int,
+                 log_file) -> Tuple[subprocess.Popen, str]:
+    """Start app.py against the league in workdir; returns (process, base URL)"""
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        'HTTP_PORT': str(port),
+        'WEB_WORKERS': str(workers),
+        'FLASK_DEBUG': 'False',
+        'ESPN_API_BASE': espn_base,
+        'ESPN_CACHE_DIR': os.path.join(workdir, 'espn_cache'),
+        'ESPN_CACHE_TTL_SECONDS': '1',
+        'ESPN_CALLS_PER_HOUR': '3600',
+        'POLL_LIVE_INTERVAL_SECONDS': str(poll_seconds),
+        'POLL_OVERDUE_INTERVAL_SECONDS': str(poll_seconds),
+        'POLL_MIN_SLEEP_SECONDS': str(poll_seconds),
+        'POLL_OVERDUE_GIVE_UP_HOURS': '240',
+        'PERF_SNAPSHOT_DIR': os.path.join(workdir, 'perf_metrics'),
+        'PERF_SNAPSHOT_SECONDS': '2',
+        # background_updater lives in cleanup_backup in this tree
+        'PYTHONPATH': os.pathsep.join(filter(None, [REPO_DIR, os.path.join(REPO_DIR, 'cleanup_backup'),
+                                                    os.environ.get('PYTHONPATH')])),
+        'PYTHONUNBUFFERED': '1'
+    })
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'app.py'), mode], cwd=workdir, env=env,
+                               stdout=log_file, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + SERVER_START_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'app.py exited with code {process.returncode}; see {log_file.name}')
+        try:
+            if requests.get(f'{base_url}/health/simple', timeout=2).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_server(process)
+    raise RuntimeError(f'app.py did not answer /health/simple within {SERVER_START_TIMEOUT_SECONDS}s')
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    if process.poll() is not None:
+        return
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _log_offsets(paths: List[str]) -> Dict[str, int]:
+    return {path: os.path.getsize(path) if os.path.exists(path) else 0 for path in paths}
+
+
+def count_locked_in_logs(offsets: Dict[str, int]) -> Dict[str, int]:
+    """'database is locked' lines written to each log since its recorded offset"""
+    counts = {}
+    for path, offset in offsets.items():
+        count = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                f.seek(offset)
+                count = sum(1 for line in f if LOCKED_MESSAGE in line)
+        counts[path] = count
+    return counts
+
+
+def summarize(stats: ReplayStats, elapsed: float) -> Dict[str, Any]:
+    def latency(samples):
+        values = [seconds * 1000 for seconds, _, _ in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for _, _, ok in samples if not ok),
+            'p50_ms': round(percentile(values, 0.50), 2),
+            'p95_ms': round(percentile(values, 0.95), 2),
+            'p99_ms': round(percentile(values, 0.99), 2),
+            'max_ms': round(max(values), 2)
+        }
+
+    everything = [sample for samples in stats.samples.values() for sample in samples]
+    summary = latency(everything) if everything else {'requests': 0, 'errors': 0}
+    summary.update({
+        'seconds': round(elapsed, 1),
+        'throughput_rps': round(len(everything) / elapsed, 2) if elapsed else 0.0,
+        'error_rate': round(summary['errors'] / len(everything), 4) if everything else 0.0,
+        'statuses': dict(Counter(str(status) for _, status, _ in everything)),
+        'actions': {action: latency(samples) for action, samples in sorted(stats.samples.items())},
+        'top_errors': dict(stats.errors.most_common(10)),
+        'locked_responses': stats.locked_responses
+    })
+    return summary
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    run = report['run']
+    meta = report['meta']
+    print(f"\n{meta['concurrency']} users against {meta['url']} ({meta['mode']}) for {run['seconds']}s")
+    print(f"  {run['requests']} requests, {run['throughput_rps']} req/s, "
+          f"{run['errors']} errors ({run['error_rate'] * 100:.2f}%)")
+    if run['requests']:
+        print(f"  latency p50 {run['p50_ms']} ms, p95 {run['p95_ms']} ms, p99 {run['p99_ms']} ms, "
+              f"max {run['max_ms']} ms")
+    print(f"\n  {'action':<22} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for action, row in run['actions'].items():
+        print(f"  {action:<22} {row['requests']:>9} {row['errors']:>7} {row['p50_ms']:>9.2f} "
+              f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}")
+
+    locked = report['database_locked']
+    print(f"\n  'database is locked': {locked['responses']} responses, {locked['log_lines']} log lines")
+    for path, count in locked['logs'].items():
+        print(f"    {path}: {count}")
+    updates = report['score_updates']
+    if updates['espn_polls'] is not None:
+        print(f"  fake ESPN polls: {updates['espn_polls']}")
+    if updates['games_final_before'] is not None:
+        print(f"  week {updates['week']} games final: {updates['games_final_before']} -> "
+              f"{updates['games_final_after']} ({updates['admin_finalized']} by the admin)")
+    if run['top_errors']:
+        print('\n  errors:')
+        for error, count in run['top_errors'].items():
+            print(f'    {count:>5}  {error}')
+    if report.get('server_routes'):
+        print(f"\n  {'server route (by total time)':<45} {'count':>7} {'p95 ms':>9} {'sql/req':>8}")
+        for row in report['server_routes']:
+            print(f"  {row['method'] + ' ' + row['route']:<45} {row['count']:>7} "
+                  f"{row['p95_ms'] if row['p95_ms'] is not None else '-':>9} {row['avg_sql_count']:>8}")
+
+
+def run_replay(args, base_url: str, db_path: str, log_paths: List[str],
+               scoreboard: Optional[FakeScoreboard]) -> Dict[str, Any]:
+    league = load_league_state(db_path)
+    if league['submission_week'] is None:
+        print('No week is still open for picks; submit_picks is skipped', file=sys.stderr)
+    finals_before = _count_finals(db_path, league['year'], league['open_week'])
+    offsets = _log_offsets(log_paths)
+
+    stop_event = threading.Event()
+    stats = ReplayStats()
+    rng = random.Random(args.seed)
+    usernames = league['usernames'][:args.concurrency]
+    if len(usernames) < args.concurrency:
+        print(f"Only {len(usernames)} players in the league; some log in more than once", file=sys.stderr)
+        usernames = [usernames[n % len(usernames)] for n in range(args.concurrency)]
+    users = [SimulatedUser(base_url, username, args.password, league, args.mix, args.think_seconds,
+                           args.ramp_seconds * n / max(1, args.concurrency), stop_event, stats,
+                           random.Random(rng.random()))
+             for n, username in enumerate(usernames)]
+    admin = AdminFinalizer(base_url, args.admin_user, args.admin_password, league, args.finalize_seconds,
+                           args.seed, stop_event, stats)
+
+    print(f"Replaying week {league['open_week']} with {args.concurrency} users for {args.duration}s...",
+          file=sys.stderr)
+    started = time.perf_counter()
+    for thread in users + [admin]:
+        thread.start()
+    try:
+        stop_event.wait(args.ramp_seconds + args.duration)
+    except KeyboardInterrupt:
+        print('Interrupted; reporting what ran so far', file=sys.stderr)
+    stop_event.set()
+    for thread in users + [admin]:
+        thread.join(REQUEST_TIMEOUT_SECONDS)
+    elapsed = time.perf_counter() - started
+
+    locked_logs = count_locked_in_logs(offsets)
+    run = summarize(stats, elapsed)
+    perf = admin.perf_report()
+    return {
+        'meta': {
+            'url': base_url,
+            'mode': args.mode if not args.url else 'external',
+            'workers': args.workers if not args.url else None,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'ramp_seconds': args.ramp_seconds,
+            'think_seconds': args.think_seconds,
+            'mix': args.mix,
+            'seed': args.seed,
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'run': run,
+        'database_locked': {
+            'responses': run['locked_responses'],
+            'log_lines': sum(locked_logs.values()),
+            'logs': locked_logs
+        },
+        'score_updates': {
+            'week': league['open_week'],
+            'espn_polls': sum(scoreboard.polls.values()) if scoreboard else None,
+            'games_final_before': finals_before,
+            'games_final_after': _count_finals(db_path, league['year'], league['open_week']),
+            'admin_finalized': admin.finalized
+        },
+        'server_routes': sorted(perf['routes'], key=lambda row: row['total_ms'], reverse=True)[:8]
+        if perf and perf.get('enabled') else []
+    }
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(','):
+        action, _, weight = part.partition('=')
+        if action not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"expected action=weight with actions {', '.join(DEFAULT_MIX)}")
+        mix[action] = int(weight)
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Replay game-day load against the Flask app')
+    parser.add_argument('--concurrency', type=int, default=30, help='simultaneous simulated users')
+    parser.add_argument('--duration', type=int, default=120, help='seconds of load after the ramp-up')
+    parser.add_argument('--ramp-seconds', type=float, default=10.0, help='spread user logins over this long')
+    parser.add_argument('--think-seconds', type=float, default=3.0, help='mean pause between a user\'s requests')
+    parser.add_argument('--mix', type=_parse_mix, default=dict(DEFAULT_MIX),
+                        help='action weights (default ' + ','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()) + ')')
+    parser.add_argument('--finalize-seconds', type=float, default=20.0,
+                        help='admin finalizes a started game this often (0 disables)')
+    parser.add_argument('--game-minutes', type=float, default=5.0,
+                        help='fake ESPN plays each started game to its final score over this long')
+    parser.add_argument('--poll-seconds', type=int, default=10, help='background updater poll interval')
+    parser.add_argument('--mode', choices=['threaded', 'production'], default='threaded',
+                        help='app.py mode to start (production pre-forks --workers processes)')
+    parser.add_argument('--workers', type=int, default=2, help='WEB_WORKERS for --mode production')
+    parser.add_argument('--league-size', type=int, help='players in the synthetic league (default --concurrency)')
+    parser.add_argument('--completed-weeks', type=int, default=8,
+                        help='final weeks before the one being played (1-15)')
+    parser.add_argument('--seed', type=int, default=2025)
+    parser.add_argument('--workdir', help='build the league and run the server here and keep it afterwards')
+    parser.add_argument('--url', help='replay against this running instance instead of starting one')
+    parser.add_argument('--db', help='with --url: that instance\'s database (players and games are read from it)')
+    parser.add_argument('--server-log', action='append', default=[],
+                        help='with --url: log file to count "database is locked" lines in (repeatable)')
+    parser.add_argument('--espn-port', type=int, default=0,
+                        help='with --url: serve the fake scoreboard on this port (point ESPN_API_BASE at it)')
+    parser.add_argument('--password', default='benchmark', help='player password')
+    parser.add_argument('--admin-user', default='admin')
+    parser.add_argument('--admin-password', default='admin123')
+    parser.add_argument('--output', help='save the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.duration < 1:
+        parser.error('--duration must be at least 1')
+    if not 1 <= args.completed_weeks <= 15:
+        parser.error('--completed-weeks must be between 1 and 15')
+    if args.url and not args.db:
+        parser.error('--url needs --db')
+    if not sum(args.mix.values()):
+        parser.error('--mix needs a positive weight')
+    if args.think_seconds < 0 or args.poll_seconds < 1:
+        parser.error('--think-seconds must be >= 0 and --poll-seconds >= 1')
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.url:
+        league = load_league_state(args.db)
+        scoreboard = FakeScoreboard(league['games'], args.seed, args.game_minutes * 60, args.espn_port)
+        scoreboard.start()
+        print(f'Fake ESPN scoreboard at {scoreboard.base_url} (set ESPN_API_BASE to use it)', file=sys.stderr)
+        try:
+            report = run_replay(args, args.url.rstrip('/'), args.db, args.server_log, scoreboard)
+        finally:
+            scoreboard.stop()
+    else:
+        workdir = args.workdir or tempfile.mkdtemp(prefix='load_replay_')
+        os.makedirs(workdir, exist_ok=True)
+        previous_dir = os.getcwd()
+        os.chdir(workdir)
+        try:
+            print(f'Building a {args.league_size or args.concurrency}-player league in {workdir}...',
+                  file=sys.stderr)
+            build_league(args.league_size or args.concurrency, args.completed_weeks, args.seed, in_progress=True)
+        finally:
+            os.chdir(previous_dir)
+        db_path = os.path.join(workdir, DATABASE_PATH)
+        scoreboard = FakeScoreboard(load_league_state(db_path)['games'], args.seed, args.game_minutes * 60)
+        scoreboard.start()
+        server_log = os.path.join(workdir, 'server.log')
+        process = None
+        try:
+            with open(server_log, 'a', encoding='utf-8') as log_file:
+                process, base_url = start_server(workdir, args.mode, args.workers, scoreboard.base_url,
+                                                 args.poll_seconds, log_file)
+                report = run_replay(args, base_url, db_path, [server_log, os.path.join(workdir, 'app.log')],
+                                    scoreboard)
+        finally:
+            if process is not None:
+                stop_server(process)
+            scoreboard.stop()
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
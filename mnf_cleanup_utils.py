@@ -3,14 +3,146 @@ Monday Night Football Data Cleanup Utilities
 
 This module provides functions to automatically clean up obsolete score predictions
 when the Monday Night Football detection logic changes.
+
+run_mnf_cleanup_job() is the event-driven entry point: it is called after a
+week's games are created, edited, deleted or synced, and only takes the write
+lock when the week's set of Monday games differs from the one recorded in
+mnf_cleanup_state the last time the cleanup ran.
 """
 
 import sqlite3
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+from models import get_pooled_connection
+from game_slots import sync_game_slots
 
 logger = logging.getLogger(__name__)
 
+MNF_CLEANUP_STATE_SQL = '''
+    CREATE TABLE IF NOT EXISTS mnf_cleanup_state (
+        week INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        monday_games TEXT NOT NULL,
+        actual_mnf_id INTEGER,
+        predictions_cleaned INTEGER DEFAULT 0,
+        checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (week, year)
+    )
+'''
+
+def _monday_game_set(cursor, week: int, year: int) -> Tuple[str, List[int], Optional[int]]:
+    """
+    (signature, Monday game ids, actual MNF game id) for one week.
+    The signature changes whenever a Monday game is added, removed or moved.
+    """
+    cursor.execute('''
+        SELECT id, kickoff_utc
+        FROM nfl_games
+        WHERE week = ? AND year = ?
+        AND slot = 'MNF'  -- Monday games
+        ORDER BY kickoff_utc ASC, id ASC
+    ''', (week, year))
+    monday_games = cursor.fetchall()
+    signature = ';'.join(f"{row[0]}@{row[1]}" for row in monday_games)
+    game_ids = [row[0] for row in monday_games]
+    # Latest Monday game is the actual MNF game
+    return signature, game_ids, (game_ids[-1] if game_ids else None)
+
+def _week_needs_cleanup(cursor, week: int, year: int, signature: str) -> bool:
+    cursor.execute('''
+        SELECT monday_games FROM mnf_cleanup_state WHERE week = ? AND year = ?
+    ''', (week, year))
+    row = cursor.fetchone()
+    return row is None or row[0] != signature
+
+def run_mnf_cleanup_job(db_path: str, week: int = None, year: int = None, force: bool = False) -> int:
+    """
+    Clear score predictions from Monday games that are not the week's actual
+    MNF game, for weeks whose Monday game set changed since the last run.
+
+    Args:
+        db_path: Path to the database file
+        week: Week that changed (optional; all weeks of the year when omitted)
+        year: Season year (defaults to 2025)
+        force: Re-run the cleanup even if the Monday game set is unchanged
+
+    Returns:
+        Number of predictions cleaned up
+    """
+    year = year or 2025
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(MNF_CLEANUP_STATE_SQL)
+        conn.commit()
+
+        if week:
+            weeks = [week]
+        else:
+            cursor.execute('SELECT DISTINCT week FROM nfl_games WHERE year = ? ORDER BY week', (year,))
+            weeks = [row[0] for row in cursor.fetchall()]
+
+        # Read-only pass: nothing below takes the write lock unless a week changed
+        changed = []
+        for w in weeks:
+            signature, _, _ = _monday_game_set(cursor, w, year)
+            if force or _week_needs_cleanup(cursor, w, year, signature):
+                changed.append(w)
+        if not changed:
+            return 0
+
+        total_cleaned = 0
+        conn.isolation_level = None
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            for w in changed:
+                # Re-read inside the transaction so the recorded set is the one cleaned
+                signature, monday_ids, actual_mnf_id = _monday_game_set(cursor, w, year)
+                cleaned = 0
+                for obsolete_game_id in monday_ids[:-1]:
+                    cursor.execute('''
+                        UPDATE user_picks
+                        SET predicted_home_score = NULL, predicted_away_score = NULL
+                        WHERE game_id = ?
+                        AND (predicted_home_score IS NOT NULL OR predicted_away_score IS NOT NULL)
+                    ''', (obsolete_game_id,))
+                    cleaned += cursor.rowcount
+
+                cursor.execute('''
+                    INSERT INTO mnf_cleanup_state
+                    (week, year, monday_games, actual_mnf_id, predictions_cleaned, checked_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(week, year) DO UPDATE SET
+                        monday_games = excluded.monday_games,
+                        actual_mnf_id = excluded.actual_mnf_id,
+                        predictions_cleaned = excluded.predictions_cleaned,
+                        checked_at = excluded.checked_at
+                ''', (w, year, signature, actual_mnf_id, cleaned))
+
+                if cleaned:
+                    logger.info(f"Cleaned {cleaned} obsolete MNF predictions for Week {w}, {year}")
+                total_cleaned += cleaned
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+    finally:
+        conn.close()
+
+    return total_cleaned
+
+def on_schedule_changed(db_path: str, week: int = None, year: int = None) -> int:
+    """
+    Hook for code paths that change nfl_games: runs the MNF cleanup job and
+    logs (rather than raises) failures so the schedule write itself stands.
+    """
+    try:
+        sync_game_slots(db_path, week, year)
+        return run_mnf_cleanup_job(db_path, week, year)
+    except Exception as e:
+        logger.warning(f"MNF cleanup job failed for week {week}, {year}: {e}")
+        return 0
+
 def cleanup_obsolete_mnf_predictions(db_path: str, week: int = None, year: int = None) -> int:
     """
     Clean up obsolete Monday Night Football score predictions.
@@ -26,7 +158,7 @@ def cleanup_obsolete_mnf_predictions(db_path: str, week: int = None, year: int =
     Returns:
         Number of predictions cleaned up
     """
-    conn = sqlite3.connect(db_path)
+    conn = get_pooled_connection(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -56,8 +188,8 @@ def cleanup_obsolete_mnf_predictions(db_path: str, week: int = None, year: int =
                 SELECT id, away_team, home_team, game_date
                 FROM nfl_games 
                 WHERE week = ? AND year = ? 
-                AND strftime('%w', game_date) = '1'  -- Monday games
-                ORDER BY game_date ASC
+                AND slot = 'MNF'  -- Monday games
+                ORDER BY kickoff_utc ASC, id ASC
             ''', (w, y))
             
             monday_games = cursor.fetchall()
@@ -69,8 +201,8 @@ def cleanup_obsolete_mnf_predictions(db_path: str, week: int = None, year: int =
             cursor.execute('''
                 SELECT id FROM nfl_games 
                 WHERE week = ? AND year = ? 
-                AND strftime('%w', game_date) = '1'  -- Monday
-                ORDER BY game_date DESC, id DESC
+                AND slot = 'MNF'  -- Monday
+                ORDER BY kickoff_utc DESC, id DESC
                 LIMIT 1
             ''', (w, y))
             
@@ -132,15 +264,15 @@ def get_actual_mnf_game_id(db_path: str, week: int, year: int) -> int:
     Returns:
         Game ID of the actual MNF game, or None if no Monday games
     """
-    conn = sqlite3.connect(db_path)
+    conn = get_pooled_connection(db_path)
     cursor = conn.cursor()
     
     try:
         cursor.execute('''
             SELECT id FROM nfl_games 
             WHERE week = ? AND year = ? 
-            AND strftime('%w', game_date) = '1'  -- Monday
-            ORDER BY game_date DESC, id DESC
+            AND slot = 'MNF'  -- Monday
+            ORDER BY kickoff_utc DESC, id DESC
             LIMIT 1
         ''', (week, year))
         
@@ -162,7 +294,7 @@ def validate_mnf_predictions(db_path: str, week: int, year: int) -> Dict[str, An
     Returns:
         Dictionary with validation results
     """
-    conn = sqlite3.connect(db_path)
+    conn = get_pooled_connection(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -175,8 +307,8 @@ def validate_mnf_predictions(db_path: str, week: int, year: int) -> Dict[str, An
             SELECT id, away_team, home_team, game_date
             FROM nfl_games 
             WHERE week = ? AND year = ? 
-            AND strftime('%w', game_date) = '1'
-            ORDER BY game_date ASC
+            AND slot = 'MNF'
+            ORDER BY kickoff_utc ASC, id ASC
         ''', (week, year))
         
         monday_games = cursor.fetchall()
@@ -0,0 +1,335 @@
+"""
+Monday Night scenario engine for NFL Fantasy League
+Evaluates every plausible final score of the Monday Night tiebreaker game
+(0-70 x 0-70) together with every win/loss combination of the week's other
+unfinished games, ranking players with the weekly tiebreaker order:
+wins, correct MNF winner, total diff, winner diff, loser diff, earliest
+submission, username.
+
+Returns each player's win probability plus the score regions in which they
+win. The ranking is evaluated with NumPy for the whole score grid and all
+outcome combinations at once.
+"""
+
+import math
+import random
+import logging
+import threading
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models import get_pooled_connection
+from weekly_winners import pick_monday_night_game
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Final scores considered for the tiebreaker game
+SCORE_MAX = 70
+# Per-team score prior (roughly NFL-shaped); a score of 1 is impossible
+SCORE_MEAN = 22.0
+SCORE_STDDEV = 10.0
+# Win/loss combinations of the other games are enumerated up to this many, sampled beyond
+MAX_OUTCOME_COMBINATIONS = 1024
+# Tiebreaker differences are capped so keys fit in one integer
+DIFF_CAP = 255
+NO_PICK_DIFF = 999
+
+_simulation_cache: Dict[Tuple[str, int, int], Tuple[int, Dict[str, Any]]] = {}
+_simulation_cache_lock = threading.Lock()
+
+
+def _score_weights(max_score: int) -> List[float]:
+    """Unnormalized probability of a team finishing on each score"""
+    weights = [math.exp(-((score - SCORE_MEAN) ** 2) / (2 * SCORE_STDDEV ** 2))
+               for score in range(max_score + 1)]
+    if max_score >= 1:
+        weights[1] = 0.0
+    return weights
+
+
+class MondayScenarioEngine:
+    """Who can still win the week, and with which Monday Night scores"""
+
+    def __init__(self, db_path: str = DATABASE_PATH, max_score: int = SCORE_MAX):
+        self.db_path = db_path
+        self.max_score = max_score
+
+    def _load_week(self, week: int, year: int) -> Optional[Dict[str, Any]]:
+        """Players, current wins, unfinished games and the tiebreaker game's picks"""
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, home_team, away_team, home_score, away_score, is_final,
+                       kickoff_utc, slot
+                FROM nfl_games
+                WHERE week = ? AND year = ?
+                ORDER BY game_date, id
+            ''', (week, year))
+            games = cursor.fetchall()
+
+            cursor.execute('''
+                SELECT up.user_id, u.username, up.game_id, up.selected_team,
+                       up.predicted_home_score, up.predicted_away_score,
+                       up.is_correct, up.created_at
+                FROM user_picks up
+                JOIN nfl_games g ON up.game_id = g.id
+                JOIN users u ON up.user_id = u.id
+                WHERE g.week = ? AND g.year = ? AND u.is_admin = 0
+                ORDER BY up.id
+            ''', (week, year))
+            picks = cursor.fetchall()
+        finally:
+            conn.close()
+
+        if not games or not picks:
+            return None
+
+        games_by_id = {game[0]: game for game in games}
+
+        # Tiebreaker game: the same Monday Night game the weekly rankings use
+        monday_game = pick_monday_night_game([{'id': game[0], 'kickoff_utc': game[6], 'slot': game[7]}
+                                              for game in games])
+        tiebreaker = games_by_id[monday_game['id']] if monday_game else None
+
+        players: Dict[int, Dict[str, Any]] = {}
+        for user_id, username, game_id, selected_team, pred_home, pred_away, is_correct, created_at in picks:
+            player = players.setdefault(user_id, {
+                'user_id': user_id,
+                'username': username,
+                'wins': 0,
+                'tiebreaker_win': False,
+                'earliest_pick': created_at or '9999-12-31 23:59:59',
+                'picks': {},
+                'tiebreaker_pick': None
+            })
+            if created_at and created_at < player['earliest_pick']:
+                player['earliest_pick'] = created_at
+            game = games_by_id[game_id]
+            if tiebreaker and game_id == tiebreaker[0]:
+                # The evaluators add the tiebreaker win themselves (tiebreaker_correct),
+                # final or not, so it never counts in wins
+                if player['tiebreaker_pick'] is None:
+                    player['tiebreaker_pick'] = (selected_team, pred_home or 0, pred_away or 0)
+                    player['tiebreaker_win'] = game[5] == 1 and is_correct == 1
+            elif game[5] == 1:
+                if is_correct == 1:
+                    player['wins'] += 1
+            else:
+                player['picks'][game_id] = selected_team
+
+        # Array order doubles as the last tiebreakers: earliest submission, then username
+        ordered = sorted(players.values(), key=lambda p: (p['earliest_pick'], p['username']))
+
+        other_games = [game for game in games
+                       if game[5] != 1 and (tiebreaker is None or game[0] != tiebreaker[0])]
+        return {
+            'players': ordered,
+            'other_games': [{'id': game[0], 'home_team': game[1], 'away_team': game[2]} for game in other_games],
+            'tiebreaker': None if tiebreaker is None else {
+                'id': tiebreaker[0],
+                'home_team': tiebreaker[1],
+                'away_team': tiebreaker[2],
+                'home_score': tiebreaker[3],
+                'away_score': tiebreaker[4],
+                'is_final': tiebreaker[5] == 1
+            }
+        }
+
+    def _score_grid(self, tiebreaker: Optional[Dict[str, Any]]) -> List[Tuple[int, int, float]]:
+        """(home, away, probability) for every tiebreaker final score still possible"""
+        if tiebreaker is None:
+            return [(0, 0, 1.0)]
+        if tiebreaker['is_final']:
+            return [(tiebreaker['home_score'] or 0, tiebreaker['away_score'] or 0, 1.0)]
+
+        weights = _score_weights(self.max_score)
+        cells = [(home, away, weights[home] * weights[away])
+                 for home in range(self.max_score + 1)
+                 for away in range(self.max_score + 1)
+                 if home != away and weights[home] * weights[away] > 0]
+        total = sum(weight for _, _, weight in cells)
+        return [(home, away, weight / total) for home, away, weight in cells]
+
+    @staticmethod
+    def _outcome_combinations(game_count: int, seed: int,
+                              limit: int = MAX_OUTCOME_COMBINATIONS) -> List[Tuple[Tuple[bool, ...], float]]:
+        """Home-win flags for each other game, with their probability (each side 50/50)"""
+        if game_count == 0:
+            return [((), 1.0)]
+        if 2 ** game_count <= limit:
+            probability = 1.0 / (2 ** game_count)
+            return [(combo, probability) for combo in product((True, False), repeat=game_count)]
+
+        rng = random.Random(seed)
+        probability = 1.0 / limit
+        return [(tuple(rng.random() < 0.5 for _ in range(game_count)), probability)
+                for _ in range(limit)]
+
+    @staticmethod
+    def _extra_wins(data: Dict[str, Any], combos) -> np.ndarray:
+        """Wins each player adds from the other games (one row per outcome combination)"""
+        players, games = data['players'], data['other_games']
+        home_wins = np.array([combo for combo, _ in combos], dtype=bool).reshape(len(combos), len(games))
+        picked_home = np.array([[player['picks'].get(game['id']) == game['home_team'] for game in games]
+                                for player in players], dtype=np.int64).reshape(len(players), len(games))
+        picked_away = np.array([[player['picks'].get(game['id']) == game['away_team'] for game in games]
+                                for player in players], dtype=np.int64).reshape(len(players), len(games))
+        return home_wins.astype(np.int64) @ picked_home.T + (~home_wins).astype(np.int64) @ picked_away.T
+
+    def _evaluate(self, data, home, away, combos, extra_wins) -> np.ndarray:
+        """Winner probability of each player in each cell, over every outcome combination
+
+        Within the cells one side of the tiebreaker wins, a combination fixes
+        every player's win total, so combinations collapse to the distinct
+        groups of players tied on most wins and only those groups are ranked on
+        the tiebreaker for the whole grid.
+        """
+        players = data['players']
+        tiebreaker = data['tiebreaker'] or {'home_team': None, 'away_team': None}
+        user_count = len(players)
+
+        has_pick = np.array([p['tiebreaker_pick'] is not None for p in players])
+        picked_home = np.array([bool(p['tiebreaker_pick']) and p['tiebreaker_pick'][0] == tiebreaker['home_team']
+                                for p in players])
+        picked_away = np.array([bool(p['tiebreaker_pick']) and p['tiebreaker_pick'][0] == tiebreaker['away_team']
+                                for p in players])
+        pred_home = np.array([p['tiebreaker_pick'][1] if p['tiebreaker_pick'] else 0 for p in players],
+                             dtype=np.int64)[:, None]
+        pred_away = np.array([p['tiebreaker_pick'][2] if p['tiebreaker_pick'] else 0 for p in players],
+                             dtype=np.int64)[:, None]
+
+        home_wins = home > away
+        away_wins = away > home
+        tiebreaker_correct = (home_wins[None, :] & picked_home[:, None]) | (away_wins[None, :] & picked_away[:, None])
+        total_diff = np.abs((pred_home + pred_away) - (home + away)[None, :])
+        winner_diff = np.where(away_wins[None, :], np.abs(pred_away - away), np.abs(pred_home - home))
+        loser_diff = np.where(away_wins[None, :], np.abs(pred_home - home), np.abs(pred_away - away))
+        total_diff, winner_diff, loser_diff = (
+            np.where(has_pick[:, None], np.minimum(diff, DIFF_CAP), DIFF_CAP)
+            for diff in (total_diff, winner_diff, loser_diff)
+        )
+
+        # Ties on the full key go to the earlier player in array order (argmin keeps the first)
+        span = DIFF_CAP + 1
+        tiebreak_key = (((~tiebreaker_correct).astype(np.int64) * span + total_diff) * span
+                        + winner_diff) * span + loser_diff
+
+        base_wins = np.array([p['wins'] for p in players], dtype=np.int64)
+        combo_probability = np.array([probability for _, probability in combos], dtype=np.float64)
+        cell_probability = np.zeros((user_count, len(home)), dtype=np.float64)
+
+        for side_cells, side_correct in ((home_wins, picked_home), (away_wins, picked_away),
+                                         (home == away, np.zeros(user_count, dtype=bool))):
+            columns = np.flatnonzero(side_cells)
+            if columns.size == 0:
+                continue
+            wins = extra_wins + (base_wins + side_correct)[None, :]
+            leaders = wins == wins.max(axis=1, keepdims=True)
+            groups: Dict[bytes, List[int]] = {}
+            for combo_index, packed in enumerate(np.packbits(leaders, axis=1)):
+                groups.setdefault(packed.tobytes(), []).append(combo_index)
+            side_keys = tiebreak_key[:, columns]
+            for combo_indexes in groups.values():
+                candidates = np.flatnonzero(leaders[combo_indexes[0]])
+                probability = combo_probability[combo_indexes].sum()
+                winner = candidates[np.argmin(side_keys[candidates], axis=0)]
+                cell_probability[winner, columns] += probability
+
+        return cell_probability
+
+    @staticmethod
+    def _summarize_regions(home: np.ndarray, away: np.ndarray, cell_probability: np.ndarray,
+                           tiebreaker: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score ranges (per winning side) where a player is the favourite to win"""
+        if tiebreaker is None:
+            return []
+
+        regions = []
+        favourite = cell_probability >= 0.5
+        for team, side_cells in ((tiebreaker['home_team'], home > away), (tiebreaker['away_team'], away > home)):
+            cells = favourite & side_cells
+            if not cells.any():
+                continue
+            home_scores, away_scores = home[cells], away[cells]
+            margins = np.abs(home_scores - away_scores)
+            totals = home_scores + away_scores
+            regions.append({
+                'winning_team': team,
+                'cells': int(cells.sum()),
+                'home_score': [int(home_scores.min()), int(home_scores.max())],
+                'away_score': [int(away_scores.min()), int(away_scores.max())],
+                'margin': [int(margins.min()), int(margins.max())],
+                'total_points': [int(totals.min()), int(totals.max())]
+            })
+        return regions
+
+    def simulate(self, week: int, year: int) -> Dict[str, Any]:
+        """Win probability and winning score regions for every player in the week"""
+        data = self._load_week(week, year)
+        if data is None:
+            return {'error': 'No picks found for this week'}
+
+        fingerprint = hash(repr(data))
+        cache_key = (self.db_path, week, year)
+        cached = _simulation_cache.get(cache_key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        grid = self._score_grid(data['tiebreaker'])
+        home = np.array([cell[0] for cell in grid], dtype=np.int64)
+        away = np.array([cell[1] for cell in grid], dtype=np.int64)
+        weight = np.array([cell[2] for cell in grid], dtype=np.float64)
+
+        combos = self._outcome_combinations(len(data['other_games']), seed=year * 100 + week)
+        extra_wins = self._extra_wins(data, combos)
+        cell_probability = self._evaluate(data, home, away, combos, extra_wins)
+
+        win_probabilities = cell_probability @ weight
+        best_cells = np.argmax(cell_probability * weight[None, :], axis=1)
+        players = []
+        for player, probabilities, win_probability, best_cell in zip(
+                data['players'], cell_probability, win_probabilities.tolist(), best_cells.tolist()):
+            players.append({
+                'user_id': player['user_id'],
+                'username': player['username'],
+                'current_wins': player['wins'] + (1 if player['tiebreaker_win'] else 0),
+                'win_probability': round(win_probability, 4),
+                'can_win': win_probability > 0,
+                'best_score': ({'home': grid[best_cell][0], 'away': grid[best_cell][1]}
+                               if probabilities[best_cell] > 0 else None),
+                'regions': self._summarize_regions(home, away, probabilities, data['tiebreaker'])
+            })
+
+        players.sort(key=lambda p: (-p['win_probability'], -p['current_wins'], p['username']))
+
+        tiebreaker = data['tiebreaker']
+        result = {
+            'week': week,
+            'year': year,
+            'tiebreaker_game': (None if tiebreaker is None else
+                                f"{tiebreaker['away_team']} @ {tiebreaker['home_team']}"),
+            'tiebreaker_final': bool(tiebreaker and tiebreaker['is_final']),
+            'remaining_games': len(data['other_games']) + (1 if tiebreaker and not tiebreaker['is_final'] else 0),
+            'scenarios_evaluated': len(grid) * len(combos),
+            'outcomes_sampled': 2 ** len(data['other_games']) > MAX_OUTCOME_COMBINATIONS,
+            'players': players,
+            'contenders': [p for p in players if p['can_win']]
+        }
+
+        with _simulation_cache_lock:
+            _simulation_cache[cache_key] = (fingerprint, result)
+        return result
+
+
+def simulate_monday_scenarios(week: int, year: int, db_path: str = DATABASE_PATH) -> Dict[str, Any]:
+    """Convenience wrapper around MondayScenarioEngine.simulate"""
+    try:
+        return MondayScenarioEngine(db_path).simulate(week, year)
+    except Exception as e:
+        logger.error(f"Error simulating Monday scenarios for Week {week}, {year}: {e}")
+        return {'error': str(e)}
@@ -3,12 +3,16 @@ Database models for NFL Fantasy League
 """
 from __future__ import annotations
 
+import os
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from werkzeug.security import generate_password_hash, check_password_hash
 from config import Config
+from request_metrics import trace_connection, connection_released
 
 @dataclass
 class User:
@@ -74,12 +78,222 @@ class WeeklyResult:
     is_winner: bool = False
     points: int = 0
 
+class PooledConnection:
+    """
+    Wrapper around a pooled sqlite3 connection.
+    Behaves like sqlite3.Connection, but close() hands the connection back
+    to the pool instead of closing it, so existing connect/close code keeps working.
+    """
+
+    def __init__(self, pool: ConnectionPool, raw: sqlite3.Connection):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_raw', raw)
+
+    def __getattr__(self, name):
+        raw = object.__getattribute__(self, '_raw')
+        if raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(raw, name)
+
+    def __setattr__(self, name, value):
+        raw = object.__getattribute__(self, '_raw')
+        if raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        setattr(raw, name, value)
+
+    def __enter__(self):
+        # Same transaction semantics as sqlite3.Connection: commit/rollback, no close
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._raw.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def raw_connection(self) -> sqlite3.Connection:
+        """Underlying sqlite3 connection (for APIs like Connection.backup)"""
+        return self._raw
+
+    def close(self) -> None:
+        raw = object.__getattribute__(self, '_raw')
+        if raw is not None:
+            object.__setattr__(self, '_raw', None)
+            self._pool.release(raw)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """
+    Thread-safe pool of SQLite connections for one database file.
+    PRAGMAs are applied once when a connection is opened; connections are
+    reused LIFO so a thread that releases and re-acquires gets the same warm connection.
+    """
+
+    def __init__(self, db_path: str, max_connections: int = None, wait_seconds: float = None):
+        self.db_path = db_path
+        self.max_connections = max_connections or Config.DB_POOL_SIZE
+        self.wait_seconds = Config.DB_POOL_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        self._idle: List[sqlite3.Connection] = []
+        self._condition = threading.Condition()
+        self._open_count = 0
+        self._in_use = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'waits': 0,
+            'wait_seconds_total': 0.0,
+            'overflow': 0,
+            'peak_in_use': 0,
+            'rollbacks_on_release': 0
+        }
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute(f'PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}')
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA cache_size = -{int(Config.DB_CACHE_SIZE_KB)}')
+        conn.execute(f'PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        trace_connection(conn)
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, waiting briefly if the pool is exhausted"""
+        raw = None
+        with self._condition:
+            if not self._idle and self._open_count >= self.max_connections:
+                self._stats['waits'] += 1
+                wait_start = time.monotonic()
+                self._condition.wait_for(lambda: self._idle, timeout=self.wait_seconds)
+                self._stats['wait_seconds_total'] += time.monotonic() - wait_start
+
+            if self._idle:
+                raw = self._idle.pop()
+                self._stats['hits'] += 1
+            else:
+                # Nothing idle: open a new one (past the limit counts as overflow
+                # so nested checkouts in one thread can never deadlock)
+                self._stats['misses'] += 1
+                if self._open_count >= self.max_connections:
+                    self._stats['overflow'] += 1
+                self._open_count += 1
+
+            self._in_use += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+
+        if raw is None:
+            try:
+                raw = self._open_connection()
+            except Exception:
+                with self._condition:
+                    self._open_count -= 1
+                    self._in_use -= 1
+                raise
+
+        return PooledConnection(self, raw)
+
+    def release(self, raw: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding any uncommitted work"""
+        connection_released()
+        keep = True
+        try:
+            if raw.in_transaction:
+                raw.rollback()
+                with self._condition:
+                    self._stats['rollbacks_on_release'] += 1
+            raw.row_factory = None
+            raw.isolation_level = ''
+        except sqlite3.Error:
+            keep = False
+
+        with self._condition:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.max_connections:
+                self._idle.append(raw)
+                self._condition.notify()
+                return
+            self._open_count -= 1
+
+        try:
+            raw.close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self) -> int:
+        """Close idle connections, e.g. after the database file was replaced"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open_count -= len(idle)
+        for raw in idle:
+            try:
+                raw.close()
+            except sqlite3.Error:
+                pass
+        return len(idle)
+
+    def get_stats(self) -> Dict:
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                'db_path': self.db_path,
+                'max_connections': self.max_connections,
+                'open_connections': self._open_count,
+                'idle_connections': len(self._idle),
+                'in_use': self._in_use
+            })
+        return stats
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def _pool_key(db_path: str) -> str:
+    if db_path == ':memory:' or db_path.startswith('file:'):
+        return db_path
+    return os.path.abspath(db_path)
+
+def get_connection_pool(db_path: str = None) -> ConnectionPool:
+    """Get (or create) the shared pool for a database file"""
+    key = _pool_key(db_path or Config.DATABASE_PATH)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key)
+                _pools[key] = pool
+    return pool
+
+def get_pooled_connection(db_path: str = None, row_factory=None) -> PooledConnection:
+    """Drop-in replacement for sqlite3.connect(db_path) backed by the shared pool"""
+    conn = get_connection_pool(db_path).acquire()
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
+
+def get_pool_stats() -> List[Dict]:
+    """Stats for every pool in this process"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
+
+def close_all_pools() -> int:
+    """Close idle pooled connections for every database"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return sum(pool.close_all() for pool in pools)
+
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DATABASE_PATH
-    
-    def get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        self.pool = get_connection_pool(self.db_path)
+
+    def get_connection(self) -> PooledConnection:
+        conn = self.pool.acquire()
         conn.row_factory = sqlite3.Row  # Enable dict-like access
         return conn
     
@@ -157,17 +371,21 @@ class GameRepository:
         self.db = db_manager
     
     def create_game(self, game: NFLGame) -> int:
+        from game_slots import game_time_fields  # game_slots imports this module
+        kickoff_utc, slot = game_time_fields(game.game_date) if game.game_date else (None, None)
         query = '''
             INSERT OR REPLACE INTO nfl_games 
             (game_id, week, year, home_team, away_team, game_date, 
-             is_monday_night, is_thursday_night, home_score, away_score, is_final)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             is_monday_night, is_thursday_night, home_score, away_score, is_final,
+             kickoff_utc, slot)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         '''
         return self.db.execute_insert(query, (
             game.game_id, game.week, game.year, game.home_team, game.away_team,
             game.game_date.isoformat() if game.game_date else None,
             game.is_monday_night, game.is_thursday_night,
-            game.home_score, game.away_score, game.is_final
+            game.home_score, game.away_score, game.is_final,
+            kickoff_utc, slot
         ))
     
     def get_games_by_week(self, week: int, year: int) -> List[NFLGame]:
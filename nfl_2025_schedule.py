@@ -292,6 +292,7 @@ def import_2025_schedule_to_db():
     """Import the complete 2025 schedule to database"""
     import sqlite3
     from app import get_db
+    from game_slots import refresh_game_slots
     
     schedule = get_2025_nfl_schedule()
     total_games = 0
@@ -324,6 +325,7 @@ def import_2025_schedule_to_db():
                 ))
                 total_games += 1
         
+        refresh_game_slots(cursor, year=2025)
         conn.commit()
         conn.close()
         
@@ -7,6 +7,7 @@ Calculates the current NFL week based on game completion status and dates
 import sqlite3
 from datetime import datetime, timedelta
 import pytz
+from models import get_pooled_connection
 
 
 def get_current_nfl_week(year=2025):
@@ -36,7 +37,7 @@ def get_current_nfl_week_original(year=2025):
         calendar_week = get_calendar_week_with_boundaries(current_time, year)
         
         # Connect to database to validate
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -173,7 +174,7 @@ if __name__ == "__main__":
     
     # Test with database check
     try:
-        conn = sqlite3.connect('nfl_fantasy.db')
+        conn = get_pooled_connection('nfl_fantasy.db')
         cursor = conn.cursor()
         
         cursor.execute('''
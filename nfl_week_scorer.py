@@ -7,6 +7,7 @@ Handles complete week scoring including tiebreaker analysis for Monday Night Foo
 import sqlite3
 from datetime import datetime
 from typing import List, Tuple, Dict, Optional
+from weekly_winners import WeeklyWinnerEngine
 
 
 class NFLWeekScorer:
@@ -151,85 +152,43 @@ class NFLWeekScorer:
         
         print(f"\n=== RESOLVING TIEBREAKER FOR WEEK {week} ===")
         
-        # Find Monday Night Football game for tiebreaker (HOU @ SEA for Week 7)
-        cursor.execute('''
-            SELECT id, away_team, home_team, away_score, home_score
-            FROM nfl_games 
-            WHERE week = ? AND year = ? AND away_team = 'HOU' AND home_team = 'SEA'
-            AND is_final = 1
-            LIMIT 1
-        ''', (week, year))
+        # The week's actual Monday Night game and the league tiebreaker rules
+        # come from the weekly winner engine
+        results = WeeklyWinnerEngine(self.db_path).get_week_results(week, year)
+        tied_user_ids = {user['user_id'] for user in tied_users}
+        candidates = [entry for entry in results
+                      if entry['user_id'] in tied_user_ids and entry['monday_tiebreaker'].get('has_pick')]
         
-        mnf_game = cursor.fetchone()
-        if not mnf_game:
-            print("⚠️  No completed Monday Night Football game found for tiebreaker")
+        if not candidates or not candidates[0]['monday_tiebreaker'].get('is_final'):
+            print("⚠️  No completed Monday Night Football game or tiebreaker predictions for tied users")
             return None
         
-        game_id = mnf_game['id']
-        actual_away = mnf_game['away_score']
-        actual_home = mnf_game['home_score']
-        actual_total = actual_away + actual_home
-        
-        print(f"MNF Tiebreaker Game: {mnf_game['away_team']} @ {mnf_game['home_team']}")
-        print(f"Actual Score: {mnf_game['away_team']} {actual_away} - {mnf_game['home_team']} {actual_home}")
-        print(f"Actual Total: {actual_total}")
-        
-        # Get tiebreaker predictions from tied users
-        tied_user_ids = [user['user_id'] for user in tied_users]
-        placeholders = ','.join('?' * len(tied_user_ids))
-        
-        cursor.execute(f'''
-            SELECT u.username, u.id as user_id,
-                   p.predicted_away_score, p.predicted_home_score
-            FROM users u
-            JOIN user_picks p ON u.id = p.user_id
-            WHERE p.game_id = ? AND u.id IN ({placeholders})
-            AND p.predicted_away_score IS NOT NULL 
-            AND p.predicted_home_score IS NOT NULL
-        ''', [game_id] + tied_user_ids)
-        
-        tiebreaker_predictions = cursor.fetchall()
-        
-        if not tiebreaker_predictions:
-            print("⚠️  No tiebreaker predictions found from tied users")
-            return None
+        tiebreaker = candidates[0]['monday_tiebreaker']
+        print(f"MNF Tiebreaker Game: {tiebreaker['away_team']} @ {tiebreaker['home_team']}")
+        print(f"Actual Score: {tiebreaker['away_team']} {tiebreaker['actual_away']} - "
+              f"{tiebreaker['home_team']} {tiebreaker['actual_home']}")
         
         print(f"\n📊 TIEBREAKER PREDICTIONS:")
+        for entry in candidates:
+            data = entry['monday_tiebreaker']
+            print(f"  {entry['username']}: Predicted {data['predicted_away']}-{data['predicted_home']} "
+                  f"(Total diff: {data['total_diff']}, Winner diff: {data['winner_diff']}, "
+                  f"Loser diff: {data['loser_diff']})")
+        
+        best = candidates[0]
+        data = best['monday_tiebreaker']
+        best_prediction = {
+            'username': best['username'],
+            'user_id': best['user_id'],
+            'predicted_away': data['predicted_away'],
+            'predicted_home': data['predicted_home'],
+            'predicted_total': data['predicted_away'] + data['predicted_home'],
+            'total_difference': data['total_diff'],
+            'combined_difference': data['home_diff'] + data['away_diff']
+        }
         
-        best_prediction = None
-        best_diff = float('inf')
-        
-        for pred in tiebreaker_predictions:
-            username = pred['username']
-            pred_away = pred['predicted_away_score']
-            pred_home = pred['predicted_home_score']
-            pred_total = pred_away + pred_home
-            
-            # Calculate differences
-            away_diff = abs(actual_away - pred_away)
-            home_diff = abs(actual_home - pred_home)
-            total_diff = abs(actual_total - pred_total)
-            combined_diff = away_diff + home_diff
-            
-            print(f"  {username}: Predicted {pred_away}-{pred_home} (Total: {pred_total})")
-            print(f"    Differences: Away {away_diff}, Home {home_diff}, Total {total_diff}")
-            
-            # Use total score difference as primary tiebreaker
-            if total_diff < best_diff:
-                best_diff = total_diff
-                best_prediction = {
-                    'username': username,
-                    'user_id': pred['user_id'],
-                    'predicted_away': pred_away,
-                    'predicted_home': pred_home,
-                    'predicted_total': pred_total,
-                    'total_difference': total_diff,
-                    'combined_difference': combined_diff
-                }
-        
-        if best_prediction:
-            print(f"\n🏆 TIEBREAKER WINNER: {best_prediction['username']}")
-            print(f"   Closest total score prediction (difference: {best_prediction['total_difference']})")
+        print(f"\n🏆 TIEBREAKER WINNER: {best_prediction['username']}")
+        print(f"   Closest total score prediction (difference: {best_prediction['total_difference']})")
             
         return best_prediction
     
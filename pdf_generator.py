@@ -13,6 +13,8 @@ from datetime import datetime
 import sqlite3
 from typing import List, Dict, Any
 import io
+from models import get_pooled_connection
+from game_views import get_week_game_views
 
 class WeeklyDashboardPDF:
     """Generate PDF reports for weekly fantasy league dashboard"""
@@ -41,7 +43,7 @@ class WeeklyDashboardPDF:
 
     def get_weekly_data(self, week: int, year: int) -> Dict[str, Any]:
         """Get all data needed for weekly dashboard PDF"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -82,35 +84,34 @@ class WeeklyDashboardPDF:
         
         leaderboard = [dict(row) for row in cursor.fetchall()]
         
-        # Get game status summary
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_games,
-                COUNT(CASE WHEN is_final = 1 THEN 1 END) as final_games,
-                COUNT(CASE WHEN is_final = 0 THEN 1 END) as pending_games
-            FROM nfl_games 
-            WHERE week = ? AND year = ?
-        ''', (week, year))
-        
-        game_summary = dict(cursor.fetchone())
-        
-        # Get individual game results
-        cursor.execute('''
-            SELECT away_team, home_team, away_score, home_score, game_status, is_final,
-                   CASE 
-                       WHEN is_thursday_night = 1 THEN 'Thursday Night'
-                       WHEN is_monday_night = 1 THEN 'Monday Night'
-                       WHEN is_sunday_night = 1 THEN 'Sunday Night'
-                       ELSE 'Regular'
-                   END as game_type
-            FROM nfl_games 
-            WHERE week = ? AND year = ?
-            ORDER BY game_date
-        ''', (week, year))
+        conn.close()
         
-        games = [dict(row) for row in cursor.fetchall()]
+        # Game list and status summary come from the per-week view cache
+        games = []
+        for view in get_week_game_views(week, year, self.db_path):
+            if view.get('is_thursday_night') == 1:
+                game_type = 'Thursday Night'
+            elif view.get('is_monday_night') == 1:
+                game_type = 'Monday Night'
+            elif view.get('is_sunday_night') == 1:
+                game_type = 'Sunday Night'
+            else:
+                game_type = 'Regular'
+            games.append({
+                'away_team': view['away_team'],
+                'home_team': view['home_team'],
+                'away_score': view['away_score'],
+                'home_score': view['home_score'],
+                'game_status': view.get('game_status'),
+                'is_final': view['is_final'],
+                'game_type': game_type
+            })
         
-        conn.close()
+        game_summary = {
+            'total_games': len(games),
+            'final_games': sum(1 for game in games if game['is_final'] == 1),
+            'pending_games': sum(1 for game in games if game['is_final'] == 0)
+        }
         
         return {
             'leaderboard': leaderboard,
@@ -0,0 +1,186 @@
+"""
+Pick correctness engine for NFL Fantasy League
+Scores user_picks for finalized games with one set-based UPDATE per batch and
+records a per-game watermark (game_scoring_state) holding the final score each
+game was scored against, so a game is only rescored when its final score
+changes or it gains picks that have not been scored yet.
+
+Usage:
+    python pick_correctness.py            # score every pending final game
+    python pick_correctness.py --force    # rescore every final game
+"""
+
+import sys
+import logging
+from typing import Iterable, List, Optional, Tuple
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Stay well below SQLite's host parameter limit for IN (...) lookups
+MAX_IN_PARAMS = 500
+
+# 1 when the pick matches the winner of its (final) game; ties score 0 for everyone
+PICK_RESULT_SQL = '''(
+    SELECT CASE
+        WHEN g.home_score > g.away_score AND user_picks.selected_team = g.home_team THEN 1
+        WHEN g.away_score > g.home_score AND user_picks.selected_team = g.away_team THEN 1
+        ELSE 0
+    END
+    FROM nfl_games g
+    WHERE g.id = user_picks.game_id
+)'''
+
+GAME_SCORING_STATE_SQL = '''
+    CREATE TABLE IF NOT EXISTS game_scoring_state (
+        game_id INTEGER PRIMARY KEY,
+        home_score INTEGER,
+        away_score INTEGER,
+        winning_team TEXT,
+        picks_scored INTEGER DEFAULT 0,
+        scored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (game_id) REFERENCES nfl_games (id)
+    )
+'''
+
+
+def create_game_scoring_state_table_if_not_exists(db_path: str = DATABASE_PATH) -> bool:
+    """Ensure the game_scoring_state watermark table exists"""
+    conn = get_pooled_connection(db_path)
+    try:
+        conn.execute(GAME_SCORING_STATE_SQL)
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
+
+def _chunks(game_ids: List[int]):
+    for start in range(0, len(game_ids), MAX_IN_PARAMS):
+        yield game_ids[start:start + MAX_IN_PARAMS]
+
+
+def _has_points_column(cursor) -> bool:
+    cursor.execute('PRAGMA table_info(user_picks)')
+    return any(row[1] == 'points_earned' for row in cursor.fetchall())
+
+
+def find_pending_games(cursor, game_ids: Optional[Iterable[int]] = None, force: bool = False) -> List[int]:
+    """
+    Final games that need scoring: never scored, final score changed since the
+    watermark, or holding picks with no is_correct value yet.
+    game_ids=None checks every game; force=True returns every final game.
+    """
+    pending_sql = '''
+        SELECT g.id
+        FROM nfl_games g
+        LEFT JOIN game_scoring_state s ON s.game_id = g.id
+        WHERE g.is_final = 1
+        AND g.home_score IS NOT NULL AND g.away_score IS NOT NULL
+        AND (? = 1
+             OR s.game_id IS NULL
+             OR s.home_score IS NOT g.home_score
+             OR s.away_score IS NOT g.away_score
+             OR EXISTS (SELECT 1 FROM user_picks up
+                        WHERE up.game_id = g.id AND up.is_correct IS NULL))
+        {id_filter}
+        ORDER BY g.id
+    '''
+
+    if game_ids is None:
+        cursor.execute(pending_sql.format(id_filter=''), (1 if force else 0,))
+        return [row[0] for row in cursor.fetchall()]
+
+    game_ids = sorted({int(game_id) for game_id in game_ids if game_id is not None})
+    pending = []
+    for chunk in _chunks(game_ids):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(pending_sql.format(id_filter=f'AND g.id IN ({placeholders})'),
+                       [1 if force else 0] + chunk)
+        pending.extend(row[0] for row in cursor.fetchall())
+    return pending
+
+
+def score_games_with_cursor(cursor, game_ids: Optional[Iterable[int]] = None,
+                            force: bool = False) -> Tuple[List[int], int]:
+    """
+    Score pending games inside the caller's transaction (the caller commits).
+    Returns (scored game ids, picks updated).
+    """
+    cursor.execute(GAME_SCORING_STATE_SQL)
+    pending = find_pending_games(cursor, game_ids, force)
+    if not pending:
+        return [], 0
+
+    assignments = f'is_correct = {PICK_RESULT_SQL}'
+    if _has_points_column(cursor):
+        assignments += f', points_earned = {PICK_RESULT_SQL}'
+
+    picks_updated = 0
+    for chunk in _chunks(pending):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f'''
+            UPDATE user_picks
+            SET {assignments}
+            WHERE game_id IN ({placeholders})
+        ''', chunk)
+        picks_updated += cursor.rowcount
+
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO game_scoring_state
+                (game_id, home_score, away_score, winning_team, picks_scored, scored_at)
+            SELECT g.id, g.home_score, g.away_score,
+                   CASE WHEN g.home_score > g.away_score THEN g.home_team
+                        WHEN g.away_score > g.home_score THEN g.away_team
+                        ELSE NULL END,
+                   (SELECT COUNT(*) FROM user_picks up WHERE up.game_id = g.id),
+                   CURRENT_TIMESTAMP
+            FROM nfl_games g
+            WHERE g.id IN ({placeholders})
+        ''', chunk)
+
+    return pending, picks_updated
+
+
+def score_finalized_games(game_ids: Optional[Iterable[int]] = None, db_path: str = DATABASE_PATH,
+                          force: bool = False, refresh_standings: bool = True) -> int:
+    """
+    Score picks for the given finalized games (every pending final game when None)
+    and refresh season standings for the players involved. Returns picks updated.
+    """
+    if game_ids is not None:
+        game_ids = [game_id for game_id in game_ids if game_id is not None]
+        if not game_ids:
+            return 0
+
+    try:
+        conn = get_pooled_connection(db_path)
+        try:
+            cursor = conn.cursor()
+            scored_ids, picks_updated = score_games_with_cursor(cursor, game_ids, force)
+            conn.commit()
+        finally:
+            conn.close()
+
+        if not scored_ids:
+            return 0
+
+        logger.info(f"Scored {picks_updated} picks on {len(scored_ids)} finalized games")
+
+        if refresh_standings:
+            from season_standings import refresh_standings_for_games
+            refresh_standings_for_games(scored_ids, db_path)
+
+        return picks_updated
+
+    except Exception as e:
+        logger.error(f"Error scoring finalized games {game_ids}: {e}")
+        return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    count = score_finalized_games(force='--force' in sys.argv)
+    print(f"✅ Scored {count} picks")
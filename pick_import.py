@@ -0,0 +1,411 @@
+"""
+CSV pick import for NFL Fantasy League
+Streams an uploaded CSV, resolves every row in memory against one user map
+and one ordered games list, diffs the result against existing picks, and
+writes all changes with a single executemany inside one transaction.
+
+Two layouts are supported:
+- wide: header row of usernames, one row per game in schedule order
+  (rows map onto the selected week's games, or the whole season's games
+  ordered by week/kickoff when no week is given)
+- long: username, game_id, selected_team, predicted_home_score,
+  predicted_away_score columns for a single week
+"""
+
+import csv
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from werkzeug.security import generate_password_hash
+
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Stay well below SQLite's host parameter limit for IN (...) lookups
+MAX_IN_PARAMS = 500
+# Changes listed individually in a dry-run diff
+MAX_DIFF_ENTRIES = 50
+DEFAULT_PASSWORD = 'changeme123'
+
+UPSERT_PICK_SQL = '''
+    INSERT INTO user_picks
+    (user_id, game_id, selected_team, predicted_home_score, predicted_away_score, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, game_id) DO UPDATE SET
+        selected_team = excluded.selected_team,
+        predicted_home_score = COALESCE(excluded.predicted_home_score, user_picks.predicted_home_score),
+        predicted_away_score = COALESCE(excluded.predicted_away_score, user_picks.predicted_away_score),
+        is_correct = NULL
+'''
+
+
+def _chunks(values: List[Any], size: int = MAX_IN_PARAMS) -> Iterator[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _parse_score(value: str) -> Tuple[Optional[int], bool]:
+    """(score, ok) for an optional integer cell"""
+    value = (value or '').strip()
+    if not value:
+        return None, True
+    try:
+        return int(value), True
+    except ValueError:
+        return None, False
+
+
+class PickImportPipeline:
+    """Validates a CSV of picks in memory and applies it in one transaction"""
+
+    def __init__(self, db_path: str = DATABASE_PATH):
+        self.db_path = db_path
+
+    def _load_users(self, cursor) -> Dict[str, Tuple[int, str]]:
+        """Case-folded username -> (id, username)"""
+        cursor.execute('SELECT id, username FROM users')
+        return {row[1].casefold(): (row[0], row[1]) for row in cursor.fetchall()}
+
+    def _load_games(self, cursor, year: int, week: Optional[int] = None) -> List[sqlite3.Row]:
+        """The week's games (or the season's) in schedule order"""
+        if week is not None:
+            cursor.execute('''
+                SELECT id, week, year, home_team, away_team FROM nfl_games
+                WHERE week = ? AND year = ?
+                ORDER BY game_date, id
+            ''', (week, year))
+        else:
+            cursor.execute('''
+                SELECT id, week, year, home_team, away_team FROM nfl_games
+                WHERE year = ?
+                ORDER BY week, game_date, id
+            ''', (year,))
+        return cursor.fetchall()
+
+    def _load_existing_picks(self, cursor, game_ids: Iterable[int]) -> Dict[Tuple[int, int], Tuple]:
+        """(user_id, game_id) -> (selected_team, predicted_home, predicted_away)"""
+        existing = {}
+        for chunk in _chunks(sorted(set(game_ids))):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT user_id, game_id, selected_team, predicted_home_score, predicted_away_score
+                FROM user_picks WHERE game_id IN ({placeholders})
+            ''', chunk)
+            for row in cursor.fetchall():
+                existing[(row[0], row[1])] = (row[2], row[3], row[4])
+        return existing
+
+    @staticmethod
+    def _new_plan(layout: str) -> Dict[str, Any]:
+        return {
+            'layout': layout,
+            'total_rows': 0,
+            'picks': [],
+            'empty_picks': 0,
+            'users_found': set(),
+            'missing_users': set(),
+            'errors': [],
+            'warnings': []
+        }
+
+    @staticmethod
+    def _canonical_team(game, team: str) -> Optional[str]:
+        """The game's own spelling of a picked team, or None if it isn't playing"""
+        team = team.strip().upper()
+        for candidate in (game['away_team'], game['home_team']):
+            if candidate.upper() == team:
+                return candidate
+        return None
+
+    def plan_wide(self, lines: Iterable[str], year: int, week: Optional[int] = None) -> Dict[str, Any]:
+        """Validate a usernames-header CSV; data rows follow the schedule order"""
+        plan = self._new_plan('wide')
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        usernames = [name.strip() for name in header or []]
+        if not any(usernames):
+            plan['errors'].append('No usernames found in header row')
+            return plan
+
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            users = self._load_users(cursor)
+            games = self._load_games(cursor, year, week)
+        finally:
+            conn.close()
+
+        columns = []
+        for username in usernames:
+            if not username:
+                columns.append(None)
+            elif username.casefold() in users:
+                columns.append(users[username.casefold()])
+                plan['users_found'].add(users[username.casefold()][1])
+            else:
+                columns.append(None)
+                plan['missing_users'].add(username)
+                plan['warnings'].append(f"User '{username}' not found")
+
+        game_index = 0
+        for row_num, cells in enumerate(reader, 2):
+            if not cells:
+                continue  # Blank line, not an empty row of picks
+            plan['total_rows'] += 1
+
+            if game_index >= len(games):
+                plan['errors'].append(f"Row {row_num}: No game found for this row")
+                continue
+            game = games[game_index]
+            game_index += 1
+
+            if len(cells) != len(usernames):
+                plan['errors'].append(f"Row {row_num}: Expected {len(usernames)} picks, got {len(cells)}")
+                continue
+
+            for column, cell in zip(columns, cells):
+                if column is None:
+                    continue
+                if not cell.strip():
+                    plan['empty_picks'] += 1
+                    continue
+                team = self._canonical_team(game, cell)
+                if team is None:
+                    plan['errors'].append(f"Row {row_num}: Invalid pick '{cell.strip()}' for user '{column[1]}' "
+                                          f"(game: {game['away_team']} @ {game['home_team']})")
+                    continue
+                plan['picks'].append({
+                    'row': row_num,
+                    'username': column[1],
+                    'user_id': column[0],
+                    'game_id': game['id'],
+                    'week': game['week'],
+                    'year': game['year'],
+                    'matchup': f"{game['away_team']} @ {game['home_team']}",
+                    'selected_team': team,
+                    'predicted_home_score': None,
+                    'predicted_away_score': None
+                })
+
+        return plan
+
+    def plan_long(self, lines: Iterable[str], week: int, year: int,
+                  create_missing_users: bool = False) -> Dict[str, Any]:
+        """Validate a username/game_id/selected_team CSV for one week"""
+        plan = self._new_plan('long')
+
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            users = self._load_users(cursor)
+            games = {game['id']: game for game in self._load_games(cursor, year, week)}
+        finally:
+            conn.close()
+
+        for row in csv.DictReader(lines):
+            plan['total_rows'] += 1
+            row_num = plan['total_rows']
+
+            username = (row.get('username') or '').strip()
+            game_id = (row.get('game_id') or '').strip()
+            selected_team = (row.get('selected_team') or '').strip()
+
+            if not username:
+                plan['errors'].append(f"Row {row_num}: Missing username")
+                continue
+
+            if not game_id.isdigit():
+                plan['errors'].append(f"Row {row_num}: Invalid game_id '{game_id}'")
+                continue
+
+            game = games.get(int(game_id))
+            if game is None:
+                plan['errors'].append(f"Row {row_num}: Game ID {game_id} not found for Week {week}, {year}")
+                continue
+
+            if not selected_team:
+                plan['empty_picks'] += 1
+                continue
+
+            team = self._canonical_team(game, selected_team)
+            if team is None:
+                plan['errors'].append(f"Row {row_num}: '{selected_team}' is not valid for "
+                                      f"{game['away_team']} @ {game['home_team']}")
+                continue
+
+            user = users.get(username.casefold())
+            if user is not None:
+                plan['users_found'].add(user[1])
+                user_id, username = user
+            else:
+                if username not in plan['missing_users'] and not create_missing_users:
+                    plan['warnings'].append(f"User '{username}' not found and user creation disabled")
+                plan['missing_users'].add(username)
+                if not create_missing_users:
+                    continue
+                user_id = None  # Created when the plan is applied
+
+            home_score, home_ok = _parse_score(row.get('predicted_home_score'))
+            if not home_ok:
+                plan['warnings'].append(f"Row {row_num}: Invalid home score '{row.get('predicted_home_score')}'")
+            away_score, away_ok = _parse_score(row.get('predicted_away_score'))
+            if not away_ok:
+                plan['warnings'].append(f"Row {row_num}: Invalid away score '{row.get('predicted_away_score')}'")
+
+            plan['picks'].append({
+                'row': row_num,
+                'username': username,
+                'user_id': user_id,
+                'game_id': game['id'],
+                'week': game['week'],
+                'year': game['year'],
+                'matchup': f"{game['away_team']} @ {game['home_team']}",
+                'selected_team': team,
+                'predicted_home_score': home_score,
+                'predicted_away_score': away_score
+            })
+
+        return plan
+
+    def diff(self, plan: Dict[str, Any], overwrite_existing: bool = True) -> Dict[str, Any]:
+        """Classify every planned pick against what is stored (insert/update/unchanged/skipped)"""
+        conn = get_pooled_connection(self.db_path)
+        try:
+            existing = self._load_existing_picks(conn.cursor(), (pick['game_id'] for pick in plan['picks']))
+        finally:
+            conn.close()
+
+        counts = {'insert': 0, 'update': 0, 'unchanged': 0, 'skipped': 0}
+        changes = []
+        # Later rows for the same user/game win, as they would with row-by-row writes
+        latest = {}
+        for pick in plan['picks']:
+            key = (pick['user_id'], pick['game_id']) if pick['user_id'] is not None \
+                else (pick['username'], pick['game_id'])
+            latest[key] = pick
+
+        for pick in latest.values():
+            stored = existing.get((pick['user_id'], pick['game_id'])) if pick['user_id'] is not None else None
+            if stored is None:
+                action = 'insert'
+            elif not overwrite_existing:
+                action = 'skipped'
+            else:
+                new_home = pick['predicted_home_score'] if pick['predicted_home_score'] is not None else stored[1]
+                new_away = pick['predicted_away_score'] if pick['predicted_away_score'] is not None else stored[2]
+                action = 'unchanged' if (pick['selected_team'], new_home, new_away) == stored else 'update'
+
+            pick['action'] = action
+            counts[action] += 1
+            if action in ('insert', 'update') and len(changes) < MAX_DIFF_ENTRIES:
+                changes.append({
+                    'row': pick['row'],
+                    'username': pick['username'],
+                    'week': pick['week'],
+                    'matchup': pick['matchup'],
+                    'action': action,
+                    'old': stored[0] if stored else None,
+                    'new': pick['selected_team']
+                })
+
+        return {
+            'counts': counts,
+            'changes': changes,
+            'changes_truncated': counts['insert'] + counts['update'] > len(changes),
+            'writes': [pick for pick in latest.values() if pick['action'] in ('insert', 'update')]
+        }
+
+    def _create_users(self, cursor, usernames: List[str]) -> Dict[str, int]:
+        """Insert missing users with the default password; username -> id"""
+        password_hash = generate_password_hash(DEFAULT_PASSWORD)
+        cursor.executemany('''
+            INSERT INTO users (username, password_hash, email, is_admin)
+            VALUES (?, ?, ?, ?)
+        ''', [(username, password_hash, '', False) for username in usernames])
+
+        created = {}
+        for chunk in _chunks(usernames):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'SELECT id, username FROM users WHERE username IN ({placeholders})', chunk)
+            created.update({row[1]: row[0] for row in cursor.fetchall()})
+        return created
+
+    def apply(self, plan: Dict[str, Any], overwrite_existing: bool = True,
+              dry_run: bool = False) -> Dict[str, Any]:
+        """Diff the plan and, unless dry_run, write it in one transaction"""
+        diff = self.diff(plan, overwrite_existing)
+        writes = diff.pop('writes')
+        result = {
+            'dry_run': dry_run,
+            'total_rows': plan['total_rows'],
+            'valid_picks': len(plan['picks']),
+            'empty_picks': plan['empty_picks'],
+            'users_found': len(plan['users_found']),
+            'missing_users': sorted(plan['missing_users']),
+            'errors': plan['errors'],
+            'warnings': plan['warnings'],
+            'diff': diff,
+            'picks_imported': 0,
+            'picks_updated': 0,
+            'users_created': 0,
+            'skipped_picks': diff['counts']['skipped'],
+            'weeks': sorted({(pick['week'], pick['year']) for pick in writes})
+        }
+        if dry_run or not writes:
+            return result
+
+        now = datetime.now()
+        conn = get_pooled_connection(self.db_path)
+        try:
+            conn.isolation_level = None
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                new_usernames = sorted({pick['username'] for pick in writes if pick['user_id'] is None})
+                if new_usernames:
+                    created = self._create_users(cursor, new_usernames)
+                    for pick in writes:
+                        if pick['user_id'] is None:
+                            pick['user_id'] = created[pick['username']]
+                    result['users_created'] = len(new_usernames)
+
+                cursor.executemany(UPSERT_PICK_SQL, [
+                    (pick['user_id'], pick['game_id'], pick['selected_team'],
+                     pick['predicted_home_score'], pick['predicted_away_score'], now)
+                    for pick in writes
+                ])
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+        result['picks_imported'] = diff['counts']['insert']
+        result['picks_updated'] = diff['counts']['update']
+        logger.info(f"Imported {len(writes)} picks from {plan['layout']} CSV "
+                    f"({result['picks_imported']} new, {result['picks_updated']} changed)")
+
+        # Imported picks on games that are already final get scored right away
+        from pick_correctness import score_finalized_games
+        result['picks_scored'] = score_finalized_games({pick['game_id'] for pick in writes}, self.db_path)
+        return result
+
+
+def import_picks_csv(lines: Iterable[str], layout: str = 'wide', week: Optional[int] = None,
+                     year: int = 2025, overwrite_existing: bool = True, create_missing_users: bool = False,
+                     dry_run: bool = False, db_path: str = DATABASE_PATH) -> Dict[str, Any]:
+    """Convenience wrapper: plan and apply a CSV import in one call"""
+    pipeline = PickImportPipeline(db_path)
+    if layout == 'wide':
+        plan = pipeline.plan_wide(lines, year, week)
+    else:
+        plan = pipeline.plan_long(lines, week, year, create_missing_users)
+    return pipeline.apply(plan, overwrite_existing=overwrite_existing, dry_run=dry_run)
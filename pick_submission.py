@@ -0,0 +1,163 @@
+"""
+Bulk pick submission for NFL Fantasy League
+Validates a batch of picks against the games table and pick deadlines, then
+writes every accepted pick in a single transaction
+"""
+
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from models import get_pooled_connection
+from deadline_manager import DeadlineManager
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's host parameter limit for IN (...) lookups
+MAX_IN_PARAMS = 500
+
+
+class PickSubmissionService:
+    """Submits picks in bulk: one games lookup, one deadline pass, one write transaction"""
+
+    def __init__(self, db_path: str = 'nfl_fantasy.db'):
+        self.db_path = db_path
+        self.deadline_manager = DeadlineManager()
+
+    @staticmethod
+    def _normalize_pick(pick: Dict[str, Any], default_user_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Coerce a submitted pick into ids/teams, or None if it is incomplete"""
+        user_id = pick.get('user_id', default_user_id)
+        game_id = pick.get('game_id')
+        selected_team = pick.get('selected_team')
+
+        if user_id is None or not game_id or not selected_team:
+            return None
+
+        try:
+            user_id = int(user_id)
+            game_id = int(game_id)
+        except (TypeError, ValueError):
+            return None
+
+        return {
+            'user_id': user_id,
+            'game_id': game_id,
+            'selected_team': selected_team,
+            'home_score': pick.get('home_score'),
+            'away_score': pick.get('away_score')
+        }
+
+    def _fetch_games(self, cursor, game_ids: Iterable[int]) -> Dict[int, sqlite3.Row]:
+        """Load every referenced game with IN (...) lookups"""
+        game_ids = sorted(set(game_ids))
+        games = {}
+        for start in range(0, len(game_ids), MAX_IN_PARAMS):
+            chunk = game_ids[start:start + MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT id, week, year, game_date, away_team, home_team
+                FROM nfl_games WHERE id IN ({placeholders})
+            ''', chunk)
+            for row in cursor.fetchall():
+                games[row['id']] = row
+        return games
+
+    def submit(self, picks: List[Dict[str, Any]], user_id: Optional[int] = None,
+               enforce_deadlines: bool = True, created_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Submit a batch of picks.
+        Each pick is a dict with game_id, selected_team, optional home_score/away_score
+        and optional user_id (defaults to the user_id argument).
+        Returns per-game results plus accepted/rejected counts and the affected (week, year) pairs.
+        """
+        results = []
+        accepted_rows = []
+        weeks: Set[Tuple[int, int]] = set()
+
+        normalized = []
+        for pick in picks:
+            normalized_pick = self._normalize_pick(pick, user_id)
+            if normalized_pick is None:
+                results.append({
+                    'game_id': pick.get('game_id'),
+                    'user_id': pick.get('user_id', user_id),
+                    'accepted': False,
+                    'reason': 'invalid_pick'
+                })
+            else:
+                normalized.append(normalized_pick)
+
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            games = self._fetch_games(cursor, (pick['game_id'] for pick in normalized))
+
+            pick_allowed = {}
+            if enforce_deadlines:
+                pick_allowed = self.deadline_manager.can_make_picks_for_games(
+                    [(game['id'], game['week'], game['year'], game['game_date']) for game in games.values()]
+                )
+
+            for pick in normalized:
+                game = games.get(pick['game_id'])
+                result = {'game_id': pick['game_id'], 'user_id': pick['user_id']}
+
+                if game is None:
+                    result.update({'accepted': False, 'reason': 'game_not_found'})
+                    results.append(result)
+                    continue
+
+                result.update({
+                    'week': game['week'],
+                    'year': game['year'],
+                    'matchup': f"{game['away_team']} @ {game['home_team']}"
+                })
+
+                if enforce_deadlines and not pick_allowed.get(game['id'], True):
+                    result.update({'accepted': False, 'reason': 'deadline_passed'})
+                    results.append(result)
+                    continue
+
+                result['accepted'] = True
+                results.append(result)
+                weeks.add((game['week'], game['year']))
+                accepted_rows.append((
+                    pick['user_id'], pick['game_id'], pick['selected_team'],
+                    pick['home_score'], pick['away_score'], created_at
+                ))
+
+            if accepted_rows:
+                # Explicit write transaction: take the write lock up front so a
+                # concurrent writer can't make us fail halfway through the batch
+                conn.isolation_level = None
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO user_picks
+                        (user_id, game_id, selected_team, predicted_home_score, predicted_away_score, created_at)
+                        VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                    ''', accepted_rows)
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+        finally:
+            conn.close()
+
+        rejected = [result for result in results if not result['accepted']]
+        return {
+            'results': results,
+            'accepted_count': len(accepted_rows),
+            'rejected_count': len(rejected),
+            'rejected': rejected,
+            'weeks': sorted(weeks)
+        }
+
+
+def submit_picks_bulk(picks: List[Dict[str, Any]], user_id: Optional[int] = None,
+                      enforce_deadlines: bool = True, created_at: Optional[datetime] = None,
+                      db_path: str = 'nfl_fantasy.db') -> Dict[str, Any]:
+    """Convenience wrapper around PickSubmissionService.submit"""
+    return PickSubmissionService(db_path).submit(picks, user_id, enforce_deadlines, created_at)
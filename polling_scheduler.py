@@ -0,0 +1,160 @@
+"""
+Score polling scheduler for NFL Fantasy League
+Builds a polling plan from nfl_games.game_date instead of guessing game windows:
+- poll densely while games are in progress (kickoff .. kickoff + window)
+- keep polling slowly for games past their window that are still not final
+- stop polling a game once it is final
+- otherwise sleep until the next kickoff
+The live interval never drops below what the shared ESPN budget allows.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+
+from config import Config
+from models import get_pooled_connection
+from deadline_manager import parse_game_time_ast
+from api_rate_limiter import ENDPOINT_BUDGETS, DEFAULT_ENDPOINT
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Never sleep less than this, even when a kickoff is imminent
+MIN_SLEEP_SECONDS = Config.POLL_MIN_SLEEP_SECONDS
+
+
+@dataclass
+class PollingPlan:
+    """What to poll now and how long to wait before the next cycle"""
+    generated_at: datetime
+    sleep_seconds: int
+    reason: str
+    live_weeks: List[Tuple[int, int]] = field(default_factory=list)
+    overdue_weeks: List[Tuple[int, int]] = field(default_factory=list)
+    live_game_ids: List[int] = field(default_factory=list)
+    overdue_game_ids: List[int] = field(default_factory=list)
+    next_kickoff: Optional[datetime] = None
+
+    @property
+    def weeks(self) -> List[Tuple[int, int]]:
+        """Every (week, year) that should be polled this cycle"""
+        return sorted(set(self.live_weeks) | set(self.overdue_weeks))
+
+    @property
+    def should_poll(self) -> bool:
+        return bool(self.live_game_ids or self.overdue_game_ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'generated_at': self.generated_at.isoformat(),
+            'sleep_seconds': self.sleep_seconds,
+            'reason': self.reason,
+            'weeks': [{'week': week, 'year': year} for week, year in self.weeks],
+            'live_games': len(self.live_game_ids),
+            'overdue_games': len(self.overdue_game_ids),
+            'next_kickoff': self.next_kickoff.isoformat() if self.next_kickoff else None
+        }
+
+
+class PollingScheduler:
+    """Turns the stored schedule into a polling plan"""
+
+    def __init__(self, db_path: str = DATABASE_PATH):
+        self.db_path = db_path
+        self.ast_tz = pytz.timezone('America/Puerto_Rico')
+        self.game_window = timedelta(hours=Config.POLL_GAME_WINDOW_HOURS)
+        self.give_up_after = timedelta(hours=Config.POLL_OVERDUE_GIVE_UP_HOURS)
+        self.overdue_interval = Config.POLL_OVERDUE_INTERVAL_SECONDS
+        self.max_idle_seconds = Config.POLL_MAX_IDLE_SECONDS
+
+    def live_interval(self, week_count: int = 1) -> int:
+        """Polling interval during games, stretched to fit the hourly ESPN budget"""
+        budget = max(1, ENDPOINT_BUDGETS.get(DEFAULT_ENDPOINT, 5))
+        budget_interval = 3600 // budget
+        return max(Config.POLL_LIVE_INTERVAL_SECONDS, budget_interval) * max(1, week_count)
+
+    def _fetch_unfinished_games(self) -> List[Tuple[int, int, int, str]]:
+        """Every game that is not final yet (id, week, year, game_date)"""
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, week, year, game_date
+                FROM nfl_games
+                WHERE is_final = 0 AND game_date IS NOT NULL
+            ''')
+            return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def build_plan(self, now: Optional[datetime] = None) -> PollingPlan:
+        """Classify unfinished games against now and pick the next wake-up"""
+        now = now or datetime.now(self.ast_tz)
+        if now.tzinfo is None:
+            now = self.ast_tz.localize(now)
+
+        live_weeks, overdue_weeks = set(), set()
+        live_ids, overdue_ids = [], []
+        next_kickoff = None
+
+        for game_id, week, year, game_date in self._fetch_unfinished_games():
+            kickoff = parse_game_time_ast(game_date)
+            if kickoff is None:
+                continue
+
+            if kickoff > now:
+                if next_kickoff is None or kickoff < next_kickoff:
+                    next_kickoff = kickoff
+            elif now <= kickoff + self.game_window:
+                live_ids.append(game_id)
+                live_weeks.add((week, year))
+            elif now <= kickoff + self.give_up_after:
+                overdue_ids.append(game_id)
+                overdue_weeks.add((week, year))
+
+        if live_ids:
+            sleep_seconds = self.live_interval(len(live_weeks | overdue_weeks))
+            reason = f"{len(live_ids)} games in progress"
+        elif overdue_ids:
+            sleep_seconds = self.overdue_interval
+            reason = f"{len(overdue_ids)} games past their window and not final"
+        elif next_kickoff is not None:
+            sleep_seconds = int((next_kickoff - now).total_seconds())
+            reason = f"idle until kickoff at {next_kickoff.strftime('%Y-%m-%d %H:%M')} AST"
+        else:
+            sleep_seconds = self.max_idle_seconds
+            reason = "no unfinished games scheduled"
+
+        # Wake up for the next kickoff even if we're mid-window on other games
+        if next_kickoff is not None:
+            sleep_seconds = min(sleep_seconds, int((next_kickoff - now).total_seconds()))
+        sleep_seconds = max(MIN_SLEEP_SECONDS, min(sleep_seconds, self.max_idle_seconds))
+
+        return PollingPlan(
+            generated_at=now,
+            sleep_seconds=sleep_seconds,
+            reason=reason,
+            live_weeks=sorted(live_weeks),
+            overdue_weeks=sorted(overdue_weeks),
+            live_game_ids=live_ids,
+            overdue_game_ids=overdue_ids,
+            next_kickoff=next_kickoff
+        )
+
+
+def get_polling_plan(db_path: str = DATABASE_PATH, now: Optional[datetime] = None) -> PollingPlan:
+    """Convenience wrapper around PollingScheduler.build_plan"""
+    return PollingScheduler(db_path).build_plan(now)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    plan = get_polling_plan()
+    print(f"📅 {plan.reason}")
+    print(f"🔄 Weeks to poll: {plan.weeks or 'none'}")
+    print(f"⏱️  Next cycle in {plan.sleep_seconds // 60} min")
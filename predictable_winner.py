@@ -4,18 +4,20 @@ Predictable Winner Analysis for Monday Night Football
 Analyzes potential weekly winners based on different game outcomes
 """
 
-import sqlite3
 from typing import Dict, List, Tuple, Optional
+from models import get_pooled_connection
+from mnf_scenario_engine import simulate_monday_scenarios
 
-def analyze_predictable_winners(week: int = 1, year: int = 2025) -> Dict:
+def analyze_predictable_winners(week: int = 1, year: int = 2025, include_simulation: bool = True) -> Dict:
     """
     Analyze potential weekly winners based on ALL Monday Night Football outcomes
     Handles multiple Monday games in sequence (TB@HOU, then LAC@LV)
+    include_simulation adds the full scenario simulation ('simulation')
     
     Returns:
         Dict containing analysis of potential winners for each game outcome
     """
-    conn = sqlite3.connect('nfl_fantasy.db')
+    conn = get_pooled_connection('nfl_fantasy.db')
     cursor = conn.cursor()
     
     # Get ALL Monday Night games (in chronological order)
@@ -23,9 +25,9 @@ def analyze_predictable_winners(week: int = 1, year: int = 2025) -> Dict:
         SELECT id, home_team, away_team, is_final, game_date
         FROM nfl_games 
         WHERE week = ? AND year = ? 
-        AND strftime('%w', game_date) = '1'
+        AND slot = 'MNF'
         AND is_final = 0
-        ORDER BY game_date ASC, id ASC
+        ORDER BY kickoff_utc ASC, id ASC
     ''', (week, year))
     
     monday_games = cursor.fetchall()
@@ -95,6 +97,10 @@ def analyze_predictable_winners(week: int = 1, year: int = 2025) -> Dict:
     analysis = analyze_monday_scenarios(monday_games, monday_picks_by_game, user_standings)
     
     conn.close()
+    
+    # Full outcome space: every tiebreaker score x every remaining game result
+    if include_simulation:
+        analysis['simulation'] = simulate_monday_scenarios(week, year)
     return analysis
 
 
@@ -273,12 +279,12 @@ def analyze_multiple_monday_games(monday_games, picks_by_game, user_standings):
     }
 
 
-def get_winner_prediction_summary(week: int = 1, year: int = 2025) -> str:
+def get_winner_prediction_summary(week: int = 1, year: int = 2025, include_simulation: bool = True) -> str:
     """
     Get a concise summary for displaying on the weekly dashboard
     Updated to show progressive tiebreaker scenarios with dynamic Monday game detection
     """
-    analysis = analyze_predictable_winners(week, year)
+    analysis = analyze_predictable_winners(week, year, include_simulation)
     
     if 'error' in analysis:
         return analysis['error']
@@ -292,7 +298,7 @@ def get_winner_prediction_summary(week: int = 1, year: int = 2025) -> str:
         
         # Get current standings and first Monday game info
         try:
-            conn = sqlite3.connect('nfl_fantasy.db')
+            conn = get_pooled_connection('nfl_fantasy.db')
             cursor = conn.cursor()
             
             # Get the first Monday game details
@@ -300,9 +306,9 @@ def get_winner_prediction_summary(week: int = 1, year: int = 2025) -> str:
                 SELECT id, home_team, away_team
                 FROM nfl_games
                 WHERE week = ? AND year = ?
-                AND strftime('%w', game_date) = '1'
+                AND slot = 'MNF'
                 AND is_final = 0
-                ORDER BY game_date, game_time
+                ORDER BY kickoff_utc, id
                 LIMIT 1
             ''', (week, year))
             
@@ -390,6 +396,12 @@ def get_winner_prediction_summary(week: int = 1, year: int = 2025) -> str:
     
     # Single Monday game case
     elif 'home_team' in game_info:
+        contenders = analysis.get('simulation', {}).get('contenders', [])
+        if contenders:
+            odds = ', '.join(f"{p['username']} {p['win_probability']:.0%}" for p in contenders[:3])
+            if len(contenders) > 3:
+                odds += f" +{len(contenders)-3}"
+            return f"🎯 Monday: {game_info['away_team']} @ {game_info['home_team']} → Still alive: {odds}"
         return f"📊 Monday: {game_info['away_team']} @ {game_info['home_team']} - Single game analysis"
     
     # Fallback
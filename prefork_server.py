@@ -0,0 +1,317 @@
+"""
+Pre-fork production server for NFL Fantasy League
+The master process binds the listening sockets (HTTP, plus HTTPS when SSL
+certificates are available) and forks:
+
+    web workers   Config.WEB_WORKERS processes, each running a threaded
+                  Werkzeug server on the inherited sockets; the kernel hands
+                  every new connection to one of them
+    updater       one process running the background score updater, so
+                  scores are polled once however many workers there are
+
+The master starts no threads and serves no requests. It restarts children
+that die (backing off when one dies right after starting) and passes signals
+on: SIGTERM/SIGINT stop everything, SIGHUP recycles the web workers one at a
+time without dropping the sockets. Recycled workers are forked from the
+master's already-imported app, so they run the same Python code (only
+templates the master never loaded are read fresh); SIGHUP sheds memory growth
+and per-worker state, while code changes need a full restart of the service.
+
+Workers are forked after the app is imported and bootstrapped, so they share
+its memory copy-on-write; pooled database connections are closed first so no
+SQLite handle crosses a fork.
+"""
+
+import os
+import time
+import socket
+import signal
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from werkzeug.serving import make_server
+from werkzeug.wsgi import ClosingIterator
+
+from config import Config
+from models import close_all_pools
+
+logger = logging.getLogger(__name__)
+
+WORKER = 'worker'
+UPDATER = 'updater'
+
+# A child that exits sooner than this after starting is restarted with a growing delay
+MIN_CHILD_UPTIME_SECONDS = 5.0
+MAX_RESTART_DELAY_SECONDS = 30.0
+
+# How often the master reaps children and acts on signals
+SUPERVISE_INTERVAL_SECONDS = 0.5
+
+
+def can_prefork() -> bool:
+    """os.fork() is only available on POSIX platforms"""
+    return hasattr(os, 'fork')
+
+
+class _RequestTracker:
+    """WSGI wrapper counting in-flight requests so a stopping worker can drain them"""
+
+    def __init__(self, app):
+        self.app = app
+        self.active = 0
+        self._idle = threading.Condition()
+
+    def __call__(self, environ, start_response):
+        with self._idle:
+            self.active += 1
+        try:
+            body = self.app(environ, start_response)
+        except BaseException:
+            self._finished()
+            raise
+        # Streaming responses (CSV exports, /stream/week) count until they are closed
+        return ClosingIterator(body, self._finished)
+
+    def _finished(self) -> None:
+        with self._idle:
+            self.active -= 1
+            if self.active <= 0:
+                self._idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self.active <= 0, timeout)
+
+
+class PreforkServer:
+    """Master process: owns the listening sockets and supervises the children"""
+
+    def __init__(self, app, listeners: List[Tuple[str, int, Optional[object]]],
+                 workers: Optional[int] = None,
+                 start_updater: Optional[Callable[[], None]] = None,
+                 stop_updater: Optional[Callable[[], None]] = None):
+        """
+        listeners: (host, port, ssl_context or None) for each socket to serve.
+        start_updater / stop_updater run in the dedicated updater process;
+        leave them out to run web workers only.
+        """
+        self.app = app
+        self.listeners = listeners
+        self.workers = max(1, workers if workers is not None else Config.WEB_WORKERS)
+        self.start_updater = start_updater
+        self.stop_updater = stop_updater
+
+        self._sockets: List[Tuple[socket.socket, str, Optional[object]]] = []
+        # pid -> (role, monotonic start time)
+        self._children: Dict[int, Tuple[str, float]] = {}
+        # (role, monotonic time to start it) for children waiting to be (re)started
+        self._pending: List[Tuple[str, float]] = []
+        # role -> current restart delay for children that keep dying on start
+        self._restart_delay: Dict[str, float] = {}
+        self._stopping = False
+        self._stop_deadline = 0.0
+        # Workers still to restart after SIGHUP, and the one currently restarting
+        self._reload_requested = False
+        self._reload_queue: List[int] = []
+        self._reload_in_flight: Optional[int] = None
+
+    # ----- master ---------------------------------------------------------
+
+    def bind(self) -> None:
+        """Open the listening sockets (raises PermissionError for privileged ports)"""
+        for host, port, ssl_context in self.listeners:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind((host, port))
+                sock.listen(Config.WEB_LISTEN_BACKLOG)
+            except Exception:
+                sock.close()
+                self.close_sockets()
+                raise
+            self._sockets.append((sock, host, ssl_context))
+            logger.info(f"Listening on {host}:{port}{' (HTTPS)' if ssl_context else ''}")
+
+    def close_sockets(self) -> None:
+        for sock, _, _ in self._sockets:
+            sock.close()
+        self._sockets = []
+
+    def serve_forever(self) -> None:
+        """Fork the children and supervise them until SIGTERM/SIGINT"""
+        if not self._sockets:
+            self.bind()
+
+        # Nothing pooled may cross the fork: every child opens its own connections
+        close_all_pools()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        if self.start_updater is not None:
+            self._spawn(UPDATER)
+        for _ in range(self.workers):
+            self._spawn(WORKER)
+        logger.info(f"Pre-fork server started: {self.workers} web workers"
+                    f"{' + updater' if self.start_updater is not None else ''} (master pid {os.getpid()})")
+
+        try:
+            while self._children or (self._pending and not self._stopping):
+                self._reap()
+                if self._stopping:
+                    self._pending = []
+                else:
+                    self._start_pending()
+                    self._continue_reload()
+                time.sleep(SUPERVISE_INTERVAL_SECONDS)
+        finally:
+            self._kill_children(signal.SIGKILL)
+            self.close_sockets()
+        logger.info("Pre-fork server stopped")
+
+    def _handle_stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        logger.info(f"Received signal {signum}, stopping workers")
+        self._stopping = True
+        self._kill_children(signal.SIGTERM)
+        self._stop_deadline = time.monotonic() + Config.WEB_SHUTDOWN_TIMEOUT_SECONDS + 5
+
+    def _handle_reload(self, signum, frame) -> None:
+        logger.info("Received SIGHUP, recycling web workers (code changes need a full restart)")
+        self._reload_requested = True
+
+    def _kill_children(self, signum: int) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _reap(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                break
+            role, started = self._children.pop(pid, (None, 0.0))
+            if role is None or self._stopping:
+                continue
+
+            if pid in self._reload_queue:
+                self._reload_queue.remove(pid)
+                self._restart_delay.pop(role, None)
+                self._pending.append((role, time.monotonic()))
+                continue
+
+            logger.warning(f"{role.capitalize()} process {pid} exited (status {status}), restarting")
+            delay = 0.0
+            if time.monotonic() - started < MIN_CHILD_UPTIME_SECONDS:
+                delay = min(max(self._restart_delay.get(role, 0.5) * 2, 1.0), MAX_RESTART_DELAY_SECONDS)
+                self._restart_delay[role] = delay
+            else:
+                self._restart_delay.pop(role, None)
+            self._pending.append((role, time.monotonic() + delay))
+
+        if self._stopping and self._children and time.monotonic() > self._stop_deadline:
+            logger.warning("Children did not stop in time, killing them")
+            self._kill_children(signal.SIGKILL)
+
+    def _start_pending(self) -> None:
+        now = time.monotonic()
+        due = [entry for entry in self._pending if entry[1] <= now]
+        self._pending = [entry for entry in self._pending if entry[1] > now]
+        for role, _ in due:
+            self._spawn(role)
+
+    def _continue_reload(self) -> None:
+        """
+        Recycle web workers one at a time; the next goes once its predecessor
+        is replaced. New workers fork from the master, so they run the code it imported
+        """
+        if self._reload_requested:
+            self._reload_requested = False
+            self._reload_queue = [pid for pid, (role, _) in self._children.items() if role == WORKER]
+            self._reload_in_flight = None
+        if not self._reload_queue or self._pending:
+            return
+        if self._reload_in_flight in self._children:
+            return
+        pid = self._reload_queue[0]
+        if pid not in self._children:
+            self._reload_queue.pop(0)
+            return
+        self._reload_in_flight = pid
+        os.kill(pid, signal.SIGTERM)
+
+    def _spawn(self, role: str) -> int:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = (role, time.monotonic())
+            return pid
+
+        # Child: never return into the master's loop, and drop its signal handlers
+        exit_code = 1
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            self._children = {}
+            if role == UPDATER:
+                self.close_sockets()
+                self._run_updater()
+            else:
+                self._run_worker()
+            exit_code = 0
+        except Exception as e:
+            logger.error(f"{role.capitalize()} process {os.getpid()} crashed: {e}")
+        finally:
+            logging.shutdown()
+            os._exit(exit_code)
+
+    # ----- children -------------------------------------------------------
+
+    def _run_worker(self) -> None:
+        tracker = _RequestTracker(self.app)
+        servers = []
+        for sock, host, ssl_context in self._sockets:
+            servers.append(make_server(host, sock.getsockname()[1], tracker, threaded=True,
+                                       ssl_context=ssl_context, fd=sock.fileno()))
+        # The worker's servers hold duplicates; the master's copies can go
+        self.close_sockets()
+
+        def stop(signum, frame):
+            # shutdown() waits for serve_forever to return, so not from the main thread
+            threading.Thread(target=lambda: [server.shutdown() for server in servers],
+                             daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        for server in servers[1:]:
+            threading.Thread(target=server.serve_forever, name=f'serve-{server.port}', daemon=True).start()
+        logger.info(f"Web worker {os.getpid()} serving")
+        servers[0].serve_forever()
+
+        # No new connections are accepted; let in-flight requests finish
+        if not tracker.wait_idle(Config.WEB_SHUTDOWN_TIMEOUT_SECONDS):
+            logger.warning(f"Web worker {os.getpid()} stopping with {tracker.active} requests in flight")
+        for server in servers:
+            server.server_close()
+
+    def _run_updater(self) -> None:
+        stopped = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: stopped.set())
+
+        self.start_updater()
+        logger.info(f"Updater process {os.getpid()} running the background updater")
+        while not stopped.wait(1.0):
+            pass
+        if self.stop_updater is not None:
+            self.stop_updater()
@@ -0,0 +1,452 @@
+"""
+Request performance metrics for NFL Fantasy League
+Every request is timed from before_request to after_request, and every SQL
+statement run on a pooled connection is seen through sqlite3's
+set_trace_callback, so each request knows how many statements it ran and how
+long they took.
+
+Kept per route: a latency histogram plus SQL statement count and time. Kept
+per statement shape (the SQL with literals and bound values replaced by ?):
+how often it ran, total and slowest time. Requests slower than
+Config.PERF_SLOW_REQUEST_MS go into a ring buffer together with their heaviest
+statement shapes, so an N+1 shows up as one shape run dozens of times in a
+single request. Only shapes are kept, never the values that were bound.
+
+A statement's time runs from when SQLite starts it until the same thread
+starts its next statement or hands the connection back to the pool, so it
+includes fetching the rows. sqlite3 reports a write again for every trigger
+step it runs (the data_versions triggers fire on most writes); those repeats
+are folded into the write instead of counted as statements.
+Streamed downloads (CSV exports) are timed until the response is closed,
+since their queries run while the body is sent.
+
+Metrics are per process. Each process writes a snapshot to
+Config.PERF_SNAPSHOT_DIR every Config.PERF_SNAPSHOT_SECONDS, and the report
+merges them, so under the pre-fork server /admin/perf covers every worker.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Statements kept with each slow request
+SLOW_REQUEST_TOP_STATEMENTS = 5
+
+_LITERAL_RE = re.compile(r"\b[xX]'[0-9A-Fa-f]*'|'(?:[^']|'')*'|(?<![\w.])\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_PLACEHOLDER_LIST_RE = re.compile(r'\?(?:\s*,\s*\?)+')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Only writes fire triggers, whose steps the trace callback reports as the outer statement again
+_WRITE_RE = re.compile(r'\s*(?:INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+MAX_SHAPE_LENGTH = 500
+
+_local = threading.local()
+_lock = threading.Lock()
+_state: Dict[str, Any] = {}
+
+
+def _reset_state() -> None:
+    _state.update({
+        'pid': os.getpid(),
+        'started_at': time.time(),
+        'requests': 0,
+        'routes': {},
+        'statements': {},
+        'slow_requests': deque(maxlen=Config.PERF_SLOW_REQUEST_BUFFER),
+        'last_snapshot': 0.0
+    })
+
+
+_reset_state()
+
+
+def reset_request_metrics() -> None:
+    """Forget this process's metrics, e.g. between benchmark scenarios"""
+    with _lock:
+        _reset_state()
+
+
+def normalize_sql(sql: str) -> str:
+    """Statement shape: literals and bound values become ?, lists of them collapse to '?, ...'"""
+    shape = _LITERAL_RE.sub('?', sql)
+    shape = _PLACEHOLDER_LIST_RE.sub('?, ...', shape)
+    shape = _WHITESPACE_RE.sub(' ', shape).strip()
+    return shape[:MAX_SHAPE_LENGTH]
+
+
+class _RequestTrace:
+    """SQL seen by one request's thread"""
+
+    __slots__ = ('started', 'sql_count', 'sql_seconds', 'statements', 'current', 'streaming')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        # raw sql -> [count, seconds, max seconds]; normalized once per request
+        self.statements: Dict[str, List[float]] = {}
+        self.current = None
+        self.streaming = False
+
+    def start_statement(self, sql: str, now: float) -> None:
+        if self.current is not None and self.current[0] == sql and _WRITE_RE.match(sql):
+            # A trigger step of the write still running, not a new statement
+            return
+        self.finish_statement(now)
+        self.current = (sql, now)
+
+    def finish_statement(self, now: float) -> None:
+        if self.current is None:
+            return
+        sql, started = self.current
+        self.current = None
+        elapsed = now - started
+        self.sql_count += 1
+        self.sql_seconds += elapsed
+        entry = self.statements.get(sql)
+        if entry is None:
+            self.statements[sql] = [1, elapsed, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+    def shapes(self) -> Dict[str, List[float]]:
+        shapes: Dict[str, List[float]] = {}
+        for sql, (count, seconds, slowest) in self.statements.items():
+            shape = normalize_sql(sql)
+            entry = shapes.get(shape)
+            if entry is None:
+                shapes[shape] = [count, seconds, slowest]
+            else:
+                entry[0] += count
+                entry[1] += seconds
+                entry[2] = max(entry[2], slowest)
+        return shapes
+
+
+def _trace_statement(sql: str) -> None:
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.start_statement(sql, time.perf_counter())
+
+
+def trace_connection(conn) -> None:
+    """Called by the connection pool for every connection it opens"""
+    if Config.PERF_INSTRUMENTATION:
+        conn.set_trace_callback(_trace_statement)
+
+
+def connection_released() -> None:
+    """Called by the connection pool when this thread hands a connection back"""
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.finish_statement(time.perf_counter())
+
+
+def init_request_metrics(app) -> None:
+    """Register the request hooks; call right after creating the app so they wrap everything else"""
+    if not Config.PERF_INSTRUMENTATION:
+        return
+    app.before_request(_start_request)
+    # after_request functions run in reverse order, so this one runs last
+    app.after_request(_finish_request)
+    app.teardown_request(_discard_request)
+
+
+def _start_request() -> None:
+    _local.trace = _RequestTrace()
+
+
+def _finish_request(response):
+    from flask import request
+
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return response
+
+    route = request.url_rule.rule if request.url_rule is not None else '(unmatched)'
+    details = (request.method, route, request.full_path.rstrip('?'), response.status_code)
+    if response.is_streamed and response.mimetype != 'text/event-stream':
+        # Streamed downloads (CSV exports) run their queries while the body is
+        # sent, so the request ends when the response is closed
+        trace.streaming = True
+        response.call_on_close(lambda: _record_trace(trace, details))
+        return response
+
+    _record_trace(trace, details)
+    return response
+
+
+def _record_trace(trace: '_RequestTrace', details) -> None:
+    if getattr(_local, 'trace', None) is trace:
+        _local.trace = None
+    now = time.perf_counter()
+    trace.finish_statement(now)
+    method, route, path, status = details
+    try:
+        record_request(method, route, path, status, now - trace.started, trace)
+    except Exception as e:
+        logger.warning(f"Could not record request metrics: {e}")
+
+
+def _discard_request(exc=None) -> None:
+    trace = getattr(_local, 'trace', None)
+    if trace is not None and not trace.streaming:
+        _local.trace = None
+
+
+def _new_route_stats() -> Dict[str, Any]:
+    return {
+        'count': 0,
+        'errors': 0,
+        'total_seconds': 0.0,
+        'max_seconds': 0.0,
+        'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        'sql_count': 0,
+        'sql_seconds': 0.0,
+        'max_sql_count': 0
+    }
+
+
+def _bucket_index(duration_ms: float) -> int:
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if duration_ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def record_request(method: str, route: str, path: str, status: int, seconds: float,
+                   trace: _RequestTrace) -> None:
+    """Add one finished request to the route histogram, statement shapes and slow ring buffer"""
+    key = f'{method} {route}'
+    duration_ms = seconds * 1000
+    shapes = trace.shapes()
+
+    with _lock:
+        if _state['pid'] != os.getpid():
+            # Forked child: start from empty metrics of its own
+            _reset_state()
+
+        _state['requests'] += 1
+        stats = _state['routes'].get(key)
+        if stats is None:
+            stats = _state['routes'][key] = _new_route_stats()
+        stats['count'] += 1
+        if status >= 500:
+            stats['errors'] += 1
+        stats['total_seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+        stats['buckets'][_bucket_index(duration_ms)] += 1
+        stats['sql_count'] += trace.sql_count
+        stats['sql_seconds'] += trace.sql_seconds
+        stats['max_sql_count'] = max(stats['max_sql_count'], trace.sql_count)
+
+        statements = _state['statements']
+        for shape, (count, total, slowest) in shapes.items():
+            entry = statements.get(shape)
+            if entry is None:
+                entry = statements[shape] = {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'route': key}
+            entry['count'] += count
+            entry['total_seconds'] += total
+            if slowest >= entry['max_seconds']:
+                entry['max_seconds'] = slowest
+                entry['route'] = key
+        if len(statements) > Config.PERF_MAX_STATEMENT_SHAPES:
+            # Forget the shapes that were never slow
+            keep = sorted(statements.items(), key=lambda item: item[1]['max_seconds'],
+                          reverse=True)[:Config.PERF_MAX_STATEMENT_SHAPES]
+            _state['statements'] = dict(keep)
+
+        if duration_ms >= Config.PERF_SLOW_REQUEST_MS:
+            heaviest = sorted(shapes.items(), key=lambda item: item[1][1], reverse=True)
+            _state['slow_requests'].append({
+                'at': datetime.now().isoformat(timespec='seconds'),
+                'pid': _state['pid'],
+                'method': method,
+                'route': route,
+                'path': path,
+                'status': status,
+                'duration_ms': round(duration_ms, 1),
+                'sql_count': trace.sql_count,
+                'sql_ms': round(trace.sql_seconds * 1000, 1),
+                'statements': [{'sql': shape, 'count': count, 'total_ms': round(total * 1000, 2),
+                                'max_ms': round(slowest * 1000, 2)}
+                               for shape, (count, total, slowest) in heaviest[:SLOW_REQUEST_TOP_STATEMENTS]]
+            })
+
+        snapshot_due = time.monotonic() - _state['last_snapshot'] >= Config.PERF_SNAPSHOT_SECONDS
+        if snapshot_due:
+            _state['last_snapshot'] = time.monotonic()
+            snapshot = _snapshot_locked()
+
+    if snapshot_due:
+        _write_snapshot(snapshot)
+
+
+def _snapshot_locked() -> Dict[str, Any]:
+    return json.loads(json.dumps({
+        'pid': _state['pid'],
+        'started_at': _state['started_at'],
+        'written_at': time.time(),
+        'requests': _state['requests'],
+        'routes': _state['routes'],
+        'statements': _state['statements'],
+        'slow_requests': list(_state['slow_requests'])
+    }))
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(Config.PERF_SNAPSHOT_DIR, f'perf-{pid}.json')
+
+
+def _write_snapshot(snapshot: Dict[str, Any]) -> None:
+    path = _snapshot_path(snapshot['pid'])
+    try:
+        os.makedirs(Config.PERF_SNAPSHOT_DIR, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write performance snapshot: {e}")
+
+
+def _read_snapshots() -> List[Dict[str, Any]]:
+    """This process's live metrics plus recent snapshots from the others"""
+    with _lock:
+        if _state['pid'] != os.getpid():
+            _reset_state()
+        snapshots = [_snapshot_locked()]
+    own_pid = snapshots[0]['pid']
+
+    try:
+        names = os.listdir(Config.PERF_SNAPSHOT_DIR)
+    except OSError:
+        return snapshots
+
+    cutoff = time.time() - Config.PERF_SNAPSHOT_MAX_AGE_SECONDS
+    for name in names:
+        if not (name.startswith('perf-') and name.endswith('.json')) or name == f'perf-{own_pid}.json':
+            continue
+        path = os.path.join(Config.PERF_SNAPSHOT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping performance snapshot {name}: {e}")
+    return snapshots
+
+
+def _percentile(buckets: List[int], count: int, fraction: float, max_ms: float) -> Optional[float]:
+    """Histogram estimate: upper bound of the bucket holding the given fraction of requests"""
+    if count == 0:
+        return None
+    target = fraction * count
+    seen = 0
+    for index, bucket_count in enumerate(buckets):
+        seen += bucket_count
+        if seen >= target:
+            if index < len(LATENCY_BUCKETS_MS):
+                return round(min(LATENCY_BUCKETS_MS[index], max_ms), 1)
+            break
+    return round(max_ms, 1)
+
+
+def get_performance_report(slow_limit: int = 50) -> Dict[str, Any]:
+    """Merged route latencies, slowest statement shapes and recent slow requests for /admin/perf"""
+    snapshots = _read_snapshots()
+
+    routes: Dict[str, Dict[str, Any]] = {}
+    statements: Dict[str, Dict[str, Any]] = {}
+    slow_requests: List[Dict[str, Any]] = []
+    for snapshot in snapshots:
+        for key, stats in snapshot['routes'].items():
+            merged = routes.get(key)
+            if merged is None:
+                merged = routes[key] = _new_route_stats()
+            for field in ('count', 'errors', 'total_seconds', 'sql_count', 'sql_seconds'):
+                merged[field] += stats[field]
+            merged['max_seconds'] = max(merged['max_seconds'], stats['max_seconds'])
+            merged['max_sql_count'] = max(merged['max_sql_count'], stats['max_sql_count'])
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], stats['buckets'])]
+
+        for shape, stats in snapshot['statements'].items():
+            merged = statements.get(shape)
+            if merged is None:
+                statements[shape] = dict(stats)
+                continue
+            merged['count'] += stats['count']
+            merged['total_seconds'] += stats['total_seconds']
+            if stats['max_seconds'] > merged['max_seconds']:
+                merged['max_seconds'] = stats['max_seconds']
+                merged['route'] = stats['route']
+
+        slow_requests.extend(snapshot['slow_requests'])
+
+    route_rows = []
+    for key, stats in routes.items():
+        count = stats['count']
+        max_ms = stats['max_seconds'] * 1000
+        method, route = key.split(' ', 1)
+        route_rows.append({
+            'method': method,
+            'route': route,
+            'count': count,
+            'errors': stats['errors'],
+            'avg_ms': round(stats['total_seconds'] * 1000 / count, 1),
+            'p50_ms': _percentile(stats['buckets'], count, 0.50, max_ms),
+            'p95_ms': _percentile(stats['buckets'], count, 0.95, max_ms),
+            'p99_ms': _percentile(stats['buckets'], count, 0.99, max_ms),
+            'max_ms': round(max_ms, 1),
+            'total_ms': round(stats['total_seconds'] * 1000, 1),
+            'avg_sql_count': round(stats['sql_count'] / count, 1),
+            'max_sql_count': stats['max_sql_count'],
+            'avg_sql_ms': round(stats['sql_seconds'] * 1000 / count, 1),
+            'buckets': stats['buckets']
+        })
+    route_rows.sort(key=lambda row: row['total_ms'], reverse=True)
+
+    statement_rows = [{
+        'sql': shape,
+        'count': stats['count'],
+        'avg_ms': round(stats['total_seconds'] * 1000 / stats['count'], 2),
+        'max_ms': round(stats['max_seconds'] * 1000, 2),
+        'total_ms': round(stats['total_seconds'] * 1000, 1),
+        'route': stats['route']
+    } for shape, stats in statements.items() if stats['count']]
+    statement_rows.sort(key=lambda row: row['max_ms'], reverse=True)
+
+    slow_requests.sort(key=lambda entry: entry['at'], reverse=True)
+
+    return {
+        'enabled': Config.PERF_INSTRUMENTATION,
+        'processes': [{
+            'pid': snapshot['pid'],
+            'started_at': datetime.fromtimestamp(snapshot['started_at']).isoformat(timespec='seconds'),
+            'updated_at': datetime.fromtimestamp(snapshot['written_at']).isoformat(timespec='seconds'),
+            'requests': snapshot['requests']
+        } for snapshot in snapshots],
+        'requests': sum(snapshot['requests'] for snapshot in snapshots),
+        'slow_request_ms': Config.PERF_SLOW_REQUEST_MS,
+        'bucket_bounds_ms': list(LATENCY_BUCKETS_MS),
+        'routes': route_rows,
+        'slowest_statements': statement_rows[:Config.PERF_TOP_STATEMENTS],
+        'slow_requests': slow_requests[:slow_limit]
+    }
@@ -29,6 +29,12 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import os
+from pick_correctness import score_games_with_cursor
+from season_standings import refresh_standings_for_games
+from espn_scoreboard_client import get_scoreboard_client
+from api_rate_limiter import acquire_api_call
+from updater_lease import UpdaterLease
+from config import Config
 
 
 class RobustNFLScoreSystem:
@@ -159,14 +165,14 @@ class RobustNFLScoreSystem:
             return 0
             
         try:
-            # Get ESPN data with timeout
-            url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-            params = {'seasontype': 2, 'week': week, 'year': self.year}
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            # Uncached fetches spend the ESPN budget shared with the web app
+            client = get_scoreboard_client()
+            if not client.is_fresh(week=week, year=self.year) and not acquire_api_call():
+                self.logger.info(f"Shared ESPN rate limit reached, skipping Week {week}")
+                return 0
             
-            data = response.json()
+            # Get ESPN data through the shared cached client
+            data = client.fetch_json(week=week, year=self.year, seasontype=2)
             games_data = data.get('events', [])
             
             if not games_data:
@@ -234,19 +240,25 @@ class RobustNFLScoreSystem:
                     if cursor.rowcount > 0:
                         updated_count += 1
                         self.logger.info(f"Updated: {away_team} {away_score} - {home_team} {home_score}")
-                        
-                        # Update pick scoring if game is final
-                        if is_final:
-                            self._update_pick_scoring(cursor, away_team, home_team, away_score, home_score, week)
                 
                 except Exception as e:
                     self.logger.error(f"Error processing game: {e}")
                     continue
             
+            # Score picks for final games not yet scored at their final score
+            cursor.execute("""
+                SELECT id FROM nfl_games WHERE week = ? AND year = ? AND is_final = 1
+            """, (week, self.year))
+            scored_ids, picks_updated = score_games_with_cursor(cursor, [row[0] for row in cursor.fetchall()])
+            
             conn.commit()
             self.update_count += 1
             self.last_update_time = datetime.now()
             
+            if scored_ids:
+                self.logger.info(f"Updated {picks_updated} picks on {len(scored_ids)} final games")
+                refresh_standings_for_games(scored_ids, self.db_path)
+            
         except Exception as e:
             conn.rollback()
             self.logger.error(f"Database transaction error: {e}")
@@ -256,44 +268,6 @@ class RobustNFLScoreSystem:
         
         return updated_count
 
-    def _update_pick_scoring(self, cursor, away_team: str, home_team: str, 
-                           away_score: int, home_score: int, week: int):
-        """Update pick scoring for completed games"""
-        try:
-            # Determine winner
-            winning_team = home_team if home_score > away_score else away_team
-            
-            # Get game ID
-            cursor.execute("""
-                SELECT id FROM nfl_games 
-                WHERE away_team = ? AND home_team = ? AND week = ? AND year = ?
-            """, (away_team, home_team, week, self.year))
-            
-            game = cursor.fetchone()
-            if not game:
-                return
-            
-            game_id = game[0]
-            
-            # Update picks
-            cursor.execute("""
-                UPDATE user_picks 
-                SET is_correct = CASE 
-                    WHEN selected_team = ? THEN 1 
-                    ELSE 0 
-                END,
-                points_earned = CASE 
-                    WHEN selected_team = ? THEN 1 
-                    ELSE 0 
-                END
-                WHERE game_id = ?
-            """, (winning_team, winning_team, game_id))
-            
-            self.logger.info(f"Updated {cursor.rowcount} picks for {away_team} vs {home_team}")
-            
-        except Exception as e:
-            self.logger.error(f"Error updating pick scoring: {e}")
-
     def update_current_week(self) -> int:
         """Main method to update current week scores"""
         current_week = self.get_current_week()
@@ -309,11 +283,12 @@ class RobustNFLScoreSystem:
         return updated
 
     def monitor_continuously(self, duration_minutes: int = 60):
-        """Run continuous monitoring with safety limits"""
+        """Run continuous monitoring with safety limits (only while holding the updater lease)"""
         self.logger.info(f"🔄 Starting monitoring for {duration_minutes} minutes")
         
         start_time = datetime.now()
         update_interval = 15  # 15 minutes between checks
+        lease = UpdaterLease('robust_nfl_system', self.db_path)
         
         try:
             while True:
@@ -323,9 +298,18 @@ class RobustNFLScoreSystem:
                     self.logger.info(f"✅ Monitoring duration completed: {duration_minutes} minutes")
                     break
                 
+                if not lease.acquire():
+                    # Another updater is polling; stand by and check the lease again shortly
+                    self.logger.info("⏸️ Another updater holds the lease, standing by")
+                    time.sleep(Config.UPDATER_LEASE_HEARTBEAT_SECONDS)
+                    continue
+                
                 # Run update
+                started_at = time.time()
+                result = 'ok'
                 try:
                     updated = self.update_current_week()
+                    result = f"updated {updated} games"
                     
                     if updated > 0:
                         # If we updated games, check next week too
@@ -336,15 +320,24 @@ class RobustNFLScoreSystem:
                 
                 except Exception as e:
                     self.logger.error(f"Update cycle error: {e}")
+                    result = f"error: {e}"
+                lease.record_cycle(started_at, time.time(), result)
                 
-                # Wait for next update (with safety check)
+                # Wait for next update, renewing the lease meanwhile
                 self.logger.info(f"⏰ Waiting {update_interval} minutes until next check...")
-                time.sleep(update_interval * 60)
+                waited = 0
+                while waited < update_interval * 60 and lease.held:
+                    step = min(Config.UPDATER_LEASE_HEARTBEAT_SECONDS, update_interval * 60 - waited)
+                    time.sleep(step)
+                    waited += step
+                    lease.acquire()
                 
         except KeyboardInterrupt:
             self.logger.info("🛑 Monitoring stopped by user")
         except Exception as e:
             self.logger.error(f"🚨 Monitoring system error: {e}")
+        finally:
+            lease.release()
             
         self.logger.info("📊 Monitoring session ended")
 
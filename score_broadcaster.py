@@ -0,0 +1,283 @@
+"""
+Live score stream for NFL Fantasy League
+One ScoreBroadcaster per process keeps the latest score/standings snapshot of
+every week somebody is watching and fans changes out to all connected
+/stream/week/<week> clients as Server-Sent Events.
+
+The score write paths call notify_scores_changed() after they commit. The
+broadcaster then rebuilds each watched week once - a single games query plus
+the weekly standings - and sends every client only what changed. Writes made
+by other processes are picked up through the shared data version
+(data_version), and kickoffs/deadlines passing (which reveal picks)
+through the per-week game views. Nothing is read per client.
+
+Events:
+    snapshot   {"week", "year", "games": [...], "standings": [...]}  on connect / resync
+    scores     {"week", "year", "games": [changed games]}
+    standings  {"week", "year", "standings": [...], "order_changed": bool}
+"""
+
+import json
+import queue
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from config import Config
+from models import get_pooled_connection
+from weekly_standings import WeeklyStandingsEngine
+from data_version import get_data_version
+from leaderboard_cache import week_time_marker
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Events buffered per client before it is considered stuck and resynced
+CLIENT_QUEUE_SIZE = 32
+
+
+class LiveStreamFull(Exception):
+    """Raised when LIVE_STREAM_MAX_CLIENTS clients are already connected"""
+
+
+def _format_event(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _game_status(game: Dict[str, Any]) -> str:
+    if game['is_final']:
+        return 'FINAL'
+    if game['away_score'] or game['home_score']:
+        return 'LIVE'
+    return game['game_status'] or 'scheduled'
+
+
+class ScoreBroadcaster:
+    """Shared snapshot + fan-out for live week streams"""
+
+    def __init__(self, db_path: str = DATABASE_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Tuple[int, int], Set[queue.Queue]] = {}
+        # (week, year) -> {'games': {id: game}, 'standings': [...], 'marker': int, 'version': int}
+        self._snapshots: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._dirty: Set[Tuple[int, int]] = set()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- subscriptions -------------------------------------------------
+
+    def client_count(self) -> int:
+        with self._lock:
+            return sum(len(clients) for clients in self._subscribers.values())
+
+    def subscribe(self, week: int, year: int) -> queue.Queue:
+        """Register a client for a week; its first event is the current snapshot"""
+        key = (week, year)
+        client: queue.Queue = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        with self._lock:
+            if sum(len(clients) for clients in self._subscribers.values()) >= Config.LIVE_STREAM_MAX_CLIENTS:
+                raise LiveStreamFull()
+            snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._build_snapshot(week, year)
+
+        with self._lock:
+            self._snapshots.setdefault(key, snapshot)
+            self._subscribers.setdefault(key, set()).add(client)
+            client.put_nowait(self._snapshot_event(key, self._snapshots[key]))
+            self._ensure_thread()
+        return client
+
+    def unsubscribe(self, week: int, year: int, client: queue.Queue) -> None:
+        key = (week, year)
+        with self._lock:
+            clients = self._subscribers.get(key)
+            if clients is None:
+                return
+            clients.discard(client)
+            if not clients:
+                del self._subscribers[key]
+                self._snapshots.pop(key, None)
+                self._dirty.discard(key)
+
+    def stream(self, week: int, year: int, client: queue.Queue) -> Iterator[str]:
+        """SSE body for one client; unsubscribes when the client goes away"""
+        try:
+            yield f"retry: {Config.LIVE_STREAM_RETRY_MS}\n\n"
+            while True:
+                try:
+                    yield client.get(timeout=Config.LIVE_STREAM_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    # Keeps proxies from closing the connection and detects gone clients
+                    yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe(week, year, client)
+
+    # ----- publishing ----------------------------------------------------
+
+    def notify(self, week: Optional[int] = None, year: Optional[int] = None) -> None:
+        """Scores changed for a week (or for any week when None); called after commit"""
+        with self._lock:
+            if not self._subscribers:
+                return
+            for key in self._subscribers:
+                if (week is None or key[0] == week) and (year is None or key[1] == year):
+                    self._dirty.add(key)
+        self._wakeup.set()
+
+    def _ensure_thread(self) -> None:
+        """Start the publisher thread (caller holds self._lock)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='score-broadcaster', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(Config.DATA_VERSION_CHECK_SECONDS)
+            self._wakeup.clear()
+
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                watched = list(self._subscribers)
+                dirty = set(self._dirty)
+                self._dirty.clear()
+
+            try:
+                # Writes from other processes show up as a new data version
+                version = get_data_version(self.db_path)
+                for key in watched:
+                    snapshot = self._snapshots.get(key)
+                    if snapshot is None:
+                        continue
+                    if (key in dirty or snapshot['version'] != version or
+                            snapshot['marker'] != week_time_marker(key[0], key[1], self.db_path)):
+                        self._publish(key)
+            except Exception as e:
+                logger.error(f"Live score broadcast failed: {e}")
+
+    def _publish(self, key: Tuple[int, int]) -> None:
+        new = self._build_snapshot(*key)
+        with self._lock:
+            clients = self._subscribers.get(key)
+            if not clients:
+                return
+            old = self._snapshots.get(key)
+            self._snapshots[key] = new
+            events = self._diff_events(key, old, new) if old else [self._snapshot_event(key, new)]
+            if not events:
+                return
+            for client in list(clients):
+                for event in events:
+                    try:
+                        client.put_nowait(event)
+                    except queue.Full:
+                        # Client fell behind: drop what it hasn't read and resync it
+                        while not client.empty():
+                            try:
+                                client.get_nowait()
+                            except queue.Empty:
+                                break
+                        client.put_nowait(self._snapshot_event(key, new))
+                        break
+
+    def _build_snapshot(self, week: int, year: int) -> Dict[str, Any]:
+        """Games and standings for one week (one games query + the standings engine)"""
+        # Read before the data so a write landing mid-build triggers another rebuild
+        version = get_data_version(self.db_path)
+        marker = week_time_marker(week, year, self.db_path)
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, away_team, home_team, away_score, home_score, is_final,
+                       game_status, quarter, time_remaining
+                FROM nfl_games
+                WHERE week = ? AND year = ?
+                ORDER BY game_date, id
+            ''', (week, year))
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+        games = {}
+        for row in rows:
+            games[row['id']] = {
+                'id': row['id'],
+                'away_team': row['away_team'],
+                'home_team': row['home_team'],
+                'away_score': row['away_score'],
+                'home_score': row['home_score'],
+                'is_final': bool(row['is_final']),
+                'status': _game_status(row),
+                'quarter': row['quarter'],
+                'time_remaining': row['time_remaining']
+            }
+
+        standings = WeeklyStandingsEngine(self.db_path).build_week(week, year)
+        players = [{
+            'rank': entry['rank'],
+            'username': entry['username'],
+            'correct_picks': entry['correct_picks'],
+            'total_picks': entry['total_picks'],
+            'win_percentage': entry['breakdown']['win_percentage']
+        } for entry in standings['leaderboard']]
+
+        return {'games': games, 'standings': players, 'marker': marker, 'version': version}
+
+    @staticmethod
+    def _snapshot_event(key: Tuple[int, int], snapshot: Dict[str, Any]) -> str:
+        return _format_event('snapshot', {
+            'week': key[0],
+            'year': key[1],
+            'games': list(snapshot['games'].values()),
+            'standings': snapshot['standings']
+        })
+
+    @staticmethod
+    def _diff_events(key: Tuple[int, int], old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+        if set(old['games']) != set(new['games']):
+            # Games added or removed: clients redraw from a full snapshot
+            return [ScoreBroadcaster._snapshot_event(key, new)]
+
+        events = []
+        changed_games = [game for game_id, game in new['games'].items()
+                         if old['games'][game_id] != game]
+        if changed_games:
+            events.append(_format_event('scores', {'week': key[0], 'year': key[1], 'games': changed_games}))
+
+        if old['standings'] != new['standings']:
+            old_order = [player['username'] for player in old['standings']]
+            new_order = [player['username'] for player in new['standings']]
+            events.append(_format_event('standings', {
+                'week': key[0],
+                'year': key[1],
+                'standings': new['standings'],
+                'order_changed': old_order != new_order
+            }))
+        return events
+
+
+_broadcaster: Optional[ScoreBroadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_score_broadcaster() -> ScoreBroadcaster:
+    """Process-wide shared broadcaster"""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = ScoreBroadcaster()
+    return _broadcaster
+
+
+def notify_scores_changed(week: Optional[int] = None, year: Optional[int] = None) -> None:
+    """Hook for score write paths; a no-op when nobody is watching"""
+    if _broadcaster is not None:
+        _broadcaster.notify(week, year)
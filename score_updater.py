@@ -4,13 +4,18 @@ NFL Score Updater - Automated system to fetch and update game scores
 Fetches scores from ESPN API for games that have passed their scheduled time
 """
 
-import requests
-import sqlite3
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import json
 import time
+from models import get_pooled_connection
+from pick_correctness import score_games_with_cursor
+from espn_scoreboard_client import get_scoreboard_client
+from api_rate_limiter import acquire_api_call
+from game_views import invalidate_game_view_cache
+from data_version import refresh_data_version
+from score_broadcaster import notify_scores_changed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,19 +26,11 @@ class NFLScoreUpdater:
     
     def __init__(self, db_path: str = 'nfl_fantasy.db'):
         self.db_path = db_path
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        # Disable SSL verification for development/testing
-        self.session.verify = False
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
     def get_games_needing_updates(self) -> List[Tuple]:
         """Get games that are past their scheduled time but not marked as final"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             cursor = conn.cursor()
             
             # Find games that are past their time but not final
@@ -83,18 +80,13 @@ class NFLScoreUpdater:
     def _fetch_espn_scores(self, year: int, week: int) -> Dict:
         """Fetch scores from ESPN API"""
         try:
-            url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-            params = {
-                'seasontype': 2,  # Regular season
-                'week': week,
-                'year': year
-            }
+            client = get_scoreboard_client()
+            if not client.is_fresh(week=week, year=year) and not acquire_api_call():
+                logger.info(f"ESPN rate limit reached, skipping Week {week}, {year}")
+                return {}
             
             logger.info(f"Fetching scores for Week {week}, {year} from ESPN API")
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = client.fetch_json(week=week, year=year, seasontype=2)
             return self.parse_espn_scores(data)
             
         except Exception as e:
@@ -202,12 +194,18 @@ class NFLScoreUpdater:
             logger.error(f"Error parsing ESPN data: {e}")
             return {}
     
-    def update_game_scores(self, games_data: Dict) -> int:
-        """Update game scores in the database"""
+    def update_game_scores(self, games_data: Dict, week: Optional[int] = None,
+                           year: Optional[int] = None) -> int:
+        """
+        Update game scores in the database
+        week/year limit matching to the scoreboard's week, so a rematch later in
+        the season never picks up this week's score
+        """
         updated_count = 0
+        final_game_ids = []
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             cursor = conn.cursor()
             
             for game_key, game_info in games_data.items():
@@ -226,15 +224,16 @@ class NFLScoreUpdater:
                         WHERE UPPER(away_team) = UPPER(?)
                         AND UPPER(home_team) = UPPER(?)
                         AND (is_final = 0 OR home_score != ? OR away_score != ?)
+                        AND (? IS NULL OR week = ?)
+                        AND (? IS NULL OR year = ?)
                         ORDER BY game_date DESC
                         LIMIT 1
-                    ''', (away_team, home_team, home_score, away_score))
+                    ''', (away_team, home_team, home_score, away_score, week, week, year, year))
 
                     existing_game = cursor.fetchone()
 
                     if existing_game:
                         string_game_id = existing_game[0]
-                        old_is_final = existing_game[3]
                         numeric_game_id = existing_game[4]
 
                         # Update the game using string game_id (for new system)
@@ -255,12 +254,9 @@ class NFLScoreUpdater:
                         ''', (home_score, away_score, is_final, game_status,
                               numeric_game_id))
 
-                        # Update user picks correctness if game is final
-                        if is_final and not old_is_final:
-                            # Update picks using numeric game_id (what picks actually reference)
-                            self.update_pick_correctness(
-                                cursor, numeric_game_id, away_team, home_team,
-                                away_score, home_score)
+                        # Score picks by numeric game_id (what picks actually reference)
+                        if is_final:
+                            final_game_ids.append(numeric_game_id)
 
                         logger.info(
                             f"Updated {away_team}@{home_team}: "
@@ -272,9 +268,21 @@ class NFLScoreUpdater:
                     logger.error(f"Error updating game {game_key}: {e}")
                     continue
             
+            # Only games not yet scored at this final score are touched
+            scored_ids, picks_updated = score_games_with_cursor(cursor, final_game_ids)
+            
             conn.commit()
             conn.close()
             
+            if updated_count:
+                invalidate_game_view_cache()
+                notify_scores_changed()
+            
+            if scored_ids:
+                logger.info(f"Updated pick correctness for {picks_updated} picks on {len(scored_ids)} games")
+                from season_standings import refresh_standings_for_games
+                refresh_standings_for_games(scored_ids, self.db_path)
+            
             logger.info(f"Successfully updated {updated_count} games")
             return updated_count
             
@@ -282,64 +290,27 @@ class NFLScoreUpdater:
             logger.error(f"Error updating game scores: {e}")
             return 0
     
-    def update_pick_correctness(self, cursor, game_id: int, away_team: str, 
-                              home_team: str, away_score: int, home_score: int):
-        """Update the correctness of user picks for a completed game"""
-        try:
-            # Determine winning team
-            if home_score > away_score:
-                winning_team = home_team
-            elif away_score > home_score:
-                winning_team = away_team
-            else:
-                winning_team = None  # Tie
-            
-            if winning_team:
-                # Update correct picks
-                cursor.execute('''
-                    UPDATE user_picks 
-                    SET is_correct = 1
-                    WHERE game_id = ? AND selected_team = ?
-                ''', (game_id, winning_team))
-                
-                # Update incorrect picks
-                cursor.execute('''
-                    UPDATE user_picks 
-                    SET is_correct = 0
-                    WHERE game_id = ? AND selected_team != ?
-                ''', (game_id, winning_team))
-                
-                logger.info(f"Updated pick correctness for game {game_id}, winner: {winning_team}")
-            else:
-                # Handle ties (rare in NFL)
-                cursor.execute('''
-                    UPDATE user_picks 
-                    SET is_correct = 0
-                    WHERE game_id = ?
-                ''', (game_id,))
-                
-                logger.info(f"Updated picks for tie game {game_id}")
-                
-        except Exception as e:
-            logger.error(f"Error updating pick correctness for game {game_id}: {e}")
-    
     def trigger_leaderboard_refresh(self):
         """Trigger leaderboard cache refresh after game updates"""
         try:
-            # This could be used to clear cache, trigger webhooks, etc.
+            # The score writes already bumped the data version (SQLite triggers);
+            # re-read it now instead of after DATA_VERSION_CHECK_SECONDS
             logger.info("Triggering leaderboard refresh after game updates")
-            
-            # You could add cache clearing logic here if you implement caching
-            # For now, just log that updates occurred
+            refresh_data_version()
             
         except Exception as e:
             logger.error(f"Error triggering leaderboard refresh: {e}")
     
-    def run_update_cycle(self) -> Dict:
-        """Run a complete update cycle - fetch and update scores"""
+    def run_update_cycle(self, weeks: Optional[List[Tuple[int, int]]] = None) -> Dict:
+        """
+        Run a complete update cycle - fetch and update scores
+        weeks is a list of (week, year); by default the weeks the polling plan
+        says have games in progress or awaiting a final score
+        """
         start_time = datetime.now()
         results = {
             'start_time': start_time.isoformat(),
+            'weeks': [],
             'games_checked': 0,
             'games_updated': 0,
             'errors': [],
@@ -349,39 +320,37 @@ class NFLScoreUpdater:
         try:
             logger.info("Starting NFL score update cycle")
             
-            # Get current week
-            current_date = datetime.now()
-            season_start = datetime(2025, 9, 5)
-            days_since_start = (current_date - season_start).days
-            current_week = 10  # FORCED TO WEEK 10
-            
-            # Fetch scores for current week
-            scores_data = self.fetch_current_week_scores(year=2025, week=current_week)
-            results['games_checked'] = len(scores_data)
+            if weeks is None:
+                from polling_scheduler import get_polling_plan
+                plan = get_polling_plan(self.db_path)
+                weeks = plan.weeks
+                logger.info(f"Polling plan: {plan.reason}")
             
-            if scores_data:
-                # Update scores in database
-                updated_count = self.update_game_scores(scores_data)
-                results['games_updated'] = updated_count
+            results['weeks'] = [{'week': week, 'year': year} for week, year in weeks]
+            if not weeks:
+                # Nothing in progress or awaiting a final score
                 results['success'] = True
+            
+            for week, year in weeks:
+                scores_data = self.fetch_current_week_scores(year=year, week=week)
+                results['games_checked'] += len(scores_data)
                 
-                # Trigger leaderboard refresh if any games were updated
-                if updated_count > 0:
-                    self.trigger_leaderboard_refresh()
+                if not scores_data:
+                    logger.warning(f"No score data retrieved from ESPN for Week {week}, {year}")
+                    results['errors'].append(f"No score data retrieved from ESPN for Week {week}, {year}")
+                    continue
                 
-                logger.info(f"Update cycle completed: {updated_count} games updated")
-            else:
-                logger.warning("No score data retrieved from ESPN")
-                results['errors'].append("No score data retrieved from ESPN")
-            
-            # Also check previous week if it's early in current week
-            if current_week > 1 and current_date.weekday() < 2:  # Monday or Tuesday
-                logger.info("Also checking previous week scores")
-                prev_scores = self.fetch_current_week_scores(year=2025, week=current_week-1)
-                if prev_scores:
-                    prev_updated = self.update_game_scores(prev_scores)
-                    results['games_updated'] += prev_updated
-                    logger.info(f"Previous week: {prev_updated} additional games updated")
+                # Update scores in database
+                updated_count = self.update_game_scores(scores_data, week, year)
+                results['games_updated'] += updated_count
+                results['success'] = True
+                logger.info(f"Week {week}, {year}: {updated_count} games updated")
+            
+            # Trigger leaderboard refresh if any games were updated
+            if results['games_updated'] > 0:
+                self.trigger_leaderboard_refresh()
+            
+            logger.info(f"Update cycle completed: {results['games_updated']} games updated")
             
         except Exception as e:
             logger.error(f"Error in update cycle: {e}")
@@ -395,7 +364,7 @@ class NFLScoreUpdater:
     def get_latest_scores_summary(self) -> Dict:
         """Get a summary of the latest scores for monitoring"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_pooled_connection(self.db_path)
             cursor = conn.cursor()
             
             # Get recent games
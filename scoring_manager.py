@@ -6,6 +6,7 @@ Implements the closest total points logic for determining winners
 import sqlite3
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
+from weekly_winners import WeeklyWinnerEngine
 
 class NFLScoringManager:
     """Manages scoring logic for NFL fantasy picks"""
@@ -253,58 +254,16 @@ class NFLScoringManager:
 
     def determine_week_winner(self, week: int, year: int) -> List[Dict[str, Any]]:
         """
-        Determine the winner(s) for a specific week based on scoring
-        Returns sorted list of users with their scores
-        Includes Monday Night tiebreaker logic
+        Determine the winner(s) for a specific week
+        Returns sorted list of users with their scores (rank 1 first), ranked by
+        the league's weekly winner engine including the Monday Night tiebreakers
         """
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get all users who made picks this week
-            cursor.execute('''
-                SELECT DISTINCT u.id, u.username
-                FROM users u
-                JOIN user_picks p ON u.id = p.user_id
-                JOIN nfl_games g ON p.game_id = g.id
-                WHERE g.week = ? AND g.year = ? AND u.is_admin = 0
-            ''', (week, year))
-            
-            users = cursor.fetchall()
-            user_scores = []
-            
-            # Calculate score for each user
-            for user_id, username in users:
-                score_data = self.calculate_user_week_score(user_id, week, year)
-                monday_data = self.get_monday_night_tiebreaker_data(user_id, week, year)
-                
-                user_scores.append({
-                    'user_id': user_id,
-                    'username': username,
-                    'total_score': score_data['total_score'],
-                    'breakdown': score_data.get('breakdown', score_data),
-                    'total_points_difference': score_data.get('total_points_difference', 999),
-                    'monday_tiebreaker': monday_data
-                })
-            
-            # Sort with Monday Night tiebreaker logic
-            # 1. Highest total score first
-            # 2. If tied, use Monday Night tiebreakers:
-            #    a. Closest to home team score
-            #    b. Closest to away team score  
-            #    c. Closest to total combined score
-            # 3. If still tied, use overall total points difference
-            user_scores.sort(key=lambda x: (
-                -x['total_score'],                                    # Highest score first
-                x['monday_tiebreaker']['home_difference'],           # Closest to MNF home team
-                x['monday_tiebreaker']['away_difference'],           # Closest to MNF away team
-                x['monday_tiebreaker']['total_difference'],          # Closest to MNF total
-                x['total_points_difference']                         # Overall total difference
-            ))
-            
-            conn.close()
-            return user_scores
+            results = WeeklyWinnerEngine(self.db_path).get_week_results(week, year)
+            for entry in results:
+                entry['total_score'] = entry['correct_picks']  # 1 point per correct pick
+            return results
             
         except Exception as e:
             print(f"Error determining week winner: {e}")
@@ -316,45 +275,14 @@ class NFLScoringManager:
         """
         
         try:
-            user_scores = self.determine_week_winner(week, year)
+            ranking = WeeklyWinnerEngine(self.db_path).recompute_week(week, year)
+            results = ranking['results']
             
-            if not user_scores:
+            if not results:
                 return False
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Update each user's weekly results
-            for i, user_data in enumerate(user_scores):
-                # Determine if this user is the winner (rank 1)
-                is_winner = i == 0
-                weekly_rank = i + 1
-                
-                breakdown = user_data['breakdown']
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO weekly_results
-                    (user_id, week, year, total_points, weekly_rank, is_winner,
-                     correct_picks, confidence_points, bonus_points, exact_score_bonus)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    user_data['user_id'],
-                    week,
-                    year,
-                    breakdown['total_score'],
-                    weekly_rank,
-                    is_winner,
-                    breakdown.get('exact_predictions', 0) // 10,  # Convert points back to count
-                    breakdown.get('proximity_points', 0),
-                    breakdown.get('total_proximity_bonus', 0) + breakdown.get('monday_night_bonus', 0),
-                    breakdown.get('perfect_week_bonus', 0)
-                ))
-            
-            conn.commit()
-            conn.close()
-            
             print(f"✅ Updated weekly results for Week {week}, {year}")
-            print(f"   Winner: {user_scores[0]['username']} with {user_scores[0]['total_score']} points")
+            print(f"   Leader: {results[0]['username']} with {results[0]['correct_picks']} points")
             
             return True
             
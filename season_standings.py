@@ -0,0 +1,236 @@
+"""
+Season standings materialization for NFL Fantasy League
+Keeps per-player season totals (weekly wins, games won, weeks played) in the
+season_standings table so the leaderboard is a single indexed SELECT.
+Rows are refreshed for the affected players whenever games are finalized or
+weekly results are recalculated; rebuild_season_standings() repairs everything.
+
+Usage:
+    python season_standings.py            # rebuild all standings
+"""
+
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+
+def create_season_standings_table_if_not_exists(db_path: str = DATABASE_PATH) -> bool:
+    """Ensure season_standings table and its ordering index exist"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS season_standings (
+                user_id INTEGER PRIMARY KEY,
+                weekly_wins INTEGER DEFAULT 0,
+                total_games_won INTEGER DEFAULT 0,
+                weeks_played INTEGER DEFAULT 0,
+                games_played INTEGER DEFAULT 0,
+                avg_games_won_per_week REAL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_season_standings_order
+            ON season_standings(weekly_wins DESC, total_games_won DESC, avg_games_won_per_week DESC)
+        ''')
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+def _refresh(cursor, user_ids: Optional[List[int]]) -> int:
+    """Recompute standings rows for the given users (all users when None)"""
+    if user_ids is not None and not user_ids:
+        return 0
+
+    if user_ids is None:
+        pick_filter = result_filter = user_filter = ''
+        params: List[Any] = []
+    else:
+        placeholders = ','.join('?' * len(user_ids))
+        pick_filter = f'AND up.user_id IN ({placeholders})'
+        result_filter = f'AND user_id IN ({placeholders})'
+        user_filter = f'AND u.id IN ({placeholders})'
+        params = list(user_ids) * 3
+
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO season_standings
+            (user_id, weekly_wins, total_games_won, weeks_played, games_played,
+             avg_games_won_per_week, updated_at)
+        SELECT u.id,
+               COALESCE(w.weekly_wins, 0),
+               COALESCE(p.games_won, 0),
+               COALESCE(p.weeks_played, 0),
+               COALESCE(p.games_played, 0),
+               CASE WHEN COALESCE(p.weeks_played, 0) > 0
+                    THEN ROUND(CAST(p.games_won AS FLOAT) / p.weeks_played, 1)
+                    ELSE 0.0 END,
+               CURRENT_TIMESTAMP
+        FROM users u
+        LEFT JOIN (
+            SELECT up.user_id as user_id,
+                   SUM(CASE WHEN up.is_correct = 1 THEN 1 ELSE 0 END) as games_won,
+                   COUNT(DISTINCT g.week || '-' || g.year) as weeks_played,
+                   COUNT(*) as games_played
+            FROM user_picks up
+            JOIN nfl_games g ON up.game_id = g.id
+            WHERE g.is_final = 1 {pick_filter}
+            GROUP BY up.user_id
+        ) p ON p.user_id = u.id
+        LEFT JOIN (
+            SELECT user_id, COUNT(*) as weekly_wins
+            FROM weekly_results
+            WHERE is_winner = 1 {result_filter}
+            GROUP BY user_id
+        ) w ON w.user_id = u.id
+        WHERE 1 = 1 {user_filter}
+    ''', params)
+    return cursor.rowcount
+
+
+def refresh_season_standings_with_cursor(cursor, user_ids: Iterable[int]) -> int:
+    """Refresh standings for the given users inside the caller's transaction (no commit)"""
+    return _refresh(cursor, sorted({user_id for user_id in user_ids if user_id is not None}))
+
+
+def refresh_season_standings(user_ids: Iterable[int], db_path: str = DATABASE_PATH) -> int:
+    """Incrementally refresh standings for the given users"""
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if not user_ids:
+        return 0
+
+    try:
+        conn = get_pooled_connection(db_path)
+        try:
+            cursor = conn.cursor()
+            refreshed = refresh_season_standings_with_cursor(cursor, user_ids)
+            conn.commit()
+        finally:
+            conn.close()
+
+        logger.info(f"Refreshed season standings for {refreshed} users")
+        return refreshed
+
+    except Exception as e:
+        logger.error(f"Error refreshing season standings: {e}")
+        return 0
+
+
+def refresh_standings_for_games(game_ids: Iterable[int], db_path: str = DATABASE_PATH) -> int:
+    """Refresh standings for every user with a pick on the given games"""
+    game_ids = [game_id for game_id in game_ids if game_id is not None]
+    if not game_ids:
+        return 0
+
+    try:
+        conn = get_pooled_connection(db_path)
+        try:
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(game_ids))
+            cursor.execute(f'''
+                SELECT DISTINCT user_id FROM user_picks WHERE game_id IN ({placeholders})
+            ''', game_ids)
+            user_ids = [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+        return refresh_season_standings(user_ids, db_path)
+
+    except Exception as e:
+        logger.error(f"Error refreshing season standings for games {game_ids}: {e}")
+        return 0
+
+
+def get_week_participant_ids(week: int, year: int, db_path: str = DATABASE_PATH) -> List[int]:
+    """Users with picks or weekly results in the given week"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT up.user_id FROM user_picks up
+            JOIN nfl_games g ON up.game_id = g.id
+            WHERE g.week = ? AND g.year = ?
+            UNION
+            SELECT user_id FROM weekly_results WHERE week = ? AND year = ?
+        ''', (week, year, week, year))
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def refresh_standings_for_week(week: int, year: int, db_path: str = DATABASE_PATH) -> int:
+    """Refresh standings for every user who played the given week"""
+    try:
+        return refresh_season_standings(get_week_participant_ids(week, year, db_path), db_path)
+    except Exception as e:
+        logger.error(f"Error refreshing season standings for Week {week}, {year}: {e}")
+        return 0
+
+
+def rebuild_season_standings(db_path: str = DATABASE_PATH) -> int:
+    """Rebuild the whole table from user_picks and weekly_results (repair command)"""
+    create_season_standings_table_if_not_exists(db_path)
+
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM season_standings')
+        rebuilt = _refresh(cursor, None)
+        conn.commit()
+    finally:
+        conn.close()
+
+    logger.info(f"Rebuilt season standings for {rebuilt} users")
+    return rebuilt
+
+
+def ensure_season_standings(db_path: str = DATABASE_PATH) -> bool:
+    """Startup migration: create the table and populate it if it is empty"""
+    create_season_standings_table_if_not_exists(db_path)
+
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM season_standings')
+        is_empty = cursor.fetchone()[0] == 0
+    finally:
+        conn.close()
+
+    if is_empty:
+        rebuild_season_standings(db_path)
+    return True
+
+
+def get_season_leaderboard(db_path: str = DATABASE_PATH) -> List[Dict[str, Any]]:
+    """Season leaderboard rows, ordered for display"""
+    conn = get_pooled_connection(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT u.username, s.weekly_wins, s.total_games_won, s.weeks_played,
+                   s.games_played, s.avg_games_won_per_week
+            FROM season_standings s
+            JOIN users u ON u.id = s.user_id
+            WHERE u.is_admin = 0
+            AND (s.games_played > 0 OR s.weekly_wins > 0)
+            ORDER BY s.weekly_wins DESC, s.total_games_won DESC,
+                     s.avg_games_won_per_week DESC, u.username
+        ''')
+        return [dict(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    count = rebuild_season_standings()
+    print(f"✅ Rebuilt season standings for {count} users")
@@ -7,6 +7,7 @@ from typing import List, Optional
 import logging
 from models import NFLGame
 from config import Config
+from espn_scoreboard_client import get_scoreboard_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +19,7 @@ class NFLService:
     def fetch_games_from_api(self, week: int, year: int) -> List[NFLGame]:
         """Fetch NFL games from ESPN API"""
         try:
-            url = f"{self.base_url}/scoreboard"
-            params = {'seasontype': 2, 'week': week, 'year': year}
-            
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = get_scoreboard_client().fetch_json(week=week, year=year, seasontype=2)
             
             games = []
             for event in data.get('events', []):
@@ -22,11 +22,17 @@ This replaces:
 """
 
 import sqlite3
+import time
 import requests
 import sys
 from datetime import datetime
 from pathlib import Path
 import urllib3
+from pick_correctness import score_games_with_cursor
+from season_standings import refresh_standings_for_games
+from espn_scoreboard_client import get_scoreboard_client
+from api_rate_limiter import acquire_api_call
+from updater_lease import UpdaterLease
 
 # Disable SSL warnings for enterprise networks
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -119,24 +125,14 @@ class SimpleBackgroundService:
     def update_scores(self, week: int) -> int:
         """Update scores for a specific week"""
         try:
-            # Get ESPN data with SSL verification disabled for enterprise networks
-            url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-            params = {'seasontype': 2, 'week': week, 'year': self.year}
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(
-                url, 
-                params=params, 
-                headers=headers,
-                timeout=30,
-                verify=False  # Disable SSL verification for enterprise networks
-            )
-            response.raise_for_status()
+            # Uncached fetches spend the ESPN budget shared with the web app
+            client = get_scoreboard_client()
+            if not client.is_fresh(week=week, year=self.year) and not acquire_api_call():
+                self.log(f"Shared ESPN rate limit reached, skipping Week {week}")
+                return 0
             
-            data = response.json()
+            # Get ESPN data through the shared cached client
+            data = client.fetch_json(week=week, year=self.year, seasontype=2)
             games = data.get('events', [])
             
             if not games:
@@ -200,51 +196,45 @@ class SimpleBackgroundService:
                     if cursor.rowcount > 0:
                         updated += 1
                         self.log(f"UPDATED: {away_team} {away_score} - {home_team} {home_score}")
-                        
-                        # Update picks if final
-                        if is_final:
-                            self._update_picks(cursor, away_team, home_team, away_score, home_score, week)
                 
                 except Exception as e:
                     self.log(f"Error processing game: {e}")
             
+            # Score picks for final games not yet scored at their final score
+            cursor.execute("""
+                SELECT id FROM nfl_games WHERE week = ? AND year = ? AND is_final = 1
+            """, (week, self.year))
+            scored_ids, picks_updated = score_games_with_cursor(cursor, [row[0] for row in cursor.fetchall()])
+            
             conn.commit()
             conn.close()
+            
+            if scored_ids:
+                self.log(f"PICKS: Updated {picks_updated} picks on {len(scored_ids)} final games")
+                refresh_standings_for_games(scored_ids, str(self.db_path))
             return updated
             
         except Exception as e:
             self.log(f"Database error: {e}")
             return 0
 
-    def _update_picks(self, cursor, away_team: str, home_team: str, 
-                     away_score: int, home_score: int, week: int):
-        """Update pick scoring"""
+    def run_update_cycle(self):
+        """Run one complete update cycle (skipped while another updater holds the lease)"""
+        lease = UpdaterLease('simple_background_service', str(self.db_path))
+        if not lease.acquire():
+            self.log("STANDBY: another updater holds the lease, skipping cycle")
+            return 0
+        started_at = time.time()
+        updated = 0
         try:
-            winner = home_team if home_score > away_score else away_team
-            
-            cursor.execute("""
-                SELECT id FROM nfl_games 
-                WHERE away_team = ? AND home_team = ? AND week = ? AND year = ?
-            """, (away_team, home_team, week, self.year))
-            
-            game = cursor.fetchone()
-            if not game:
-                return
-            
-            cursor.execute("""
-                UPDATE user_picks 
-                SET is_correct = CASE WHEN selected_team = ? THEN 1 ELSE 0 END,
-                    points_earned = CASE WHEN selected_team = ? THEN 1 ELSE 0 END
-                WHERE game_id = ?
-            """, (winner, winner, game[0]))
-            
-            self.log(f"PICKS: Updated {cursor.rowcount} picks for {away_team} vs {home_team}")
-            
-        except Exception as e:
-            self.log(f"Error updating picks: {e}")
+            updated = self._run_update_cycle()
+            return updated
+        finally:
+            lease.record_cycle(started_at, time.time(), f"updated {updated} games")
+            lease.release()
 
-    def run_update_cycle(self):
-        """Run one complete update cycle"""
+    def _run_update_cycle(self):
+        """The current week and the next"""
         try:
             self.log("=== STARTING UPDATE CYCLE ===")
             
@@ -0,0 +1,96 @@
+"""
+NFL team reference data for NFL Fantasy League
+Team names and logo paths shared by the web app and the game view cache
+"""
+
+# NFL team name mappings
+NFL_TEAM_NAMES = {
+    'ARI': 'Arizona Cardinals',
+    'ATL': 'Atlanta Falcons', 
+    'BAL': 'Baltimore Ravens',
+    'BUF': 'Buffalo Bills',
+    'CAR': 'Carolina Panthers',
+    'CHI': 'Chicago Bears',
+    'CIN': 'Cincinnati Bengals',
+    'CLE': 'Cleveland Browns',
+    'DAL': 'Dallas Cowboys',
+    'DEN': 'Denver Broncos',
+    'DET': 'Detroit Lions',
+    'GB': 'Green Bay Packers',
+    'HOU': 'Houston Texans',
+    'IND': 'Indianapolis Colts',
+    'JAX': 'Jacksonville Jaguars',
+    'KC': 'Kansas City Chiefs',
+    'LAC': 'Los Angeles Chargers',
+    'LAR': 'Los Angeles Rams',
+    'LV': 'Las Vegas Raiders',
+    'MIA': 'Miami Dolphins',
+    'MIN': 'Minnesota Vikings',
+    'NE': 'New England Patriots',
+    'NO': 'New Orleans Saints',
+    'NYG': 'New York Giants',
+    'NYJ': 'New York Jets',
+    'PHI': 'Philadelphia Eagles',
+    'PIT': 'Pittsburgh Steelers',
+    'SF': 'San Francisco 49ers',
+    'SEA': 'Seattle Seahawks',
+    'TB': 'Tampa Bay Buccaneers',
+    'TEN': 'Tennessee Titans',
+    'WAS': 'Washington Commanders'
+}
+
+# Full team names -> logo file abbreviations
+TEAM_LOGO_ABBR = {
+    'Arizona Cardinals': 'ari',
+    'Atlanta Falcons': 'atl', 
+    'Baltimore Ravens': 'bal',
+    'Buffalo Bills': 'buf',
+    'Carolina Panthers': 'car',
+    'Chicago Bears': 'chi',
+    'Cincinnati Bengals': 'cin',
+    'Cleveland Browns': 'cle',
+    'Dallas Cowboys': 'dal',
+    'Denver Broncos': 'den',
+    'Detroit Lions': 'det',
+    'Green Bay Packers': 'gb',
+    'Houston Texans': 'hou',
+    'Indianapolis Colts': 'ind',
+    'Jacksonville Jaguars': 'jax',
+    'Kansas City Chiefs': 'kc',
+    'Los Angeles Chargers': 'lac',
+    'Los Angeles Rams': 'lar',
+    'Las Vegas Raiders': 'lv',
+    'Miami Dolphins': 'mia',
+    'Minnesota Vikings': 'min',
+    'New England Patriots': 'ne',
+    'New Orleans Saints': 'no',
+    'New York Giants': 'nyg',
+    'New York Jets': 'nyj',
+    'Philadelphia Eagles': 'phi',
+    'Pittsburgh Steelers': 'pit',
+    'Seattle Seahawks': 'sea',
+    'San Francisco 49ers': 'sf',
+    'Tampa Bay Buccaneers': 'tb',
+    'Tennessee Titans': 'ten',
+    'Washington Commanders': 'was'
+}
+
+
+def get_team_name(abbreviation):
+    """Get full team name from abbreviation"""
+    return NFL_TEAM_NAMES.get(abbreviation, abbreviation)
+
+
+def get_team_logo_url(team_name_or_abbr):
+    """Get team logo URL from team name or abbreviation"""
+    # Get abbreviation (either directly or from mapping)
+    abbr = TEAM_LOGO_ABBR.get(team_name_or_abbr, team_name_or_abbr.lower())
+
+    # Use local SVG files
+    return f"/static/images/{abbr}.svg"
+
+
+def get_team_display(abbreviation):
+    """Get team display as 'ABB - Full Name'"""
+    full_name = NFL_TEAM_NAMES.get(abbreviation, abbreviation)
+    return f"{abbreviation} - {full_name}"
@@ -0,0 +1,114 @@
+"""
+MondayScenarioEngine must agree with WeeklyWinnerEngine once the Monday
+Night game is final: a correct MNF pick counts as one win, not two.
+"""
+
+import os
+import sys
+import sqlite3
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+import mnf_scenario_engine
+from mnf_scenario_engine import MondayScenarioEngine
+from weekly_winners import WeeklyWinnerEngine
+
+WEEK, YEAR = 5, 2025
+
+# away, home, away_score, home_score, is_monday_night
+GAMES = [
+    ('DAL', 'NYG', 20, 17, 0),
+    ('KC', 'LV', 31, 10, 0),
+    ('BUF', 'MIA', 24, 27, 0),
+    ('CHI', 'GB', 13, 28, 1),
+]
+
+# username -> selected team per game, in GAMES order (MNF pick last)
+PICKS = {
+    'bob': ['DAL', 'KC', 'MIA', 'CHI'],     # 3 correct, wrong MNF pick
+    'alice': ['DAL', 'LV', 'BUF', 'GB'],    # 2 correct, one of them the MNF pick
+}
+
+
+@pytest.fixture
+def final_week_db(tmp_path):
+    db_path = str(tmp_path / 'nfl_fantasy.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, is_admin INTEGER DEFAULT 0);
+        CREATE TABLE nfl_games (
+            id INTEGER PRIMARY KEY, week INTEGER, year INTEGER, home_team TEXT, away_team TEXT,
+            home_score INTEGER, away_score INTEGER, game_date TEXT, is_final INTEGER,
+            is_monday_night INTEGER, kickoff_utc INTEGER, slot TEXT
+        );
+        CREATE TABLE user_picks (
+            id INTEGER PRIMARY KEY, user_id INTEGER, game_id INTEGER, selected_team TEXT,
+            predicted_home_score INTEGER, predicted_away_score INTEGER, is_correct INTEGER,
+            created_at TEXT
+        );
+    ''')
+    game_ids = []
+    for index, (away, home, away_score, home_score, is_monday) in enumerate(GAMES):
+        cursor = conn.execute('''
+            INSERT INTO nfl_games (week, year, home_team, away_team, home_score, away_score,
+                                   game_date, is_final, is_monday_night, kickoff_utc, slot)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?, ?)
+        ''', (WEEK, YEAR, home, away, home_score, away_score, f'2025-10-0{5 + is_monday} 13:0{index}:00',
+              is_monday, 1759683600 + index * 60 + is_monday * 86400, 'MNF' if is_monday else 'SUN_EARLY'))
+        game_ids.append(cursor.lastrowid)
+    for username, teams in PICKS.items():
+        user_id = conn.execute('INSERT INTO users (username) VALUES (?)', (username,)).lastrowid
+        for game_id, team, (away, home, away_score, home_score, is_monday) in zip(game_ids, teams, GAMES):
+            winner = home if home_score > away_score else away
+            conn.execute('''
+                INSERT INTO user_picks (user_id, game_id, selected_team, predicted_home_score,
+                                        predicted_away_score, is_correct, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, '2025-10-04 12:00:00')
+            ''', (user_id, game_id, team, 24 if is_monday else None, 17 if is_monday else None,
+                  1 if team == winner else 0))
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_final_monday_matches_weekly_winner_engine(final_week_db, monkeypatch):
+    monkeypatch.setattr(mnf_scenario_engine, '_simulation_cache', {})
+
+    ranked = WeeklyWinnerEngine(final_week_db).get_week_results(WEEK, YEAR)
+    winner = next(result for result in ranked if result['is_winner'])
+    assert winner['username'] == 'bob'
+
+    result = MondayScenarioEngine(final_week_db).simulate(WEEK, YEAR)
+    assert result['tiebreaker_final']
+    players = {player['username']: player for player in result['players']}
+    assert players['bob']['win_probability'] == 1.0
+    assert players['alice']['win_probability'] == 0.0
+    assert players['bob']['current_wins'] == 3
+    assert players['alice']['current_wins'] == 2
+
+
+def test_open_week_assigns_every_scenario_one_winner(final_week_db, monkeypatch):
+    monkeypatch.setattr(mnf_scenario_engine, '_simulation_cache', {})
+    conn = sqlite3.connect(final_week_db)
+    # Reopen BUF @ MIA and the Monday Night game
+    conn.execute("UPDATE nfl_games SET is_final = 0, home_score = NULL, away_score = NULL "
+                 "WHERE home_team IN ('MIA', 'GB')")
+    conn.execute('UPDATE user_picks SET is_correct = NULL WHERE game_id IN '
+                 "(SELECT id FROM nfl_games WHERE is_final = 0)")
+    conn.commit()
+    conn.close()
+
+    result = MondayScenarioEngine(final_week_db).simulate(WEEK, YEAR)
+    assert not result['tiebreaker_final']
+    assert result['remaining_games'] == 2
+    players = {player['username']: player for player in result['players']}
+    assert players['bob']['current_wins'] == 2
+    assert players['alice']['current_wins'] == 1
+    # alice can only catch up by winning both open games, then wins the tiebreaker on GB
+    assert 0 < players['alice']['win_probability'] < 0.5
+    assert sum(player['win_probability'] for player in result['players']) == pytest.approx(1.0, abs=1e-3)
+    assert all(region['winning_team'] == 'GB' for region in players['alice']['regions'])
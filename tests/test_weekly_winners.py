@@ -0,0 +1,32 @@
+"""
+pick_monday_night_game chooses the tiebreaker game from kickoff_utc/slot,
+whatever format game_date happens to be stored in.
+"""
+
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from weekly_winners import pick_monday_night_game
+
+
+def test_latest_mnf_kickoff_wins_over_game_date_text():
+    games = [
+        # 7:15 PM game stored in the 12-hour format; sorts last as text
+        {'id': 1, 'game_date': '2025-10-06 7:15 PM', 'is_monday_night': 1,
+         'kickoff_utc': 1759792500, 'slot': 'MNF'},
+        {'id': 2, 'game_date': '2025-10-06 20:15:00', 'is_monday_night': 1,
+         'kickoff_utc': 1759796100, 'slot': 'MNF'},
+        {'id': 3, 'game_date': '2025-10-05 20:20:00', 'is_monday_night': 0,
+         'kickoff_utc': 1759710000, 'slot': 'SNF'},
+    ]
+    assert pick_monday_night_game(games)['id'] == 2
+
+
+def test_no_mnf_slot_means_no_tiebreaker_game():
+    games = [{'id': 1, 'game_date': '2025-10-05 13:00:00', 'is_monday_night': 1,
+              'kickoff_utc': 1759683600, 'slot': 'SUN_EARLY'}]
+    assert pick_monday_night_game(games) is None
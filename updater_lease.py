@@ -0,0 +1,221 @@
+"""
+Score updater lease for NFL Fantasy League
+Several processes can poll ESPN against the same database: the background
+updater (in the app, or its own process under the pre-fork server),
+start_updater.py, simple_background_service.py and
+robust_nfl_system.monitor_continuously. Only the one holding the lease row in
+updater_lease runs update cycles; the others stay on hot standby and take
+over once the holder stops renewing it.
+
+The holder renews the lease (heartbeat) every
+Config.UPDATER_LEASE_HEARTBEAT_SECONDS; it expires
+Config.UPDATER_LEASE_TTL_SECONDS after the last renewal, so a crashed holder
+is replaced within one TTL. A holder that stops cleanly releases it at once.
+The row also records the last cycle's timings for the admin status page.
+"""
+
+import os
+import time
+import uuid
+import socket
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import Config
+from models import get_pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+SCORE_UPDATER_LEASE = 'score_updater'
+
+UPDATER_LEASE_SQL = '''
+    CREATE TABLE IF NOT EXISTS updater_lease (
+        name TEXT PRIMARY KEY,
+        holder TEXT,
+        holder_role TEXT,
+        acquired_at REAL,
+        heartbeat_at REAL,
+        expires_at REAL NOT NULL DEFAULT 0,
+        cycle_started_at REAL,
+        cycle_finished_at REAL,
+        cycle_seconds REAL,
+        cycle_result TEXT,
+        cycles INTEGER NOT NULL DEFAULT 0
+    )
+'''
+
+
+def ensure_updater_lease_table(db_path: str = DATABASE_PATH) -> bool:
+    """Startup migration: create the updater_lease table"""
+    conn = get_pooled_connection(db_path)
+    try:
+        conn.execute(UPDATER_LEASE_SQL)
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds') if timestamp else None
+
+
+class UpdaterLease:
+    """One process's claim on a named updater lease"""
+
+    def __init__(self, role: str, db_path: str = DATABASE_PATH, name: str = SCORE_UPDATER_LEASE):
+        self.role = role
+        self.db_path = db_path
+        self.name = name
+        self.held = False
+        self._holder_pid: Optional[int] = None
+        self._holder_id: Optional[str] = None
+        self._table_checked = False
+
+    @property
+    def holder_id(self) -> str:
+        """host:pid:token, regenerated in forked children so a copy never shares its parent's claim"""
+        if self._holder_pid != os.getpid():
+            self._holder_pid = os.getpid()
+            self._holder_id = f"{socket.gethostname()}:{self._holder_pid}:{uuid.uuid4().hex[:8]}"
+            self.held = False
+        return self._holder_id
+
+    def acquire(self) -> bool:
+        """Take the lease, or renew it if already held; False while another live holder has it"""
+        holder = self.holder_id
+        now = time.time()
+        expires_at = now + Config.UPDATER_LEASE_TTL_SECONDS
+
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            if not self._table_checked:
+                # Standalone services may run against a database the app hasn't migrated yet
+                cursor.execute(UPDATER_LEASE_SQL)
+                conn.commit()
+                self._table_checked = True
+
+            conn.isolation_level = None
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute('SELECT holder, expires_at FROM updater_lease WHERE name = ?', (self.name,))
+                row = cursor.fetchone()
+                if row is not None and row[0] != holder and row[1] > now:
+                    cursor.execute('ROLLBACK')
+                    if self.held:
+                        logger.warning(f"Updater lease '{self.name}' lost to {row[0]}")
+                    self.held = False
+                    return False
+
+                if row is None:
+                    cursor.execute('''
+                        INSERT INTO updater_lease (name, holder, holder_role, acquired_at, heartbeat_at, expires_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (self.name, holder, self.role, now, now, expires_at))
+                elif row[0] == holder:
+                    cursor.execute('''
+                        UPDATE updater_lease SET heartbeat_at = ?, expires_at = ?
+                        WHERE name = ?
+                    ''', (now, expires_at, self.name))
+                else:
+                    cursor.execute('''
+                        UPDATE updater_lease
+                        SET holder = ?, holder_role = ?, acquired_at = ?, heartbeat_at = ?, expires_at = ?
+                        WHERE name = ?
+                    ''', (holder, self.role, now, now, expires_at, self.name))
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+        except Exception as e:
+            logger.error(f"Could not acquire updater lease '{self.name}': {e}")
+            self.held = False
+            return False
+        finally:
+            conn.close()
+
+        if not self.held:
+            logger.info(f"Updater lease '{self.name}' acquired by {holder} ({self.role})")
+        self.held = True
+        return True
+
+    def release(self) -> None:
+        """Give the lease up so a standby can take over without waiting for it to expire"""
+        if not self.held:
+            return
+        self.held = False
+        conn = get_pooled_connection(self.db_path)
+        try:
+            conn.execute('UPDATE updater_lease SET expires_at = 0 WHERE name = ? AND holder = ?',
+                         (self.name, self.holder_id))
+            conn.commit()
+            logger.info(f"Updater lease '{self.name}' released by {self.holder_id}")
+        except Exception as e:
+            logger.error(f"Could not release updater lease '{self.name}': {e}")
+        finally:
+            conn.close()
+
+    def record_cycle(self, started_at: float, finished_at: float, result: str) -> None:
+        """Store the timings of an update cycle run under this lease"""
+        conn = get_pooled_connection(self.db_path)
+        try:
+            conn.execute('''
+                UPDATE updater_lease
+                SET cycle_started_at = ?, cycle_finished_at = ?, cycle_seconds = ?,
+                    cycle_result = ?, cycles = cycles + 1
+                WHERE name = ? AND holder = ?
+            ''', (started_at, finished_at, round(finished_at - started_at, 3), result,
+                  self.name, self.holder_id))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Could not record updater cycle: {e}")
+        finally:
+            conn.close()
+
+
+def get_lease_status(db_path: str = DATABASE_PATH, name: str = SCORE_UPDATER_LEASE) -> Dict[str, Any]:
+    """Who holds the lease, whether it is live, and the last cycle's timings"""
+    conn = get_pooled_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT holder, holder_role, acquired_at, heartbeat_at, expires_at, cycle_started_at,
+                   cycle_finished_at, cycle_seconds, cycle_result, cycles
+            FROM updater_lease WHERE name = ?
+        ''', (name,))
+        row = cursor.fetchone()
+    except Exception as e:
+        logger.warning(f"Could not read updater lease: {e}")
+        row = None
+    finally:
+        conn.close()
+
+    if row is None:
+        return {'name': name, 'active': False, 'holder': None}
+
+    (holder, role, acquired_at, heartbeat_at, expires_at, cycle_started_at,
+     cycle_finished_at, cycle_seconds, cycle_result, cycles) = row
+    now = time.time()
+    active = expires_at > now
+    return {
+        'name': name,
+        'active': active,
+        'holder': holder if active else None,
+        'holder_role': role if active else None,
+        'last_holder': holder,
+        'acquired_at': _iso(acquired_at),
+        'heartbeat_at': _iso(heartbeat_at),
+        'heartbeat_age_seconds': round(now - heartbeat_at, 1) if heartbeat_at else None,
+        'expires_in_seconds': round(expires_at - now, 1) if active else 0,
+        'last_cycle': {
+            'started_at': _iso(cycle_started_at),
+            'finished_at': _iso(cycle_finished_at),
+            'duration_seconds': cycle_seconds,
+            'result': cycle_result
+        },
+        'cycles': cycles
+    }
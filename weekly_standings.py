@@ -0,0 +1,252 @@
+"""
+Weekly standings engine for NFL Fantasy League
+Builds the weekly leaderboard, Monday Night tiebreaker fields and pick grids
+from a fixed number of queries, independent of how many players are in the league
+"""
+
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+from models import get_pooled_connection
+from game_views import get_week_game_views
+from weekly_winners import assign_ranks, calculate_monday_tiebreaker, pick_monday_night_game, rank_sort_key
+
+logger = logging.getLogger(__name__)
+
+# Game date formats stored in nfl_games.game_date
+GAME_DATE_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S']
+
+
+def _parse_game_date(date_string):
+    """Parse game_date string with multiple format support"""
+    if not date_string:
+        return None
+    if not isinstance(date_string, str):
+        return date_string
+
+    for fmt in GAME_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+
+    logger.error(f"Unable to parse date format: {date_string}")
+    return None
+
+
+class WeeklyStandingsEngine:
+    """Computes a week's standings in a single in-memory pass over games and picks"""
+
+    def __init__(self, db_path: str = 'nfl_fantasy.db'):
+        self.db_path = db_path
+
+    def _fetch_week(self, week: int, year: int):
+        """Load every game and every non-admin pick for the week (two queries)"""
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+
+            # is_revealed mirrors the "past deadline OR completed" rule used across the app
+            cursor.execute('''
+                SELECT id, away_team, home_team, home_score, away_score, game_date,
+                       is_final, is_monday_night, is_thursday_night, kickoff_utc, slot,
+                       CASE WHEN kickoff_utc < CAST(strftime('%s', 'now') AS INTEGER) OR is_final = 1
+                            THEN 1 ELSE 0 END as is_revealed
+                FROM nfl_games
+                WHERE week = ? AND year = ?
+                ORDER BY game_date, id
+            ''', (week, year))
+            games = [dict(row) for row in cursor.fetchall()]
+
+            cursor.execute('''
+                SELECT up.user_id, u.username, up.game_id, up.selected_team,
+                       up.predicted_home_score, up.predicted_away_score, up.is_correct, up.created_at
+                FROM user_picks up
+                JOIN nfl_games g ON up.game_id = g.id
+                JOIN users u ON up.user_id = u.id
+                WHERE g.week = ? AND g.year = ? AND u.is_admin = 0
+                ORDER BY up.id
+            ''', (week, year))
+            picks = [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+        return games, picks
+
+    def get_available_weeks(self, limit: int = 10) -> List[sqlite3.Row]:
+        """Weeks with final games, for leaderboard navigation"""
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT DISTINCT week, year
+                FROM nfl_games
+                WHERE is_final = 1
+                ORDER BY year DESC, week DESC
+                LIMIT ?
+            ''', (limit,))
+            return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def build_week(self, week: int, year: int) -> Dict[str, Any]:
+        """
+        Build everything the weekly leaderboard page shows for one week
+        Returns games_available/completed_games counts, week_completed, the
+        sorted leaderboard, all_picks, picks_by_game and games
+        """
+        games, picks = self._fetch_week(week, year)
+        games_by_id = {game['id']: game for game in games}
+
+        # Kickoff times come pre-parsed from the per-week view cache
+        kickoffs = {view['id']: (view['game_date_raw'], view['game_date_et'])
+                    for view in get_week_game_views(week, year, self.db_path)}
+
+        def kickoff(game):
+            cached = kickoffs.get(game['id'])
+            if cached is not None and cached[0] == game['game_date']:
+                return cached[1]
+            return _parse_game_date(game['game_date'])
+
+        games_available = sum(1 for game in games if game['is_revealed'])
+        completed_games = sum(1 for game in games if game['is_final'] == 1)
+        week_completed = len(games) > 0 and completed_games == len(games)
+
+        # Actual Monday Night game: latest Monday game of the week
+        monday_game = pick_monday_night_game(games)
+
+        # Single pass over picks: group per player and per revealed game
+        players: Dict[int, Dict[str, Any]] = {}
+        revealed_picks = []
+        for pick in picks:
+            game = games_by_id[pick['game_id']]
+            player = players.setdefault(pick['user_id'], {
+                'username': pick['username'],
+                'total_picks': 0,
+                'correct_picks': 0,
+                'submission_time': None,
+                'monday_pick': None,
+                'picks': []
+            })
+            player['picks'].append((pick, game))
+            if pick['created_at'] and (player['submission_time'] is None or
+                                       str(pick['created_at']) < player['submission_time']):
+                player['submission_time'] = str(pick['created_at'])
+
+            if monday_game and game['id'] == monday_game['id'] and player['monday_pick'] is None:
+                player['monday_pick'] = pick
+
+            if game['is_revealed']:
+                player['total_picks'] += 1
+                if pick['is_correct'] == 1:
+                    player['correct_picks'] += 1
+                revealed_picks.append((pick, game))
+
+        leaderboard = []
+        for player in players.values():
+            total_picks = player['total_picks']
+            if total_picks == 0:
+                continue
+            correct_picks = player['correct_picks']
+
+            player['picks'].sort(key=lambda item: item[1]['game_date'] or '')
+            picks_detail = []
+            for pick, game in player['picks']:
+                picks_detail.append({
+                    'home_team': game['home_team'],
+                    'away_team': game['away_team'],
+                    'selected_team': pick['selected_team'],
+                    'predicted_home': pick['predicted_home_score'] or 0,
+                    'predicted_away': pick['predicted_away_score'] or 0,
+                    'actual_home': game['home_score'],
+                    'actual_away': game['away_score'],
+                    'is_final': game['is_final'],
+                    'is_correct': pick['is_correct'],
+                    'game_date': kickoff(game)
+                })
+
+            leaderboard.append({
+                'rank': 0,
+                'username': player['username'],
+                'total_score': correct_picks,  # 1 point per correct pick
+                'total_picks': total_picks,
+                'correct_picks': correct_picks,
+                'breakdown': {
+                    'games_won': correct_picks,
+                    'games_played': total_picks,
+                    'win_percentage': round((correct_picks / total_picks * 100) if total_picks > 0 else 0, 1),
+                    'total_score': correct_picks
+                },
+                'monday_tiebreaker': calculate_monday_tiebreaker(player['monday_pick'], monday_game),
+                'submission_time': player['submission_time'],
+                'picks_detail': picks_detail,
+                'is_winner': False
+            })
+
+        # Same ranking rules as the stored weekly_results (weekly_winners); while the
+        # week is in progress a 5+ pick lead is already shown as the winner
+        leaderboard.sort(key=rank_sort_key)
+        assign_ranks(leaderboard, week_completed, clinch_lead=5)
+
+        # CSV-style grid of revealed picks, grouped by game
+        revealed_picks.sort(key=lambda item: (item[1]['game_date'] or '', item[0]['username']))
+        all_picks = []
+        picks_by_game: Dict[int, Dict[str, Any]] = {}
+        for pick, game in revealed_picks:
+            pick_data = {
+                'game_id': game['id'],
+                'username': pick['username'],
+                'selected_team': pick['selected_team'],
+                'predicted_home_score': pick['predicted_home_score'],
+                'predicted_away_score': pick['predicted_away_score'],
+                'is_correct': pick['is_correct'],
+                'away_team': game['away_team'],
+                'home_team': game['home_team'],
+                'home_score': game['home_score'],
+                'away_score': game['away_score'],
+                'is_final': game['is_final'],
+                'is_monday_night': game['is_monday_night']
+            }
+            all_picks.append(pick_data)
+
+            if game['id'] not in picks_by_game:
+                picks_by_game[game['id']] = {
+                    'game_id': game['id'],
+                    'away_team': game['away_team'],
+                    'home_team': game['home_team'],
+                    'home_score': game['home_score'],
+                    'away_score': game['away_score'],
+                    'is_final': game['is_final'],
+                    'is_monday_night': game['is_monday_night'],
+                    'picks': []
+                }
+            picks_by_game[game['id']]['picks'].append(pick_data)
+
+        games_view = [{
+            'id': game['id'],
+            'away_team': game['away_team'],
+            'home_team': game['home_team'],
+            'game_date': kickoff(game),
+            'is_thursday_night': bool(game['is_thursday_night']),
+            'is_final': bool(game['is_final']),
+            'away_score': game['away_score'],
+            'home_score': game['home_score']
+        } for game in games]
+
+        return {
+            'games_available': games_available,
+            'completed_games': completed_games,
+            'week_completed': week_completed,
+            'leaderboard': leaderboard,
+            'all_picks': all_picks,
+            'picks_by_game': picks_by_game,
+            'games': games_view
+        }
+
+
+def get_weekly_standings(week: int, year: int, db_path: str = 'nfl_fantasy.db') -> Dict[str, Any]:
+    """Convenience wrapper around WeeklyStandingsEngine.build_week"""
+    return WeeklyStandingsEngine(db_path).build_week(week, year)
@@ -3,6 +3,7 @@
 import sqlite3
 from datetime import datetime
 import logging
+from weekly_winners import WeeklyWinnerEngine
 
 class WeeklyWinnerManager:
     """Automatically determines and saves weekly winners when a week completes"""
@@ -56,7 +57,7 @@ class WeeklyWinnerManager:
                    COUNT(*) as total_picks,
                    SUM(CASE WHEN up.is_correct = 1 THEN 1 ELSE 0 END) as correct_picks
             FROM user_picks up
-            JOIN nfl_games ng ON up.game_id = ng.game_id
+            JOIN nfl_games ng ON up.game_id = ng.id
             JOIN users u ON up.user_id = u.id
             WHERE ng.week = ? AND ng.year = ?
             GROUP BY u.id, u.username
@@ -77,7 +78,7 @@ class WeeklyWinnerManager:
             SELECT ng.home_team, ng.away_team, ng.home_score, ng.away_score,
                    up.selected_team, up.predicted_home_score, up.predicted_away_score
             FROM user_picks up
-            JOIN nfl_games ng ON up.game_id = ng.game_id
+            JOIN nfl_games ng ON up.game_id = ng.id
             WHERE up.user_id = ? AND ng.week = ? AND ng.year = ? 
               AND ng.is_monday_night = 1
         ''', (user_id, week, year))
@@ -108,66 +109,32 @@ class WeeklyWinnerManager:
         return None
     
     def save_weekly_results(self, week, year=2025):
-        """Save weekly results to weekly_results table"""
-        standings = self.get_week_standings(week, year)
+        """Save weekly results to weekly_results table (ranked by the weekly winner engine)"""
+        ranking = WeeklyWinnerEngine(self.db_path).recompute_week(week, year)
+        results = ranking['results']
         
-        if not standings:
+        if not results:
             self.logger.warning(f"No standings found for Week {week}, {year}")
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Delete existing records for this week (in case of re-calculation)
-        cursor.execute('DELETE FROM weekly_results WHERE week = ? AND year = ?', (week, year))
-        
-        # Determine rankings and winners
-        current_rank = 1
-        prev_score = None
-        winner_found = False
-        saved_count = 0
-        
         self.logger.info(f"📊 Saving Week {week} Results:")
         
-        for i, (user_id, username, total_picks, correct_picks) in enumerate(standings):
-            # Handle ties in ranking
-            if prev_score is not None and correct_picks < prev_score:
-                current_rank = i + 1
-            
-            # Winner is anyone with the highest score (handles ties)
-            is_winner = (not winner_found and (prev_score is None or correct_picks == standings[0][3]))
+        for entry in results:
+            winner_emoji = "🏆" if entry['is_winner'] else ""
+            self.logger.info(f"  {entry['rank']:2d}. {entry['username']:12s}: "
+                             f"{entry['correct_picks']:2d}/{entry['total_picks']:2d} {winner_emoji}")
             
-            # Insert into weekly_results
-            cursor.execute('''
-                INSERT INTO weekly_results (
-                    user_id, week, year, correct_picks, total_picks,
-                    is_winner, weekly_rank, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (user_id, week, year, correct_picks, total_picks, 
-                  is_winner, current_rank, datetime.now()))
-            
-            winner_emoji = "🏆" if is_winner else ""
-            self.logger.info(f"  {current_rank:2d}. {username:12s}: {correct_picks:2d}/{total_picks:2d} {winner_emoji}")
-            
-            # If this is the winner, get Monday Night info
-            if is_winner and not winner_found:
-                mnf_info = self.get_monday_night_info(user_id, week, year)
+            # For the winner, show the Monday Night pick that may have decided it
+            if entry['is_winner']:
+                mnf_info = self.get_monday_night_info(entry['user_id'], week, year)
                 if mnf_info:
                     self.logger.info(f"     Monday Night Pick: {mnf_info['pick']}")
                     self.logger.info(f"     Game Result: {mnf_info['game']}")
                     self.logger.info(f"     Pick Result: {'✅ CORRECT' if mnf_info['pick_correct'] else '❌ WRONG'}")
                     if mnf_info['prediction'] != "No prediction":
                         self.logger.info(f"     Score Prediction: {mnf_info['prediction']} (Actual: {mnf_info['actual_score']})")
-                
-                winner_found = True
-            
-            prev_score = correct_picks
-            saved_count += 1
-        
-        conn.commit()
-        conn.close()
         
-        self.logger.info(f"✅ Week {week} results saved: {saved_count} records")
+        self.logger.info(f"✅ Week {week} results saved: {len(results)} records")
         return True
     
     def process_completed_weeks(self, start_week=1, end_week=18, year=2025):
@@ -0,0 +1,372 @@
+"""
+Weekly winner engine for NFL Fantasy League
+The one place that ranks a week's players, breaks ties and decides the
+winner. The weekly leaderboard (weekly_standings) ranks with the same rules;
+ScoringUpdater, WeeklyWinnerManager, NFLScoringManager, NFLWeekScorer and
+/admin/calculate_results all store weekly_results through
+WeeklyWinnerEngine.
+
+Ranking rules:
+    1. Most correct picks
+    2. Picked the Monday Night winner
+    3. Monday Night total points closest, then winner score, then loser score
+    4. Earliest pick submission of the week
+    5. Username
+The winner is rank 1 once every game of the week is final.
+
+Games and picks are loaded in bulk (two queries for any number of weeks) and
+weekly_results is written with one executemany upsert, so recomputing a whole
+season after a data fix is a single transaction.
+"""
+
+import time
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from models import get_pooled_connection
+from season_standings import refresh_season_standings_with_cursor
+from data_version import refresh_data_version
+from game_slots import SLOT_MNF
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'nfl_fantasy.db'
+
+# Sorts after any real created_at timestamp
+NO_SUBMISSION = '9999-12-31 23:59:59'
+
+
+def pick_monday_night_game(games: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    The week's actual Monday Night (tiebreaker) game: the latest kickoff in the MNF slot.
+    Every tiebreaker consumer (rankings, leaderboard, scenario engine) picks it here,
+    the same game predictable_winner and mnf_cleanup_utils select in SQL.
+    """
+    candidates = [game for game in games if game['slot'] == SLOT_MNF]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda game: (game['kickoff_utc'] or 0, game['id']))
+
+
+def calculate_monday_tiebreaker(monday_pick: Optional[Dict[str, Any]],
+                                monday_game: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Monday Night tiebreaker fields for one player
+    NEW MONDAY NIGHT TIEBREAKER RULES (Starting Week 4, 2025):
+    1. Total points (home + away) - closest to actual total
+    2. Winning team score - closest to actual winner's score
+    3. Losing team score - closest to actual loser's score
+    """
+    if not monday_pick or not monday_game:
+        return {
+            'has_pick': False,
+            'correct_winner': False,
+            'home_diff': 999,
+            'away_diff': 999,
+            'total_diff': 999
+        }
+
+    pred_home = monday_pick['predicted_home_score'] or 0
+    pred_away = monday_pick['predicted_away_score'] or 0
+    actual_home = monday_game['home_score'] or 0
+    actual_away = monday_game['away_score'] or 0
+    home_team = monday_game['home_team'] or ''
+    away_team = monday_game['away_team'] or ''
+    is_final = monday_game['is_final'] or False
+    selected_team = monday_pick['selected_team']
+
+    # Check if user predicted correct winner based on selected_team
+    if selected_team and is_final:
+        actual_winner = away_team if actual_away > actual_home else home_team
+        correct_winner = selected_team == actual_winner
+    else:
+        correct_winner = False
+
+    if is_final:
+        if actual_home > actual_away:
+            winner_diff = abs(pred_home - actual_home)
+            loser_diff = abs(pred_away - actual_away)
+        else:
+            winner_diff = abs(pred_away - actual_away)
+            loser_diff = abs(pred_home - actual_home)
+    else:
+        winner_diff = 999
+        loser_diff = 999
+
+    return {
+        'has_pick': True,
+        'correct_winner': correct_winner,
+        'home_diff': abs(pred_home - actual_home) if is_final else 999,
+        'away_diff': abs(pred_away - actual_away) if is_final else 999,
+        'total_diff': abs((pred_home + pred_away) - (actual_home + actual_away)) if is_final else 999,
+        'winner_diff': winner_diff,
+        'loser_diff': loser_diff,
+        'home_team': home_team,
+        'away_team': away_team,
+        'predicted_home': pred_home,
+        'predicted_away': pred_away,
+        'actual_home': actual_home,
+        'actual_away': actual_away,
+        'selected_team': selected_team,
+        'is_final': is_final
+    }
+
+
+def rank_sort_key(entry: Dict[str, Any]):
+    """Ranking order: wins, correct MNF winner, total/winner/loser diffs, earliest submission, username"""
+    tiebreaker = entry['monday_tiebreaker']
+    return (
+        -entry['correct_picks'],
+        not tiebreaker.get('correct_winner', False),
+        tiebreaker.get('total_diff', 999),
+        tiebreaker.get('winner_diff', 999),
+        tiebreaker.get('loser_diff', 999),
+        entry.get('submission_time') or NO_SUBMISSION,
+        entry['username']
+    )
+
+
+def assign_ranks(leaderboard: List[Dict[str, Any]], week_completed: bool,
+                 clinch_lead: Optional[int] = None) -> None:
+    """
+    Set ranks on a sorted leaderboard and flag the week winner.
+    The winner is rank 1 once the week is complete; pages showing a week in
+    progress may also pass clinch_lead to flag a leader that far ahead.
+    """
+    for i, entry in enumerate(leaderboard, 1):
+        entry['rank'] = i
+        if i == 1:
+            if len(leaderboard) > 1:
+                second_place_score = leaderboard[1]['correct_picks']
+                user_score = entry['correct_picks']
+
+                lead = user_score - second_place_score
+                entry['is_winner'] = ((week_completed and user_score >= second_place_score) or
+                                      (clinch_lead is not None and lead >= clinch_lead))
+            else:
+                # Only one user, they win only if week is completed
+                entry['is_winner'] = week_completed
+        else:
+            entry['is_winner'] = False
+
+
+class WeeklyWinnerEngine:
+    """Ranks weeks from bulk-loaded games and picks and stores weekly_results"""
+
+    def __init__(self, db_path: str = DATABASE_PATH):
+        self.db_path = db_path
+
+    @staticmethod
+    def _load(cursor, year: int, weeks: Optional[List[int]]
+              ) -> Tuple[Dict[int, List[Dict[str, Any]]], Dict[int, List[Dict[str, Any]]]]:
+        """Games and non-admin picks of the given weeks (every week when None), grouped by week"""
+        week_filter = ''
+        params: List[Any] = [year]
+        if weeks is not None:
+            week_filter = f"AND g.week IN ({','.join('?' * len(weeks))})"
+            params.extend(weeks)
+
+        cursor.execute(f'''
+            SELECT g.id, g.week, g.home_team, g.away_team, g.home_score, g.away_score,
+                   g.game_date, g.is_final, g.is_monday_night, g.kickoff_utc, g.slot
+            FROM nfl_games g
+            WHERE g.year = ? {week_filter}
+            ORDER BY g.week, g.game_date, g.id
+        ''', params)
+        games_by_week: Dict[int, List[Dict[str, Any]]] = {}
+        for row in cursor.fetchall():
+            games_by_week.setdefault(row['week'], []).append(dict(row))
+
+        cursor.execute(f'''
+            SELECT up.user_id, u.username, up.game_id, g.week, up.selected_team,
+                   up.predicted_home_score, up.predicted_away_score, up.is_correct, up.created_at
+            FROM user_picks up
+            JOIN nfl_games g ON up.game_id = g.id
+            JOIN users u ON up.user_id = u.id
+            WHERE g.year = ? AND u.is_admin = 0 {week_filter}
+            ORDER BY up.id
+        ''', params)
+        picks_by_week: Dict[int, List[Dict[str, Any]]] = {}
+        for row in cursor.fetchall():
+            picks_by_week.setdefault(row['week'], []).append(dict(row))
+
+        return games_by_week, picks_by_week
+
+    @staticmethod
+    def rank_week(games: List[Dict[str, Any]], picks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Rank one week from its games and picks.
+        Only picks on final games count; players without one are left out.
+        Returns {'week_completed', 'completed_games', 'total_games', 'results'}.
+        """
+        games_by_id = {game['id']: game for game in games}
+        completed_games = sum(1 for game in games if game['is_final'] == 1)
+        week_completed = len(games) > 0 and completed_games == len(games)
+        monday_game = pick_monday_night_game(games)
+
+        players: Dict[int, Dict[str, Any]] = {}
+        for pick in picks:
+            game = games_by_id.get(pick['game_id'])
+            if game is None:
+                continue
+            player = players.setdefault(pick['user_id'], {
+                'user_id': pick['user_id'],
+                'username': pick['username'],
+                'total_picks': 0,
+                'correct_picks': 0,
+                'submission_time': None,
+                'monday_pick': None
+            })
+            if pick['created_at'] and (player['submission_time'] is None or
+                                       str(pick['created_at']) < player['submission_time']):
+                player['submission_time'] = str(pick['created_at'])
+            if monday_game is not None and game['id'] == monday_game['id'] and player['monday_pick'] is None:
+                player['monday_pick'] = pick
+            if game['is_final'] == 1:
+                player['total_picks'] += 1
+                if pick['is_correct'] == 1:
+                    player['correct_picks'] += 1
+
+        results = []
+        for player in players.values():
+            if player['total_picks'] == 0:
+                continue
+            results.append({
+                'user_id': player['user_id'],
+                'username': player['username'],
+                'total_picks': player['total_picks'],
+                'correct_picks': player['correct_picks'],
+                'submission_time': player['submission_time'] or NO_SUBMISSION,
+                'monday_tiebreaker': calculate_monday_tiebreaker(player['monday_pick'], monday_game),
+                'rank': 0,
+                'is_winner': False
+            })
+
+        results.sort(key=rank_sort_key)
+        assign_ranks(results, week_completed)
+        return {
+            'week_completed': week_completed,
+            'completed_games': completed_games,
+            'total_games': len(games),
+            'results': results
+        }
+
+    def rank_weeks(self, year: int, weeks: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """Rank the given weeks (every week of the season when None) without storing anything"""
+        week_list = sorted(set(weeks)) if weeks is not None else None
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            games_by_week, picks_by_week = self._load(conn.cursor(), year, week_list)
+        finally:
+            conn.close()
+        return {week: self.rank_week(games_by_week.get(week, []), picks_by_week.get(week, []))
+                for week in (week_list if week_list is not None else sorted(games_by_week))}
+
+    def get_week_results(self, week: int, year: int) -> List[Dict[str, Any]]:
+        """A week's ranked players (rank 1 first)"""
+        return self.rank_weeks(year, [week])[week]['results']
+
+    @staticmethod
+    def _write(cursor, year: int, ranked: Dict[int, Dict[str, Any]]) -> Set[int]:
+        """Upsert the weeks' weekly_results rows and drop stale ones; returns every affected user"""
+        weeks = list(ranked)
+        if not weeks:
+            return set()
+
+        cursor.execute(f'''
+            SELECT user_id, week FROM weekly_results
+            WHERE year = ? AND week IN ({','.join('?' * len(weeks))})
+        ''', [year] + weeks)
+        existing = {(row[0], row[1]) for row in cursor.fetchall()}
+
+        now = datetime.now()
+        rows = []
+        for week, ranking in ranked.items():
+            for entry in ranking['results']:
+                rows.append((entry['user_id'], week, year, entry['total_picks'], entry['correct_picks'],
+                             1 if entry['is_winner'] else 0, entry['rank'], now))
+        current = {(row[0], row[1]) for row in rows}
+
+        stale = existing - current
+        if stale:
+            cursor.executemany('DELETE FROM weekly_results WHERE user_id = ? AND week = ? AND year = ?',
+                               [(user_id, week, year) for user_id, week in stale])
+
+        cursor.executemany('''
+            INSERT INTO weekly_results
+                (user_id, week, year, total_picks, correct_picks, is_winner, weekly_rank, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, week, year) DO UPDATE SET
+                total_picks = excluded.total_picks,
+                correct_picks = excluded.correct_picks,
+                is_winner = excluded.is_winner,
+                weekly_rank = excluded.weekly_rank
+        ''', rows)
+
+        return {user_id for user_id, _ in existing | current}
+
+    def recompute(self, year: int, weeks: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Rank and store the given weeks (every week of the season when None)
+        together with the affected season standings, in one transaction.
+        Weeks without any final game are cleared. Returns the rankings by week.
+        """
+        started = time.perf_counter()
+        week_list = sorted(set(weeks)) if weeks is not None else None
+
+        conn = get_pooled_connection(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            conn.isolation_level = None
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                games_by_week, picks_by_week = self._load(cursor, year, week_list)
+                ranked = {week: self.rank_week(games_by_week.get(week, []), picks_by_week.get(week, []))
+                          for week in (week_list if week_list is not None else sorted(games_by_week))}
+                affected_users = self._write(cursor, year, ranked)
+                if affected_users:
+                    refresh_season_standings_with_cursor(cursor, affected_users)
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+        refresh_data_version(self.db_path)
+        logger.info(f"Recomputed weekly results for {len(ranked)} weeks of {year} "
+                    f"({sum(len(r['results']) for r in ranked.values())} rows) "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return ranked
+
+    def recompute_week(self, week: int, year: int) -> Dict[str, Any]:
+        """Rank and store one week"""
+        return self.recompute(year, [week])[week]
+
+    def recompute_season(self, year: int, through_week: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """Rank and store weeks 1..through_week (the whole season when None) in one transaction"""
+        weeks = range(1, through_week + 1) if through_week is not None else None
+        return self.recompute(year, weeks)
+
+
+def summarize_rankings(ranked: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-week winner summary for admin responses"""
+    summary = []
+    for week, ranking in sorted(ranked.items()):
+        winner = next((entry for entry in ranking['results'] if entry['is_winner']), None)
+        leader = ranking['results'][0] if ranking['results'] else None
+        summary.append({
+            'week': week,
+            'players': len(ranking['results']),
+            'completed_games': ranking['completed_games'],
+            'total_games': ranking['total_games'],
+            'week_completed': ranking['week_completed'],
+            'winner': winner['username'] if winner else None,
+            'leader': leader['username'] if leader else None,
+            'leader_correct_picks': leader['correct_picks'] if leader else None
+        })
+    return summary